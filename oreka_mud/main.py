@@ -891,10 +891,15 @@ async def handle_client(reader, writer, world, parser):
         result += f"\n{prompt}"
         return result
 
-    # Register GMCP handler for this connection
+    # Register GMCP handler for this connection (WebSocket sessions bring
+    # their own handler; telnet sessions negotiate one)
     try:
-        from src.gmcp import register_handler as gmcp_register
-        gmcp_handler = gmcp_register(character, writer)
+        from src.gmcp import register_handler as gmcp_register, register_ws_handler
+        if getattr(writer, 'gmcp', None) is not None:
+            gmcp_handler = register_ws_handler(character, writer.websocket,
+                                               handler=writer.gmcp)
+        else:
+            gmcp_handler = gmcp_register(character, writer)
         gmcp_handler.emit_vitals(character)
         gmcp_handler.emit_status(character)
         gmcp_handler.emit_room(character.room, character)
@@ -908,6 +913,14 @@ async def handle_client(reader, writer, world, parser):
     except Exception:
         pass
 
+    # Story chapters earned while offline play before the first look
+    try:
+        from src.narrative import get_narrative_manager
+        for _chapter, text in get_narrative_manager().catch_up(character):
+            writer.write(text + "\n")
+    except Exception:
+        pass
+
     # Notify shadow presences in this room that a player logged in
     try:
         from src.shadow_presence import shadow_manager
@@ -929,50 +942,14 @@ async def handle_client(reader, writer, world, parser):
         )
     )
     last_room_vnum = character.room.vnum
-    COMBAT_TICK_RATE = 2  # seconds between auto-attack rounds (was 4)
     _cmd_times = []  # Rate limiting: timestamps of recent commands
     _CMD_RATE_LIMIT = 8  # max commands per second
     while True:
         try:
-            # In combat: use timeout so combat auto-ticks even without input
+            # Combat rounds are stepped centrally by the combat scheduler
+            # (src/combat.py), so input is read the same way in or out of combat.
             from src.character import State as _State
-            from src.combat import get_combat as _get_combat
-            in_combat = (character.state == _State.COMBAT
-                         and _get_combat(character.room)
-                         and _get_combat(character.room).is_active)
-            if in_combat:
-                try:
-                    data = await asyncio.wait_for(reader.readline(), timeout=COMBAT_TICK_RATE)
-                except asyncio.TimeoutError:
-                    # No input — auto-tick combat
-                    combat = _get_combat(character.room)
-                    if combat and combat.is_active:
-                        combat_messages = []
-                        should_end, end_msg = combat.check_combat_end()
-                        if should_end:
-                            combat_messages.append(end_msg)
-                            combat.end_combat()
-                            character.clear_combat_target()
-                            character.state = _State.EXPLORING
-                        else:
-                            turn_msg = combat.advance_turn()
-                            if turn_msg:
-                                combat_messages.append(turn_msg)
-                            current = combat.get_current_combatant()
-                            if current:
-                                turn_result = combat.execute_turn(current.combatant, parser)
-                                combat_messages.append(turn_result)
-                                should_end, end_msg = combat.check_combat_end()
-                                if should_end:
-                                    combat_messages.append(end_msg)
-                                    combat.end_combat()
-                                    character.clear_combat_target()
-                                    character.state = _State.EXPLORING
-                        if combat_messages:
-                            writer.write(f"{WHITE}" + "\n".join(combat_messages) + f"\n{character.get_prompt()} {RESET}")
-                            await writer.drain()
-                    continue
-            elif character.state == _State.CHATTING and character.active_chat_session:
+            if character.state == _State.CHATTING and character.active_chat_session:
                 # Chat mode: route input to AI conversation
                 _chat_session = character.active_chat_session
                 _chat_prompt = f"\033[1;35m[Chat: {_chat_session.npc_name}]\033[0m > "
@@ -1067,15 +1044,8 @@ async def handle_client(reader, writer, world, parser):
             _dir_chars = {'n': 'north', 's': 'south', 'e': 'east', 'w': 'west', 'u': 'up', 'd': 'down'}
             _diagonal_shortcuts = {"ne", "nw", "se", "sw"}
             if len(cmd) > 1 and cmd not in _diagonal_shortcuts and all(c in _dir_chars for c in cmd) and cmd not in parser.commands:
-                _sw_results = []
-                for _ch in cmd:
-                    _dir = _dir_chars[_ch]
-                    _res = parser.cmd_move(character, _dir)
-                    if "no exit" in _res.lower() or "closed" in _res.lower() or "locked" in _res.lower() or "cannot" in _res.lower():
-                        _sw_results.append(f"Stopped: {_res}")
-                        break
-                    _sw_results.append(f"You move {_dir} to {character.room.name}.")
-                writer.write(f"{WHITE}" + "\n".join(_sw_results) + f"\n{character.get_prompt()} {RESET}")
+                _sw_result = parser.cmd_speedwalk(character, cmd)
+                writer.write(f"{WHITE}{_sw_result}\n{character.get_prompt()} {RESET}")
                 await writer.drain()
                 continue
 
@@ -1202,7 +1172,8 @@ async def handle_client(reader, writer, world, parser):
     world.players_by_name.pop(character.name.lower(), None)
     character.room.players.remove(character)
     try:
-        character.save()
+        from src.persistence import get_player_store
+        await get_player_store().save_async(character)
         logger.info(f"Saved character {character.name}")
     except Exception as e:
         logger.error(f"Failed to save character {character.name}: {e}")
@@ -1794,343 +1765,318 @@ async def confirm_character(writer, reader, summary):
 #     ...create and save character...
 
 
-async def log_players(world):
-    while True:
-        logger.info(f"Active players: {[p.name for p in world.players]}")
-        await asyncio.sleep(60)
+# =====================================================================
+# WORLD PULSES — each runs once per heartbeat beat (see src/heartbeat.py)
+# =====================================================================
 
+def log_players(world):
+    logger.info(f"Active players: {[p.name for p in world.players]}")
 
-async def hunger_thirst_tick(world):
-    """Periodic tick to drain hunger/thirst for players in survival mode."""
-    while True:
-        await asyncio.sleep(60)
+
+def hunger_thirst_tick(world):
+    """Drain hunger/thirst for players in survival mode."""
+    for player in world.players:
+        if not getattr(player, 'survival_mode', False):
+            continue
+        if getattr(player, 'is_ai', False):
+            continue
+        player.hunger = max(0, getattr(player, 'hunger', 100) - 1)
+        player.thirst = max(0, getattr(player, 'thirst', 100) - 2)
+        _w = getattr(player, 'writer', None)
+        if not _w:
+            continue
         try:
-            for player in world.players:
-                if not getattr(player, 'survival_mode', False):
-                    continue
-                if getattr(player, 'is_ai', False):
-                    continue
-                player.hunger = max(0, getattr(player, 'hunger', 100) - 1)
-                player.thirst = max(0, getattr(player, 'thirst', 100) - 2)
-                _w = getattr(player, 'writer', None)
-                if not _w:
-                    continue
-                try:
-                    if player.hunger == 25:
-                        _w.write("\nYou are very hungry!\n")
-                    elif player.hunger == 0:
-                        _w.write("\nYou are starving! Find food soon!\n")
-                        # Add fatigued condition from starvation
-                        if not player.has_condition('fatigued'):
-                            player.add_condition('fatigued')
-                            _w.write("You are fatigued from hunger.\n")
-                    elif player.hunger > 0 and player.has_condition('fatigued'):
-                        # Check if fatigue was from hunger (remove it when fed)
-                        # Only remove if thirst isn't also causing it
-                        if getattr(player, 'thirst', 100) > 0:
-                            player.remove_condition('fatigued')
-                            _w.write("You no longer feel fatigued.\n")
-
-                    if player.thirst == 25:
-                        _w.write("\nYou are very thirsty!\n")
-                    elif player.thirst == 0:
-                        _w.write("\nYou are dehydrated! Find water!\n")
-                        # Add exhausted condition from dehydration
-                        if not player.has_condition('exhausted'):
-                            player.add_condition('exhausted')
-                            _w.write("You are exhausted from dehydration.\n")
-                    elif player.thirst > 0 and player.has_condition('exhausted'):
-                        player.remove_condition('exhausted')
-                        _w.write("You no longer feel exhausted.\n")
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.error(f"Error in hunger/thirst tick: {e}")
+            if player.hunger == 25:
+                _w.write("\nYou are very hungry!\n")
+            elif player.hunger == 0:
+                _w.write("\nYou are starving! Find food soon!\n")
+                # Add fatigued condition from starvation
+                if not player.has_condition('fatigued'):
+                    player.add_condition('fatigued')
+                    _w.write("You are fatigued from hunger.\n")
+            elif player.hunger > 0 and player.has_condition('fatigued'):
+                # Check if fatigue was from hunger (remove it when fed)
+                # Only remove if thirst isn't also causing it
+                if getattr(player, 'thirst', 100) > 0:
+                    player.remove_condition('fatigued')
+                    _w.write("You no longer feel fatigued.\n")
+
+            if player.thirst == 25:
+                _w.write("\nYou are very thirsty!\n")
+            elif player.thirst == 0:
+                _w.write("\nYou are dehydrated! Find water!\n")
+                # Add exhausted condition from dehydration
+                if not player.has_condition('exhausted'):
+                    player.add_condition('exhausted')
+                    _w.write("You are exhausted from dehydration.\n")
+            elif player.thirst > 0 and player.has_condition('exhausted'):
+                player.remove_condition('exhausted')
+                _w.write("You no longer feel exhausted.\n")
+        except Exception:
+            pass
 
 
-async def schedule_tick(world):
-    """Periodic tick to advance game time and process NPC schedules."""
+def schedule_tick(world):
+    """Advance game time and process NPC schedules."""
     from src.schedules import get_game_time, get_schedule_manager
     game_time = get_game_time()
     sched_mgr = get_schedule_manager()
-    while True:
-        await asyncio.sleep(30)  # Tick every 30 seconds
-        try:
-            game_time.tick()
-            messages = sched_mgr.tick(game_time, world)
-            # Broadcast movement messages to rooms
-            for room_vnum, msg in messages:
-                room = world.rooms.get(room_vnum)
-                if room:
-                    for p in getattr(room, 'players', []):
-                        _pw = getattr(p, 'writer', None)
-                        if _pw and not getattr(p, 'is_ai', False):
-                            try:
-                                _pw.write(f"\n{msg}\n")
-                            except Exception:
-                                pass
-        except Exception as e:
-            logger.error(f"Error in schedule tick: {e}")
-
-
-async def location_effects_tick(world):
-    """Periodically process environmental hazards in rooms."""
-    from src.location_effects import get_location_effects
-    le = get_location_effects()
-    while True:
-        try:
-            await asyncio.sleep(60)
-            notifications = le.tick_hazards(world)
-            for player, msg in notifications:
-                if hasattr(player, '_writer'):
+    game_time.tick()
+    messages = sched_mgr.tick(game_time, world)
+    # Broadcast movement messages to rooms
+    for room_vnum, msg in messages:
+        room = world.rooms.get(room_vnum)
+        if room:
+            for p in getattr(room, 'players', []):
+                _pw = getattr(p, 'writer', None)
+                if _pw and not getattr(p, 'is_ai', False):
                     try:
-                        player._writer.write(msg + "\n")
+                        _pw.write(f"\n{msg}\n")
                     except Exception:
                         pass
-        except Exception as e:
-            logger.error(f"Error in location effects tick: {e}")
 
 
-async def wandering_gods_tick(world):
+def location_effects_tick(world):
+    """Process environmental hazards in rooms."""
+    from src.location_effects import get_location_effects
+    notifications = get_location_effects().tick_hazards(world)
+    for player, msg in notifications:
+        if hasattr(player, '_writer'):
+            try:
+                player._writer.write(msg + "\n")
+            except Exception:
+                pass
+
+
+def wandering_gods_tick(world):
     """Move gods between shrines and notify nearby players."""
-    wg = get_wandering_gods()
-    wg.initialize()
-    while True:
-        try:
-            await asyncio.sleep(60)
-            movements = wg.tick(world)
-            # Notify players in rooms where gods arrive/depart
-            for god, old_vnum, new_vnum in movements:
-                # Notify players in the new room
-                if new_vnum in world.rooms:
-                    for player in world.rooms[new_vnum].players:
-                        msg = god.get_presence_message(player)
-                        if msg and hasattr(player, '_writer'):
-                            try:
-                                player._writer.write(f"\n{msg}\n")
-                            except Exception:
-                                pass
-        except Exception as e:
-            logger.error(f"Error in wandering gods tick: {e}")
+    movements = get_wandering_gods().tick(world)
+    # Notify players in rooms where gods arrive/depart
+    for god, old_vnum, new_vnum in movements:
+        # Notify players in the new room
+        if new_vnum in world.rooms:
+            for player in world.rooms[new_vnum].players:
+                msg = god.get_presence_message(player)
+                if msg and hasattr(player, '_writer'):
+                    try:
+                        player._writer.write(f"\n{msg}\n")
+                    except Exception:
+                        pass
 
 
-async def gmcp_tick(world):
-    """Central GMCP state tick — emit vitals/status/room-mobs deltas every 2s.
+def gmcp_tick(world):
+    """Central GMCP state tick — emit vitals/status/room-mobs deltas.
 
     Suppresses redundant emits via per-character fingerprint cache in
     src/gmcp.py. Panels that rely on live HP/combat state (combat feed,
-    character sheet) depend on this loop.
+    character sheet) depend on this pulse.
     """
     from src import gmcp as _gmcp
-    while True:
-        try:
-            await asyncio.sleep(2)
-            _gmcp.tick_all(world)
-        except Exception as e:
-            logger.error(f"Error in GMCP tick: {e}")
+    _gmcp.tick_all(world)
 
 
-async def chat_despawn_tick(world):
+def chat_despawn_tick(world):
     """Auto-despawn stale chat sessions (30 min inactive)."""
-    while True:
-        try:
-            await asyncio.sleep(60)  # Check every 60 seconds
-            from src.shadow_presence import shadow_manager
-            from src.chat_session import force_end_timeout
-            stale = shadow_manager.get_stale(timeout_seconds=1800)
-            for shadow in stale:
-                if shadow.is_telnet and shadow.character_ref:
-                    char = shadow.character_ref
-                    if getattr(char, 'active_chat_session', None):
-                        force_end_timeout(char.active_chat_session, char)
-                else:
-                    shadow_manager.remove(shadow.player_id)
-        except Exception as e:
-            logger.error(f"Error in chat despawn tick: {e}")
+    from src.shadow_presence import shadow_manager
+    from src.chat_session import force_end_timeout
+    stale = shadow_manager.get_stale(timeout_seconds=1800)
+    for shadow in stale:
+        if shadow.is_telnet and shadow.character_ref:
+            char = shadow.character_ref
+            if getattr(char, 'active_chat_session', None):
+                force_end_timeout(char.active_chat_session, char)
+        else:
+            shadow_manager.remove(shadow.player_id)
 
 
-async def townsfolk_tick(world):
+def townsfolk_tick(world):
     """Move wandering townsfolk and send ambient messages to nearby players."""
     from src.townsfolk import get_townsfolk_manager
-    mgr = get_townsfolk_manager()
-    mgr.initialize(world)
-    while True:
-        try:
-            await asyncio.sleep(30)  # Check every 30 seconds
-            messages = mgr.tick(world)
-            for vnum, msg in messages:
-                if vnum in world.rooms:
-                    for player in world.rooms[vnum].players:
-                        if hasattr(player, '_writer'):
-                            try:
-                                player._writer.write(f"\n\033[0;90m{msg}\033[0m\n")
-                            except Exception:
-                                pass
-        except Exception as e:
-            logger.error(f"Error in townsfolk tick: {e}")
+    messages = get_townsfolk_manager().tick(world)
+    for vnum, msg in messages:
+        if vnum in world.rooms:
+            for player in world.rooms[vnum].players:
+                if hasattr(player, '_writer'):
+                    try:
+                        player._writer.write(f"\n\033[0;90m{msg}\033[0m\n")
+                    except Exception:
+                        pass
 
 
-async def spawn_respawn_tick(world):
-    """Periodically check for dead mobs and respawn them."""
+def init_spawn_manager(world):
+    """Build spawn points from mobs.json. Returns False if unavailable."""
     spawn_mgr = get_spawn_manager()
-    if not spawn_mgr.spawn_points:
-        # Initialize from current mobs data
-        import json as _json
-        try:
-            with open("data/mobs.json", encoding="utf-8") as _f:
-                mobs_data = _json.load(_f)
-            spawn_mgr.initialize_from_mobs_data(mobs_data)
-            spawn_mgr.link_existing_mobs(world)
-            logger.info(f"SpawnManager initialized with {len(spawn_mgr.spawn_points)} spawn points")
-        except Exception as e:
-            logger.error(f"Failed to initialize SpawnManager: {e}")
-            return
-    while True:
-        try:
-            await asyncio.sleep(30)
-            messages = spawn_mgr.tick(world)
-            for msg in messages:
-                logger.info(f"Spawn: {msg}")
-        except Exception as e:
-            logger.error(f"Error in spawn tick: {e}")
+    if spawn_mgr.spawn_points:
+        return True
+    import json as _json
+    try:
+        with open("data/mobs.json", encoding="utf-8") as _f:
+            mobs_data = _json.load(_f)
+        spawn_mgr.initialize_from_mobs_data(mobs_data)
+        spawn_mgr.link_existing_mobs(world)
+        logger.info(f"SpawnManager initialized with {len(spawn_mgr.spawn_points)} spawn points")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to initialize SpawnManager: {e}")
+        return False
+
 
+def spawn_respawn_tick(world):
+    """Check for dead mobs and respawn them."""
+    messages = get_spawn_manager().tick(world)
+    for msg in messages:
+        logger.info(f"Spawn: {msg}")
 
-async def encounter_tick(world):
+
+def encounter_tick(world):
     """Roll regional random encounters and advance active stalkers."""
     from src.encounters import get_encounter_manager
     from src.schedules import get_game_time
-    mgr = get_encounter_manager()
-    game_time = get_game_time()
-    while True:
-        try:
-            await asyncio.sleep(30)
-            messages = mgr.tick(world, game_time)
-            for msg in messages:
-                logger.info(f"Encounter: {msg}")
-        except Exception as e:
-            logger.error(f"Error in encounter tick: {e}")
+    messages = get_encounter_manager().tick(world, get_game_time())
+    for msg in messages:
+        logger.info(f"Encounter: {msg}")
+
+
+AMBIENT_MESSAGES = {
+    'forest': [
+        "Leaves rustle in the wind.",
+        "A bird calls from somewhere in the canopy.",
+        "Sunlight filters through the branches above.",
+    ],
+    'cave': [
+        "Water drips from the ceiling.",
+        "A faint echo reverberates through the cavern.",
+        "You hear stones shifting somewhere in the darkness.",
+    ],
+    'safe': [
+        "You hear the distant murmur of conversation.",
+        "A merchant calls out to passersby.",
+    ],
+    'town': [
+        "You hear the distant murmur of conversation.",
+        "The smell of fresh bread wafts from a nearby bakery.",
+    ],
+    'water': [
+        "Waves lap gently against the shore.",
+        "The sound of flowing water fills the air.",
+    ],
+    'mountain': [
+        "A cold wind whistles through the peaks.",
+        "Loose pebbles tumble down the slope.",
+    ],
+}
 
 
-async def ambient_echo_tick(world):
-    """Send ambient room echoes to players periodically."""
+def ambient_echo_tick(world):
+    """Send ambient room echoes to players."""
     import random as _rnd
-    AMBIENT_MESSAGES = {
-        'forest': [
-            "Leaves rustle in the wind.",
-            "A bird calls from somewhere in the canopy.",
-            "Sunlight filters through the branches above.",
-        ],
-        'cave': [
-            "Water drips from the ceiling.",
-            "A faint echo reverberates through the cavern.",
-            "You hear stones shifting somewhere in the darkness.",
-        ],
-        'safe': [
-            "You hear the distant murmur of conversation.",
-            "A merchant calls out to passersby.",
-        ],
-        'town': [
-            "You hear the distant murmur of conversation.",
-            "The smell of fresh bread wafts from a nearby bakery.",
-        ],
-        'water': [
-            "Waves lap gently against the shore.",
-            "The sound of flowing water fills the air.",
-        ],
-        'mountain': [
-            "A cold wind whistles through the peaks.",
-            "Loose pebbles tumble down the slope.",
-        ],
-    }
-    while True:
-        await asyncio.sleep(60)
-        try:
-            # Collect rooms with players
-            visited_rooms = set()
-            for player in world.players:
-                if getattr(player, 'is_ai', False):
-                    continue
-                room = getattr(player, 'room', None)
-                if room and room.vnum not in visited_rooms:
-                    visited_rooms.add(room.vnum)
-                    # 10% chance for ambient echo
-                    if _rnd.random() < 0.10:
-                        flags = getattr(room, 'flags', [])
-                        terrain = getattr(room, 'terrain', '')
-                        # Determine message pool from terrain or flags
-                        msg_pool = None
-                        for key in AMBIENT_MESSAGES:
-                            if key in flags or key == terrain:
-                                msg_pool = AMBIENT_MESSAGES[key]
-                                break
-                        if msg_pool:
-                            msg = _rnd.choice(msg_pool)
-                            for p in room.players:
-                                _pw = getattr(p, 'writer', None)
-                                if _pw and not getattr(p, 'is_ai', False):
-                                    try:
-                                        _pw.write(f"\n{msg}\n")
-                                    except Exception:
-                                        pass
-        except Exception as e:
-            logger.error(f"Error in ambient echo tick: {e}")
+    # Collect rooms with players
+    visited_rooms = set()
+    for player in world.players:
+        if getattr(player, 'is_ai', False):
+            continue
+        room = getattr(player, 'room', None)
+        if room and room.vnum not in visited_rooms:
+            visited_rooms.add(room.vnum)
+            # 10% chance for ambient echo
+            if _rnd.random() < 0.10:
+                flags = getattr(room, 'flags', [])
+                terrain = getattr(room, 'terrain', '')
+                # Determine message pool from terrain or flags
+                msg_pool = None
+                for key in AMBIENT_MESSAGES:
+                    if key in flags or key == terrain:
+                        msg_pool = AMBIENT_MESSAGES[key]
+                        break
+                if msg_pool:
+                    msg = _rnd.choice(msg_pool)
+                    for p in room.players:
+                        _pw = getattr(p, 'writer', None)
+                        if _pw and not getattr(p, 'is_ai', False):
+                            try:
+                                _pw.write(f"\n{msg}\n")
+                            except Exception:
+                                pass
 
 
 async def weather_tick(world):
-    """Periodic tick to update dynamic weather per region."""
+    """Update dynamic weather per region (timer managed internally)."""
     from src.weather import get_weather_manager
-    wm = get_weather_manager()
-    while True:
-        await asyncio.sleep(30)  # Check every 30 seconds (timer managed internally)
-        try:
-            await wm.update(world)
-        except Exception as e:
-            logger.error(f"Error in weather tick: {e}")
+    await get_weather_manager().update(world)
 
 
-async def area_reset_tick(world):
-    """Periodic tick to check and perform area resets."""
+def area_reset_tick(world):
+    """Start due area resets and restore the next slice of dirty rooms."""
     from src.area_resets import get_reset_manager
-    rm = get_reset_manager()
-    while True:
-        await asyncio.sleep(60)  # Check every 60 seconds
-        try:
-            await rm.check_resets(world)
-        except Exception as e:
-            logger.error(f"Error in area reset tick: {e}")
+    get_reset_manager().check_resets(world)
 
 
-async def narrative_tick(world):
-    """Periodic tick to check narrative triggers for online players."""
-    from src.narrative import get_narrative_manager
-    nm = get_narrative_manager()
-    while True:
-        await asyncio.sleep(120)  # Check every 2 minutes
-        try:
-            for player in world.players:
-                if getattr(player, 'is_ai', False):
-                    continue
-                triggered = nm.check_triggers(player)
-                for chapter in triggered:
-                    text, rewards = nm.trigger_chapter(player, chapter)
-                    _w = getattr(player, '_writer', None) or getattr(player, 'writer', None)
-                    if _w:
-                        try:
-                            _w.write(text + "\n")
-                            if rewards:
-                                if "xp" in rewards:
-                                    player.xp = getattr(player, 'xp', 0) + rewards["xp"]
-                                    _w.write(f"Gained {rewards['xp']} XP!\n")
-                                if "title" in rewards:
-                                    if not hasattr(player, 'titles'):
-                                        player.titles = []
-                                    if rewards["title"] not in player.titles:
-                                        player.titles.append(rewards["title"])
-                                    _w.write(f"Earned title: {rewards['title']}\n")
-                        except Exception:
-                            pass
-        except Exception as e:
-            logger.error(f"Error in narrative tick: {e}")
+def register_world_pulses(world, parser, hb):
+    """Register every periodic world subsystem with the heartbeat.
+
+    Phase offsets are picked by the heartbeat so pulses sharing a period
+    are spread across the beat instead of firing on the same iteration.
+    Budgets are the per-pulse run time (seconds) above which the pulse
+    counts an overrun in @heartbeat.
+    """
+    from src.combat import get_combat_scheduler, COMBAT_TICK_RATE
+    combat_scheduler = get_combat_scheduler()
+    combat_scheduler.command_parser = parser
+    hb.register("combat", combat_scheduler.step_all, period=COMBAT_TICK_RATE, budget=0.02)
+    hb.register("gmcp", gmcp_tick, period=2, budget=0.02, args=(world,))
+    hb.register("schedules", schedule_tick, period=30, args=(world,))
+    if init_spawn_manager(world):
+        hb.register("spawns", spawn_respawn_tick, period=30, args=(world,))
+    from src.townsfolk import get_townsfolk_manager
+    get_townsfolk_manager().initialize(world)
+    hb.register("townsfolk", townsfolk_tick, period=30, args=(world,))
+    hb.register("weather", weather_tick, period=30, args=(world,))
+    hb.register("encounters", encounter_tick, period=30, args=(world,))
+    hb.register("log_players", log_players, period=60, args=(world,))
+    hb.register("hunger_thirst", hunger_thirst_tick, period=60, args=(world,))
+    hb.register("ambient_echo", ambient_echo_tick, period=60, args=(world,))
+    get_wandering_gods().initialize()
+    hb.register("wandering_gods", wandering_gods_tick, period=60, args=(world,))
+    from src.location_effects import HAZARD_PULSE
+    hb.register("hazards", location_effects_tick, period=HAZARD_PULSE, args=(world,))
+    hb.register("chat_despawn", chat_despawn_tick, period=60, args=(world,))
+    from src.area_resets import RESET_PULSE
+    hb.register("area_resets", area_reset_tick, period=RESET_PULSE, budget=0.05, args=(world,))
+
+    # Write-behind player saves
+    from src.persistence import get_player_store, FLUSH_PERIOD
+    player_store = get_player_store()
+    hb.register("player_saves", player_store.flush, period=FLUSH_PERIOD, budget=0.1,
+                background=True)
+    player_store.active = True
+
+    # Buffered event log appends
+    from src.event_log import get_event_store, FLUSH_PERIOD as EVENT_FLUSH_PERIOD
+    event_store = get_event_store()
+    hb.register("event_log", event_store.flush_async, period=EVENT_FLUSH_PERIOD, budget=0.05,
+                background=True)
+    event_store.active = True
+
+    # Write-behind NPC memory
+    from src.npc_memory import get_npc_memory_store, FLUSH_PERIOD as MEMORY_FLUSH_PERIOD
+    memory_store = get_npc_memory_store()
+    hb.register("npc_memory", memory_store.flush_async, period=MEMORY_FLUSH_PERIOD, budget=0.05,
+                background=True)
+    memory_store.active = True
+
+    # Chat session logs appended to the segmented archive
+    from src.chat_archive import get_chat_archive, FLUSH_PERIOD as ARCHIVE_FLUSH_PERIOD
+    chat_archive = get_chat_archive()
+    hb.register("chat_archive", chat_archive.flush_async, period=ARCHIVE_FLUSH_PERIOD, budget=0.05,
+                background=True)
+    chat_archive.active = True
+
+    # Family-fate tick (burnt-trail timers, ambush waves, etc.)
+    try:
+        from src.family_fates import family_fate_tick
+        hb.register("family_fates", family_fate_tick, period=15, args=(world,))
+    except Exception as e:
+        logger.warning(f"Family fate tick not started: {e}")
 
 
 async def main():
@@ -2209,27 +2155,38 @@ async def main():
     # =====================================================================
     # RAW TCP SERVER — replaces telnetlib3 for universal client compatibility
     # =====================================================================
-    IAC, WILL, WONT, DO, DONT, SB, SE = 255, 251, 252, 253, 254, 250, 240
-    GMCP_OPT = 201
+    from src.telnet_codec import (
+        IAC, WILL, GMCP_OPT, MCCP2_OPT, MCCP2_ENABLED, TelnetDecoder, TelnetOutput,
+    )
 
     class TelnetReader:
         """Wraps asyncio.StreamReader with telnet-aware readline."""
-        def __init__(self, stream_reader):
+        def __init__(self, stream_reader, on_event=None):
             self._reader = stream_reader
             self._buffer = ""
+            self._decoder = TelnetDecoder()
+            self._on_event = on_event
+
+        async def _fill(self):
+            """Read one chunk, strip telnet sequences. False on EOF/timeout."""
+            try:
+                raw = await asyncio.wait_for(self._reader.read(4096), timeout=300)
+            except asyncio.TimeoutError:
+                return False
+            if not raw:
+                return False
+            clean, events = self._decoder.feed(raw)
+            if events and self._on_event:
+                for event in events:
+                    self._on_event(event)
+            self._buffer += clean.decode('utf-8', errors='replace')
+            return True
 
         async def readline(self):
             """Read until newline, stripping telnet IAC sequences."""
             while '\n' not in self._buffer:
-                try:
-                    raw = await asyncio.wait_for(self._reader.read(4096), timeout=300)
-                except asyncio.TimeoutError:
-                    return ""
-                if not raw:
+                if not await self._fill():
                     return ""
-                # Strip telnet negotiation bytes
-                clean = self._strip_iac(raw)
-                self._buffer += clean.decode('utf-8', errors='replace')
 
             line, self._buffer = self._buffer.split('\n', 1)
             return line.strip('\r')
@@ -2237,14 +2194,8 @@ async def main():
         async def read(self, n):
             """Read up to n chars, stripping telnet IAC."""
             while len(self._buffer) < n:
-                try:
-                    raw = await asyncio.wait_for(self._reader.read(4096), timeout=300)
-                except asyncio.TimeoutError:
-                    break
-                if not raw:
+                if not await self._fill():
                     break
-                clean = self._strip_iac(raw)
-                self._buffer += clean.decode('utf-8', errors='replace')
                 if self._buffer:
                     break  # Got something, return it
 
@@ -2252,75 +2203,54 @@ async def main():
             self._buffer = self._buffer[n:]
             return result
 
-        def _strip_iac(self, data):
-            """Remove all telnet IAC negotiation sequences from raw bytes."""
-            result = bytearray()
-            i = 0
-            while i < len(data):
-                if data[i] == IAC and i + 1 < len(data):
-                    cmd = data[i + 1]
-                    if cmd in (WILL, WONT, DO, DONT):
-                        i += 3  # IAC + cmd + option
-                    elif cmd == SB:
-                        # Skip subnegotiation until IAC SE
-                        j = i + 2
-                        while j < len(data) - 1:
-                            if data[j] == IAC and data[j + 1] == SE:
-                                j += 2
-                                break
-                            j += 1
-                        i = j
-                    elif cmd == IAC:
-                        result.append(IAC)
-                        i += 2
-                    else:
-                        i += 2
-                else:
-                    result.append(data[i])
-                    i += 1
-            return bytes(result)
-
     class TelnetWriter:
-        """Wraps asyncio.StreamWriter with write/close/drain and _writer for GMCP."""
+        """Wraps asyncio.StreamWriter with write/close/drain and _writer for GMCP.
+
+        Output is coalesced per event-loop tick (and MCCP2-compressed when
+        negotiated) by TelnetOutput.
+        """
         def __init__(self, stream_writer):
             self._writer = stream_writer
             self._transport = stream_writer.transport if hasattr(stream_writer, 'transport') else None
+            self.output = TelnetOutput(stream_writer)
 
         def write(self, text):
             """Send text to client."""
             if isinstance(text, str):
                 text = text.encode('utf-8', errors='replace')
-            try:
-                self._writer.write(text)
-            except Exception:
-                pass
+            self.output.write(text)
+
+        def write_raw(self, data):
+            """Send raw telnet bytes (GMCP etc.) in order with text."""
+            self.output.write(data)
 
         async def drain(self):
-            try:
-                await self._writer.drain()
-            except Exception:
-                pass
+            await self.output.drain()
 
         def close(self):
-            try:
-                self._writer.close()
-            except Exception:
-                pass
+            self.output.close()
 
     async def tcp_client_handler(stream_reader, stream_writer):
         """Handle a raw TCP connection."""
         addr = stream_writer.get_extra_info('peername')
         logger.info(f"Connection from {addr}")
 
-        reader = TelnetReader(stream_reader)
         writer = TelnetWriter(stream_writer)
 
+        def on_telnet_event(event):
+            if event == ("do", MCCP2_OPT):
+                writer.output.start_mccp2()
+            elif event == ("dont", MCCP2_OPT):
+                writer.output.stop_mccp2()
+
+        reader = TelnetReader(stream_reader, on_event=on_telnet_event)
+
         # Send minimal telnet negotiation (don't wait for response)
-        try:
-            stream_writer.write(bytes([IAC, WILL, GMCP_OPT]))  # Advertise GMCP
-            await stream_writer.drain()
-        except Exception:
-            pass
+        offers = [IAC, WILL, GMCP_OPT]  # Advertise GMCP
+        if MCCP2_ENABLED:
+            offers += [IAC, WILL, MCCP2_OPT]
+        writer.write_raw(bytes(offers))
+        await writer.drain()
 
         # Small delay to let client negotiate, then proceed regardless
         await asyncio.sleep(0.3)
@@ -2359,45 +2289,27 @@ async def main():
     except Exception as e:
         logger.error(f"Module loading failed: {e}")
 
-    # Start background ticks
-    asyncio.create_task(log_players(world))
-    asyncio.create_task(hunger_thirst_tick(world))
-    asyncio.create_task(ambient_echo_tick(world))
-    asyncio.create_task(schedule_tick(world))
-    asyncio.create_task(spawn_respawn_tick(world))
-    asyncio.create_task(wandering_gods_tick(world))
-    asyncio.create_task(location_effects_tick(world))
-    asyncio.create_task(townsfolk_tick(world))
-
-    # Start chat session auto-despawn tick
-    asyncio.create_task(chat_despawn_tick(world))
-    asyncio.create_task(gmcp_tick(world))
-
-    # Start dynamic weather tick
-    asyncio.create_task(weather_tick(world))
-
-    # Start area reset tick
-    asyncio.create_task(area_reset_tick(world))
+    # Open the NPC memory database (and import legacy files) off the loop
+    from src.npc_memory import get_npc_memory_store
+    await asyncio.get_running_loop().run_in_executor(None, get_npc_memory_store().open)
 
-    # Start narrative check tick
-    asyncio.create_task(narrative_tick(world))
-
-    # Start regional random-encounter tick
-    asyncio.create_task(encounter_tick(world))
-
-    # Start family-fate tick (burnt-trail timers, ambush waves, etc.)
-    try:
-        from src.family_fates import family_fate_tick
-        asyncio.create_task(family_fate_tick(world))
-    except Exception as e:
-        logger.warning(f"Family fate tick not started: {e}")
+    # Start the world heartbeat (all periodic subsystems share one scheduler)
+    from src.heartbeat import get_heartbeat
+    heartbeat = get_heartbeat()
+    register_world_pulses(world, parser, heartbeat)
+    _heartbeat_task = asyncio.create_task(heartbeat.run())
 
     # Start WebSocket server (for Veil Client)
     # Keep a reference to prevent garbage collection of the task
     _ws_task = None
     try:
         from src.websocket_server import start_websocket_server
-        _ws_task = asyncio.create_task(start_websocket_server())
+
+        async def ws_client_handler(reader, writer):
+            # Veil sessions attach in-process instead of via the telnet port
+            await handle_client(reader, writer, world, parser)
+
+        _ws_task = asyncio.create_task(start_websocket_server(ws_client_handler))
     except Exception as e:
         logger.warning(f"WebSocket server not started: {e}")
 
@@ -2422,8 +2334,19 @@ async def main():
     except Exception as e:
         logger.warning(f"Map WS server not started: {e}")
 
-    async with server:
-        await server.serve_forever()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        # Write out any player saves still waiting on the write-behind queue
+        from src.persistence import get_player_store
+        get_player_store().flush_sync()
+        from src.event_log import get_event_store
+        get_event_store().flush()
+        from src.npc_memory import get_npc_memory_store
+        get_npc_memory_store().flush()
+        from src.chat_archive import get_chat_archive
+        get_chat_archive().flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark the respawn tick against a full spawn-point scan.
+
+Builds a synthetic world with N spawn points (default 20000) spread over
+rooms, spawns everything, kills a handful of mobs, then times the
+SpawnManager.tick() timer-queue pass against the old approach of calling
+can_respawn() on every spawn point.
+
+Usage:
+  python scripts/bench_respawns.py
+  python scripts/bench_respawns.py --points 50000 --deaths 50
+"""
+import argparse
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from src.room import Room
+from src.spawning import SpawnManager
+
+
+class BenchWorld:
+    def __init__(self, rooms):
+        self.mobs = {}
+        self.rooms = {
+            vnum: Room(vnum=vnum, name=f"Room {vnum}", description="", exits={}, flags=[])
+            for vnum in range(1, rooms + 1)
+        }
+
+
+def _template(vnum, room_vnum):
+    return {"vnum": vnum, "name": f"mob {vnum}", "level": 1, "hp_dice": [1, 4, 0],
+            "ac": 10, "damage_dice": [1, 3, 0], "flags": [], "room_vnum": room_vnum}
+
+
+def _time(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--deaths", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rooms = max(1, args.points // 4)
+    world = BenchWorld(rooms)
+    manager = SpawnManager()
+    manager.initialize_from_mobs_data(
+        [_template(100000 + i, 1 + i % rooms) for i in range(args.points)])
+    manager.tick(world)
+
+    for spawn_point in list(manager.spawn_points.values())[:args.deaths]:
+        spawn_point.current_mob.alive = False
+
+    def full_scan():
+        return [sp for sp in manager.spawn_points.values() if sp.can_respawn()]
+
+    queue_tick = _time(lambda: manager.tick(world), args.repeat)
+    scan = _time(full_scan, args.repeat)
+
+    print(f"{args.points} spawn points, {args.deaths} dead, "
+          f"{len(manager._queue)} queue entries")
+    print(f"  full can_respawn() scan: {scan * 1e3:8.3f} ms/tick")
+    print(f"  timer-queue tick:        {queue_tick * 1e3:8.3f} ms/tick")
+    print(f"  pending respawns listed: {len(manager.get_pending_respawns())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
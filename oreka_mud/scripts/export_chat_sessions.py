@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Stream archived AI chat sessions out as JSON lines.
+
+Reads the day-segmented archive in data/chat_sessions (plus any loose
+per-session logs not yet imported), using the segment indexes to skip
+segments that cannot match. One session per output line, oldest first,
+so scribe tooling can consume it as a stream.
+
+Usage:
+  python scripts/export_chat_sessions.py --player Hormoth > hormoth.jsonl
+  python scripts/export_chat_sessions.py --npc 9010 --since 2026-03-01 --out elder.jsonl
+  python scripts/export_chat_sessions.py --import-legacy
+  python scripts/export_chat_sessions.py --status
+"""
+import argparse
+import calendar
+import json
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from src.chat_archive import CHAT_SESSIONS_DIR, ChatArchive
+
+
+def _day_start(value):
+    """YYYY-MM-DD (UTC) -> epoch seconds."""
+    return calendar.timegm(time.strptime(value, "%Y-%m-%d"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=CHAT_SESSIONS_DIR, help="chat session archive directory")
+    parser.add_argument("--player", help="only sessions for this player (case-insensitive)")
+    parser.add_argument("--npc", type=int, help="only sessions with this NPC vnum")
+    parser.add_argument("--since", help="sessions ending on or after this UTC date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="sessions ending before the end of this UTC date")
+    parser.add_argument("--out", help="write to this file instead of stdout")
+    parser.add_argument("--import-legacy", action="store_true",
+                        help="fold loose per-session JSON logs into segments and remove them")
+    parser.add_argument("--status", action="store_true", help="print archive status and exit")
+    args = parser.parse_args()
+
+    archive = ChatArchive(directory=args.dir)
+    if args.import_legacy:
+        print(f"Imported {archive.import_legacy()} legacy session log(s)", file=sys.stderr)
+        return 0
+    if args.status:
+        print(archive.get_status())
+        return 0
+
+    since = _day_start(args.since) if args.since else None
+    until = _day_start(args.until) + 86399.999 if args.until else None
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    count = 0
+    try:
+        for session in archive.iter_sessions(player=args.player, npc_vnum=args.npc,
+                                             since=since, until=until):
+            out.write(json.dumps(session, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if args.out:
+            out.close()
+    print(f"Exported {count} session(s) "
+          f"({archive.segments_scanned} segment(s) read, {archive.segments_skipped} skipped)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
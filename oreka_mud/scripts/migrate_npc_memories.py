@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Import legacy NPC memory JSON files into the NPC memory store.
+
+Reads the three old layouts under data/npc_memories:
+  <vnum>.json            chat-session summaries for every player
+  <vnum>/<player>.json   importance-ranked memories ("memories" list)
+  <vnum>/<player>.json   prompt-pipeline facts ("facts" list)
+
+and merges them into data/npc_memory.db. Facts and memories already in
+the store are not duplicated, so re-running is safe. The JSON files are
+left in place.
+
+Usage:
+  python scripts/migrate_npc_memories.py
+  python scripts/migrate_npc_memories.py --source data/npc_memories --db /tmp/npc_memory.db
+"""
+import argparse
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from src.npc_memory import DB_PATH, LEGACY_DIR, NPCMemoryStore, import_legacy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=LEGACY_DIR,
+                        help="legacy npc_memories directory")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database to import into")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        print(f"[X] No legacy directory at {args.source}")
+        return 1
+
+    # legacy_dir=None: import explicitly rather than on first open
+    store = NPCMemoryStore(db_path=args.db, legacy_dir=None)
+    imported = import_legacy(store, args.source)
+    print(f"Imported {imported} NPC/player memory record(s) into {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
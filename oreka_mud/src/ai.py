@@ -15,6 +15,15 @@ import os
 import random
 import logging
 
+from src.dialogue_cache import dialogue_key, get_dialogue_cache, persona_hash
+from src.llm_client import (
+    LLMQueueFull,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    configure_lane as configure_llm_lane,
+    get_llm_client,
+)
+
 logger = logging.getLogger("OrekaMUD.AI")
 
 # =========================================================================
@@ -32,9 +41,10 @@ _config = {
     "lmstudio_host": os.environ.get("LMSTUDIO_HOST", "http://localhost:1234"),
     "lmstudio_model": os.environ.get("LMSTUDIO_MODEL", "local-model"),
     "timeout": int(os.environ.get("AI_TIMEOUT", "30")),
+    "max_concurrency": int(os.environ.get("AI_MAX_CONCURRENCY", "4")),
+    "max_queue": int(os.environ.get("AI_MAX_QUEUE", "32")),
 }
 
-
 def enable_llm(enabled: bool):
     _config["enabled"] = enabled
 
@@ -59,7 +69,106 @@ def set_lmstudio_model(model: str):
     _config["lmstudio_model"] = model
 
 
+# =========================================================================
+# Model-Tier Routing
+# =========================================================================
+#
+# Every LLM request names a kind (what it is for) and, for NPC dialogue,
+# the NPC's model tier (see _select_model_tier). The route picks the
+# backend/host/model and the client lane, and background kinds wait
+# behind interactive ones. The "fast" tier is the primary _config; other
+# tiers override only the settings given (OLLAMA_PREMIUM_MODEL,
+# AI_STANDARD_BACKEND, ...). Lanes are per backend host: tiers that reach
+# the same server share the first such tier's lane, so with no host
+# overrides every request queues on "fast" and AI_MAX_CONCURRENCY caps the
+# whole backend. A tier with its own host gets its own workers, sized by
+# AI_<TIER>_CONCURRENCY (default: AI_MAX_CONCURRENCY).
+
+MODEL_TIERS = ("fast", "standard", "premium")
+
+# kind -> (fixed tier, or None to use the NPC's tier; queue priority)
+REQUEST_KINDS = {
+    "chat":    (None, PRIORITY_INTERACTIVE),
+    "talk":    (None, PRIORITY_INTERACTIVE),
+    "rpsay":   (None, PRIORITY_INTERACTIVE),
+    "dm":      ("premium", PRIORITY_INTERACTIVE),
+    "summary": ("fast", PRIORITY_BACKGROUND),
+}
+
+_tier_config = {
+    tier: {key: value for key, value in {
+        "backend": os.environ.get(f"AI_{tier.upper()}_BACKEND", "").lower(),
+        "ollama_host": os.environ.get(f"OLLAMA_{tier.upper()}_URL", "").rstrip("/"),
+        "ollama_model": os.environ.get(f"OLLAMA_{tier.upper()}_MODEL"),
+        "lmstudio_host": os.environ.get(f"LMSTUDIO_{tier.upper()}_HOST", "").rstrip("/"),
+        "lmstudio_model": os.environ.get(f"LMSTUDIO_{tier.upper()}_MODEL"),
+    }.items() if value}
+    for tier in ("standard", "premium")
+}
+
+# Worker slots and queue depth per lane, used when a tier owns its lane
+_tier_lanes = {
+    "fast": (_config["max_concurrency"], _config["max_queue"]),
+    "standard": (int(os.environ.get("AI_STANDARD_CONCURRENCY", _config["max_concurrency"])),
+                 int(os.environ.get("AI_STANDARD_QUEUE", "16"))),
+    "premium": (int(os.environ.get("AI_PREMIUM_CONCURRENCY", _config["max_concurrency"])),
+                int(os.environ.get("AI_PREMIUM_QUEUE", "8"))),
+}
+for _tier, (_workers, _queue) in _tier_lanes.items():
+    configure_llm_lane(_tier, max_concurrency=_workers, max_queue=_queue)
+
+
+def set_tier_model(tier: str, backend: str, model: str):
+    """Route a non-fast tier to its own backend/model."""
+    backend = backend.lower()
+    overrides = _tier_config.setdefault(tier, {})
+    overrides["backend"] = backend
+    overrides[f"{backend}_model"] = model
+
+
+def npc_model_tier(npc) -> str:
+    """Model tier for an NPC (or chat session) by its npc_type."""
+    return _select_model_tier(getattr(npc, 'npc_type', None) or 'commoner')
+
+
+def _tier_endpoint(tier: str) -> tuple:
+    """(backend, host, model) a tier's requests go to."""
+    overrides = _tier_config.get(tier, {})
+    backend = overrides.get("backend") or _config["backend"]
+    if backend != "ollama":
+        backend = "lmstudio"  # any other backend speaks the OpenAI-style API
+    return (backend,
+            overrides.get(f"{backend}_host") or _config[f"{backend}_host"],
+            overrides.get(f"{backend}_model") or _config[f"{backend}_model"])
+
+
+def _tier_lane(tier: str) -> str:
+    """Lane for a tier: the first tier that reaches the same backend host."""
+    backend, host, _model = _tier_endpoint(tier)
+    return next(t for t in MODEL_TIERS if _tier_endpoint(t)[:2] == (backend, host))
+
+
+def resolve_route(kind: str, tier: str = None) -> dict:
+    """Map a request kind (and NPC tier) to backend, host, model, lane, priority."""
+    fixed_tier, priority = REQUEST_KINDS.get(kind, (None, PRIORITY_INTERACTIVE))
+    tier = fixed_tier or tier
+    if tier not in MODEL_TIERS:
+        tier = "fast"
+    backend, host, model = _tier_endpoint(tier)
+    return {
+        "kind": kind,
+        "tier": tier,
+        "backend": backend,
+        "host": host,
+        "model": model,
+        "lane": _tier_lane(tier),
+        "priority": priority,
+    }
+
+
 def get_llm_status() -> dict:
+    routes = {tier: resolve_route("chat", tier) for tier in MODEL_TIERS}
+    lanes = {route["lane"] for route in routes.values()}
     return {
         "enabled": _config["enabled"],
         "backend": _config["backend"],
@@ -68,6 +177,10 @@ def get_llm_status() -> dict:
         "lmstudio_host": _config["lmstudio_host"],
         "lmstudio_model": _config["lmstudio_model"],
         "timeout": _config["timeout"],
+        "max_concurrency": sum(_tier_lanes[lane][0] for lane in lanes),
+        "max_queue": sum(_tier_lanes[lane][1] for lane in lanes),
+        "routes": routes,
+        "client": get_llm_client().get_stats(),
     }
 
 
@@ -78,14 +191,8 @@ def get_llm_status() -> dict:
 async def check_ollama_available() -> bool:
     """Check if Ollama server is reachable."""
     try:
-        import urllib.request
-        req = urllib.request.Request(f"{_config['ollama_host']}/api/tags", method="GET")
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(None, lambda: urllib.request.urlopen(req, timeout=3)),
-            timeout=5
-        )
-        return response.status == 200
+        status = await get_llm_client().get_status(f"{_config['ollama_host']}/api/tags", timeout=5)
+        return status == 200
     except Exception:
         return False
 
@@ -93,14 +200,8 @@ async def check_ollama_available() -> bool:
 async def check_lmstudio_available() -> bool:
     """Check if LM Studio server is reachable."""
     try:
-        import urllib.request
-        req = urllib.request.Request(f"{_config['lmstudio_host']}/v1/models", method="GET")
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(None, lambda: urllib.request.urlopen(req, timeout=3)),
-            timeout=5
-        )
-        return response.status == 200
+        status = await get_llm_client().get_status(f"{_config['lmstudio_host']}/v1/models", timeout=5)
+        return status == 200
     except Exception:
         return False
 
@@ -356,16 +457,63 @@ def _get_template_response(npc, player, message, room) -> str:
 # LLM Response System
 # =========================================================================
 
+def _ollama_generate_text(data: dict) -> str:
+    return data.get("response", "")
+
+
+def _ollama_chat_text(data: dict) -> str:
+    return (data.get("message") or {}).get("content", "")
+
+
+def _openai_text(data: dict) -> str:
+    """Text from an OpenAI-style completion or streamed delta."""
+    choices = data.get("choices") or []
+    if not choices:
+        return ""
+    choice = choices[0]
+    part = choice.get("delta") or choice.get("message") or {}
+    return part.get("content") or ""
+
+
+async def _post_llm(url: str, payload: dict, extract, on_token=None,
+                    route: dict = None) -> str:
+    """POST to an LLM backend through the pooled client.
+
+    With ``on_token`` set the request is streamed and each partial chunk
+    of text is passed to the callback as it arrives; the full text is
+    still returned at the end. ``route`` (see resolve_route) picks the
+    client lane and queue priority.
+    """
+    client = get_llm_client()
+    lane = route["lane"] if route else "fast"
+    priority = route["priority"] if route else PRIORITY_INTERACTIVE
+    if on_token is None:
+        data = await client.post_json(url, payload, timeout=_config["timeout"],
+                                      lane=lane, priority=priority)
+        return extract(data).strip()
+
+    payload["stream"] = True
+    parts = []
+    async for obj in client.stream_json(url, payload, timeout=_config["timeout"],
+                                        lane=lane, priority=priority):
+        piece = extract(obj)
+        if piece:
+            parts.append(piece)
+            on_token(piece)
+    return "".join(parts).strip()
+
+
 async def _call_ollama(prompt: str, system_prompt: str, *,
-                       generation_params: dict = None) -> str:
+                       generation_params: dict = None, on_token=None,
+                       route: dict = None) -> str:
     """Call Ollama API for a response.
 
     ``generation_params`` optionally overrides temperature, top_p,
     num_predict (max_tokens), presence_penalty, and frequency_penalty
     on a per-NPC basis.  If None, uses sensible defaults.
+    ``on_token`` streams partial text to a callback (see _post_llm).
+    ``route`` overrides host/model and picks the queue lane.
     """
-    import urllib.request
-
     gp = generation_params or {}
     options = {
         "temperature":       gp.get("temperature", 0.8),
@@ -378,69 +526,60 @@ async def _call_ollama(prompt: str, system_prompt: str, *,
     if "frequency_penalty" in gp:
         options["frequency_penalty"] = gp["frequency_penalty"]
 
-    url = f"{_config['ollama_host']}/api/generate"
+    host, model = ((route["host"], route["model"]) if route
+                   else (_config["ollama_host"], _config["ollama_model"]))
+    url = f"{host}/api/generate"
     # ``think: false`` suppresses the internal chain-of-thought field on
     # reasoning models (qwen3, deepseek-r1). Without it, those models emit
     # into ``thinking`` and leave ``response`` empty — NPCs say nothing.
     # Non-reasoning models ignore the field. Safe to always send.
-    payload = json.dumps({
-        "model": _config["ollama_model"],
+    payload = {
+        "model": model,
         "prompt": prompt,
         "system": system_prompt,
         "stream": False,
         "think": False,
         "options": options,
-    }).encode("utf-8")
-
-    req = urllib.request.Request(url, data=payload, method="POST")
-    req.add_header("Content-Type", "application/json")
-
-    loop = asyncio.get_event_loop()
-
-    def _do_request():
-        resp = urllib.request.urlopen(req, timeout=_config["timeout"])
-        data = json.loads(resp.read().decode("utf-8"))
-        return data.get("response", "").strip()
-
-    return await asyncio.wait_for(
-        loop.run_in_executor(None, _do_request),
-        timeout=_config["timeout"] + 5
-    )
+    }
+    return await _post_llm(url, payload, _ollama_generate_text, on_token, route)
 
 
-async def _call_lmstudio(prompt: str, system_prompt: str) -> str:
+async def _call_lmstudio(prompt: str, system_prompt: str, *,
+                         generation_params: dict = None, on_token=None,
+                         route: dict = None) -> str:
     """Call LM Studio OpenAI-compatible API for a response."""
-    import urllib.request
-
-    url = f"{_config['lmstudio_host']}/v1/chat/completions"
-    payload = json.dumps({
-        "model": _config["lmstudio_model"],
+    gp = generation_params or {}
+    host, model = ((route["host"], route["model"]) if route
+                   else (_config["lmstudio_host"], _config["lmstudio_model"]))
+    url = f"{host}/v1/chat/completions"
+    payload = {
+        "model": model,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
         ],
-        "temperature": 0.8,
-        "max_tokens": 150,
+        "temperature": gp.get("temperature", 0.8),
+        "max_tokens": gp.get("max_tokens", 150),
         "stream": False,
-    }).encode("utf-8")
+    }
+    return await _post_llm(url, payload, _openai_text, on_token, route)
 
-    req = urllib.request.Request(url, data=payload, method="POST")
-    req.add_header("Content-Type", "application/json")
 
-    loop = asyncio.get_event_loop()
+async def call_llm(prompt: str, system_prompt: str, *, kind: str, tier: str = None,
+                   generation_params: dict = None, on_token=None) -> str:
+    """Send a single-prompt request along its routed backend, model and lane."""
+    route = resolve_route(kind, tier)
+    call = _call_ollama if route["backend"] == "ollama" else _call_lmstudio
+    return await call(prompt, system_prompt, generation_params=generation_params,
+                      on_token=on_token, route=route)
 
-    def _do_request():
-        resp = urllib.request.urlopen(req, timeout=_config["timeout"])
-        data = json.loads(resp.read().decode("utf-8"))
-        choices = data.get("choices", [])
-        if choices:
-            return choices[0].get("message", {}).get("content", "").strip()
-        return ""
 
-    return await asyncio.wait_for(
-        loop.run_in_executor(None, _do_request),
-        timeout=_config["timeout"] + 5
-    )
+async def call_llm_chat(messages: list, *, kind: str = "chat", tier: str = None,
+                        on_token=None) -> str:
+    """Send a multi-turn chat request along its routed backend, model and lane."""
+    route = resolve_route(kind, tier)
+    call = _call_ollama_chat if route["backend"] == "ollama" else _call_lmstudio_chat
+    return await call(messages, on_token=on_token, route=route)
 
 
 # =========================================================================
@@ -469,6 +608,7 @@ def build_unified_npc_prompt(
     session=None,
     rp_room_buffer: list = None,
     npc_last_remark: str = "",
+    anonymous: bool = False,
 ) -> str:
     """Build a complete NPC system prompt for any of the three modes.
 
@@ -481,6 +621,9 @@ def build_unified_npc_prompt(
         session: ChatSession instance (only for 'chat' mode)
         rp_room_buffer: list of recent room conversation lines (for 'rpsay')
         npc_last_remark: this NPC's last line in the room (for 'rpsay' continuity)
+        anonymous: leave out everything about the speaker except trust (PC
+            sheet, dossier, memory, story chapter, arc reactions) so the
+            reply can be shared between players
 
     Returns the full system prompt string.
     """
@@ -492,7 +635,9 @@ def build_unified_npc_prompt(
     npc_type = getattr(npc, 'type_', '')
 
     # Load memory if not provided
-    if npc_memory is None:
+    if anonymous:
+        npc_memory = npc_memory or {}
+    elif npc_memory is None:
         try:
             from src.chat_session import load_npc_memory
             npc_memory = load_npc_memory(
@@ -532,39 +677,40 @@ def build_unified_npc_prompt(
         parts.append(_build_npc_personality(npc))
 
     # ── 2. PC sheet ─────────────────────────────────────────────────
-    try:
-        from src.ai_schemas.pc_sheet import PcSheet, summarize_for_prompt
-        pc_sheet = getattr(character, 'rp_sheet', None)
-        if not isinstance(pc_sheet, PcSheet):
-            pc_sheet = PcSheet()
-        pc_block = summarize_for_prompt(pc_sheet, character)
-        if pc_block:
-            parts.append(f"\nPLAYER:\n{pc_block}")
-    except ImportError:
-        if character is not None:
-            parts.append(
-                f"\nPLAYER: {getattr(character, 'name', '?')}, "
-                f"a level {getattr(character, 'level', 1)} "
-                f"{getattr(character, 'race', 'unknown')} "
-                f"{getattr(character, 'char_class', 'adventurer')}."
-            )
+    if not anonymous:
+        try:
+            from src.ai_schemas.pc_sheet import PcSheet, summarize_for_prompt
+            pc_sheet = getattr(character, 'rp_sheet', None)
+            if not isinstance(pc_sheet, PcSheet):
+                pc_sheet = PcSheet()
+            pc_block = summarize_for_prompt(pc_sheet, character)
+            if pc_block:
+                parts.append(f"\nPLAYER:\n{pc_block}")
+        except ImportError:
+            if character is not None:
+                parts.append(
+                    f"\nPLAYER: {getattr(character, 'name', '?')}, "
+                    f"a level {getattr(character, 'level', 1)} "
+                    f"{getattr(character, 'race', 'unknown')} "
+                    f"{getattr(character, 'char_class', 'adventurer')}."
+                )
 
-    # Character dossier -- replaces the old simple faction-standings block
-    # with a richer summary that includes rescue history, behavioral tags,
-    # and exploration depth so NPCs can react to the player's reputation.
-    try:
-        from src.character_dossier import build_dossier_prompt_block
-        dossier_block = build_dossier_prompt_block(character)
-        if dossier_block:
-            parts.append(f"\n{dossier_block}")
-    except Exception:
-        # Fallback to basic faction standings
-        factions = getattr(character, 'reputation', None) or {}
-        nonzero = [(f, v) for f, v in factions.items() if v]
-        if nonzero:
-            parts.append("Faction standings:")
-            for f, v in nonzero[:8]:
-                parts.append(f"  {f}: {v}")
+        # Character dossier -- replaces the old simple faction-standings block
+        # with a richer summary that includes rescue history, behavioral tags,
+        # and exploration depth so NPCs can react to the player's reputation.
+        try:
+            from src.character_dossier import build_dossier_prompt_block
+            dossier_block = build_dossier_prompt_block(character)
+            if dossier_block:
+                parts.append(f"\n{dossier_block}")
+        except Exception:
+            # Fallback to basic faction standings
+            factions = getattr(character, 'reputation', None) or {}
+            nonzero = [(f, v) for f, v in factions.items() if v]
+            if nonzero:
+                parts.append("Faction standings:")
+                for f, v in nonzero[:8]:
+                    parts.append(f"  {f}: {v}")
 
     # ── 3. Room ambience (or description fallback) ──────────────────
     if room:
@@ -594,7 +740,7 @@ def build_unified_npc_prompt(
         from src.ai_schemas.environment_context import (
             build_environment_context, format_environment_for_prompt,
         )
-        env_ctx = build_environment_context(character, room)
+        env_ctx = build_environment_context(None if anonymous else character, room)
         env_block = format_environment_for_prompt(env_ctx)
         if env_block:
             parts.append("\n" + env_block)
@@ -606,7 +752,7 @@ def build_unified_npc_prompt(
             pass
 
     # ── 5. NPC memory of player ─────────────────────────────────────
-    if npc_memory and npc_memory.get("sessions", 0) > 0:
+    if not anonymous and npc_memory and npc_memory.get("sessions", 0) > 0:
         parts.append("\nYOU REMEMBER THIS PLAYER:")
         parts.append(f"Previous sessions: {npc_memory['sessions']}")
         for fact in (npc_memory.get("facts") or [])[-5:]:
@@ -635,7 +781,7 @@ def build_unified_npc_prompt(
             parts.append(f"\nYour last remark in this room: \"{npc_last_remark}\"")
 
     if mode == "chat" and session is not None:
-        if hasattr(session, '_summary') and session._summary:
+        if getattr(session, '_summary', None):
             parts.append(f"\nEARLIER IN THIS CONVERSATION:\n{session._summary}")
         recent_events = session.get_recent_world_events(limit=5)
         if recent_events:
@@ -644,7 +790,7 @@ def build_unified_npc_prompt(
                 parts.append(f"- {e['text']}")
 
     # ── 8. Arc awareness (same for all modes) ───────────────────────
-    if persona:
+    if persona and not anonymous:
         arc_block = _build_arc_context_block(persona, character)
         if arc_block:
             parts.append("\n" + arc_block)
@@ -696,28 +842,80 @@ def build_unified_npc_prompt(
     return "\n".join(parts)
 
 
-async def _get_llm_response(npc, player, message, room) -> str:
-    """Get a response from the configured LLM backend (talk mode)."""
+async def _get_llm_response(npc, player, message, room, on_token=None) -> str:
+    """Get a response from the configured LLM backend (talk mode).
+
+    Talk that does not depend on the speaker is generated from a
+    speaker-agnostic prompt and served from the dialogue cache (see
+    _talk_cache_key); concurrent identical requests share one backend call.
+    """
+    try:
+        from src.chat_session import load_npc_memory
+        from src.npc_memory import get_npc_memory_store
+        await get_npc_memory_store().prefetch(
+            getattr(npc, 'vnum', 0), getattr(player, 'name', 'unknown'))
+        npc_memory = load_npc_memory(
+            getattr(npc, 'vnum', 0),
+            getattr(player, 'name', 'unknown'),
+        )
+    except Exception:
+        npc_memory = {"sessions": 0, "facts": [], "disposition": "neutral"}
+
+    player_name = getattr(player, 'name', 'someone')
+    tier = npc_model_tier(npc)
+    key = _talk_cache_key(npc, player, message, room, tier, npc_memory)
     system_prompt = build_unified_npc_prompt(
         npc=npc,
         character=player,
         room=room,
         mode="talk",
+        npc_memory=npc_memory,
+        anonymous=key is not None,
     )
+    if key is None:
+        user_prompt = f"The player {player_name} says to you: \"{message}\""
+    else:
+        user_prompt = f"A traveller says to you: \"{message}\""
 
-    user_prompt = f"The player {getattr(player, 'name', 'someone')} says to you: \"{message}\""
+    async def generate():
+        return await call_llm(user_prompt, system_prompt, kind="talk",
+                              tier=tier, on_token=on_token)
 
-    if _config["backend"] == "ollama":
-        return await _call_ollama(user_prompt, system_prompt)
-    else:
-        return await _call_lmstudio(user_prompt, system_prompt)
+    if key is None:
+        return await generate()
+    return await get_dialogue_cache().get_or_create(key, generate)
+
+
+def _talk_cache_key(npc, player, message, room, tier, npc_memory):
+    """Dialogue cache key for a talk request, or None if it is not shareable.
+
+    Keyed on NPC vnum, model tier, persona hash, trust tier, room/time/
+    weather bucket and the normalized message. Talk shaped by the speaker
+    (the NPC remembers them, or an arc reaction applies) is not cached.
+    """
+    if (npc_memory or {}).get("sessions", 0) > 0:
+        return None
+    persona = getattr(npc, 'ai_persona', None)
+    if persona and _build_arc_context_block(persona, player):
+        return None
+    trust = effective_trust(persona, player, npc_memory or {}) if persona else ""
+    scene = (getattr(room, 'vnum', None),)
+    try:
+        from src.ai_schemas.environment_context import build_environment_context
+        env = build_environment_context(None, room)
+        scene += (env.get("time_of_day"), env.get("season"), env.get("weather"))
+    except ImportError:
+        pass
+    return dialogue_key(getattr(npc, 'vnum', 0), tier, persona_hash(persona),
+                        trust, scene, message)
 
 
 # =========================================================================
 # Main Entry Point
 # =========================================================================
 
-async def get_npc_response(npc, player, message, room=None, use_llm=True) -> str:
+async def get_npc_response(npc, player, message, room=None, use_llm=True,
+                           on_token=None) -> str:
     """
     Get an NPC's response to a player message.
 
@@ -732,6 +930,7 @@ async def get_npc_response(npc, player, message, room=None, use_llm=True) -> str
         message: What the player said
         room: The Room where the conversation happens
         use_llm: Whether to attempt LLM (can be overridden by config)
+        on_token: Optional callback receiving partial LLM text as it streams
 
     Returns:
         String response from the NPC
@@ -745,16 +944,23 @@ async def get_npc_response(npc, player, message, room=None, use_llm=True) -> str
     # Try LLM if enabled
     if use_llm and _config["enabled"]:
         try:
-            response = await _get_llm_response(npc, player, message, room)
+            response = await _get_llm_response(npc, player, message, room,
+                                               on_token=on_token)
             if response:
                 # Clean up LLM response — remove quotes, trim
                 response = response.strip().strip('"').strip("'")
                 # Ensure it's not too long for MUD display
                 if len(response) > 500:
                     response = response[:497] + "..."
+                # A streaming callback gets the same cleanup (TokenStreamer)
+                finish = getattr(on_token, "finish", None)
+                if finish is not None:
+                    finish()
                 return response
         except asyncio.TimeoutError:
             logger.warning(f"LLM timeout for NPC {getattr(npc, 'name', '?')}")
+        except LLMQueueFull:
+            logger.warning(f"LLM queue full, templating reply for NPC {getattr(npc, 'name', '?')}")
         except Exception as e:
             logger.debug(f"LLM failed for NPC {getattr(npc, 'name', '?')}: {e}")
 
@@ -935,10 +1141,27 @@ def _build_arc_context_block(persona, character) -> str:
         return ""
 
     try:
-        from src.ai_schemas.arc_expression import evaluate_expression
+        from src.ai_schemas.arc_expression import compile_expression, ArcExpressionError
     except ImportError:
         return ""
 
+    # Compile each reaction's `when` once (cached by source across turns);
+    # invalid ones were reported by persona validation at load time.
+    reactions = []
+    for ar in arc_reactions:
+        ar_data = ar.to_dict() if hasattr(ar, 'to_dict') else ar
+        if not isinstance(ar_data, dict):
+            continue
+        when_expr = ar_data.get("when", "")
+        if not when_expr:
+            continue
+        try:
+            reactions.append((compile_expression(when_expr), ar_data))
+        except ArcExpressionError:
+            continue
+    if not reactions:
+        return ""
+
     # Match reactions against player's arc state
     matched_per_arc = {}  # arc_id -> list of (flavor, loudness)
     for arc_id in arcs_known:
@@ -946,14 +1169,8 @@ def _build_arc_context_block(persona, character) -> str:
         if not arc_sheet:
             continue
         ctx = arc_sheet.to_evaluation_context() if hasattr(arc_sheet, 'to_evaluation_context') else {}
-        for ar in arc_reactions:
-            ar_data = ar.to_dict() if hasattr(ar, 'to_dict') else ar
-            if not isinstance(ar_data, dict):
-                continue
-            when_expr = ar_data.get("when", "")
-            if not when_expr:
-                continue
-            if evaluate_expression(when_expr, ctx):
+        for when, ar_data in reactions:
+            if when(ctx):
                 matched_per_arc.setdefault(arc_id, []).append((
                     ar_data.get("flavor", ""),
                     ar_data.get("loudness", "natural"),
@@ -1311,33 +1528,33 @@ async def get_chat_response(session, character) -> tuple:
     Returns (response_text, action_list) tuple.
     Uses JSON structured responses. Falls back to template on failure.
     """
-    from src.chat_session import load_npc_memory
+    from src.chat_session import load_npc_memory, estimate_tokens
+    from src.npc_memory import get_npc_memory_store
 
+    await get_npc_memory_store().prefetch(session.npc_vnum, session.player_name)
     npc_memory = load_npc_memory(session.npc_vnum, session.player_name)
+    # Summarization normally runs in the background after the turn; only
+    # an overflowing window makes this reply wait for it
+    await summarize_to_budget(session)
     system_prompt = _build_chat_system_prompt(session, character, npc_memory)
 
-    # Check if conversation needs summarization
-    if len(session.conversation_history) > 32:
-        await _summarize_history(session)
-
-    # Build messages array
+    # Build messages array: system prompt (with the rolling summary) + every
+    # unsummarized turn
     messages = [{"role": "system", "content": system_prompt}]
-    messages.extend(session.get_messages_for_llm(max_messages=20))
+    messages.extend(session.get_messages_for_llm())
 
     # Select model tier based on NPC type
-    npc_type = getattr(session, 'npc_type', None) or 'commoner'
-    model_tier = _select_model_tier(npc_type)
+    model_tier = npc_model_tier(session)
 
     # Try LLM if enabled
     if _config["enabled"]:
+        session.prompt_tokens += sum(estimate_tokens(m["content"]) for m in messages)
         try:
-            if _config["backend"] == "ollama":
-                raw_response = await _call_ollama_chat(messages)
-            else:
-                raw_response = await _call_lmstudio_chat(messages)
+            raw_response = await call_llm_chat(messages, kind="chat", tier=model_tier)
 
             if raw_response:
                 parsed = _parse_json_response(raw_response)
+                session.completion_tokens += estimate_tokens(raw_response)
                 if parsed:
                     # Extract actions and clean dialogue
                     dialogue = parsed["dialogue"]
@@ -1386,54 +1603,114 @@ async def get_chat_response(session, character) -> tuple:
     return fallback, []
 
 
-async def _summarize_history(session):
-    """Compress old conversation history when it exceeds the limit.
-    Keeps the 12 most recent messages verbatim, summarizes the rest."""
-    KEEP_RECENT = 12
-    if len(session.conversation_history) <= KEEP_RECENT:
-        return
-
-    old_messages = session.conversation_history[:-KEEP_RECENT]
-    recent = session.conversation_history[-KEEP_RECENT:]
-
-    # Build summary from old messages
-    exchange_text = "\n".join(
-        f"{'Player' if m['role'] == 'user' else session.npc_name}: {m['content']}"
-        for m in old_messages if m.get('role') in ('user', 'assistant')
-    )
+# Strong references to in-flight summary jobs (asyncio only keeps weak ones)
+_summary_tasks = set()
 
-    if not exchange_text:
-        session.conversation_history = recent
-        return
 
-    prompt = (
-        f"Summarize this conversation between a player and {session.npc_name} "
-        f"in 2-3 sentences. Focus on what was discussed and any decisions made.\n\n"
-        f"{exchange_text}"
-    )
+def schedule_summary(session):
+    """Start a background job folding aged-out turns into the rolling summary.
 
+    Called after a chat turn completes, so the player never waits on the
+    summarization round-trip. Returns the task, or None if nothing to do.
+    """
+    if not session.needs_summary():
+        return None
     try:
-        if _config["enabled"] and _config["backend"] == "ollama":
-            summary = await _call_ollama(prompt, "Summarize concisely.")
-        elif _config["enabled"]:
-            summary = await _call_lmstudio(prompt, "Summarize concisely.")
-        else:
-            summary = f"Earlier: Player spoke with {session.npc_name} about various topics."
-    except Exception:
-        summary = f"Earlier: Player spoke with {session.npc_name} about various topics."
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    session._summarizing = True
+    task = loop.create_task(_summarize_history(session))
+    session._summary_task = task
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+    return task
 
-    session._summary = summary
-    session.conversation_history = recent
-    logger.info(f"Chat history summarized for {session.player_name} with {session.npc_name}")
 
+async def summarize_to_budget(session):
+    """Fold aged-out turns before a reply if the unsummarized window has
+    outgrown the prompt budget (e.g. the background job fell behind).
 
-async def _call_ollama_chat(messages: list) -> str:
-    """Call Ollama /api/chat endpoint with full conversation history."""
-    import urllib.request
+    Turns are never dropped unsent, so the reply waits for the summary
+    instead. The SUMMARY_KEEP_RECENT newest entries are always sent as-is.
+    """
+    from src.chat_session import SUMMARY_KEEP_RECENT
+    task = session._summary_task
+    if task is not None and not task.done():
+        await task
+    if (session.history_over_budget()
+            and len(session.conversation_history) > SUMMARY_KEEP_RECENT):
+        await _summarize_history(session)
+
+
+async def _summarize_history(session):
+    """Fold history entries older than the recent window into the summary.
+
+    Incremental: the prompt carries the previous summary plus only the
+    newly aged-out exchanges. Folded entries then move from
+    conversation_history to folded_history (kept for the archive); turns
+    added while the summary was generated sit after them and are kept.
+    If no summary comes back the history is left untouched for a retry.
+    """
+    from src.chat_session import SUMMARY_KEEP_RECENT, estimate_tokens
+    session._summarizing = True
+    try:
+        upto = len(session.conversation_history) - SUMMARY_KEEP_RECENT
+        if upto <= 0:
+            return
+
+        exchange_text = "\n".join(
+            f"{'Player' if m['role'] == 'user' else session.npc_name}: {m['content']}"
+            for m in session.conversation_history[:upto]
+            if m.get('role') in ('user', 'assistant')
+        )
+        if not exchange_text:
+            _prune_folded(session, upto)
+            return
+
+        if not _config["enabled"]:
+            return
+        previous = (f"Summary so far:\n{session._summary}\n\nNew exchanges:\n"
+                    if session._summary else "")
+        prompt = (
+            f"Summarize this conversation between a player and {session.npc_name} "
+            f"in 2-3 sentences. Focus on what was discussed and any decisions made.\n\n"
+            f"{previous}{exchange_text}"
+        )
 
-    url = f"{_config['ollama_host']}/api/chat"
-    payload = json.dumps({
-        "model": _config["ollama_model"],
+        try:
+            summary = await call_llm(prompt, "Summarize concisely.", kind="summary")
+        except Exception as e:
+            logger.warning(f"Chat summary failed for {session.player_name} with "
+                           f"{session.npc_name}: {e}")
+            return
+        if not summary or session.ended:
+            return  # nothing to fold in, or already handed to the archive
+
+        session.summary_tokens += estimate_tokens(prompt) + estimate_tokens(summary)
+        session.summaries += 1
+        session._summary = summary
+        _prune_folded(session, upto)
+        logger.info(f"Chat history summarized for {session.player_name} with "
+                    f"{session.npc_name} ({upto} entries folded)")
+    finally:
+        session._summarizing = False
+
+
+def _prune_folded(session, upto: int):
+    """Move the first ``upto`` history entries, now carried by the summary,
+    out of the prompt window and into folded_history."""
+    session.folded_history.extend(session.conversation_history[:upto])
+    del session.conversation_history[:upto]
+
+
+async def _call_ollama_chat(messages: list, *, on_token=None, route: dict = None) -> str:
+    """Call Ollama /api/chat endpoint with full conversation history."""
+    host, model = ((route["host"], route["model"]) if route
+                   else (_config["ollama_host"], _config["ollama_model"]))
+    url = f"{host}/api/chat"
+    payload = {
+        "model": model,
         "messages": messages,
         "stream": False,
         "options": {
@@ -1441,55 +1718,23 @@ async def _call_ollama_chat(messages: list) -> str:
             "top_p": 0.9,
             "num_predict": 250,
         }
-    }).encode("utf-8")
-
-    req = urllib.request.Request(url, data=payload, method="POST")
-    req.add_header("Content-Type", "application/json")
-
-    loop = asyncio.get_event_loop()
-
-    def _do_request():
-        resp = urllib.request.urlopen(req, timeout=_config["timeout"])
-        data = json.loads(resp.read().decode("utf-8"))
-        msg = data.get("message", {})
-        return msg.get("content", "").strip()
-
-    return await asyncio.wait_for(
-        loop.run_in_executor(None, _do_request),
-        timeout=_config["timeout"] + 5
-    )
+    }
+    return await _post_llm(url, payload, _ollama_chat_text, on_token, route)
 
 
-async def _call_lmstudio_chat(messages: list) -> str:
+async def _call_lmstudio_chat(messages: list, *, on_token=None, route: dict = None) -> str:
     """Call LM Studio with full conversation history."""
-    import urllib.request
-
-    url = f"{_config['lmstudio_host']}/v1/chat/completions"
-    payload = json.dumps({
-        "model": _config["lmstudio_model"],
+    host, model = ((route["host"], route["model"]) if route
+                   else (_config["lmstudio_host"], _config["lmstudio_model"]))
+    url = f"{host}/v1/chat/completions"
+    payload = {
+        "model": model,
         "messages": messages,
         "temperature": 0.8,
         "max_tokens": 250,
         "stream": False,
-    }).encode("utf-8")
-
-    req = urllib.request.Request(url, data=payload, method="POST")
-    req.add_header("Content-Type", "application/json")
-
-    loop = asyncio.get_event_loop()
-
-    def _do_request():
-        resp = urllib.request.urlopen(req, timeout=_config["timeout"])
-        data = json.loads(resp.read().decode("utf-8"))
-        choices = data.get("choices", [])
-        if choices:
-            return choices[0].get("message", {}).get("content", "").strip()
-        return ""
-
-    return await asyncio.wait_for(
-        loop.run_in_executor(None, _do_request),
-        timeout=_config["timeout"] + 5
-    )
+    }
+    return await _post_llm(url, payload, _openai_text, on_token, route)
 
 
 async def execute_chat_actions(actions: list, character, session) -> list:
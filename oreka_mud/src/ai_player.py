@@ -124,6 +124,8 @@ class AIPlayerBot:
         if new_room:
             self.character.room = new_room
             new_room.players.append(self.character)
+            from src.narrative import announce_event
+            announce_event(self.character, "enter_room", new_room)
             self.rooms_visited.add(target_vnum)
             self.move_count += 1
 
@@ -39,6 +39,7 @@ from src.ai_schemas.arc_sheet import (
 )
 from src.ai_schemas.arc_expression import (
     parse_expression, evaluate_expression, validate_expression,
+    compile_expression, clear_expression_cache, CompiledExpression,
     ArcExpressionError,
 )
 
@@ -61,5 +62,6 @@ __all__ = [
     "validate_arc_sheet", "fresh_arc_from_template",
     # arc_expression
     "parse_expression", "evaluate_expression", "validate_expression",
+    "compile_expression", "clear_expression_cache", "CompiledExpression",
     "ArcExpressionError",
 ]
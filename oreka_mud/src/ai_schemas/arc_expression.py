@@ -27,10 +27,20 @@ Examples:
 
 No `eval()`. No regex. Pure parser, evaluator is type-coerced for ints/floats
 where both sides parse as numbers.
+
+Expressions are compiled once into a tree of closures (paths pre-split,
+right-hand numbers pre-parsed) and cached by source string in a small LRU,
+so the per-chat-turn cost is just the closure calls. validate_expression()
+compiles too, so persona validation at load time warms the cache.
 """
 
+import logging
+import operator
 import re
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger("OrekaMUD.ArcExpression")
 
 
 class ArcExpressionError(ValueError):
@@ -169,83 +179,116 @@ class _Parser:
 
 
 # ---------------------------------------------------------------------------
-# Evaluator
+# Compiler — AST to a tree of closures
 # ---------------------------------------------------------------------------
 
-def _resolve_path(path: str, context: dict):
-    """Resolve a dotted path against the context dict.
-
-    Returns the raw value, or a sentinel-string ("__MISSING__") if not found.
-    Missing paths must NOT crash the evaluation — they evaluate to false in
-    comparisons (per BUILDOUT_ARC_MODULE §2.2 acceptance criteria).
-    """
-    parts = path.split(".")
-    node = context
-    for p in parts:
-        if isinstance(node, dict) and p in node:
-            node = node[p]
-        else:
-            return _MISSING
-    return node
-
-
+# Missing paths must NOT crash the evaluation — they evaluate to false in
+# comparisons (per BUILDOUT_ARC_MODULE §2.2 acceptance criteria).
 _MISSING = object()
 
-
-def _coerce_for_comparison(left, right_str: str, right_type: str):
-    """Try to coerce both sides to numbers if either looks numeric."""
-    if right_type == "NUMBER":
+_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    ">": operator.gt, "<": operator.lt,
+    ">=": operator.ge, "<=": operator.le,
+}
+
+
+def _compile_comparison(node: dict) -> Callable[[dict], bool]:
+    parts = tuple(node["path"].split("."))
+    compare = _OPERATORS[node["operator"]]
+    value, value_type = node["value"], node["value_type"]
+
+    def resolve(context):
+        for p in parts:
+            if isinstance(context, dict) and p in context:
+                context = context[p]
+            else:
+                return _MISSING
+        return context
+
+    # Numbers coerce a string left-hand side when it parses; IDENT and
+    # STRING values compare as bare strings.
+    if value_type == "NUMBER":
         try:
-            right_val = float(right_str) if "." in right_str else int(right_str)
+            right = float(value) if "." in value else int(value)
         except ValueError:
-            right_val = right_str
-        # Coerce left to same type if possible
-        if isinstance(left, (int, float)):
-            return left, right_val
-        if isinstance(left, str):
+            right = value
+
+        def cmp_number(context):
+            left = resolve(context)
+            if left is _MISSING:
+                return False
+            if isinstance(left, str):
+                try:
+                    left = float(left) if "." in left else int(left)
+                except ValueError:
+                    pass
             try:
-                left_val = float(left) if "." in left else int(left)
-                return left_val, right_val
-            except ValueError:
-                return left, right_val
-        return left, right_val
-    if right_type == "STRING":
-        return left, right_str
-    # IDENT — treat as bare-word string
-    return left, right_str
-
-
-def _evaluate_node(node: dict, context: dict) -> bool:
-    op = node.get("op")
+                return compare(left, right)
+            except TypeError:
+                return False
+        return cmp_number
+
+    def cmp_value(context):
+        left = resolve(context)
+        if left is _MISSING:
+            return False
+        try:
+            return compare(left, value)
+        except TypeError:
+            return False
+    return cmp_value
+
 
+def _compile_node(node: dict) -> Callable[[dict], bool]:
+    op = node.get("op")
     if op == "OR":
-        return _evaluate_node(node["left"], context) or _evaluate_node(node["right"], context)
+        left, right = _compile_node(node["left"]), _compile_node(node["right"])
+        return lambda context: left(context) or right(context)
     if op == "AND":
-        return _evaluate_node(node["left"], context) and _evaluate_node(node["right"], context)
+        left, right = _compile_node(node["left"]), _compile_node(node["right"])
+        return lambda context: left(context) and right(context)
     if op == "NOT":
-        return not _evaluate_node(node["inner"], context)
+        inner = _compile_node(node["inner"])
+        return lambda context: not inner(context)
     if op == "CMP":
-        left = _resolve_path(node["path"], context)
-        if left is _MISSING:
-            return False
-        left_v, right_v = _coerce_for_comparison(left, node["value"], node["value_type"])
-        operator = node["operator"]
+        return _compile_comparison(node)
+    return lambda context: False
+
+
+def _collect_paths(node: dict, out: list):
+    op = node.get("op")
+    if op in ("OR", "AND"):
+        _collect_paths(node["left"], out)
+        _collect_paths(node["right"], out)
+    elif op == "NOT":
+        _collect_paths(node["inner"], out)
+    elif op == "CMP":
+        out.append(tuple(node["path"].split(".")))
+
+
+class CompiledExpression:
+    """A parsed and compiled `when` expression; call it with a context dict.
+
+    ``paths`` lists every left-hand path, pre-split, for reference checks.
+    """
+    __slots__ = ("source", "paths", "_fn")
+
+    def __init__(self, source: str, tree: dict):
+        self.source = source
+        paths = []
+        _collect_paths(tree, paths)
+        self.paths = tuple(paths)
+        self._fn = _compile_node(tree)
+
+    def __call__(self, context: dict) -> bool:
         try:
-            if operator == "==":
-                return left_v == right_v
-            if operator == "!=":
-                return left_v != right_v
-            if operator == ">":
-                return left_v > right_v
-            if operator == "<":
-                return left_v < right_v
-            if operator == ">=":
-                return left_v >= right_v
-            if operator == "<=":
-                return left_v <= right_v
-        except TypeError:
+            return bool(self._fn(context or {}))
+        except Exception:
             return False
-    return False
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
 
 
 # ---------------------------------------------------------------------------
@@ -262,15 +305,58 @@ def parse_expression(expr: str) -> dict:
     return _parse(tokens)
 
 
+# Compiled expressions (or the parse error) by source string
+MAX_CACHED_EXPRESSIONS = 1024
+_compiled: "OrderedDict[str, object]" = OrderedDict()  # source -> compiled or error text
+_warned = set()  # invalid sources already logged at runtime
+
+
+def compile_expression(expr: str) -> CompiledExpression:
+    """Parse and compile an expression, cached by source string.
+
+    Raises ArcExpressionError on failure (the failure is cached too).
+    """
+    if isinstance(expr, str):
+        cached = _compiled.get(expr)
+        if cached is not None:
+            _compiled.move_to_end(expr)
+            if isinstance(cached, str):
+                raise ArcExpressionError(cached)
+            return cached
+    try:
+        result = CompiledExpression(expr, parse_expression(expr))
+    except ArcExpressionError as e:
+        result = str(e)
+    if isinstance(expr, str):
+        _compiled[expr] = result
+        if len(_compiled) > MAX_CACHED_EXPRESSIONS:
+            _compiled.popitem(last=False)
+    if isinstance(result, str):
+        raise ArcExpressionError(result)
+    return result
+
+
+def clear_expression_cache():
+    """Drop every compiled expression (e.g. after reloading personas)."""
+    _compiled.clear()
+    _warned.clear()
+
+
 def evaluate_expression(expr: str, context: dict) -> bool:
-    """Parse + evaluate an expression. Returns False for any parse/runtime error."""
+    """Evaluate an expression (compiled once, then cached). Returns False for
+    any parse/runtime error; parse errors are logged the first time."""
     try:
-        tree = parse_expression(expr)
-        return bool(_evaluate_node(tree, context or {}))
-    except ArcExpressionError:
+        compiled = compile_expression(expr)
+    except ArcExpressionError as e:
+        if isinstance(expr, str) and expr not in _warned:
+            if len(_warned) > MAX_CACHED_EXPRESSIONS:
+                _warned.clear()
+            _warned.add(expr)
+            logger.warning(f"Invalid arc expression {expr!r}: {e}")
         return False
     except Exception:
         return False
+    return compiled(context)
 
 
 def validate_expression(expr: str) -> list:
@@ -280,7 +366,7 @@ def validate_expression(expr: str) -> list:
     if not expr.strip():
         return ["expression is empty"]
     try:
-        parse_expression(expr)
+        compile_expression(expr)
         return []
     except ArcExpressionError as e:
         return [str(e)]
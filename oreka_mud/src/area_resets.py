@@ -7,20 +7,46 @@ separately by src.spawning.SpawnManager.
 Reset configuration lives in data/area_resets.json.  If the file is
 missing a minimal default covering the Chapel tutorial area is created
 on first load.
+
+Resets are incremental:
+
+- Areas sit in a due-time priority queue; check_resets() only looks at
+  areas whose interval has elapsed.
+- Commands that make a room diverge from its template (taking an item,
+  opening or locking a door) call mark_room_dirty(), and a due area only
+  restores its dirty rooms.  Every configured room starts dirty so the
+  first reset brings a fresh world up to its template.
+- Dirty rooms are restored RESET_SLICE_ROOMS at a time per heartbeat,
+  so a large zone is spread across several pulses.
+
+Usage:
+    from src.area_resets import get_reset_manager, mark_room_dirty
+
+    mark_room_dirty(character.room)        # after the room changed
+    get_reset_manager().check_resets(world)  # heartbeat pulse
 """
 
 import copy
+import heapq
+import itertools
 import json
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from src.room_graph import get_room_graph
 
 logger = logging.getLogger("OrekaMUD.AreaResets")
 
 # Default reset interval in seconds (15 minutes)
 DEFAULT_RESET_INTERVAL = 900
 
+# Heartbeat period for check_resets, and dirty rooms restored per pulse
+RESET_PULSE = 5
+RESET_SLICE_ROOMS = 50
+
 # ANSI-formatted message sent to players when their room resets
 RESET_MESSAGE = (
     "\033[1;33m[Area Reset]\033[0m "
@@ -72,6 +98,23 @@ class ResetManager:
         # area_name -> timestamp of last successful reset
         self.last_reset: Dict[str, float] = {}
         self.enabled: bool = True
+
+        # Due queue: (due, seq, area_name); _due holds each area's live entry
+        self._queue: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._seq = itertools.count()
+        # room vnum -> area name, and area name -> rooms diverged from template
+        self._room_area: Dict[int, str] = {}
+        self.dirty: Dict[str, Set[int]] = {}
+        # Rooms of due areas still to restore, and per-area [reset, skipped, left]
+        self._work: Deque[Tuple[str, int]] = deque()
+        self._in_progress: Dict[str, List[int]] = {}
+
+        # Counters
+        self.rooms_checked = 0
+        self.rooms_restored = 0
+        self.areas_reset = 0
+
         self.load_resets()
 
     # -- Configuration -------------------------------------------------------
@@ -98,6 +141,40 @@ class ResetManager:
         for area_name in self.config.get("areas", {}):
             if area_name not in self.last_reset:
                 self.last_reset[area_name] = now
+            self._index_area(area_name)
+            self._schedule(area_name)
+
+    # -- Due queue and dirty tracking ---------------------------------------
+
+    def _index_area(self, area_name: str) -> None:
+        """Map an area's rooms to it and mark them all dirty."""
+        area_cfg = self.config.get("areas", {}).get(area_name, {})
+        dirty = self.dirty.setdefault(area_name, set())
+        for vnum_str in area_cfg.get("rooms", {}):
+            try:
+                vnum = int(vnum_str)
+            except (ValueError, TypeError):
+                logger.warning("Invalid vnum '%s' in area '%s'", vnum_str, area_name)
+                continue
+            self._room_area[vnum] = area_name
+            dirty.add(vnum)
+
+    def _schedule(self, area_name: str) -> None:
+        """(Re)queue an area for its next reset."""
+        area_cfg = self.config.get("areas", {}).get(area_name)
+        if area_cfg is None:
+            self._due.pop(area_name, None)
+            return
+        interval = area_cfg.get("reset_interval", DEFAULT_RESET_INTERVAL)
+        due = self.last_reset.get(area_name, 0) + interval
+        self._due[area_name] = due
+        heapq.heappush(self._queue, (due, next(self._seq), area_name))
+
+    def mark_dirty(self, vnum: int) -> None:
+        """Note that a room has diverged from its reset template."""
+        area_name = self._room_area.get(vnum)
+        if area_name is not None:
+            self.dirty.setdefault(area_name, set()).add(vnum)
 
     def _save_config(self) -> None:
         """Persist the current configuration to disk."""
@@ -111,9 +188,9 @@ class ResetManager:
 
     # -- Tick entry point ----------------------------------------------------
 
-    def check_resets(self, world) -> List[str]:
-        """Called every game tick.  Check which areas are due for a reset and
-        execute them.
+    def check_resets(self, world, max_rooms: int = RESET_SLICE_ROOMS) -> List[str]:
+        """Called every heartbeat pulse.  Start resets for areas that are due
+        and restore up to *max_rooms* of their dirty rooms.
 
         Returns a list of log-level status messages (not sent to players).
         """
@@ -122,23 +199,99 @@ class ResetManager:
 
         now = time.time()
         messages: List[str] = []
-        areas = self.config.get("areas", {})
-
-        for area_name, area_cfg in areas.items():
-            interval = area_cfg.get("reset_interval", DEFAULT_RESET_INTERVAL)
-            last = self.last_reset.get(area_name, 0)
+        queue = self._queue
 
-            if now - last >= interval:
-                result = self.reset_area(world, area_name)
-                if result:
-                    messages.append(result)
+        while queue and queue[0][0] <= now:
+            due, _seq, area_name = heapq.heappop(queue)
+            if self._due.get(area_name) != due or area_name in self._in_progress:
+                continue
+            del self._due[area_name]
+            rooms = sorted(self.dirty.pop(area_name, ()))
+            if not rooms:
+                self.last_reset[area_name] = now
+                self._schedule(area_name)
+                continue
+            self._in_progress[area_name] = [0, 0, len(rooms)]
+            self._work.extend((area_name, vnum) for vnum in rooms)
+
+        budget = max_rooms
+        while self._work and budget > 0:
+            area_name, vnum = self._work.popleft()
+            budget -= 1
+            progress = self._in_progress.get(area_name)
+            if progress is None:
+                continue
+            outcome = self._reset_room(world, area_name, vnum)
+            if outcome == "reset":
+                progress[0] += 1
+            elif outcome == "skipped":
+                progress[1] += 1
+            progress[2] -= 1
+            if progress[2] <= 0:
+                msg = self._finish_area(area_name, progress[0], progress[1])
+                if msg:
+                    messages.append(msg)
 
         return messages
 
+    def _finish_area(self, area_name: str, rooms_reset: int, rooms_skipped: int) -> Optional[str]:
+        """Close out an area reset and queue the next one."""
+        self._in_progress.pop(area_name, None)
+        self.last_reset[area_name] = time.time()
+        self.areas_reset += 1
+        self._schedule(area_name)
+
+        if rooms_reset or rooms_skipped:
+            msg = (
+                f"Area '{area_name}' reset: {rooms_reset} room(s) restored"
+                f"{f', {rooms_skipped} skipped (combat)' if rooms_skipped else ''}."
+            )
+            logger.info(msg)
+            return msg
+        return None
+
+    def _reset_room(self, world, area_name: str, vnum: int) -> Optional[str]:
+        """Restore one room from its template.
+
+        Returns ``"reset"`` if the room changed, ``"skipped"`` if combat kept
+        it from resetting (it stays dirty), or ``None``.
+        """
+        room_cfg = self.config.get("areas", {}).get(area_name, {}).get("rooms", {}).get(str(vnum))
+        room = world.rooms.get(vnum)
+        if room_cfg is None or room is None:
+            return None
+
+        # Safety: skip rooms where a player is in combat
+        if self._room_has_combat(room):
+            self.dirty.setdefault(area_name, set()).add(vnum)
+            return "skipped"
+
+        self.rooms_checked += 1
+        changed = False
+
+        default_items = room_cfg.get("items")
+        if default_items is not None:
+            changed |= self.reset_room_items(world, vnum, default_items)
+
+        default_doors = room_cfg.get("doors")
+        if default_doors is not None:
+            changed |= self.reset_doors(world, vnum, default_doors)
+
+        default_containers = room_cfg.get("containers")
+        if default_containers is not None:
+            changed |= self.reset_containers(world, vnum, default_containers)
+
+        if changed:
+            self.rooms_restored += 1
+            self._notify_players(room)
+            return "reset"
+        return None
+
     # -- Full area reset -----------------------------------------------------
 
     def reset_area(self, world, area_name: str) -> Optional[str]:
-        """Reset every room defined under *area_name* in the config.
+        """Reset every room defined under *area_name* in the config, dirty
+        or not, in one pass.
 
         Skips rooms where any player is in combat (State.COMBAT).
         Notifies players in affected rooms.
@@ -150,60 +303,27 @@ class ResetManager:
         if area_cfg is None:
             return None
 
-        rooms_cfg = area_cfg.get("rooms", {})
-        if not rooms_cfg:
-            self.last_reset[area_name] = time.time()
-            return None
+        # Supersede any sliced reset already under way for this area
+        if area_name in self._in_progress:
+            self._work = deque(w for w in self._work if w[0] != area_name)
+        self.dirty.pop(area_name, None)
 
         rooms_reset = 0
         rooms_skipped = 0
 
-        for vnum_str, room_cfg in rooms_cfg.items():
+        for vnum_str in area_cfg.get("rooms", {}):
             try:
                 vnum = int(vnum_str)
             except (ValueError, TypeError):
                 logger.warning("Invalid vnum '%s' in area '%s'", vnum_str, area_name)
                 continue
-
-            room = world.rooms.get(vnum)
-            if room is None:
-                continue
-
-            # Safety: skip rooms where a player is in combat
-            if self._room_has_combat(room):
-                rooms_skipped += 1
-                continue
-
-            # Perform the actual reset steps
-            changed = False
-
-            default_items = room_cfg.get("items")
-            if default_items is not None:
-                changed |= self.reset_room_items(world, vnum, default_items)
-
-            default_doors = room_cfg.get("doors")
-            if default_doors is not None:
-                changed |= self.reset_doors(world, vnum, default_doors)
-
-            default_containers = room_cfg.get("containers")
-            if default_containers is not None:
-                changed |= self.reset_containers(world, vnum, default_containers)
-
-            if changed:
+            outcome = self._reset_room(world, area_name, vnum)
+            if outcome == "reset":
                 rooms_reset += 1
-                self._notify_players(room)
-
-        self.last_reset[area_name] = time.time()
-
-        if rooms_reset or rooms_skipped:
-            msg = (
-                f"Area '{area_name}' reset: {rooms_reset} room(s) restored"
-                f"{f', {rooms_skipped} skipped (combat)' if rooms_skipped else ''}."
-            )
-            logger.info(msg)
-            return msg
+            elif outcome == "skipped":
+                rooms_skipped += 1
 
-        return None
+        return self._finish_area(area_name, rooms_reset, rooms_skipped)
 
     # -- Item reset ----------------------------------------------------------
 
@@ -273,6 +393,7 @@ class ResetManager:
             return False
 
         changed = False
+        converted = False
         for direction, door_state in default_doors.items():
             exit_data = room.exits.get(direction)
             if exit_data is None:
@@ -293,8 +414,13 @@ class ResetManager:
                         "closed": door_state.get("closed", False),
                         "locked": door_state.get("locked", False),
                     }
+                    converted = True
                     changed = True
 
+        if converted:
+            get_room_graph(world).invalidate()
+        elif changed:
+            get_room_graph(world).note_door_change()
         return changed
 
     # -- Container reset -----------------------------------------------------
@@ -406,17 +532,25 @@ class ResetManager:
         lines = ["Area Reset Manager Status:", f"  Enabled: {self.enabled}"]
         areas = self.config.get("areas", {})
         lines.append(f"  Configured areas: {len(areas)}")
+        lines.append(
+            f"  Rooms checked: {self.rooms_checked}, restored: {self.rooms_restored}, "
+            f"area resets: {self.areas_reset}"
+        )
+        lines.append(f"  Rooms queued for restore: {len(self._work)}")
 
         for area_name, area_cfg in areas.items():
             interval = area_cfg.get("reset_interval", DEFAULT_RESET_INTERVAL)
-            last = self.last_reset.get(area_name, 0)
-            elapsed = now - last
-            remaining = max(0, interval - elapsed)
             room_count = len(area_cfg.get("rooms", {}))
+            dirty = len(self.dirty.get(area_name, ()))
+            if area_name in self._in_progress:
+                when = f"resetting ({self._in_progress[area_name][2]} room(s) left)"
+            else:
+                due = self._due.get(area_name, now)
+                when = f"next reset in {max(0, due - now):.0f}s"
             lines.append(
                 f"  [{area_name}] interval={interval}s, "
-                f"rooms={room_count}, "
-                f"next reset in {remaining:.0f}s"
+                f"rooms={room_count}, dirty={dirty}, "
+                f"{when}"
             )
 
         return "\n".join(lines)
@@ -443,6 +577,8 @@ class ResetManager:
             return f"Unknown area: '{area_name}'."
 
         areas[area_name]["reset_interval"] = seconds
+        if area_name not in self._in_progress:
+            self._schedule(area_name)
         self._save_config()
         minutes = seconds / 60
         return f"Area '{area_name}' reset interval set to {minutes:.1f} minutes."
@@ -461,6 +597,7 @@ class ResetManager:
             "rooms": {}
         }
         self.last_reset[area_name] = time.time()
+        self._schedule(area_name)
         self._save_config()
         return f"Area '{area_name}' registered with {interval}s reset interval."
 
@@ -488,6 +625,8 @@ class ResetManager:
         if containers is not None:
             room_cfg["containers"] = containers
 
+        self._room_area[vnum] = area_name
+        self.dirty.setdefault(area_name, set()).add(vnum)
         self._save_config()
         return f"Room {vnum} reset data updated in area '{area_name}'."
 
@@ -505,3 +644,10 @@ def get_reset_manager() -> ResetManager:
     if _reset_manager is None:
         _reset_manager = ResetManager()
     return _reset_manager
+
+
+def mark_room_dirty(room) -> None:
+    """Flag a room (Room or vnum) as diverged from its reset template."""
+    vnum = getattr(room, "vnum", room)
+    if vnum is not None:
+        get_reset_manager().mark_dirty(vnum)
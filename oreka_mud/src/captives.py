@@ -868,7 +868,8 @@ def spawn_captive_in_room(world, room_vnum: int,
                 pass
 
     world.mobs[mob.vnum] = mob
-    room.mobs.append(mob)
+    from src.world import get_location_index
+    get_location_index(world).place_mob(mob, room)
     return True, (f"Captive '{mob.name}' placed in room {room_vnum} "
                   f"(family={family_id}, template={template_id}, vnum={mob.vnum}).")
 
@@ -4,6 +4,8 @@ import random
 from src.classes import CLASSES
 from src.spells import get_spells_for_class
 from src import conditions as cond
+from src.derived_stats import invalidate_derived
+from src.state_version import track_attrs
 
 COLOR_TAGS = {
     "@RESET@": "\033[0m",
@@ -61,8 +63,21 @@ EQUIPMENT_SLOTS = [
     "off_hand",   # Shield, second weapon, or empty
 ]
 
+# Attributes whose writes bump the GMCP version counters
+_VITALS_ATTRS = frozenset({
+    "hp", "max_hp", "move", "max_move", "ac", "gold", "xp", "level", "spells_per_day",
+})
+_STATUS_ATTRS = frozenset({"conditions", "active_conditions", "divine_buffs"})
+# Bumps feats_version, which keys the parsed feat table (feats.get_feat_table)
+_FEAT_ATTRS = frozenset({"feats"})
+
 
 class Character:
+    # Bumped when Char.Vitals / Char.Status inputs change (see state_version)
+    vitals_version = 0
+    status_version = 0
+    feats_version = 0
+
     def __init__(self, name, title, race, level, hp, max_hp, ac, room, is_immortal=False, elemental_affinity=None,
                  str_score=10, dex_score=10, con_score=10, int_score=10, wis_score=10, cha_score=10,
                  move=100, max_move=100, inventory=None, skills=None,
@@ -249,21 +264,18 @@ class Character:
 
         self._init_domains()
     def save(self):
-        """Save this character to a JSON file in data/players/ by name (lowercase), with backup."""
-        import os, json, shutil, datetime
-        player_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'players')
-        os.makedirs(player_dir, exist_ok=True)
-        filename = os.path.join(player_dir, f"{self.name.lower()}.json")
-        # Backup existing file if it exists
-        if os.path.exists(filename):
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = os.path.join(player_dir, f"{self.name.lower()}.{timestamp}.bak.json")
-            shutil.copy2(filename, backup_name)
-        # Atomic save: write to temp, then move
-        tmpfile = filename + ".tmp"
-        with open(tmpfile, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2)
-        os.replace(tmpfile, filename)
+        """Save this character to data/players/<name>.json.
+
+        While the server is running the save is write-behind: the character
+        is marked dirty and flushed by the player_saves pulse (see
+        src/persistence.py). Otherwise it is written immediately.
+        """
+        from src.persistence import get_player_store
+        store = get_player_store()
+        if store.active:
+            store.mark_dirty(self)
+        else:
+            store.save_now(self)
 
     @classmethod
     def rollback(cls, name, timestamp=None):
@@ -338,6 +350,7 @@ class Character:
         if not hasattr(self, 'feats'):
             self.feats = []
         self.feats.append(chosen)
+        invalidate_derived(self)
         return chosen
 
     async def check_levelup_bonus_feat(self, writer, reader):
@@ -352,31 +365,14 @@ class Character:
         return None
     def get_skill(self, skill):
         value = self.skills.get(skill, 0) if hasattr(self, 'skills') else 0
-        from src.feats import FEATS
-        seen_bases = set()
-        for feat_name in getattr(self, 'feats', []):
-            base = feat_name.split(' (', 1)[0]
-            if base in seen_bases:
-                continue
-            seen_bases.add(base)
-            feat = FEATS.get(feat_name) or FEATS.get(base)
-            if feat and feat.effect:
-                value = feat.apply(self, skill=skill, value=value)
-        return value
+        from src.feats import get_feat_table
+        # One application per base feat name (repeats of a feat don't stack)
+        return get_feat_table(self).apply(self, 'skill', value, {'skill': skill}, unique=True)
 
     def get_save(self, save):
         value = self.saves.get(save, 0) if hasattr(self, 'saves') else 0
-        from src.feats import FEATS
-        seen_bases = set()
-        for feat_name in getattr(self, 'feats', []):
-            base = feat_name.split(' (', 1)[0]
-            if base in seen_bases:
-                continue
-            seen_bases.add(base)
-            feat = FEATS.get(feat_name) or FEATS.get(base)
-            if feat and feat.effect:
-                value = feat.apply(self, save_type=save, value=value)
-        return value
+        from src.feats import get_feat_table
+        return get_feat_table(self).apply(self, 'save', value, {'save_type': save}, unique=True)
     def _auto_spells_known(self):
         """Auto-populate spells known for spellcasting classes."""
         if self.char_class in ("Wizard", "Sorcerer", "Bard", "Cleric", "Paladin", "Ranger", "Magi"):
@@ -936,6 +932,7 @@ class Character:
 
     def set_class(self, new_class):
         self.char_class = new_class
+        invalidate_derived(self)
         self.class_features = self.get_class_features()
         self.spells_known = self._auto_spells_known()
         self.spells_per_day = self._auto_spells_per_day()
@@ -943,6 +940,7 @@ class Character:
     def set_level(self, new_level):
         old_level = getattr(self, 'class_level', 1)
         self.class_level = new_level
+        invalidate_derived(self)
         self.class_features = self.get_class_features()
         self.spells_known = self._auto_spells_known()
         self.spells_per_day = self._auto_spells_per_day()
@@ -1655,11 +1653,8 @@ class Character:
 
     def has_feat(self, feat_name: str) -> bool:
         """Check if character has a feat (case-insensitive, partial match)."""
-        feat_lower = feat_name.lower()
-        for f in self.feats:
-            if feat_lower in f.lower():
-                return True
-        return False
+        from src.feats import get_feat_table
+        return get_feat_table(self).has(feat_name)
 
     # =========================================================================
     # Combat Maneuvers
@@ -1753,3 +1748,8 @@ class Character:
     def get_max_carry(self):
         """Max carry weight: STR * 10 (simplified D&D 3.5 light load for medium creatures)."""
         return self.str_score * 10
+
+
+track_attrs(Character, _VITALS_ATTRS, "vitals_version")
+track_attrs(Character, _STATUS_ATTRS, "status_version")
+track_attrs(Character, _FEAT_ATTRS, "feats_version")
@@ -85,39 +85,23 @@ def broadcast_to_area(room, message, exclude=None, radius=3):
     Broadcast a message to players in nearby rooms (for shout).
     Traverses exits up to 'radius' rooms away using BFS.
     """
-    visited = set()
-    queue = [(room, 0)]
-    visited.add(room.vnum)
-
-    while queue:
-        current_room, depth = queue.pop(0)
+    # Need access to world rooms - get from room's reference
+    world = getattr(room, '_world', None)
+    if world is None:
+        nearby = [room]
+    else:
+        from src.room_graph import get_room_graph
+        # Closed doors block the sound
+        vnums = get_room_graph(world).within_radius(room.vnum, radius, respect_doors=True)
+        nearby = [world.rooms[v] for v in vnums if v in world.rooms] or [room]
+
+    for current_room in nearby:
         # Send to all players in this room
         for player in getattr(current_room, 'players', []):
             if exclude and player == exclude:
                 continue
             send_to_player(player, message)
 
-        # Traverse exits if within radius
-        if depth < radius:
-            for direction, exit_data in getattr(current_room, 'exits', {}).items():
-                if isinstance(exit_data, dict):
-                    next_vnum = exit_data.get("room")
-                    # Don't traverse closed doors
-                    if exit_data.get("closed", False):
-                        continue
-                else:
-                    next_vnum = exit_data
-                if next_vnum and next_vnum not in visited:
-                    visited.add(next_vnum)
-                    # Need access to world rooms - get from room's reference
-                    next_room = None
-                    if hasattr(current_room, '_world'):
-                        next_room = current_room._world.rooms.get(next_vnum)
-                    elif hasattr(room, '_world'):
-                        next_room = room._world.rooms.get(next_vnum)
-                    if next_room:
-                        queue.append((next_room, depth + 1))
-
 
 def send_tell(sender, recipient, message):
     """
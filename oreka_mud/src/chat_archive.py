@@ -0,0 +1,360 @@
+"""
+Segmented archive for finished AI chat session logs.
+
+Each finished chat used to become its own pretty-printed JSON file in
+data/chat_sessions, written synchronously at end_session. Months of
+play left tens of thousands of small files there.
+
+Sessions are now appended as JSON lines to gzip segments, one per UTC
+day of the session's end (data/chat_sessions/sessions-YYYYMMDD.jsonl.gz):
+
+- archive() buffers the record; the ``chat_archive`` heartbeat pulse
+  appends the buffer to its segments on a worker thread, one gzip member
+  per segment per flush (see segment_store). A full buffer starts that
+  worker flush early. Outside a running server records are written
+  immediately.
+- Each segment has a sidecar index (sessions-YYYYMMDD.idx.json) with its
+  time range and per-player / per-NPC counts, so queries only decompress
+  segments that can contain matches.
+- Loose ``*.json`` logs from before the archive are read as legacy data
+  until import_legacy() folds them into segments.
+
+Usage:
+    archive = get_chat_archive()
+    archive.archive(record)
+    for session in archive.iter_sessions(player="Hormoth"):
+        ...
+"""
+import gzip
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Dict, Iterator, List
+
+from src.segment_store import SegmentStore, replace_file
+
+logger = logging.getLogger("OrekaMUD.ChatArchive")
+
+CHAT_SESSIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'chat_sessions')
+
+# Seconds between buffered flushes (heartbeat period)
+FLUSH_PERIOD = 10
+
+# Flush early once this many sessions are buffered
+MAX_BUFFERED = 50
+
+SEGMENT_PREFIX = "sessions-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def _new_index() -> dict:
+    return {"count": 0, "size": 0, "first_ts": None, "last_ts": None,
+            "players": {}, "npcs": {}}
+
+
+def _session_ts(record: dict) -> float:
+    return record.get("ended_at") or record.get("started_at") or 0
+
+
+def _index_add(index: dict, record: dict):
+    index["count"] += 1
+    ts = _session_ts(record)
+    if index["first_ts"] is None or ts < index["first_ts"]:
+        index["first_ts"] = ts
+    if index["last_ts"] is None or ts > index["last_ts"]:
+        index["last_ts"] = ts
+    for field, key in (("players", "player_name"), ("npcs", "npc_vnum")):
+        value = record.get(key)
+        if value is not None:
+            bucket = index[field]
+            bucket[str(value)] = bucket.get(str(value), 0) + 1
+
+
+def _matches(record: dict, player, npc_vnum, since, until) -> bool:
+    if player and (record.get("player_name") or "").lower() != player.lower():
+        return False
+    if npc_vnum is not None and str(record.get("npc_vnum")) != str(npc_vnum):
+        return False
+    ts = _session_ts(record)
+    if since is not None and ts < since:
+        return False
+    if until is not None and ts > until:
+        return False
+    return True
+
+
+class ChatArchive(SegmentStore):
+    """Day-segmented, gzip-compressed JSONL archive of chat session logs."""
+
+    def __init__(self, directory: str = CHAT_SESSIONS_DIR):
+        super().__init__(directory)
+
+        # Instrumentation
+        self.archived = 0
+        self.segments_scanned = 0
+        self.segments_skipped = 0
+
+    # -- segment bookkeeping ------------------------------------------------
+
+    def _segment_path(self, segment: str) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{segment}{SEGMENT_SUFFIX}")
+
+    def _index_path(self, segment: str) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{segment}.idx.json")
+
+    @staticmethod
+    def _segment_for(record: dict) -> str:
+        return time.strftime("%Y%m%d", time.gmtime(_session_ts(record)))
+
+    def _read_segment(self, segment: str) -> Iterator[dict]:
+        path = self._segment_path(segment)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except (OSError, EOFError) as e:
+            # A truncated trailing member (crash mid-append) ends the segment
+            logger.warning(f"Chat archive segment {segment} unreadable past this point: {e}")
+
+    def _scan_index(self, segment: str) -> dict:
+        index = _new_index()
+        for record in self._read_segment(segment):
+            _index_add(index, record)
+        index["size"] = os.path.getsize(self._segment_path(segment))
+        return index
+
+    def _write_index(self, segment: str, index: dict):
+        tmp = self._index_path(segment) + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp, self._index_path(segment))
+        except OSError as e:
+            logger.error(f"Failed to write chat archive index {segment}: {e}")
+
+    def _load(self):
+        """Discover segments and load (or rebuild stale) sidecar indexes."""
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self.directory, exist_ok=True)
+        for fn in os.listdir(self.directory):
+            if not (fn.startswith(SEGMENT_PREFIX) and fn.endswith(SEGMENT_SUFFIX)):
+                continue
+            segment = fn[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+            index = None
+            try:
+                with open(self._index_path(segment), "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("size") != os.path.getsize(self._segment_path(segment)):
+                    index = None  # segment grew behind the index's back
+            except (OSError, ValueError):
+                index = None
+            if index is None:
+                index = self._scan_index(segment)
+                self._write_index(segment, index)
+            self._indexes[segment] = index
+
+    def _legacy_files(self) -> List[str]:
+        """Loose per-session JSON logs written before the archive."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.path.join(self.directory, fn) for fn in os.listdir(self.directory)
+                      if fn.endswith(".json") and not fn.startswith(SEGMENT_PREFIX))
+
+    # -- writing ------------------------------------------------------------
+
+    def archive(self, record: dict):
+        self.archived += 1
+        self._add(record, MAX_BUFFERED)
+
+    def _append(self, records: List[dict]) -> List[dict]:
+        """Append records to their segments (one gzip member per segment).
+
+        Returns the records whose segment could not be written.
+        """
+        failed = []
+        by_segment: Dict[str, List[dict]] = {}
+        for record in records:
+            by_segment.setdefault(self._segment_for(record), []).append(record)
+        for segment, batch in by_segment.items():
+            path = self._segment_path(segment)
+            payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch)
+            try:
+                with open(path, "ab") as f:
+                    f.write(gzip.compress(payload.encode("utf-8")))
+            except OSError as e:
+                logger.error(f"Failed to write chat archive segment {segment}: {e}")
+                failed.extend(batch)
+                continue
+            index = self._indexes.setdefault(segment, _new_index())
+            for record in batch:
+                _index_add(index, record)
+            index["size"] = os.path.getsize(path)
+            self._write_index(segment, index)
+        return failed
+
+    def _rewrite_segment(self, segment: str, records: List[dict]) -> bool:
+        """Replace a segment's contents with ``records`` via a temp file.
+
+        On failure the old segment and its index are left as they were.
+        """
+        path = self._segment_path(segment)
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        if not replace_file(path, gzip.compress(payload.encode("utf-8"))):
+            return False
+        index = _new_index()
+        for record in records:
+            _index_add(index, record)
+        index["size"] = os.path.getsize(path)
+        self._indexes[segment] = index
+        self._write_index(segment, index)
+        return True
+
+    # -- querying -----------------------------------------------------------
+
+    def _may_contain(self, index: dict, player, npc_vnum, since, until) -> bool:
+        if player and not any(p.lower() == player.lower() for p in index["players"]):
+            return False
+        if npc_vnum is not None and str(npc_vnum) not in index["npcs"]:
+            return False
+        if since is not None and index["last_ts"] is not None and index["last_ts"] < since:
+            return False
+        if until is not None and index["first_ts"] is not None and index["first_ts"] > until:
+            return False
+        return True
+
+    def iter_sessions(self, player: str = None, npc_vnum=None,
+                      since: float = None, until: float = None) -> Iterator[dict]:
+        """Stream matching sessions, oldest segment first.
+
+        ``since`` / ``until`` bound the session's end time (epoch seconds).
+        Legacy loose files come first, then archived segments, then
+        anything still buffered.
+        """
+        for path in self._legacy_files():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if _matches(record, player, npc_vnum, since, until):
+                yield record
+        self.flush()
+        with self._lock:
+            self._load()
+            segments = sorted(self._indexes)
+            candidates = []
+            for segment in segments:
+                if self._may_contain(self._indexes[segment], player, npc_vnum, since, until):
+                    candidates.append(segment)
+                else:
+                    self.segments_skipped += 1
+        for segment in candidates:
+            self.segments_scanned += 1
+            for record in self._read_segment(segment):
+                if _matches(record, player, npc_vnum, since, until):
+                    yield record
+
+    # -- maintenance --------------------------------------------------------
+
+    def import_legacy(self, remove: bool = True, batch_size: int = 500) -> int:
+        """Fold loose per-session JSON logs into segments.
+
+        Files are written in batches and, when ``remove`` is set, deleted
+        once their segment write succeeds. Returns the number imported.
+        """
+        self.flush()
+        imported = 0
+        paths = self._legacy_files()
+        for start in range(0, len(paths), batch_size):
+            loaded = []
+            for path in paths[start:start + batch_size]:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        loaded.append((path, json.load(f)))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable session log {path}: {e}")
+            with self._lock:
+                self._load()
+                failed = self._append([record for _, record in loaded])
+            failed_ids = {id(record) for record in failed}
+            for path, record in loaded:
+                if id(record) in failed_ids:
+                    continue
+                imported += 1
+                if remove:
+                    os.remove(path)
+        return imported
+
+    def purge_player(self, player: str, trash_dir: str = None) -> int:
+        """Remove a player's sessions, rewriting only segments that index them.
+
+        Touched segments are copied to ``trash_dir`` first when given, and
+        rewritten through a temp file so a failed write keeps the original.
+        """
+        self.flush()
+        lname = player.lower()
+        removed = 0
+        with self._lock:
+            self._load()
+            for segment, index in list(self._indexes.items()):
+                if not any(p.lower() == lname for p in index["players"]):
+                    continue
+                path = self._segment_path(segment)
+                if trash_dir:
+                    os.makedirs(trash_dir, exist_ok=True)
+                    shutil.copy2(path, os.path.join(trash_dir, os.path.basename(path)))
+                kept = []
+                dropped = 0
+                for record in self._read_segment(segment):
+                    if (record.get("player_name") or "").lower() == lname:
+                        dropped += 1
+                    else:
+                        kept.append(record)
+                if kept:
+                    if not self._rewrite_segment(segment, kept):
+                        continue
+                else:
+                    try:
+                        os.remove(path)
+                    except OSError as e:
+                        logger.error(f"Failed to remove chat archive segment {segment}: {e}")
+                        continue
+                    del self._indexes[segment]
+                    try:
+                        os.remove(self._index_path(segment))
+                    except OSError:
+                        pass
+                removed += dropped
+        return removed
+
+    def get_status(self) -> str:
+        with self._lock:
+            self._load()
+            total = sum(i["count"] for i in self._indexes.values())
+            size = sum(i["size"] for i in self._indexes.values())
+            segments = sorted(self._indexes)
+        span = f"{segments[0]} .. {segments[-1]}" if segments else "none"
+        return "\n".join([
+            "Chat Session Archive:",
+            f"  Segments: {len(segments)} ({span})  Sessions: {total}  "
+            f"Compressed: {size // 1024} KB",
+            f"  Buffered: {len(self.pending)}  Archived: {self.archived}  "
+            f"Flushes: {self.flushes}  Legacy files: {len(self._legacy_files())}",
+            f"  Segments scanned: {self.segments_scanned}  skipped by index: {self.segments_skipped}",
+        ])
+
+
+# Global archive instance
+chat_archive = ChatArchive()
+
+
+def get_chat_archive() -> ChatArchive:
+    """Get the global chat session archive."""
+    return chat_archive
@@ -5,79 +5,28 @@ and executes game actions from AI responses.
 """
 
 import json
-import os
-import time
 import logging
 from typing import Optional
 
 logger = logging.getLogger("OrekaMUD.ChatContext")
 
-MEMORIES_DIR = os.path.join("data", "npc_memories")
-os.makedirs(MEMORIES_DIR, exist_ok=True)
-
 
 # =========================================================================
-# NPC Memory System
+# NPC Memory System (stored in src.npc_memory)
 # =========================================================================
 
 def load_npc_memory(npc_vnum: int, player_name: str) -> list:
     """Load NPC's memories of a specific player. Returns top 5 by importance."""
-    filepath = _memory_path(npc_vnum, player_name)
-    if not os.path.exists(filepath):
-        return []
-    try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        memories = data.get("memories", [])
-        # Sort by importance descending, return top 5
-        memories.sort(key=lambda m: m.get("importance", 0), reverse=True)
-        return memories[:5]
-    except Exception as e:
-        logger.error(f"Failed to load NPC memory: {e}")
-        return []
+    from src.npc_memory import get_npc_memory_store
+    return get_npc_memory_store().top_memories(npc_vnum, player_name, 5)
 
 
 def save_npc_memory(npc_vnum: int, player_name: str, memory_text: str,
                     importance: float = 0.3, session_id: str = ""):
     """Save a memory for an NPC about a player."""
-    filepath = _memory_path(npc_vnum, player_name)
-
-    # Load existing
-    data = {"npc_vnum": npc_vnum, "player_name": player_name,
-            "memories": [], "last_interaction": 0, "total_sessions": 0}
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
-        except Exception:
-            pass
-
-    # Append new memory
-    data["memories"].append({
-        "text": memory_text,
-        "importance": importance,
-        "session_id": session_id,
-        "created_at": time.time(),
-    })
-    data["last_interaction"] = time.time()
-
-    # Keep only top 20 memories by importance
-    data["memories"].sort(key=lambda m: m.get("importance", 0), reverse=True)
-    data["memories"] = data["memories"][:20]
-
-    # Ensure directory exists
-    npc_dir = os.path.join(MEMORIES_DIR, str(npc_vnum))
-    os.makedirs(npc_dir, exist_ok=True)
-
-    try:
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        logger.error(f"Failed to save NPC memory: {e}")
-
-
-def _memory_path(npc_vnum: int, player_name: str) -> str:
-    return os.path.join(MEMORIES_DIR, str(npc_vnum), f"{player_name}.json")
+    from src.npc_memory import get_npc_memory_store
+    get_npc_memory_store().add_memory(npc_vnum, player_name, memory_text,
+                                      importance=importance, session_id=session_id)
 
 
 def calculate_importance(response: dict) -> float:
@@ -520,6 +469,8 @@ async def _handle_reputation(player, action: dict) -> str:
         if hasattr(player, 'reputation'):
             current = player.reputation.get(faction, 0)
             player.reputation[faction] = current + amount
+            from src.narrative import announce_event
+            announce_event(player, "faction_change", faction, current + amount)
             sign = "+" if amount > 0 else ""
             return (f"\033[1;33m[Action]\033[0m (Reputation {sign}{amount}: {faction})")
     return ""
@@ -7,18 +7,30 @@ Real-world events (speech, combat, room events) inject into the AI context.
 """
 
 import asyncio
-import json
-import os
 import time
 import uuid
 import logging
 from dataclasses import dataclass, field, asdict
 from typing import Optional, List
 
+from src.chat_archive import get_chat_archive
+
 logger = logging.getLogger("OrekaMUD.ChatSession")
 
-CHAT_SESSIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'chat_sessions')
-NPC_MEMORIES_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'npc_memories')
+# Rolling context window: unsummarized turns are sent verbatim. When they
+# outgrow this many (estimated) tokens or messages, the reply waits for the
+# aged-out ones to be folded into the rolling summary rather than drop them.
+HISTORY_TOKEN_BUDGET = 1500
+HISTORY_MAX_MESSAGES = 20
+# The newest entries are never folded into the summary
+SUMMARY_KEEP_RECENT = 12
+# Fold once this many entries have aged out of the recent window
+SUMMARY_CHUNK = 8
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (4 chars/token, as audit_prompt_lengths uses)."""
+    return max(1, len(text) // 4) if text else 0
 
 # ANSI colors
 PURPLE = "\033[1;35m"
@@ -60,6 +72,15 @@ class ChatSession:
     ended: bool = False
     scenario: Optional[str] = None
     _summary: Optional[str] = None  # Compressed summary of older conversation
+    _summarizing: bool = False  # summary job in flight
+    _summary_task: Optional[asyncio.Task] = None  # background summary job, if any
+    folded_history: list = field(default_factory=list)  # entries folded into _summary
+
+    # Token accounting (estimated, see estimate_tokens)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    summary_tokens: int = 0
+    summaries: int = 0
 
     # State machine (Phase 5)
     state: str = "IDLE"  # one of CHAT_STATES
@@ -108,20 +129,40 @@ class ChatSession:
         """Get the most recent world events."""
         return self.world_events_injected[-limit:]
 
-    def get_messages_for_llm(self, max_messages: int = 20) -> list:
+    def get_messages_for_llm(self) -> list:
         """Get conversation history formatted for LLM API.
-        Uses a sliding window to prevent context overflow."""
-        messages = []
-        for entry in self.conversation_history[-max_messages:]:
-            role = entry["role"]
-            content = entry["content"]
-            if role == "system":
-                messages.append({"role": "system", "content": content})
-            elif role == "user":
-                messages.append({"role": "user", "content": content})
-            elif role == "assistant":
-                messages.append({"role": "assistant", "content": content})
-        return messages
+
+        Returns every turn not yet folded into the rolling summary; folded
+        turns are pruned from conversation_history, and the summary itself
+        goes in the system prompt.
+        """
+        return [{"role": entry["role"], "content": entry["content"]}
+                for entry in self.conversation_history
+                if entry["role"] in ("system", "user", "assistant")]
+
+    def history_over_budget(self, max_messages: int = HISTORY_MAX_MESSAGES,
+                            token_budget: int = HISTORY_TOKEN_BUDGET) -> bool:
+        """True when the unsummarized turns outgrow the prompt window."""
+        messages = self.get_messages_for_llm()
+        return (len(messages) > max_messages
+                or sum(estimate_tokens(m["content"]) for m in messages) > token_budget)
+
+    def needs_summary(self) -> bool:
+        """True when enough turns have aged out of the recent window."""
+        aged = len(self.conversation_history) - SUMMARY_KEEP_RECENT
+        return not self._summarizing and not self.ended and aged >= SUMMARY_CHUNK
+
+    @property
+    def folded_entries(self) -> int:
+        """Entries folded into the summary and out of the prompt window."""
+        return len(self.folded_history)
+
+    def get_token_usage(self) -> str:
+        """One-line token accounting summary for @chatstatus."""
+        return (f"prompt ~{self.prompt_tokens}t, replies ~{self.completion_tokens}t, "
+                f"summaries {self.summaries} (~{self.summary_tokens}t, "
+                f"{self.folded_entries} entries folded, "
+                f"{len(self.conversation_history)} kept)")
 
 
 def _get_region_for_vnum(vnum: int) -> str:
@@ -368,8 +409,11 @@ def materialize(session: ChatSession, character, world) -> str:
     # End any other active dream sessions for this character (defensive)
     # (only one chat session is supported per char, so this is mainly for safety)
 
+    from src.narrative import event_cutscenes
+    cutscenes = "".join(f"\n{text}" for text in
+                        event_cutscenes(character, "enter_room", target_room))
     return (f"\033[1;35m~ The dream solidifies. You step from the shadow into "
-            f"{target_room.name}. ({cost} HP spent on the crossing.)\033[0m")
+            f"{target_room.name}. ({cost} HP spent on the crossing.)\033[0m{cutscenes}")
 
 
 # ---------------------------------------------------------------------------
@@ -483,6 +527,9 @@ async def process_player_input(session: ChatSession, character, text: str) -> st
     # Add NPC response to history
     session.add_message("assistant", response_text)
 
+    # Fold aged-out turns into the rolling summary after the turn, not in it
+    ai.schedule_summary(session)
+
     # Execute game actions if any
     action_messages = []
     if actions:
@@ -511,65 +558,22 @@ def load_npc_memory(npc_vnum: int, player_name: str) -> dict:
 
     Returns dict with keys: facts (list of strings), disposition, sessions, last_seen
     """
-    path = os.path.join(NPC_MEMORIES_DIR, f"{npc_vnum}.json")
-    if not os.path.exists(path):
-        return {"facts": [], "disposition": "neutral", "sessions": 0, "last_seen": None}
-
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        memories = data.get("memories", {})
-        player_mem = memories.get(player_name, {})
-        return {
-            "facts": player_mem.get("facts", []),
-            "disposition": player_mem.get("disposition", "neutral"),
-            "sessions": player_mem.get("sessions", 0),
-            "last_seen": player_mem.get("last_seen"),
-        }
-    except Exception as e:
-        logger.error(f"Failed to load NPC memory {npc_vnum}: {e}")
-        return {"facts": [], "disposition": "neutral", "sessions": 0, "last_seen": None}
+    from src.npc_memory import get_npc_memory_store
+    record = get_npc_memory_store().get(npc_vnum, player_name)
+    return {
+        "facts": list(record.facts),
+        "disposition": record.disposition,
+        "sessions": record.sessions,
+        "last_seen": record.last_seen,
+    }
 
 
 def save_npc_memory(npc_vnum: int, npc_name: str, player_name: str,
                     facts: list, disposition: str = "neutral"):
     """Save NPC memory about a player."""
-    os.makedirs(NPC_MEMORIES_DIR, exist_ok=True)
-    path = os.path.join(NPC_MEMORIES_DIR, f"{npc_vnum}.json")
-
-    # Load existing
-    data = {"npc_vnum": npc_vnum, "npc_name": npc_name, "memories": {}}
-    if os.path.exists(path):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception:
-            pass
-
-    # Update player's entry
-    memories = data.setdefault("memories", {})
-    player_mem = memories.setdefault(player_name, {
-        "facts": [],
-        "disposition": "neutral",
-        "sessions": 0,
-    })
-    # Merge new facts (deduplicate)
-    existing = set(player_mem.get("facts", []))
-    for fact in facts:
-        if fact and fact not in existing:
-            player_mem.setdefault("facts", []).append(fact)
-            existing.add(fact)
-    # Keep only last 10 facts
-    player_mem["facts"] = player_mem["facts"][-10:]
-    player_mem["disposition"] = disposition
-    player_mem["sessions"] = player_mem.get("sessions", 0) + 1
-    player_mem["last_seen"] = time.strftime("%Y-%m-%dT%H:%M:%S")
-
-    try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        logger.error(f"Failed to save NPC memory {npc_vnum}: {e}")
+    from src.npc_memory import get_npc_memory_store
+    get_npc_memory_store().record_session(npc_vnum, npc_name, player_name,
+                                          facts, disposition)
 
 
 def _extract_and_save_memory(session: ChatSession):
@@ -588,7 +592,7 @@ def _extract_and_save_memory(session: ChatSession):
             facts.append(f"Received an item")
 
     # Extract from conversation (player messages that are substantial)
-    for entry in session.conversation_history:
+    for entry in session.folded_history + session.conversation_history:
         if entry.get("role") == "user" and len(entry.get("content", "")) > 40:
             # Summarize: take first 60 chars
             content = entry["content"][:60].strip()
@@ -604,14 +608,11 @@ def _extract_and_save_memory(session: ChatSession):
 
 
 def _save_session_log(session: ChatSession):
-    """Save the complete session to a JSON log file."""
-    os.makedirs(CHAT_SESSIONS_DIR, exist_ok=True)
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    filename = f"{session.player_name}_{session.npc_name}_{timestamp}.json"
-    # Sanitize filename
-    filename = "".join(c if c.isalnum() or c in "._-" else "_" for c in filename)
-    path = os.path.join(CHAT_SESSIONS_DIR, filename)
+    """Hand the session to the chat archive (written behind).
 
+    The record carries the full transcript: turns folded into the rolling
+    summary come first, followed by the unsummarized ones.
+    """
     data = {
         "session_id": session.session_id,
         "player_name": session.player_name,
@@ -625,7 +626,9 @@ def _save_session_log(session: ChatSession):
         "anchor_region": session.anchor_region,
         "started_at": session.started_at,
         "ended_at": time.time(),
-        "conversation_history": session.conversation_history,
+        "summary": session._summary,
+        "folded_entries": session.folded_entries,
+        "conversation_history": session.folded_history + session.conversation_history,
         "world_events_injected": session.world_events_injected,
         "game_actions_executed": session.game_actions_executed,
         "materialized": session.materialized,
@@ -635,11 +638,9 @@ def _save_session_log(session: ChatSession):
     }
 
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Session log saved: {path}")
+        get_chat_archive().archive(data)
     except Exception as e:
-        logger.error(f"Failed to save session log: {e}")
+        logger.error(f"Failed to archive session log: {e}")
 
 
 def _build_opening(npc, room, npc_memory: dict) -> str:
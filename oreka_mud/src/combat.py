@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Tuple, Any, TYPE_CHECKING
 from src import conditions as cond
 from src import feats as feat_module
 from src import quests as quest_module
+from src.derived_stats import get_derived
 
 
 # ── D&D 3.5 Weapon Critical Ranges ──────────────────────────────────────────
@@ -38,6 +39,26 @@ _WEAPON_CRIT_TABLE = {
 }
 
 
+_CRIT_BY_NAME: Dict[str, Tuple[int, int]] = {}
+
+
+def _crit_for_name(name: str) -> Tuple[int, int]:
+    """Base (threat_range, crit_multiplier) for a weapon name, memoised."""
+    crit = _CRIT_BY_NAME.get(name)
+    if crit is None:
+        crit = (20, 2)
+        name_lower = name.lower()
+        # Check the crit table for matching weapon names
+        for fragment, entry in _WEAPON_CRIT_TABLE.items():
+            if fragment in name_lower:
+                crit = entry
+                break
+        if len(_CRIT_BY_NAME) > 4096:
+            _CRIT_BY_NAME.clear()
+        _CRIT_BY_NAME[name] = crit
+    return crit
+
+
 def get_weapon_crit_info(attacker):
     """Return (threat_range, crit_multiplier) for an attacker's equipped weapon.
 
@@ -51,13 +72,7 @@ def get_weapon_crit_info(attacker):
     crit_mult = 2
 
     if weapon:
-        name_lower = getattr(weapon, 'name', '').lower()
-        # Check the crit table for matching weapon names
-        for fragment, (threat, mult) in _WEAPON_CRIT_TABLE.items():
-            if fragment in name_lower:
-                base_threat = threat
-                crit_mult = mult
-                break
+        base_threat, crit_mult = _crit_for_name(getattr(weapon, 'name', ''))
 
         # Check weapon stats for explicit overrides
         stats = getattr(weapon, 'stats', {}) or {}
@@ -622,6 +637,124 @@ def _emit_room_mobs_to_players(room: 'Room'):
         pass
 
 
+# Seconds between automatic combat turns (one turn per instance per pulse)
+COMBAT_TICK_RATE = 2
+
+
+class CombatScheduler:
+    """
+    Owns the stepping of every active CombatInstance.
+
+    One heartbeat pulse advances every fight by exactly one turn, so round
+    timing no longer depends on how many participants are connected (or
+    whether any are), and the round output is fanned out to every player
+    combatant in the room.
+    """
+
+    def __init__(self):
+        self.command_parser = None
+        self.pulses = 0
+        self.turns_stepped = 0
+        self.combats_ended = 0
+        self.last_batch_size = 0
+        self.last_batch_time = 0.0
+        self.max_batch_time = 0.0
+        self.total_batch_time = 0.0
+
+    def step_combat(self, combat: CombatInstance) -> Tuple[List[str], List[Any]]:
+        """Advance one combat by a single turn.
+
+        Returns:
+            (messages, participants) - participants are captured before the
+            combat can end so the closing message still reaches everyone.
+        """
+        participants = list(combat.combatants.keys())
+        messages = []
+        should_end, end_msg = combat.check_combat_end()
+        if not should_end:
+            turn_msg = combat.advance_turn()
+            if turn_msg:
+                messages.append(turn_msg)
+            current = combat.get_current_combatant()
+            if current:
+                messages.append(combat.execute_turn(current.combatant, self.command_parser))
+                self.turns_stepped += 1
+            should_end, end_msg = combat.check_combat_end()
+        if should_end:
+            messages.append(end_msg)
+            for entity in participants:
+                if hasattr(entity, 'clear_combat_target'):
+                    entity.clear_combat_target()
+            end_combat(combat.room)
+            self.combats_ended += 1
+        return messages, participants
+
+    def step_all(self) -> int:
+        """Step every active combat once. Returns the number stepped."""
+        import time as _time
+        start = _time.perf_counter()
+        active = [c for c in list(_active_combats.values()) if c.is_active]
+        for combat in active:
+            try:
+                messages, participants = self.step_combat(combat)
+            except Exception as e:
+                import logging
+                logging.getLogger("OrekaMUD.Combat").error(
+                    f"Combat step failed in room {combat.room.vnum}: {e}")
+                continue
+            if messages:
+                self._fan_out(combat.room, participants, messages)
+        elapsed = _time.perf_counter() - start
+        self.pulses += 1
+        self.last_batch_size = len(active)
+        self.last_batch_time = elapsed
+        self.total_batch_time += elapsed
+        self.max_batch_time = max(self.max_batch_time, elapsed)
+        return len(active)
+
+    @staticmethod
+    def _fan_out(room, participants, messages: List[str]):
+        """Send the round output to every connected player in the fight."""
+        from src.ui import WHITE, RESET
+        text = "\n".join(m for m in messages if m)
+        for entity in participants:
+            if getattr(entity, 'is_ai', False):
+                continue
+            if getattr(entity, 'room', None) is not room:
+                continue
+            writer = getattr(entity, 'writer', None)
+            if writer is None or not hasattr(entity, 'get_prompt'):
+                continue
+            try:
+                writer.write(f"{WHITE}{text}\n{entity.get_prompt()} {RESET}")
+            except Exception:
+                pass
+
+    def get_status(self) -> str:
+        """Summary of scheduler activity for @combatstatus."""
+        active = sum(1 for c in _active_combats.values() if c.is_active)
+        avg = self.total_batch_time / self.pulses if self.pulses else 0.0
+        return "\n".join([
+            "Combat Scheduler Status:",
+            f"  Tick rate: {COMBAT_TICK_RATE}s",
+            f"  Active combats: {active}",
+            f"  Pulses: {self.pulses}",
+            f"  Turns stepped: {self.turns_stepped}",
+            f"  Combats ended: {self.combats_ended}",
+            f"  Last batch: {self.last_batch_size} combats in {self.last_batch_time * 1000:.2f} ms",
+            f"  Avg batch: {avg * 1000:.2f} ms  Max batch: {self.max_batch_time * 1000:.2f} ms",
+        ])
+
+
+# Global combat scheduler instance
+combat_scheduler = CombatScheduler()
+
+
+def get_combat_scheduler() -> CombatScheduler:
+    """Get the global combat scheduler instance."""
+    return combat_scheduler
+
+
 # =============================================================================
 # Core Combat Functions
 # =============================================================================
@@ -679,20 +812,7 @@ def roll_saving_throw(entity, save_type: SaveType, dc: int, modifiers: int = 0)
 
     # If base_save is still 0 and entity has class data, calculate from save_progression
     if base_save == 0 and hasattr(entity, 'char_class') and hasattr(entity, 'level'):
-        from src.classes import CLASSES
-        class_data = CLASSES.get(entity.char_class, {})
-        save_prog = class_data.get('save_progression', {})
-        save_key_map = {
-            SaveType.FORTITUDE: 'fort',
-            SaveType.REFLEX: 'ref',
-            SaveType.WILL: 'will',
-        }
-        prog = save_prog.get(save_key_map[save_type], 'poor')
-        lvl = entity.level
-        if prog == 'good':
-            base_save = 2 + lvl // 2
-        else:  # poor
-            base_save = lvl // 3
+        base_save = get_derived(entity).base_saves[save_type.value]
 
     # Add ability modifier
     ability_map = {
@@ -727,58 +847,15 @@ def roll_saving_throw(entity, save_type: SaveType, dc: int, modifiers: int = 0)
     return success, total, desc
 
 
-SIZE_MODIFIERS = {
-    "Fine": 8,
-    "Diminutive": 4,
-    "Tiny": 2,
-    "Small": 1,
-    "Medium": 0,
-    "Large": -1,
-    "Huge": -2,
-    "Gargantuan": -4,
-    "Colossal": -8,
-}
-
-
 def get_size_modifier(entity) -> int:
     """Return size modifier for attack rolls and AC based on entity size."""
-    if hasattr(entity, 'char_class'):
-        # Character: look up size from race data
-        from src.races import get_race
-        race_data = get_race(getattr(entity, 'race', '')) or {}
-        size = race_data.get('size', 'Medium')
-    else:
-        # Mob: use size attribute directly
-        size = getattr(entity, 'size', 'Medium')
-    # Normalise capitalisation
-    if size:
-        size = size[0].upper() + size[1:].lower() if len(size) > 1 else size.upper()
-    else:
-        size = 'Medium'
-    return SIZE_MODIFIERS.get(size, 0)
+    return get_derived(entity).size_mod
 
 
 def calculate_attack_bonus(attacker, target=None, is_aoo: bool = False) -> int:
     """Calculate total attack bonus"""
-    # Base attack bonus
-    if hasattr(attacker, 'level'):
-        level = attacker.level
-    else:
-        level = 1
-
-    # Determine BAB based on class or monster
-    if hasattr(attacker, 'char_class'):
-        from src.classes import CLASSES
-        class_data = CLASSES.get(attacker.char_class, {})
-        bab_type = class_data.get('bab_progression', '3/4')
-        if bab_type == 'full':
-            bab = level
-        elif bab_type == '1/2':
-            bab = level // 2
-        else:  # '3/4' or any other value
-            bab = (level * 3) // 4
-    else:
-        bab = (level * 3) // 4  # Default for monsters
+    # Base attack bonus (class progression, or 3/4 for monsters)
+    bab = get_derived(attacker).bab
 
     # Strength modifier (or Dex with Weapon Finesse)
     str_mod = get_ability_mod(attacker, "Str")
@@ -1487,16 +1564,10 @@ def award_xp(attacker, target) -> int:
         from src.narrative import get_narrative_manager
         nm = get_narrative_manager()
         narr_triggered = nm.on_kill(attacker, target)
-        if narr_triggered and hasattr(attacker, '_writer'):
-            for chapter in narr_triggered:
-                text, rewards = nm.trigger_chapter(attacker, chapter)
-                try:
-                    attacker._writer.write(text + "\n")
-                    if rewards and "xp" in rewards:
-                        attacker.xp += rewards["xp"]
-                        attacker._writer.write(f"Gained {rewards['xp']} XP!\n")
-                except Exception:
-                    pass
+        _w = getattr(attacker, '_writer', None) or getattr(attacker, 'writer', None)
+        if narr_triggered and _w:
+            for _chapter, text in narr_triggered:
+                _w.write(text + "\n")
     except Exception:
         pass
 
@@ -1661,6 +1732,8 @@ def generate_loot(target, room, attacker=None) -> str:
         for item in corpse_items:
             if item in room.items:
                 room.items.remove(item)
+        from src.area_resets import mark_room_dirty
+        mark_room_dirty(room)
         corpse = Corpse(mob_name=mob_name, items=corpse_items, gold=corpse_gold)
         corpse._created_at = time.time()
         room.corpses.append(corpse)
@@ -3,6 +3,10 @@ from src.character import State
 from src import quests
 from src.spawning import get_spawn_manager
 from src.schedules import get_game_time, get_schedule_manager, ActivityType
+from src.world import get_location_index
+from src.room_graph import get_room_graph
+from src.area_resets import mark_room_dirty
+from src.derived_stats import invalidate_derived
 
 VALID_RACES = [
     # True Kin (Elemental Framework)
@@ -550,15 +554,31 @@ class CommandParser:
 
         # Use AI system for response
         from src import ai
+        from src.llm_client import TokenStreamer
+        # Stream LLM text to the player as it is generated; the prefix
+        # (reveal + speaker) goes out with the first token.
+        streamer = None
+        writer = getattr(character, '_writer', None) or getattr(character, 'writer', None)
+        if writer is not None:
+            prefix = f"{npc.name} says: \""
+            if reveal_msg:
+                prefix = reveal_msg + "\n\n" + prefix
+            streamer = TokenStreamer(writer, prefix)
         try:
             response = await ai.get_npc_response(
                 npc=npc,
                 player=character,
                 message=message,
                 room=character.room,
-                use_llm=True
+                use_llm=True,
+                on_token=streamer,
             )
             ai_out = f"{npc.name} says: \"{response}\""
+            if streamer is not None and streamer.started:
+                if streamer.finished:
+                    return '"'
+                # Stream broke off and we fell back to a template reply
+                return '..."\n' + ai_out
             if reveal_msg:
                 return reveal_msg + "\n\n" + ai_out
             return ai_out
@@ -608,7 +628,9 @@ class CommandParser:
         if not npc.is_chat_eligible():
             return f"{npc.name} doesn't seem interested in conversation."
 
-        # Start the session
+        # Start the session; the NPC's memory of us loads off the event loop
+        from src.npc_memory import get_npc_memory_store
+        await get_npc_memory_store().prefetch(npc.vnum, character.name)
         session = chat_session.start_session(character, npc, character.room)
 
         # Build output
@@ -755,6 +777,9 @@ class CommandParser:
         if not shadows:
             return "No active chat sessions."
 
+        sessions = {p.name: p.active_chat_session
+                    for p in getattr(self.world, 'players', []) or []
+                    if getattr(p, 'active_chat_session', None) is not None}
         lines = ["=== Active Chat Sessions ==="]
         for pid, shadow in shadows.items():
             duration = int(time.time() - shadow.created_at)
@@ -765,6 +790,9 @@ class CommandParser:
                 f"  {shadow.player_name} <-> {shadow.npc_name} "
                 f"(room {shadow.room_vnum}, {minutes}m{seconds}s, {src})"
             )
+            session = sessions.get(shadow.player_name)
+            if session is not None:
+                lines.append(f"    tokens: {session.get_token_usage()}")
         return "\n".join(lines)
 
     def _find_shopkeeper(self, character):
@@ -996,9 +1024,10 @@ class CommandParser:
             return "Usage: @saveplayer <name>"
         try:
             # This assumes the player is loaded in memory; otherwise, load from file
+            from src.persistence import get_player_store
             for player in list(self.world.players):
                 if player.name.lower() == name.lower():
-                    player.save()
+                    get_player_store().save_now(player)
                     return f"Player {name} saved."
             # Not in memory: try to load and save
             import os, json
@@ -1025,10 +1054,11 @@ class CommandParser:
         if not name:
             return "Usage: @backupplayer <name>"
         try:
-            # Just call save, which now always creates a backup
+            # Force a rotated backup regardless of the backup interval
+            from src.persistence import get_player_store
             for player in list(self.world.players):
                 if player.name.lower() == name.lower():
-                    player.save()
+                    get_player_store().save_now(player, backup_interval=0)
                     return f"Backup created for {name}."
             # Not in memory: try to load and save
             import os, json
@@ -1039,7 +1069,7 @@ class CommandParser:
             with open(filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             char = Character.from_dict(data)
-            char.save()
+            get_player_store().save_now(char, backup_interval=0)
             return f"Backup created for {name} (from file)."
         except Exception as e:
             import logging
@@ -1133,7 +1163,7 @@ class CommandParser:
         # Basic mob template
         mob = Mob(new_vnum, name, 1, (1, 6, 0), 10, (1, 4, 0))
         self.world.mobs[new_vnum] = mob
-        character.room.mobs.append(mob)
+        get_location_index(self.world).place_mob(mob, character.room)
         self.world.save_mobs()
         return f"Mob '{name}' created in this room (vnum {new_vnum})."
 
@@ -1958,6 +1988,12 @@ class CommandParser:
             "@respawnall": self.cmd_respawnall,
             "@respawnstatus": self.cmd_respawnstatus,
             "@setrespawn": self.cmd_setrespawn,
+            # World heartbeat (admin)
+            "@heartbeat": self.cmd_heartbeat,
+            "@combatstatus": self.cmd_combatstatus,
+            "@roomgraph": self.cmd_roomgraph,
+            "@saves": self.cmd_saves,
+            "@events": self.cmd_events,
             # Time and schedule commands
             "time": self.cmd_time,
             "@settime": self.cmd_settime,
@@ -2381,11 +2417,14 @@ class CommandParser:
             return "Usage: speedwalk <directions> (e.g. speedwalk nnnwws)"
         if not all(c in direction_chars for c in sequence):
             return "Speedwalk only accepts direction letters: n s e w u d"
+        directions = [direction_chars[c] for c in sequence]
+        # Resolve the whole walk on the room graph; each step still goes
+        # through cmd_move for move costs, followers and room hooks.
+        route, _ = get_room_graph(self.world).walk(character.room.vnum, directions)
         results = []
-        for char in sequence:
-            direction = direction_chars[char]
+        for step, direction in enumerate(directions):
             result = self.cmd_move(character, direction)
-            if "no exit" in result.lower() or "closed" in result.lower() or "locked" in result.lower():
+            if step >= len(route) or character.room.vnum != route[step]:
                 results.append(f"Stopped: {result}")
                 break
             results.append(f"You move {direction} to {character.room.name}.")
@@ -2440,6 +2479,8 @@ class CommandParser:
         from src.room import Room
         new_room = Room(new_vnum, name, f"This is {name}.", {{}}, [], [])
         self.world.rooms[new_vnum] = new_room
+        from src.location_effects import get_location_effects
+        get_location_effects().update_room(new_room)
         # Link exits
         character.room.exits[direction] = new_vnum
         # Add reverse exit
@@ -2447,6 +2488,7 @@ class CommandParser:
         rev_dir = reverse.get(direction, None)
         if rev_dir:
             new_room.exits[rev_dir] = character.room.vnum
+        get_room_graph(self.world).invalidate()
         self.world.save_rooms()
         return f"Room '{name}' created to the {direction} (vnum {new_vnum})."
 
@@ -2475,6 +2517,7 @@ class CommandParser:
         if vnum not in self.world.rooms:
             return f"No room with vnum {vnum}."
         character.room.exits[direction] = vnum
+        get_room_graph(self.world).invalidate()
         self.world.save_rooms()
         return f"Exit '{direction}' set to room {vnum}."
 
@@ -2500,6 +2543,13 @@ class CommandParser:
         else:
             return "Usage: @flag <flag> [on|off]"
 
+    def _with_room_narrative(self, character, text):
+        """Append cutscenes for chapters unlocked by arriving in character.room."""
+        from src.narrative import event_cutscenes
+        for cutscene in event_cutscenes(character, "enter_room", character.room):
+            text += f"\n{cutscene}"
+        return text
+
     def cmd_recall(self, character, args):
         """Teleports the player to the city center (Artisan Square)."""
         death_check = self._check_incapacitated(character)
@@ -2513,7 +2563,9 @@ class CommandParser:
         character.room = self.world.rooms[center_vnum]
         character.room.players.append(character)
         look = self.cmd_look(character, "")
-        return f"You are enveloped in shimmering light and find yourself at {character.room.name}.\n{look}"
+        return self._with_room_narrative(
+            character,
+            f"You are enveloped in shimmering light and find yourself at {character.room.name}.\n{look}")
 
     def cmd_chapel(self, character, args):
         """Teleports the player to the Chapel (newbie area)."""
@@ -2528,7 +2580,9 @@ class CommandParser:
         character.room = self.world.rooms[chapel_vnum]
         character.room.players.append(character)
         look = self.cmd_look(character, "")
-        return f"You feel a pull toward the sacred altar and find yourself at {character.room.name}.\n{look}"
+        return self._with_room_narrative(
+            character,
+            f"You feel a pull toward the sacred altar and find yourself at {character.room.name}.\n{look}")
 
     # --- Immortal/Builder command helpers ---
     def _immortal_only(self, character):
@@ -2648,6 +2702,8 @@ class CommandParser:
             return "Level must be between 1 and 20."
         target.set_level(value)
         target.level = value
+        from src.narrative import announce_event
+        announce_event(target, "level_up")
         return f"{target.name}'s Level set to {value}."
 
     # --- Immortal Setter Commands: String Identity ---
@@ -2724,6 +2780,7 @@ class CommandParser:
             if not hasattr(target, 'feats'):
                 target.feats = []
             target.feats.append(feat_name)
+            invalidate_derived(target)
             return f"Feat '{feat_name}' added to {target.name}."
         elif action == "remove":
             if not hasattr(target, 'feats'):
@@ -2732,6 +2789,7 @@ class CommandParser:
             if not match:
                 return f"{target.name} does not have feat '{feat_name}'."
             target.feats.remove(match)
+            invalidate_derived(target)
             return f"Feat '{match}' removed from {target.name}."
         else:
             return "Usage: @setfeat <player> add|remove <feat>"
@@ -3037,6 +3095,7 @@ class CommandParser:
                 exit_data["key_vnum"] = int(value)
             except ValueError:
                 return "key_vnum must be a number."
+        get_room_graph(self.world).invalidate()
         self.world.save_rooms()
         return f"Exit '{direction}' property '{prop}' set to {value}."
 
@@ -3256,6 +3315,8 @@ class CommandParser:
         del self.world.rooms[old_vnum]
         room.vnum = new_vnum
         self.world.rooms[new_vnum] = room
+        from src.location_effects import get_location_effects
+        get_location_effects().update_room(room, old_vnum=old_vnum)
         # Update all exits in other rooms that point to old_vnum
         for r in self.world.rooms.values():
             for direction, exit_data in list(r.exits.items()):
@@ -3265,6 +3326,8 @@ class CommandParser:
                 elif exit_data == old_vnum:
                     r.exits[direction] = new_vnum
         # Update mob room_vnum references
+        get_location_index(self.world).renumber_room(old_vnum, new_vnum)
+        get_room_graph(self.world).invalidate()
         for mob in self.world.mobs.values():
             if getattr(mob, 'room_vnum', None) == old_vnum:
                 mob.room_vnum = new_vnum
@@ -3585,17 +3648,18 @@ class CommandParser:
             if result < 15:
                 return f"You fail to bond with {found.name}. (Handle Animal check: {result} vs DC 15)"
             # Dismiss previous companion first
+            locations = get_location_index(self.world)
             if companion:
-                character.room.mobs.append(companion)
+                locations.place_mob(companion, character.room)
             character.companion = found
             found._companion_following = True
-            character.room.mobs.remove(found)
+            locations.remove_mob(found, character.room)
             return f"You bond with {found.name}. They will now follow you."
 
         elif sub == "dismiss":
             if not companion:
                 return "You have no companion to dismiss."
-            character.room.mobs.append(companion)
+            get_location_index(self.world).place_mob(companion, character.room)
             character.companion = None
             return f"You release {companion.name}. They wander off."
 
@@ -3930,6 +3994,7 @@ class CommandParser:
                 return "You can't carry that much weight!"
         character.room.items.remove(item)
         character.inventory.append(item)
+        mark_room_dirty(character.room)
         result = f"You pick up {item.name}."
 
         # Quest trigger for item collection
@@ -4787,7 +4852,8 @@ class CommandParser:
                     character.room.players.remove(character)
                     character.room = self.world.rooms[new_vnum]
                     character.room.players.append(character)
-                    flee_result = f"You flee {direction}!\nYou escape to {character.room.name}."
+                    flee_result = self._with_room_narrative(
+                        character, f"You flee {direction}!\nYou escape to {character.room.name}.")
                     if flee_messages:
                         return "\n".join(flee_messages) + "\n" + flee_result
                     return flee_result
@@ -4932,6 +4998,8 @@ class CommandParser:
         if exit_data.get("locked"):
             return "The door is locked."
         exit_data["closed"] = False
+        get_room_graph(self.world).note_door_change()
+        mark_room_dirty(character.room)
         return f"You open the door to the {direction}."
 
     def cmd_close(self, character, args):
@@ -4947,6 +5015,8 @@ class CommandParser:
         if exit_data.get("closed"):
             return "The door is already closed."
         exit_data["closed"] = True
+        get_room_graph(self.world).note_door_change()
+        mark_room_dirty(character.room)
         return "You close the door."
 
     def cmd_unlock(self, character, args):
@@ -4966,6 +5036,7 @@ class CommandParser:
         if not key:
             return "You don't have the right key."
         exit_data["locked"] = False
+        mark_room_dirty(character.room)
         return f"You unlock the door with {key.name}."
 
     def cmd_lock(self, character, args):
@@ -4985,6 +5056,7 @@ class CommandParser:
         if not key:
             return "You don't have the right key."
         exit_data["locked"] = True
+        mark_room_dirty(character.room)
         return f"You lock the door with {key.name}."
 
     def cmd_pick(self, character, args):
@@ -5005,12 +5077,14 @@ class CommandParser:
             return result
         if result >= pick_dc:
             exit_data["locked"] = False
+            mark_room_dirty(character.room)
             return "You pick the lock!"
         return "You fail to pick the lock."
 
     def cmd_move(self, character, args):
         # Can't move while in AI chat session
         from src.character import State
+        from src.narrative import announce_event, event_cutscenes
         if character.state == State.CHATTING:
             return "You're lost in conversation. Type 'endchat' to return to the world."
         # Check if dead/incapacitated
@@ -5118,6 +5192,7 @@ class CommandParser:
                         new_room.players.append(player)
                         from src.chat import send_to_player as _stp
                         _stp(player, f"You follow {character.name} {direction}.")
+                        announce_event(player, "enter_room", new_room)
 
                 # If mounted, note faster travel; mount moves with the rider
                 if _mounted and getattr(character, 'mount', None):
@@ -5173,26 +5248,10 @@ class CommandParser:
                 if hasattr(character, 'rooms_visited'):
                     character.rooms_visited.add(new_vnum)
 
-                # Narrative hooks on room entry
-                try:
-                    from src.narrative import get_narrative_manager
-                    nm = get_narrative_manager()
-                    narr_msgs = nm.on_enter_room(character, new_room)
-                    if narr_msgs:
-                        for nmsg in narr_msgs:
-                            text, rewards = nm.trigger_chapter(character, nmsg)
-                            result += f"\n{text}"
-                            if rewards and "xp" in rewards:
-                                character.xp = getattr(character, 'xp', 0) + rewards["xp"]
-                                result += f"\nGained {rewards['xp']} XP!"
-                            if rewards and "title" in rewards:
-                                if not hasattr(character, 'titles'):
-                                    character.titles = []
-                                if rewards["title"] not in character.titles:
-                                    character.titles.append(rewards["title"])
-                                result += f"\nEarned title: {rewards['title']}"
-                except Exception:
-                    pass
+                # Narrative hooks on room entry; cutscene text already
+                # carries the rewards it applied
+                for text in event_cutscenes(character, "enter_room", new_room):
+                    result += f"\n{text}"
 
                 # Check achievements on room entry
                 try:
@@ -5481,7 +5540,7 @@ class CommandParser:
 
         character.mount = found
         character.mounted = True
-        character.room.mobs.remove(found)
+        get_location_index(self.world).remove_mob(found, character.room)
         return f"You mount {found.name}."
 
     def cmd_dismount(self, character, args):
@@ -5496,7 +5555,7 @@ class CommandParser:
             return "You are not mounted."
 
         mount = character.mount
-        character.room.mobs.append(mount)
+        get_location_index(self.world).place_mob(mount, character.room)
         character.mount = None
         character.mounted = False
         return "You dismount."
@@ -5807,25 +5866,8 @@ class CommandParser:
                     results.append(f"  {i}. {fname}")
 
         # Narrative level-up hook
-        try:
-            from src.narrative import get_narrative_manager
-            nm = get_narrative_manager()
-            narr_triggered = nm.on_level_up(character)
-            if narr_triggered:
-                for chapter in narr_triggered:
-                    text, rewards = nm.trigger_chapter(character, chapter)
-                    results.append(text)
-                    if rewards and "xp" in rewards:
-                        character.xp += rewards["xp"]
-                        results.append(f"Gained {rewards['xp']} XP!")
-                    if rewards and "title" in rewards:
-                        if not hasattr(character, 'titles'):
-                            character.titles = []
-                        if rewards["title"] not in character.titles:
-                            character.titles.append(rewards["title"])
-                        results.append(f"Earned title: {rewards['title']}")
-        except Exception:
-            pass
+        from src.narrative import event_cutscenes
+        results.extend(event_cutscenes(character, "level_up"))
 
         # Achievement check after level-up
         try:
@@ -5913,6 +5955,7 @@ class CommandParser:
         if not hasattr(character, 'feats'):
             character.feats = []
         character.feats.append(selected)
+        invalidate_derived(character)
         character._pending_feat_selection = None
 
         try:
@@ -8363,13 +8406,17 @@ class CommandParser:
         return character.quest_log
 
     def _get_quest_manager(self):
-        """Get or create the world's QuestManager."""
-        from src.quests import QuestManager
-        if not hasattr(self.world, 'quest_manager') or self.world.quest_manager is None:
-            self.world.quest_manager = QuestManager()
-            self.world.quest_manager.load_quests()
+        """Get the world's QuestManager (shared with the quest event hooks)."""
+        from src.quests import get_quest_manager
+        if getattr(self.world, 'quest_manager', None) is None:
+            self.world.quest_manager = get_quest_manager()
         return self.world.quest_manager
 
+    def _quest_narrative(self, character, quest_id):
+        """Cutscenes for story chapters unlocked by turning in a quest."""
+        from src.narrative import event_cutscenes
+        return event_cutscenes(character, "quest_complete", quest_id)
+
     def cmd_questlog(self, character, args):
         """
         Display your quest log.
@@ -8563,6 +8610,7 @@ class CommandParser:
                 # Apply rewards
                 reward_msgs = apply_quest_rewards(character, quest, quest_log)
                 lines.extend(reward_msgs)
+                lines.extend(self._quest_narrative(character, quest_id))
 
                 # Check for chain quest
                 if quest.chain_quest:
@@ -8656,6 +8704,7 @@ class CommandParser:
             if success:
                 reward_msgs = apply_quest_rewards(character, quest, quest_log)
                 lines.extend(reward_msgs)
+                lines.extend(self._quest_narrative(character, quest.id))
 
         # Check for available quests
         available = quest_manager.get_available_quests(character, quest_log, npc_name=npc.name)
@@ -8732,6 +8781,7 @@ class CommandParser:
             backend <name>  - Set backend: ollama, lmstudio
             ollama <host>   - Set Ollama host URL
             lmstudio <host> - Set LM Studio host URL
+            cache <on|off|clear> - Toggle or flush the dialogue cache
 
         Examples:
             @ai enable
@@ -8759,6 +8809,17 @@ class CommandParser:
         elif setting == "disable":
             ai.enable_llm(False)
             return "AI LLM responses disabled. NPCs will use templates only."
+        elif setting == "cache":
+            from src.dialogue_cache import get_dialogue_cache
+            cache = get_dialogue_cache()
+            value = value.lower()
+            if value == "clear":
+                cache.clear()
+                return "Dialogue cache cleared."
+            if value in ("on", "off"):
+                cache.enabled = value == "on"
+                return f"Dialogue cache {'enabled' if cache.enabled else 'disabled'}."
+            return cache.get_status()
         elif setting == "backend":
             if value.lower() in ("ollama", "lmstudio"):
                 ai.set_llm_backend(value)
@@ -8781,11 +8842,13 @@ class CommandParser:
         """
         Set the AI model to use.
         Usage: @aimodel <backend> <model_name>
+               @aimodel <standard|premium> <backend> <model_name>
 
         Examples:
             @aimodel ollama llama3.2
             @aimodel ollama mistral
             @aimodel lmstudio local-model
+            @aimodel premium ollama llama3:70b
         """
         if not getattr(character, 'is_immortal', False):
             return "Permission denied: You are not an admin."
@@ -8794,7 +8857,18 @@ class CommandParser:
 
         if not args:
             status = ai.get_llm_status()
-            return f"Current models:\n  Ollama: {status['ollama_model']}\n  LM Studio: {status['lmstudio_model']}"
+            lines = [f"Current models:\n  Ollama: {status['ollama_model']}\n"
+                     f"  LM Studio: {status['lmstudio_model']}", "Tiers:"]
+            for tier, route in status['routes'].items():
+                lines.append(f"  {tier}: {route['backend']} {route['model']}")
+            return "\n".join(lines)
+
+        parts = args.split(None, 2)
+        if parts[0].lower() in ("standard", "premium"):
+            if len(parts) < 3 or parts[1].lower() not in ("ollama", "lmstudio"):
+                return "Usage: @aimodel <standard|premium> <ollama|lmstudio> <model_name>"
+            ai.set_tier_model(parts[0].lower(), parts[1], parts[2])
+            return f"{parts[0].capitalize()} tier now uses {parts[1].lower()} model: {parts[2]}"
 
         parts = args.split(None, 1)
         if len(parts) < 2:
@@ -8821,6 +8895,7 @@ class CommandParser:
             return "Permission denied: You are not an admin."
 
         from src import ai
+        from src.dialogue_cache import get_dialogue_cache
 
         status = ai.get_llm_status()
 
@@ -8853,6 +8928,34 @@ class CommandParser:
             "",
             f"Timeout: {status['timeout']} seconds",
             "",
+            "HTTP Client:",
+            f"  Concurrency: {status['client']['active']}/{status['max_concurrency']} active, "
+            f"{status['client']['waiting']}/{status['max_queue']} queued",
+            f"  Requests: {status['client']['requests']}  Errors: {status['client']['errors']}  "
+            f"Timeouts: {status['client']['timeouts']}  Rejected: {status['client']['rejected']}",
+            f"  Connections: {status['client']['connections_opened']} opened, "
+            f"{status['client']['connections_reused']} reused, "
+            f"{status['client']['idle_connections']} idle",
+            f"  Avg latency: {status['client']['avg_latency_ms']} ms  "
+            f"Avg queue wait: {status['client']['avg_queue_wait_ms']} ms",
+            "",
+            "Model Tiers:",
+        ])
+        for tier, route in status['routes'].items():
+            lane = status['client']['lanes'].get(route['lane'], {})
+            lines.extend([
+                f"  {tier}: {route['backend']} {route['model']}",
+                f"    Workers: {lane.get('active', 0)}/{lane.get('max_concurrency', 0)} active, "
+                f"{lane.get('waiting', 0)}/{lane.get('max_queue', 0)} queued, "
+                f"{lane.get('rejected', 0)} rejected",
+                f"    Queue wait: avg {lane.get('avg_queue_wait_ms', 0)} ms, "
+                f"max {lane.get('max_queue_wait_ms', 0)} ms "
+                f"over {lane.get('requests', 0)} requests",
+            ])
+        lines.extend([
+            "",
+            get_dialogue_cache().get_status(),
+            "",
             "Commands:",
             "  talk <npc> <message> - Talk to an NPC",
             "  @ai <setting> <value> - Configure AI",
@@ -8934,6 +9037,116 @@ class CommandParser:
             # Show general status
             return spawn_manager.get_status()
 
+    def cmd_heartbeat(self, character, args):
+        """
+        Show world heartbeat pulses with run time and overrun counters.
+        Usage: @heartbeat [enable|disable <pulse>]
+        """
+        if not getattr(character, 'is_immortal', False):
+            return "Permission denied: You are not an admin."
+
+        from src.heartbeat import get_heartbeat
+        hb = get_heartbeat()
+
+        parts = args.split() if args else []
+        if len(parts) == 2 and parts[0].lower() in ("enable", "disable"):
+            pulse = hb.pulses.get(parts[1])
+            if pulse is None:
+                return f"No heartbeat pulse named '{parts[1]}'."
+            pulse.enabled = parts[0].lower() == "enable"
+            return f"Pulse '{pulse.name}' {'enabled' if pulse.enabled else 'disabled'}."
+        if parts:
+            return "Usage: @heartbeat [enable|disable <pulse>]"
+        return hb.get_status()
+
+    def cmd_combatstatus(self, character, args):
+        """
+        Show combat scheduler activity and per-pulse batch cost.
+        Usage: @combatstatus
+        """
+        if not getattr(character, 'is_immortal', False):
+            return "Permission denied: You are not an admin."
+
+        from src.combat import get_combat_scheduler
+        return get_combat_scheduler().get_status()
+
+    def cmd_roomgraph(self, character, args):
+        """
+        Show room graph pathfinding stats, or rebuild/precompute it.
+        Usage: @roomgraph [rebuild | precompute [area_file]]
+        """
+        if not getattr(character, 'is_immortal', False):
+            return "Permission denied: You are not an admin."
+
+        graph = get_room_graph(self.world)
+        parts = args.split(None, 1) if args else []
+        sub = parts[0].lower() if parts else ""
+        if sub == "rebuild":
+            graph.invalidate()
+            return graph.get_status()
+        if sub == "precompute":
+            if len(parts) > 1:
+                if graph.precompute_area(parts[1].strip()):
+                    return f"Next-hop table built for {parts[1].strip()}."
+                return "No table built: unknown area or too many rooms."
+            count = graph.precompute_areas()
+            return f"Next-hop tables built for {count} area(s)."
+        if sub:
+            return "Usage: @roomgraph [rebuild | precompute [area_file]]"
+        return graph.get_status()
+
+    async def cmd_saves(self, character, args):
+        """
+        Show the write-behind player save queue, or flush it now.
+        Usage: @saves [flush]
+        """
+        if not getattr(character, 'is_immortal', False):
+            return "Permission denied: You are not an admin."
+
+        from src.persistence import get_player_store
+        store = get_player_store()
+        if args and args.strip().lower() == "flush":
+            pending = store.queue_depth
+            await store.flush()
+            return f"Flushed {pending} pending save(s).\n" + store.get_status()
+        if args:
+            return "Usage: @saves [flush]"
+        return store.get_status()
+
+    def cmd_events(self, character, args):
+        """
+        Show the event store, or the most recent logged events.
+        Usage: @events                       - store status
+               @events recent [count] [player=<name>] [type=<type>] [region=<region>]
+        """
+        if not getattr(character, 'is_immortal', False):
+            return "Permission denied: You are not an admin."
+
+        from src.event_log import get_event_store, get_recent_events
+        parts = (args or "").split()
+        if not parts:
+            return get_event_store().get_status()
+        if parts[0].lower() != "recent":
+            return "Usage: @events [recent [count] [player=<name>] [type=<type>] [region=<region>]]"
+
+        count = 20
+        filters = {}
+        for part in parts[1:]:
+            if part.isdigit():
+                count = int(part)
+            elif "=" in part:
+                key, _, value = part.partition("=")
+                if key in ("player", "type", "region"):
+                    filters["event_type" if key == "type" else key] = value
+        events = get_recent_events(count=count, **filters)
+        if not events:
+            return "No matching events."
+        lines = [f"Last {len(events)} event(s):"]
+        for e in events:
+            lines.append(f"  {e.get('timestamp', '')[:19]}  {e.get('player')}  "
+                         f"{e.get('type')}  {e.get('data')}")
+        return "\n".join(lines)
+
     def cmd_setrespawn(self, character, args):
         """
         Set the respawn time for a specific mob.
@@ -9170,9 +9383,11 @@ class CommandParser:
         # Broadcast arrival
         broadcast_to_room(character.room, f"{character.name} materializes at the chapel in a flash of light.", exclude=character)
 
-        return (f"You awaken at the Chapel of the Aetherial Altar.\n"
-                f"HP restored to {character.hp}/{character.max_hp}.\n"
-                f"XP penalty: -{xp_penalty} XP.")
+        return self._with_room_narrative(
+            character,
+            f"You awaken at the Chapel of the Aetherial Altar.\n"
+            f"HP restored to {character.hp}/{character.max_hp}.\n"
+            f"XP penalty: -{xp_penalty} XP.")
 
     # =========================================================================
     # Loot Command
@@ -11080,7 +11295,7 @@ class CommandParser:
             return "You don't own a home."
 
         character.room = owned_room
-        return f"You return home to {owned_room.name}."
+        return self._with_room_narrative(character, f"You return home to {owned_room.name}.")
 
 
     # =========================================================================
@@ -13777,6 +13992,7 @@ def cmd_house(self, character, args):
             room = self.world.rooms.get(vnum)
             if room:
                 character.room = room
+                msg = self._with_room_narrative(character, msg)
         return msg
 
     else:
@@ -13898,21 +14114,7 @@ def cmd_story(self, character, args):
             return f"{chapter['title']} - {chapter['description']}\n(Not yet unlocked)"
 
     # Check for new triggers
-    triggered = nm.check_triggers(character)
-    output = []
-    for chapter in triggered:
-        text, rewards = nm.trigger_chapter(character, chapter)
-        output.append(text)
-        if rewards:
-            if "xp" in rewards:
-                character.xp = getattr(character, 'xp', 0) + rewards["xp"]
-                output.append(f"  Gained {rewards['xp']} XP!")
-            if "title" in rewards:
-                if not hasattr(character, 'titles'):
-                    character.titles = []
-                if rewards["title"] not in character.titles:
-                    character.titles.append(rewards["title"])
-                output.append(f"  Earned title: {rewards['title']}")
+    output = [text for _chapter, text in nm.catch_up(character)]
 
     if output:
         output.append("")
@@ -14116,9 +14318,7 @@ def cmd_admin_resets(self, character, args):
         area = parts[1] if len(parts) > 1 else ""
         if not area:
             return "Usage: @resets force <area_name>"
-        import asyncio
-        asyncio.create_task(rm.force_reset(self.world, area))
-        return f"Forcing reset of area '{area}'."
+        return rm.force_reset(self.world, area)
 
     elif subcmd == "interval":
         if len(parts) < 3:
@@ -14354,7 +14554,7 @@ async def _rpsay_npc_responses(character, message, npc_list, room):
     """
     import asyncio
     import random
-    from src.ai import build_unified_npc_prompt, _call_ollama, _call_lmstudio, _config
+    from src.ai import build_unified_npc_prompt, call_llm, npc_model_tier, _config
     from src.rp_context import get_rp_context, save_rpsay_memory
 
     rp_ctx = get_rp_context()
@@ -14377,6 +14577,8 @@ async def _rpsay_npc_responses(character, message, npc_list, room):
             npc_last = rp_ctx.get_npc_last_line(room.vnum, npc.name)
 
             # Build the system prompt with the unified builder
+            from src.npc_memory import get_npc_memory_store
+            await get_npc_memory_store().prefetch(getattr(npc, 'vnum', 0), character.name)
             system_prompt = build_unified_npc_prompt(
                 npc=npc,
                 character=character,
@@ -14399,10 +14601,8 @@ async def _rpsay_npc_responses(character, message, npc_list, room):
 
             # Call the LLM directly
             if _config.get("enabled"):
-                if _config["backend"] == "ollama":
-                    response = await _call_ollama(user_prompt, system_prompt)
-                else:
-                    response = await _call_lmstudio(user_prompt, system_prompt)
+                response = await call_llm(user_prompt, system_prompt, kind="rpsay",
+                                          tier=npc_model_tier(npc))
             else:
                 continue  # no LLM -> no response (template fallback isn't useful for overhear)
 
@@ -15318,7 +15518,7 @@ def cmd_purgechar(self, character, args):
 
     Moves the player save, every backup, and every AI chat session into
     data/deleted/<name>_<timestamp>/ as a safety net, strips that character's
-    lines from data/events/player_events.jsonl, force-removes them from the
+    lines from the event log segments in data/events/, force-removes them from the
     live world, and deletes veil:user:<name> from Redis if reachable.
     """
     if not getattr(character, 'is_immortal', False):
@@ -15337,13 +15537,16 @@ def cmd_purgechar(self, character, args):
     data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
     players_dir = os.path.join(data_dir, 'players')
     sessions_dir = os.path.join(data_dir, 'chat_sessions')
-    events_path = os.path.join(data_dir, 'events', 'player_events.jsonl')
 
     ts = time.strftime("%Y%m%d_%H%M%S")
     trash = os.path.join(data_dir, 'deleted', f"{lname}_{ts}")
     os.makedirs(os.path.join(trash, 'players'), exist_ok=True)
     os.makedirs(os.path.join(trash, 'chat_sessions'), exist_ok=True)
 
+    # A queued write-behind save would otherwise re-create the player file
+    from src.persistence import get_player_store
+    get_player_store().discard(name)
+
     moved_saves = 0
     if os.path.isdir(players_dir):
         for fn in os.listdir(players_dir):
@@ -15359,24 +15562,12 @@ def cmd_purgechar(self, character, args):
             if fn.startswith(prefix):
                 shutil.move(os.path.join(sessions_dir, fn), os.path.join(trash, 'chat_sessions', fn))
                 moved_sessions += 1
+    from src.chat_archive import get_chat_archive
+    moved_sessions += get_chat_archive().purge_player(
+        name, trash_dir=os.path.join(trash, 'chat_sessions'))
 
-    stripped_events = 0
-    if os.path.exists(events_path):
-        shutil.copy2(events_path, os.path.join(trash, 'player_events.pre_purge.jsonl'))
-        kept = []
-        with open(events_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    evt = json.loads(line)
-                    actor = (evt.get('character') or evt.get('player') or evt.get('actor') or '').lower()
-                    if actor == lname:
-                        stripped_events += 1
-                        continue
-                except Exception:
-                    pass
-                kept.append(line)
-        with open(events_path, 'w', encoding='utf-8') as f:
-            f.writelines(kept)
+    from src.event_log import get_event_store
+    stripped_events = get_event_store().purge_player(name, trash_dir=os.path.join(trash, 'events'))
 
     kicked = False
     for p in list(getattr(self.world, 'players', []) or []):
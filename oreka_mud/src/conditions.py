@@ -452,6 +452,41 @@ def get_effect_value(condition_name: str, effect_key: str, default=None):
     return default
 
 
+# Combined effects per distinct set of condition names. CONDITIONS is
+# static, so a profile never goes stale; the number of distinct sets in
+# play is small.
+_PROFILES: Dict[frozenset, tuple] = {}
+_EMPTY_PROFILE = ({}, frozenset())
+
+
+def condition_profile(entity) -> tuple:
+    """Return (numeric modifier totals, truthy effect keys) for an entity."""
+    conditions = getattr(entity, 'conditions', None)
+    active = getattr(entity, 'active_conditions', None)
+    if not conditions and not active:
+        return _EMPTY_PROFILE
+
+    names = frozenset(conditions or ()).union(active or ())
+    profile = _PROFILES.get(names)
+    if profile is None:
+        totals: Dict[str, Any] = {}
+        flags = set()
+        for cond_name in names:
+            condition = get_condition(cond_name)
+            if not condition:
+                continue
+            for key, value in condition.effects.items():
+                if isinstance(value, (int, float)):
+                    totals[key] = totals.get(key, 0) + value
+                if value:
+                    flags.add(key)
+        profile = (totals, frozenset(flags))
+        if len(_PROFILES) > 4096:
+            _PROFILES.clear()
+        _PROFILES[names] = profile
+    return profile
+
+
 def calculate_condition_modifiers(entity, modifier_type: str) -> int:
     """
     Calculate total modifier from all conditions for a given type.
@@ -463,35 +498,12 @@ def calculate_condition_modifiers(entity, modifier_type: str) -> int:
     - 'damage_penalty'
     - etc.
     """
-    total = 0
-    conditions = getattr(entity, 'conditions', set())
-    active = getattr(entity, 'active_conditions', {})
-
-    all_conditions = conditions | set(active.keys())
-
-    for cond_name in all_conditions:
-        condition = get_condition(cond_name)
-        if condition and modifier_type in condition.effects:
-            value = condition.effects[modifier_type]
-            if isinstance(value, (int, float)):
-                total += value
-
-    return total
+    return condition_profile(entity)[0].get(modifier_type, 0)
 
 
 def has_effect(entity, effect_key: str) -> bool:
     """Check if entity has any condition with specified effect."""
-    conditions = getattr(entity, 'conditions', set())
-    active = getattr(entity, 'active_conditions', {})
-
-    all_conditions = conditions | set(active.keys())
-
-    for cond_name in all_conditions:
-        condition = get_condition(cond_name)
-        if condition and effect_key in condition.effects:
-            if condition.effects[effect_key]:
-                return True
-    return False
+    return effect_key in condition_profile(entity)[1]
 
 
 def can_act(entity) -> bool:
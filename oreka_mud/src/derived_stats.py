@@ -0,0 +1,108 @@
+"""
+Derived combat stats for characters and mobs.
+
+calculate_attack_bonus, calculate_ac and roll_saving_throw used to look
+up the class table for BAB and save progression and scan the race table
+for size on every swing. Those numbers only change with level, class or
+race, so each entity keeps a small DerivedStats record:
+
+- get_derived(entity) returns the record, rebuilt when its stamp
+  (level, class, race, size) no longer matches the entity.
+- invalidate_derived(entity) drops the record and the entity's parsed
+  feat table; level-ups, class changes, equipment and feat grants call it.
+
+Feat bonuses are memoised on the feat table (feats.get_feat_table) and
+condition modifiers per condition set (conditions.condition_profile), so
+a full-attack round is mostly dictionary reads.
+
+Usage:
+    stats = get_derived(attacker)
+    bab = stats.bab
+"""
+
+import logging
+
+logger = logging.getLogger("OrekaMUD.DerivedStats")
+
+SIZE_MODIFIERS = {
+    "Fine": 8,
+    "Diminutive": 4,
+    "Tiny": 2,
+    "Small": 1,
+    "Medium": 0,
+    "Large": -1,
+    "Huge": -2,
+    "Gargantuan": -4,
+    "Colossal": -8,
+}
+
+
+def _stamp(entity) -> tuple:
+    return (getattr(entity, 'level', None), getattr(entity, 'char_class', None),
+            getattr(entity, 'race', None), getattr(entity, 'size', None))
+
+
+class DerivedStats:
+    """Class/race-derived numbers for one entity."""
+    __slots__ = ('stamp', 'bab', 'size_mod', 'base_saves')
+
+    def __init__(self, entity, stamp: tuple):
+        self.stamp = stamp
+        level = getattr(entity, 'level', 1)
+
+        if hasattr(entity, 'char_class'):
+            from src.classes import CLASSES
+            class_data = CLASSES.get(entity.char_class, {})
+            bab_type = class_data.get('bab_progression', '3/4')
+            if bab_type == 'full':
+                self.bab = level
+            elif bab_type == '1/2':
+                self.bab = level // 2
+            else:  # '3/4' or any other value
+                self.bab = (level * 3) // 4
+            save_prog = class_data.get('save_progression', {})
+            self.base_saves = {}
+            for save, key in (("Fort", 'fort'), ("Ref", 'ref'), ("Will", 'will')):
+                if save_prog.get(key, 'poor') == 'good':
+                    self.base_saves[save] = 2 + level // 2
+                else:
+                    self.base_saves[save] = level // 3
+
+            # Character: look up size from race data
+            from src.races import get_race
+            race_data = get_race(getattr(entity, 'race', '')) or {}
+            size = race_data.get('size', 'Medium')
+        else:
+            self.bab = (level * 3) // 4  # Default for monsters
+            self.base_saves = None
+            # Mob: use size attribute directly
+            size = getattr(entity, 'size', 'Medium')
+
+        # Normalise capitalisation
+        if size:
+            size = size[0].upper() + size[1:].lower() if len(size) > 1 else size.upper()
+        else:
+            size = 'Medium'
+        self.size_mod = SIZE_MODIFIERS.get(size, 0)
+
+
+def get_derived(entity) -> DerivedStats:
+    """The entity's derived stats, rebuilt if level, class, race or size changed."""
+    stamp = _stamp(entity)
+    stats = getattr(entity, '_derived', None)
+    if stats is None or stats.stamp != stamp:
+        stats = DerivedStats(entity, stamp)
+        try:
+            entity._derived = stats
+        except AttributeError:
+            pass
+    return stats
+
+
+def invalidate_derived(entity):
+    """Drop cached derived stats and the parsed feat table for an entity."""
+    for attr in ('_derived', '_feat_table'):
+        try:
+            delattr(entity, attr)
+        except AttributeError:
+            pass
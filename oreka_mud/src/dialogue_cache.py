@@ -0,0 +1,179 @@
+"""
+NPC dialogue response cache with request coalescing.
+
+Many players asking the same shopkeeper the same thing in the same room
+state used to cost a full LLM round trip each. This module caches
+generated talk replies keyed on normalized prompt inputs:
+
+    NPC vnum, model tier, persona hash, trust tier,
+    room/time/weather bucket, normalized message
+
+A cached reply is generated from a speaker-agnostic prompt (see
+ai._get_llm_response), so any player who lands on the same key can be
+handed it. Talk that depends on the speaker (NPC memory of them, arc
+reactions) bypasses the cache.
+
+Entries expire after a TTL and the cache is LRU-bounded. Identical
+requests that arrive while one is already being generated wait on the
+same future instead of issuing their own backend call (single-flight).
+
+Usage:
+    cache = get_dialogue_cache()
+    key = dialogue_key(npc_vnum, tier, persona_hash, trust, scene, message)
+    reply = await cache.get_or_create(key, lambda: call_backend(...))
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("OrekaMUD.DialogueCache")
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL = 600  # seconds
+
+
+def normalize_message(message: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace."""
+    text = (message or "").replace("'", "").replace("\u2019", "")
+    text = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in text)
+    return " ".join(text.casefold().split())
+
+
+def persona_hash(persona) -> str:
+    """Stable digest of an NPC persona (empty for legacy NPCs)."""
+    if not persona:
+        return ""
+    data = persona.to_dict() if hasattr(persona, 'to_dict') else persona
+    blob = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def dialogue_key(npc_vnum: int, tier: str, persona_digest: str, trust: str,
+                 scene: Tuple, message: str) -> Tuple:
+    """Cache key over the normalized inputs that shape a shared reply."""
+    return (npc_vnum, tier or "", persona_digest, trust or "", tuple(scene),
+            normalize_message(message))
+
+
+class DialogueCache:
+    """TTL + LRU cache of generated NPC replies with single-flight misses."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.enabled = True
+        self._entries: "OrderedDict[Any, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[Any, asyncio.Future] = {}
+
+        # Instrumentation
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key) -> Optional[str]:
+        """Cached reply for key, or None (expired entries are dropped)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if self.clock() >= expires:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value: str):
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_create(self, key, factory: Callable[[], Awaitable[str]],
+                            store_if: Callable[[str], bool] = None) -> str:
+        """Return the cached reply or generate it once for all concurrent askers.
+
+        Args:
+            key: Key from dialogue_key()
+            factory: Zero-arg coroutine function producing the reply
+            store_if: Optional predicate; replies failing it are returned
+                to their own caller only. They are not cached, and callers
+                coalesced onto that request run their own factory instead.
+
+        Exceptions from the factory propagate to every waiter and nothing
+        is cached.
+        """
+        if not self.enabled:
+            return await factory()
+
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            value, shared = await asyncio.shield(pending)
+            if shared:
+                self.coalesced += 1
+                return value
+            # The reply was not shareable: generate our own
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                e = RuntimeError("dialogue generation cancelled")
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody waited on isn't logged
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        shared = bool(value) and (store_if is None or store_if(value))
+        if shared:
+            self.put(key, value)
+        future.set_result((value, shared))
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_status(self) -> str:
+        """Summary for the @aistatus admin command."""
+        lookups = self.hits + self.misses + self.coalesced
+        rate = (self.hits + self.coalesced) / lookups * 100 if lookups else 0.0
+        return "\n".join([
+            "Dialogue Cache:",
+            f"  Enabled: {self.enabled}  Entries: {len(self._entries)}/{self.max_entries}  "
+            f"TTL: {self.ttl}s",
+            f"  Hits: {self.hits}  Misses: {self.misses}  Coalesced: {self.coalesced}  "
+            f"Hit rate: {rate:.1f}%",
+            f"  In flight: {len(self._inflight)}  Stores: {self.stores}  "
+            f"Expired: {self.expirations}  Evicted: {self.evictions}",
+        ])
+
+
+# Global cache instance
+dialogue_cache = DialogueCache()
+
+
+def get_dialogue_cache() -> DialogueCache:
+    """Get the global NPC dialogue cache."""
+    return dialogue_cache
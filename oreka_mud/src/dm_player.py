@@ -298,7 +298,7 @@ async def speak(character, message: str) -> str:
     this function auto-resolves the check and re-prompts the DM once with
     the outcome, returning the combined narration.
     """
-    from src.ai import _call_ollama, _config
+    from src.ai import call_llm, _config
     from src import scene_state as _scene
 
     session = load_or_create(character.name)
@@ -316,9 +316,10 @@ async def speak(character, message: str) -> str:
     if not _config.get("enabled"):
         return "(The Voice is silent — LLM backend is disabled.)"
 
-    response = await _call_ollama(
+    response = await call_llm(
         prompt=user_prompt,
         system_prompt=DM_SYSTEM_PROMPT,
+        kind="dm",
         generation_params={"temperature": 0.85, "max_tokens": MAX_RESPONSE_TOKENS},
     )
     response = (response or "").strip().strip('"').strip("'")
@@ -351,9 +352,10 @@ async def speak(character, message: str) -> str:
                 f"{outcome['total']} — {outcome['degree']} ({'pass' if outcome['success'] else 'fail'})\n\n"
                 f"Now narrate the result of the check. 1-3 sentences. Do not emit another check marker."
             )
-            followup = await _call_ollama(
+            followup = await call_llm(
                 prompt=outcome_ctx,
                 system_prompt=DM_SYSTEM_PROMPT,
+                kind="dm",
                 generation_params={"temperature": 0.8, "max_tokens": 200},
             )
             followup = (followup or "").strip().strip('"').strip("'")
@@ -18,6 +18,7 @@ in ``data/encounter_tables/``.  This module loads them at startup.
 
 from __future__ import annotations
 
+import itertools
 import json
 import logging
 import os
@@ -26,6 +27,9 @@ import time
 from collections import deque
 from typing import Dict, List, Optional, Set, Tuple, Any
 
+from src.room_graph import get_room_graph
+from src.world import get_location_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -154,26 +158,8 @@ def bfs_path(world, start_vnum: int, goal_vnum: int,
     """Return list of room vnums from start to goal (inclusive), or None."""
     if start_vnum == goal_vnum:
         return [start_vnum]
-    visited: Set[int] = {start_vnum}
-    queue: deque = deque([(start_vnum, [start_vnum])])
-    while queue:
-        cur, path = queue.popleft()
-        if len(path) > max_depth:
-            continue
-        room = world.rooms.get(cur)
-        if room is None:
-            continue
-        for direction, next_vnum in (room.exits or {}).items():
-            if not isinstance(next_vnum, int):
-                continue
-            if next_vnum in visited:
-                continue
-            new_path = path + [next_vnum]
-            if next_vnum == goal_vnum:
-                return new_path
-            visited.add(next_vnum)
-            queue.append((next_vnum, new_path))
-    return None
+    return get_room_graph(world).find_path(start_vnum, goal_vnum,
+                                           max_depth=max_depth, respect_doors=True)
 
 
 def find_spawn_room(world, target_vnum: int, region_vnums: Set[int],
@@ -264,10 +250,13 @@ def _instantiate_mob(template: dict, room_vnum: int):
 class Stalker:
     """A spawned encounter mob actively hunting a target player or party."""
 
-    __slots__ = ("mob", "region", "target", "party", "spawned_at",
+    __slots__ = ("id", "mob", "region", "target", "party", "spawned_at",
                  "last_target_vnum", "warnings_sent", "engaged", "given_up")
 
+    _ids = itertools.count(1)
+
     def __init__(self, mob, region: str, target, party: List):
+        self.id = next(Stalker._ids)  # never reused, unlike id(self)
         self.mob = mob
         self.region = region
         self.target = target          # primary target Character
@@ -447,7 +436,7 @@ class EncounterManager:
 
         mob = _instantiate_mob(creature, spawn_vnum)
         world.mobs[mob.vnum] = mob
-        spawn_room.mobs.append(mob)
+        get_location_index(world).place_mob(mob, spawn_vnum)
 
         stalker = Stalker(mob, region, target, group)
         self.active.append(stalker)
@@ -570,11 +559,7 @@ class EncounterManager:
             return None
 
         # Move the mob
-        old_room = world.rooms.get(s.mob.room_vnum)
-        if old_room and s.mob in old_room.mobs:
-            old_room.mobs.remove(s.mob)
-        next_room.mobs.append(s.mob)
-        s.mob.room_vnum = next_vnum
+        get_location_index(world).move_mob(s.mob, next_vnum)
 
         # Arrived in target's room this tick -> engage now, no half-round gap.
         if next_vnum == target_vnum:
@@ -621,9 +606,7 @@ class EncounterManager:
             send_to_player(p, message)
 
     def _despawn(self, world, s: Stalker, gave_up: bool) -> None:
-        room = world.rooms.get(s.mob.room_vnum)
-        if room and s.mob in room.mobs:
-            room.mobs.remove(s.mob)
+        get_location_index(world).remove_mob(s.mob)
         world.mobs.pop(s.mob.vnum, None)
         if gave_up:
             self._notify_party(s.party,
@@ -2,22 +2,368 @@
 Player Event Logging for OrekaMUD3.
 Logs significant player actions for the DM Agent to read.
 Written as JSONL (one JSON object per line) for easy streaming.
+
+Storage is segmented by UTC day (data/events/events-YYYYMMDD.jsonl):
+
+- log_event() appends to an in-memory buffer; the ``event_log`` heartbeat
+  pulse flushes it to the day's segment on a worker thread (see
+  segment_store). Outside a running server events are written immediately.
+- Each segment has a small sidecar index (events-YYYYMMDD.idx.json) with
+  its time range and per-player / per-type / per-region counts, so
+  queries only open segments that can contain matches, newest first,
+  and stop once they have enough.
+- Retention drops whole segments instead of rewriting a file.
+
+The pre-segmentation file player_events.jsonl is read as a legacy
+segment and is never rewritten by the appender.
 """
 import json
 import os
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+from typing import Dict, List
+
+from src.segment_store import SegmentStore, replace_file
 
 logger = logging.getLogger("OrekaMUD.EventLog")
 
 EVENT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "events")
 EVENT_LOG_FILE = os.path.join(EVENT_LOG_DIR, "player_events.jsonl")
 
+# Seconds between buffered flushes (heartbeat period)
+FLUSH_PERIOD = 5
+
+# Flush early once this many events are buffered
+MAX_BUFFERED = 500
+
+LEGACY_SEGMENT = "legacy"
+
 # Ensure directory exists
 os.makedirs(EVENT_LOG_DIR, exist_ok=True)
 
 
+def _new_index() -> dict:
+    return {"count": 0, "size": 0, "first_ts": None, "last_ts": None,
+            "players": {}, "types": {}, "regions": {}}
+
+
+def _index_add(index: dict, entry: dict):
+    index["count"] += 1
+    ts = entry.get("timestamp")
+    if ts:
+        if index["first_ts"] is None or ts < index["first_ts"]:
+            index["first_ts"] = ts
+        if index["last_ts"] is None or ts > index["last_ts"]:
+            index["last_ts"] = ts
+    for field, key in (("players", "player"), ("types", "type"), ("regions", "region")):
+        value = entry.get(key)
+        if value is not None:
+            bucket = index[field]
+            bucket[str(value)] = bucket.get(str(value), 0) + 1
+
+
+def _copy_index(index: dict) -> dict:
+    copy = dict(index)
+    for field in ("players", "types", "regions"):
+        copy[field] = dict(index[field])
+    return copy
+
+
+class EventStore(SegmentStore):
+    """Day-segmented JSONL event store with per-segment sidecar indexes.
+
+    _lock serializes writers (flush, retention, purge). Readers on the
+    event loop never take it: writers swap in a fresh _indexes dict, so
+    query() and get_status() work from a snapshot instead.
+    """
+
+    def __init__(self, directory: str = EVENT_LOG_DIR, legacy_file: str = None):
+        super().__init__(directory)
+        self.legacy_file = legacy_file
+
+        # Instrumentation
+        self.appended = 0
+        self.segments_scanned = 0
+        self.segments_skipped = 0
+        self.last_query_time = 0.0
+
+    # -- segment bookkeeping ------------------------------------------------
+
+    def _segment_path(self, segment: str) -> str:
+        if segment == LEGACY_SEGMENT:
+            return self.legacy_file
+        return os.path.join(self.directory, f"events-{segment}.jsonl")
+
+    def _index_path(self, segment: str) -> str:
+        return os.path.join(self.directory, f"events-{segment}.idx.json")
+
+    @staticmethod
+    def _segment_for(entry: dict) -> str:
+        return (entry.get("timestamp") or "")[:10].replace("-", "") or "00000000"
+
+    def _scan_index(self, path: str) -> dict:
+        index = _new_index()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    _index_add(index, json.loads(line))
+                except (json.JSONDecodeError, AttributeError):
+                    continue
+        index["size"] = os.path.getsize(path)
+        return index
+
+    def _load(self):
+        """Discover segments and load (or rebuild stale) sidecar indexes."""
+        if self._loaded:
+            return
+        indexes = {}
+        os.makedirs(self.directory, exist_ok=True)
+        for fn in os.listdir(self.directory):
+            if not (fn.startswith("events-") and fn.endswith(".jsonl")):
+                continue
+            segment = fn[len("events-"):-len(".jsonl")]
+            path = self._segment_path(segment)
+            index = None
+            try:
+                with open(self._index_path(segment), "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("size") != os.path.getsize(path):
+                    index = None  # segment grew behind the index's back
+            except (OSError, ValueError):
+                index = None
+            if index is None:
+                index = self._scan_index(path)
+                self._write_index(segment, index)
+            indexes[segment] = index
+        if self.legacy_file and os.path.exists(self.legacy_file):
+            # Indexed in memory only; the legacy file is left untouched
+            indexes[LEGACY_SEGMENT] = self._scan_index(self.legacy_file)
+        self._indexes = indexes
+        self._loaded = True
+
+    def _snapshot(self) -> Dict[str, dict]:
+        """Current segment indexes for lock-free readers."""
+        if not self._loaded:
+            with self._lock:
+                self._load()
+        return self._indexes
+
+    def _write_index(self, segment: str, index: dict):
+        if segment == LEGACY_SEGMENT:
+            return
+        tmp = self._index_path(segment) + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp, self._index_path(segment))
+        except OSError as e:
+            logger.error(f"Failed to write event index {segment}: {e}")
+
+    # -- writing ------------------------------------------------------------
+
+    def append(self, entry: dict):
+        self.appended += 1
+        self._add(entry, MAX_BUFFERED)
+
+    def _append(self, entries: List[dict]) -> List[dict]:
+        """Append entries to their day segments (one write per segment).
+
+        Returns the entries whose segment could not be written.
+        """
+        failed = []
+        by_segment: Dict[str, List[dict]] = {}
+        for entry in entries:
+            by_segment.setdefault(self._segment_for(entry), []).append(entry)
+        indexes = dict(self._indexes)
+        for segment, batch in by_segment.items():
+            path = self._segment_path(segment)
+            try:
+                payload = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Dropping unserializable events: {e}")
+                continue
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(payload)
+            except OSError as e:
+                logger.error(f"Failed to write event log: {e}")
+                failed.extend(batch)
+                continue
+            index = _copy_index(indexes.get(segment) or _new_index())
+            for entry in batch:
+                _index_add(index, entry)
+            index["size"] = os.path.getsize(path)
+            self._write_index(segment, index)
+            indexes[segment] = index
+        self._indexes = indexes
+        return failed
+
+    # -- querying -----------------------------------------------------------
+
+    @staticmethod
+    def _ordered_segments(indexes: Dict[str, dict]) -> List[str]:
+        # Legacy data predates every day segment
+        return sorted(indexes, key=lambda s: "" if s == LEGACY_SEGMENT else s)
+
+    @staticmethod
+    def _matches(entry: dict, event_type, player, region, since) -> bool:
+        if event_type and entry.get("type") != event_type:
+            return False
+        if player and entry.get("player") != player:
+            return False
+        if region and entry.get("region") != region:
+            return False
+        if since and (entry.get("timestamp") or "") < since:
+            return False
+        return True
+
+    def _may_contain(self, index: dict, event_type, player, region, since) -> bool:
+        if event_type and event_type not in index["types"]:
+            return False
+        if player and player not in index["players"]:
+            return False
+        if region and region not in index["regions"]:
+            return False
+        if since and index["last_ts"] and index["last_ts"] < since:
+            return False
+        return True
+
+    def query(self, count: int = 100, event_type: str = None, player: str = None,
+              region: str = None, since: str = None) -> list:
+        """Most recent ``count`` matching events, oldest first.
+
+        ``since`` is an ISO timestamp lower bound.
+        """
+        start = time.perf_counter()
+        indexes = self._snapshot()
+        found = [e for e in reversed(self.pending)
+                 if self._matches(e, event_type, player, region, since)][:count]
+        for segment in reversed(self._ordered_segments(indexes)):
+            if len(found) >= count:
+                break
+            index = indexes[segment]
+            if not self._may_contain(index, event_type, player, region, since):
+                self.segments_skipped += 1
+                continue
+            self.segments_scanned += 1
+            try:
+                with open(self._segment_path(segment), "r", encoding="utf-8") as f:
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in reversed(lines):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # includes a line a flush is still appending
+                if self._matches(entry, event_type, player, region, since):
+                    found.append(entry)
+                    if len(found) >= count:
+                        break
+        self.last_query_time = time.perf_counter() - start
+        found.reverse()
+        return found
+
+    # -- retention / maintenance -------------------------------------------
+
+    def drop_before(self, days: int) -> int:
+        """Delete whole segments older than ``days``; returns events removed."""
+        self.flush()
+        cutoff = (datetime.utcnow() - timedelta(days=days)).strftime("%Y%m%d")
+        cutoff_iso = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        removed = 0
+        with self._lock:
+            self._load()
+            indexes = dict(self._indexes)
+            for segment in list(indexes):
+                index = indexes[segment]
+                if segment == LEGACY_SEGMENT:
+                    expired = index["last_ts"] is not None and index["last_ts"] < cutoff_iso
+                else:
+                    expired = segment < cutoff
+                if not expired:
+                    continue
+                for path in (self._segment_path(segment), self._index_path(segment)):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                removed += index["count"]
+                del indexes[segment]
+            self._indexes = indexes
+        return removed
+
+    def purge_player(self, player: str, trash_dir: str = None) -> int:
+        """Remove a player's events, rewriting only segments that index them.
+
+        Touched segments are copied to ``trash_dir`` first when given, and
+        rewritten through a temp file so lock-free readers never see a
+        partial segment.
+        """
+        self.flush()
+        lname = player.lower()
+        stripped = 0
+        with self._lock:
+            self._load()
+            indexes = dict(self._indexes)
+            for segment, index in list(indexes.items()):
+                if not any(p.lower() == lname for p in index["players"]):
+                    continue
+                path = self._segment_path(segment)
+                if trash_dir:
+                    import shutil
+                    os.makedirs(trash_dir, exist_ok=True)
+                    shutil.copy2(path, os.path.join(trash_dir, os.path.basename(path)))
+                kept = []
+                dropped = 0
+                new_index = _new_index()
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            evt = json.loads(line)
+                            actor = (evt.get('character') or evt.get('player')
+                                     or evt.get('actor') or '').lower()
+                            if actor == lname:
+                                dropped += 1
+                                continue
+                            _index_add(new_index, evt)
+                        except Exception:
+                            pass
+                        kept.append(line)
+                if not replace_file(path, "".join(kept).encode("utf-8")):
+                    continue
+                stripped += dropped
+                new_index["size"] = os.path.getsize(path)
+                indexes[segment] = new_index
+                self._write_index(segment, new_index)
+            self._indexes = indexes
+        return stripped
+
+    def get_status(self) -> str:
+        """Summary for the @events admin command."""
+        indexes = self._snapshot()
+        total = sum(i["count"] for i in indexes.values())
+        segments = self._ordered_segments(indexes)
+        span = f"{segments[0]} .. {segments[-1]}" if segments else "none"
+        return "\n".join([
+            "Event Store:",
+            f"  Segments: {len(segments)} ({span})  Events: {total}",
+            f"  Buffered: {len(self.pending)}  Appended: {self.appended}  Flushes: {self.flushes}",
+            f"  Segments scanned: {self.segments_scanned}  skipped by index: {self.segments_skipped}",
+            f"  Last query: {self.last_query_time * 1000:.2f} ms",
+        ])
+
+
+# Global event store instance
+event_store = EventStore(EVENT_LOG_DIR, legacy_file=EVENT_LOG_FILE)
+
+
+def get_event_store() -> EventStore:
+    """Get the global event store."""
+    return event_store
+
+
 def log_event(player_name: str, event_type: str, event_data: dict,
               room_vnum: int = None, region: str = None):
     """
@@ -35,70 +381,24 @@ def log_event(player_name: str, event_type: str, event_data: dict,
         "room_vnum": room_vnum,
         "region": region
     }
-
-    try:
-        with open(EVENT_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-    except Exception as e:
-        logger.error(f"Failed to write event log: {e}")
+    event_store.append(entry)
 
 
 def get_recent_events(count: int = 100, event_type: str = None,
                       player: str = None, region: str = None) -> list:
     """Read recent events from the log, optionally filtered."""
-    if not os.path.exists(EVENT_LOG_FILE):
-        return []
-
-    events = []
     try:
-        with open(EVENT_LOG_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    if event_type and entry.get("type") != event_type:
-                        continue
-                    if player and entry.get("player") != player:
-                        continue
-                    if region and entry.get("region") != region:
-                        continue
-                    events.append(entry)
-                except json.JSONDecodeError:
-                    continue
+        return event_store.query(count=count, event_type=event_type,
+                                 player=player, region=region)
     except Exception as e:
         logger.error(f"Failed to read event log: {e}")
-
-    # Return most recent
-    return events[-count:]
+        return []
 
 
 def clear_old_events(days: int = 30):
-    """Remove events older than N days."""
-    if not os.path.exists(EVENT_LOG_FILE):
-        return 0
-
-    cutoff = time.time() - (days * 86400)
-    kept = []
-    removed = 0
-
+    """Remove events older than N days (whole day segments)."""
     try:
-        with open(EVENT_LOG_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    ts = datetime.fromisoformat(entry["timestamp"]).timestamp()
-                    if ts >= cutoff:
-                        kept.append(line)
-                    else:
-                        removed += 1
-                except Exception:
-                    kept.append(line)
-
-        with open(EVENT_LOG_FILE, "w", encoding="utf-8") as f:
-            f.writelines(kept)
+        return event_store.drop_before(days)
     except Exception as e:
         logger.error(f"Failed to clean event log: {e}")
-
-    return removed
+        return 0
@@ -143,11 +143,13 @@ async def _apply_event_effects(world, effects: dict, scope: str, target: str):
                         mob_template = world.mobs[mob_vnum].to_dict()
                     if mob_template:
                         import copy
+                        from src.world import get_location_index
+                        locations = get_location_index(world)
                         for _ in range(count):
                             data = {k: v for k, v in copy.deepcopy(mob_template).items() if k != 'room_vnum'}
                             mob = Mob(**data)
                             mob.alive = True
-                            room.mobs.append(mob)
+                            locations.place_mob(mob, room)
         except Exception:
             pass
 
@@ -181,6 +181,8 @@ def on_mob_killed_rep(attacker, mob) -> List[str]:
         # Fallback: raw dict update
         cur = attacker.reputation.get(faction_id, 0)
         attacker.reputation[faction_id] = cur + delta
+        from src.narrative import announce_event
+        announce_event(attacker, "faction_change", faction_id, cur + delta)
 
     return messages
 
@@ -244,6 +244,7 @@ class FamilyFateManager:
             return
         try:
             from src.encounters import get_encounter_manager, _instantiate_mob
+            from src.world import get_location_index
             mgr = get_encounter_manager()
             character = self._find_character(world, trail.character_name)
             apl = int(getattr(character, "level", 5)) if character else 5
@@ -284,7 +285,7 @@ class FamilyFateManager:
                     continue
                 mob = _instantiate_mob(creature, trail.home_vnum)
                 world.mobs[mob.vnum] = mob
-                room.mobs.append(mob)
+                get_location_index(world).place_mob(mob, room)
                 trail.wave_mobs.append(mob)
             # Notify the character and auto-initiate combat
             if character is not None:
@@ -523,17 +524,7 @@ def get_fate_manager() -> FamilyFateManager:
     return _mgr
 
 
-async def family_fate_tick(world):
-    """Background tick to advance burnt-trail timers/waves."""
-    import asyncio
-    mgr = get_fate_manager()
-    while True:
-        try:
-            await asyncio.sleep(15)
-            messages = mgr.tick(world)
-            for m in messages:
-                logger.info("Fates: %s", m)
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error("family_fate_tick error: %s", e)
+def family_fate_tick(world):
+    """Heartbeat pulse to advance burnt-trail timers/waves."""
+    for m in get_fate_manager().tick(world):
+        logger.info("Fates: %s", m)
@@ -1564,6 +1564,144 @@ FEATS: Dict[str, Feat] = {
 # Feat Application Helpers
 # =============================================================================
 
+# Effects that read live entity state (toggled amounts, dodge target, gear)
+# and so run on every call. They are all additive and none touches the
+# multiplicative contexts (threat_range, spell_damage), so applying them
+# after the memoised static total matches applying the feats in list order.
+LIVE_EFFECTS: Dict[Callable, frozenset] = {
+    effect_two_weapon_defense: frozenset({'ac'}),
+    effect_combat_expertise: frozenset({'attack', 'ac'}),
+    effect_power_attack: frozenset({'attack', 'damage'}),
+    effect_dodge: frozenset({'ac'}),
+    effect_combat_reflexes: frozenset({'aoo_count'}),
+}
+
+_MEMO_TYPES = (str, int, float, bool, type(None))
+
+
+def _memo_safe(value) -> bool:
+    """True for kwargs that can be part of a memo key by value."""
+    if isinstance(value, _MEMO_TYPES):
+        return True
+    if isinstance(value, tuple):
+        return all(_memo_safe(v) for v in value)
+    return False
+
+
+class FeatTable:
+    """
+    A feat list parsed once: parenthesised names resolved to Feat objects,
+    split into static and live effects, with memoised static totals and
+    name lookups. Shared by every entity with the same feat list.
+    """
+    __slots__ = ('names', '_lowered', 'static', 'live', 'unique_static',
+                 'unique_live', '_bonus', '_has')
+
+    def __init__(self, names: Tuple[str, ...]):
+        self.names = names
+        self._lowered = tuple(n.lower() for n in names)
+        self.static: List[Feat] = []
+        self.live: List[Feat] = []
+        # First feat per base name, for lookups that skip repeats
+        self.unique_static: List[Feat] = []
+        self.unique_live: List[Feat] = []
+        seen_bases = set()
+        for feat_name in names:
+            base = feat_name.split('(')[0].strip()
+            feat = FEATS.get(base) or FEATS.get(feat_name)
+            first = base not in seen_bases
+            seen_bases.add(base)
+            if not (feat and feat.effect):
+                continue
+            is_live = feat.effect in LIVE_EFFECTS
+            (self.live if is_live else self.static).append(feat)
+            if first:
+                (self.unique_live if is_live else self.unique_static).append(feat)
+        self._bonus: Dict[tuple, Any] = {}
+        self._has: Dict[str, bool] = {}
+
+    def __deepcopy__(self, memo):
+        return self  # immutable apart from its memo tables
+
+    def has(self, feat_name: str) -> bool:
+        """Case-insensitive partial match, as has_feat_by_name."""
+        found = self._has.get(feat_name)
+        if found is None:
+            needle = feat_name.lower()
+            found = any(needle in n for n in self._lowered)
+            self._has[feat_name] = found
+        return found
+
+    def apply(self, character, context: Optional[str], value, kwargs: Dict,
+              unique: bool = False):
+        """Fold every feat effect for ``context`` into ``value``."""
+        static = self.unique_static if unique else self.static
+        live = self.unique_live if unique else self.live
+        # Static effects only read the feat list and the kwargs, so the
+        # total is memoised when every kwarg can be keyed by value.
+        key = None
+        if all(_memo_safe(v) for v in kwargs.values()):
+            key = (context, value, unique) + tuple(sorted(kwargs.items()))
+        cached = self._bonus.get(key) if key is not None else None
+        if cached is None:
+            cached = value
+            for feat in static:
+                result = feat.apply(character, context=context, value=cached, **kwargs)
+                if isinstance(result, (int, float)):
+                    cached = result
+            if key is not None:
+                if len(self._bonus) > 1024:
+                    self._bonus.clear()
+                self._bonus[key] = cached
+        value = cached
+        for feat in live:
+            if context is not None and context not in LIVE_EFFECTS[feat.effect]:
+                continue
+            result = feat.apply(character, context=context, value=value, **kwargs)
+            if isinstance(result, (int, float)):
+                value = result
+        return value
+
+
+_FEAT_TABLES: Dict[Tuple[str, ...], FeatTable] = {}
+
+
+def get_feat_table(character) -> FeatTable:
+    """
+    The parsed feat table for an entity. Cached on the entity and checked
+    against its ``feats_version`` counter, which every assignment and
+    in-place edit of the feat list bumps (see state_version). Entities
+    without the counter look the table up by feat names on each call;
+    invalidate_feat_table() covers anything else.
+    """
+    feats = getattr(character, 'feats', None) or []
+    version = getattr(character, 'feats_version', None)
+    if version is not None:
+        cached = getattr(character, '_feat_table', None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    names = tuple(feats)
+    table = _FEAT_TABLES.get(names)
+    if table is None:
+        if len(_FEAT_TABLES) > 4096:
+            _FEAT_TABLES.clear()
+        table = _FEAT_TABLES[names] = FeatTable(names)
+    if version is not None:
+        try:
+            character._feat_table = (version, table)
+        except AttributeError:
+            pass
+    return table
+
+
+def invalidate_feat_table(character):
+    """Drop an entity's cached feat table after an in-place feat edit."""
+    try:
+        del character._feat_table
+    except AttributeError:
+        pass
+
+
 def apply_feat_bonuses(character, context: str, base_value: int = 0, **kwargs) -> int:
     """
     Apply all relevant feat bonuses to a value.
@@ -1577,20 +1715,7 @@ def apply_feat_bonuses(character, context: str, base_value: int = 0, **kwargs) -
     Returns:
         Modified value with all applicable feat bonuses
     """
-    value = base_value
-    feats = getattr(character, 'feats', [])
-
-    for feat_name in feats:
-        # Handle feats with parameters like "Weapon Focus (longsword)"
-        base_feat_name = feat_name.split('(')[0].strip()
-        feat = FEATS.get(base_feat_name) or FEATS.get(feat_name)
-
-        if feat and feat.effect:
-            result = feat.apply(character, context=context, value=value, **kwargs)
-            if isinstance(result, (int, float)):
-                value = result
-
-    return value
+    return get_feat_table(character).apply(character, context, base_value, kwargs)
 
 
 def get_skill_feat_bonus(character, skill_name: str) -> int:
@@ -1639,9 +1764,4 @@ def get_aoo_count(character) -> int:
 
 def has_feat_by_name(character, feat_name: str) -> bool:
     """Check if character has a feat by name (handles parameterized feats)."""
-    feats = getattr(character, 'feats', [])
-    feat_lower = feat_name.lower()
-    for f in feats:
-        if feat_lower in f.lower():
-            return True
-    return False
+    return get_feat_table(character).has(feat_name)
@@ -42,7 +42,10 @@ class GMCPHandler:
         """Send WILL GMCP to advertise support. Call on connection."""
         try:
             raw = bytes([IAC, WILL, GMCP_OPT])
-            if hasattr(self.writer, '_transport') and self.writer._transport:
+            if hasattr(self.writer, 'write_raw'):
+                # Coalesced (and possibly MCCP2-compressed) output stream
+                self.writer.write_raw(raw)
+            elif hasattr(self.writer, '_transport') and self.writer._transport:
                 self.writer._transport.write(raw)
             self.enabled = True
         except Exception:
@@ -81,7 +84,10 @@ class GMCPHandler:
             payload = f"{package} {json.dumps(data, separators=(',', ':'))}"
             payload_bytes = payload.encode('utf-8')
             raw = bytes([IAC, SB, GMCP_OPT]) + payload_bytes + bytes([IAC, SE])
-            if hasattr(self.writer, '_transport') and self.writer._transport:
+            if hasattr(self.writer, 'write_raw'):
+                # Coalesced (and possibly MCCP2-compressed) output stream
+                self.writer.write_raw(raw)
+            elif hasattr(self.writer, '_transport') and self.writer._transport:
                 self.writer._transport.write(raw)
         except Exception:
             pass
@@ -147,6 +153,10 @@ class WebSocketGMCPHandler:
         try:
             payload = json.dumps(data, separators=(',', ':'))
             message = f"GMCP:{package} {payload}"
+            # In-process WebSocketWriter: queue in order with text output
+            if hasattr(self.websocket, 'send_nowait'):
+                self.websocket.send_nowait(message)
+                return
             # Use the async send via the event loop
             import asyncio
             try:
@@ -393,17 +403,40 @@ def _mob_summary(mob):
     }
 
 
+def _room_mobs_stamp(room):
+    """Changes whenever any Room.Mobs summary in ``room`` would change.
+
+    Membership changes bump room.mobs_version; with fixed membership the
+    sum of the occupants' state_version counters can only grow.
+    """
+    mobs = getattr(room, 'mobs', [])
+    return (getattr(room, 'mobs_version', None),
+            sum(getattr(m, 'state_version', 0) for m in mobs))
+
+
+def _room_mob_summaries(room):
+    """Living-mob summaries for a room, built once and shared by every
+    viewer until the room's occupants change."""
+    stamp = _room_mobs_stamp(room)
+    cached = getattr(room, '_gmcp_mobs', None)
+    if cached is not None and cached[0] == stamp and stamp[0] is not None:
+        return cached[1]
+    mobs = [_mob_summary(mob) for mob in getattr(room, 'mobs', [])
+            if getattr(mob, 'alive', True)]
+    try:
+        room._gmcp_mobs = (stamp, mobs)
+    except AttributeError:
+        pass
+    return mobs
+
+
 def _build_room_mobs(room, character=None):
     """Build Room.Mobs payload per docs/GMCP_SPEC.md.
 
     Includes combat state derived from ``character.combat_target`` when
     the character is engaged with a mob in this room.
     """
-    mobs = []
-    for mob in getattr(room, 'mobs', []):
-        if not getattr(mob, 'alive', True):
-            continue
-        mobs.append(_mob_summary(mob))
+    mobs = _room_mob_summaries(room)
 
     target_mob = getattr(character, 'combat_target', None) if character else None
     in_combat = False
@@ -519,9 +552,14 @@ def register_handler(character, writer):
     return handler
 
 
-def register_ws_handler(character, websocket):
-    """Register a WebSocket GMCP handler for a new connection."""
-    handler = WebSocketGMCPHandler(websocket)
+def register_ws_handler(character, websocket, handler=None):
+    """Register a WebSocket GMCP handler for a new connection.
+
+    ``handler`` registers an existing handler (the one a WebSocketWriter
+    already routes inbound GMCP frames to) instead of creating a new one.
+    """
+    if handler is None:
+        handler = WebSocketGMCPHandler(websocket)
     _handlers[character.name] = handler
     return handler
 
@@ -698,14 +736,16 @@ def emit_chat_materialized(character, room_vnum, room_name):
 # ---------------------------------------------------------------------------
 
 # Per-character state cache to gate redundant emits.
-_last_emit_state = {}  # {character_name: {"vitals": {...}, "conditions": set, "room_vnum": int}}
+_last_emit_state = {}  # {character_name: {"vitals_version": int, "vitals_fp": tuple, ...}}
 
 
 def _tick_emit_for(character):
     """Emit any state-delta GMCP packages for one character.
 
-    Caches last-emitted vitals fingerprint, condition set, and room vnum
-    so redundant per-tick packets are suppressed.
+    Payloads are only rebuilt when the character's (or room's) version
+    counters moved since the last tick; the cached fingerprints then
+    suppress rebuilds that turn out identical (hp set to its old value
+    via a container, a condition timer ticking down, ...).
     """
     handler = get_handler(character)
     if not handler:
@@ -715,43 +755,46 @@ def _tick_emit_for(character):
         return
     prev = _last_emit_state.setdefault(name, {})
 
-    vitals = _build_vitals(character)
-    vitals_fp = (
-        vitals["hp"], vitals["hp_max"], vitals["mv"], vitals["mv_max"],
-        vitals["ac"], vitals["gold"], vitals["xp_tnl"],
-        tuple(sorted(vitals["spell_slots"].items())),
-    )
-    if prev.get("vitals_fp") != vitals_fp:
-        handler.emit("Char.Vitals", vitals)
-        prev["vitals_fp"] = vitals_fp
-
-    current_conditions = set(getattr(character, 'conditions', set()))
-    current_conditions |= set(getattr(character, 'active_conditions', {}).keys())
-    divine = getattr(character, 'divine_buffs', {})
-    if divine and divine.get('duration', 0) > 0:
-        current_conditions.add("Blessed")
-    prev_conditions = prev.get("conditions", set())
-    if current_conditions != prev_conditions:
-        added = next(iter(current_conditions - prev_conditions), None)
-        removed = next(iter(prev_conditions - current_conditions), None)
-        handler.emit_status(character, added=added, removed=removed)
-        prev["conditions"] = current_conditions
+    vitals_version = getattr(character, 'vitals_version', None)
+    if vitals_version is None or prev.get("vitals_version") != vitals_version:
+        prev["vitals_version"] = vitals_version
+        vitals = _build_vitals(character)
+        vitals_fp = (
+            vitals["hp"], vitals["hp_max"], vitals["mv"], vitals["mv_max"],
+            vitals["ac"], vitals["gold"], vitals["xp_tnl"],
+            tuple(sorted(vitals["spell_slots"].items())),
+        )
+        if prev.get("vitals_fp") != vitals_fp:
+            handler.emit("Char.Vitals", vitals)
+            prev["vitals_fp"] = vitals_fp
+
+    status_version = getattr(character, 'status_version', None)
+    if status_version is None or prev.get("status_version") != status_version:
+        prev["status_version"] = status_version
+        current_conditions = set(getattr(character, 'conditions', set()))
+        current_conditions |= set(getattr(character, 'active_conditions', {}).keys())
+        divine = getattr(character, 'divine_buffs', {})
+        if divine and divine.get('duration', 0) > 0:
+            current_conditions.add("Blessed")
+        prev_conditions = prev.get("conditions", set())
+        if current_conditions != prev_conditions:
+            added = next(iter(current_conditions - prev_conditions), None)
+            removed = next(iter(prev_conditions - current_conditions), None)
+            handler.emit_status(character, added=added, removed=removed)
+            prev["conditions"] = current_conditions
 
     room = getattr(character, 'room', None)
     if room is not None:
         target = getattr(character, 'combat_target', None)
         target_alive = bool(target and getattr(target, 'alive', True))
-        mob_fp = tuple(
-            (getattr(m, 'name', ''), getattr(m, 'hp', 0), getattr(m, 'alive', True))
-            for m in getattr(room, 'mobs', [])
-            if getattr(m, 'alive', True)
-        )
-        combat_fp = (
-            target_alive,
-            getattr(target, 'name', None) if target_alive else None,
-            getattr(target, 'hp', None) if target_alive else None,
-        )
-        new_fp = (mob_fp, combat_fp)
+        target_fp = (id(target), getattr(target, 'state_version', None),
+                     getattr(target, 'hp', None)) if target_alive else None
+        new_fp = (id(room), _room_mobs_stamp(room), target_fp)
+        if new_fp[1][0] is None:
+            # Room without a version counter: fall back to a content fingerprint
+            new_fp += (tuple(
+                (getattr(m, 'name', ''), getattr(m, 'hp', 0))
+                for m in getattr(room, 'mobs', []) if getattr(m, 'alive', True)),)
         if prev.get("room_mobs_fp") != new_fp:
             handler.emit_room_mobs(room, character)
             prev["room_mobs_fp"] = new_fp
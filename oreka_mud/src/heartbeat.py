@@ -0,0 +1,291 @@
+"""
+World heartbeat scheduler.
+
+A single asyncio task drives every periodic subsystem (schedules, spawning,
+weather, GMCP, ...). Subsystems register a pulse callback with a period,
+an optional phase offset and a time budget. Due work lives in a min-heap
+keyed by next-due time, so the loop sleeps until the earliest pulse and
+runs only what is due.
+
+Pulses that share a period are given distinct phase offsets so the 30s and
+60s ticks never land on the same event-loop iteration, and the loop yields
+between pulses so client input is serviced in between.
+
+Pulses registered with ``background=True`` (the write-behind flushes that
+wait on a worker thread) run as their own tasks, so a slow disk never
+delays the combat or GMCP pulses. A background pulse still running when
+it comes due again is skipped rather than started twice.
+
+Usage:
+    hb = get_heartbeat()
+    hb.register("weather", weather_tick, period=30, args=(world,))
+    asyncio.create_task(hb.run())
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("OrekaMUD.Heartbeat")
+
+# Gap between automatically assigned phase offsets (seconds)
+DEFAULT_STAGGER = 0.35
+
+# Default per-pulse time budget (seconds). Exceeding it counts an overrun.
+DEFAULT_BUDGET = 0.05
+
+
+class Pulse:
+    """One registered subsystem and its run statistics."""
+
+    def __init__(self, name: str, callback: Callable, period: float,
+                 phase: float = 0.0, budget: float = DEFAULT_BUDGET,
+                 args: Tuple = (), background: bool = False):
+        self.name = name
+        self.callback = callback
+        self.period = float(period)
+        self.phase = float(phase)
+        self.budget = float(budget)
+        self.args = args
+        self.background = background
+        self.enabled = True
+        self.task: Optional[asyncio.Task] = None
+
+        self.next_due = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        self.last_run = None
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.runs if self.runs else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "period": self.period,
+            "phase": round(self.phase, 3),
+            "budget": self.budget,
+            "enabled": self.enabled,
+            "background": self.background,
+            "runs": self.runs,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "avg_ms": round(self.avg_time * 1000, 3),
+            "max_ms": round(self.max_time * 1000, 3),
+            "last_ms": round(self.last_time * 1000, 3),
+        }
+
+
+class Heartbeat:
+    """Priority-queue scheduler for periodic world pulses."""
+
+    def __init__(self, stagger: float = DEFAULT_STAGGER,
+                 clock: Callable[[], float] = time.monotonic):
+        self.stagger = stagger
+        self.clock = clock
+        self.pulses: Dict[str, Pulse] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._start = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.running = False
+
+    # -- registration -------------------------------------------------------
+
+    def register(self, name: str, callback: Callable, period: float,
+                 phase: float = None, budget: float = DEFAULT_BUDGET,
+                 args: Tuple = (), background: bool = False) -> Pulse:
+        """Register a subsystem pulse.
+
+        Args:
+            name: Unique subsystem name (shown in @heartbeat)
+            callback: Sync function or coroutine function, called with *args
+            period: Seconds between pulses
+            phase: Offset within the period (the first pulse fires one period
+                   plus phase after start). None picks an offset that does
+                   not collide with existing pulses.
+            budget: Seconds a single pulse may take before it counts as an
+                    overrun
+            args: Positional arguments passed to the callback
+            background: Run each pulse as its own task instead of inline
+                        (for coroutines that wait on worker threads)
+        """
+        if period <= 0:
+            raise ValueError(f"Pulse period must be positive: {name}")
+        if name in self.pulses:
+            self.unregister(name)
+        if phase is None:
+            phase = self._pick_phase(period)
+        pulse = Pulse(name, callback, period, phase % period, budget, args, background)
+        self.pulses[name] = pulse
+        base = self._start if self._start is not None else self.clock()
+        pulse.next_due = base + pulse.period + pulse.phase
+        if self._start is not None:
+            now = self.clock()
+            while pulse.next_due < now:
+                pulse.next_due += pulse.period
+        heapq.heappush(self._heap, (pulse.next_due, next(self._seq), name))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return pulse
+
+    def unregister(self, name: str) -> bool:
+        """Remove a pulse. Its heap entry is dropped lazily."""
+        return self.pulses.pop(name, None) is not None
+
+    def _pick_phase(self, period: float) -> float:
+        """Choose an offset that keeps pulses from landing together."""
+        taken = {round(p.phase % period, 3) for p in self.pulses.values()}
+        slot = len(self.pulses)
+        for _ in range(len(self.pulses) + 1):
+            candidate = round((slot * self.stagger) % period, 3)
+            if candidate not in taken:
+                return candidate
+            slot += 1
+        return round((slot * self.stagger) % period, 3)
+
+    # -- execution ----------------------------------------------------------
+
+    def due(self, now: float = None) -> List[Pulse]:
+        """Pop and return every pulse due at ``now``, earliest first."""
+        if now is None:
+            now = self.clock()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, name = heapq.heappop(self._heap)
+            pulse = self.pulses.get(name)
+            if pulse is None or pulse.next_due != due_at:
+                continue  # unregistered or re-registered
+            ready.append(pulse)
+        return ready
+
+    def _reschedule(self, pulse: Pulse, now: float):
+        pulse.next_due += pulse.period
+        if pulse.next_due <= now:
+            # Fell behind by more than a whole period: skip, don't burst
+            missed = int((now - pulse.next_due) // pulse.period) + 1
+            pulse.skipped += missed
+            pulse.next_due += missed * pulse.period
+        heapq.heappush(self._heap, (pulse.next_due, next(self._seq), pulse.name))
+
+    async def run_pulse(self, pulse: Pulse):
+        """Run one pulse, recording its wall time and overrun status."""
+        start = time.perf_counter()
+        try:
+            if pulse.enabled:
+                result = pulse.callback(*pulse.args)
+                if inspect.isawaitable(result):
+                    await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            pulse.errors += 1
+            logger.error(f"Error in {pulse.name} pulse: {e}")
+        finally:
+            elapsed = time.perf_counter() - start
+            if pulse.enabled:
+                pulse.runs += 1
+                pulse.total_time += elapsed
+                pulse.last_time = elapsed
+                pulse.max_time = max(pulse.max_time, elapsed)
+                pulse.last_run = time.time()
+                if elapsed > pulse.budget:
+                    pulse.overruns += 1
+
+    async def step(self, now: float = None) -> int:
+        """Run all pulses due at ``now``, yielding between each. Returns count."""
+        if now is None:
+            now = self.clock()
+        ready = self.due(now)
+        for i, pulse in enumerate(ready):
+            if pulse.background:
+                if pulse.task is not None and not pulse.task.done():
+                    pulse.skipped += 1  # previous flush still in flight
+                else:
+                    pulse.task = asyncio.create_task(self.run_pulse(pulse))
+                self._reschedule(pulse, self.clock())
+                continue
+            if i:
+                await asyncio.sleep(0)  # let client I/O in between pulses
+            await self.run_pulse(pulse)
+            if pulse.name in self.pulses:
+                self._reschedule(pulse, self.clock())
+        return len(ready)
+
+    def start(self):
+        """Anchor registered phases to now. Called by run()."""
+        if self._start is not None:
+            return
+        self._start = self.clock()
+        pending = list(self.pulses.values())
+        self._heap = []
+        for pulse in pending:
+            pulse.next_due = self._start + pulse.period + pulse.phase
+            heapq.heappush(self._heap, (pulse.next_due, next(self._seq), pulse.name))
+
+    async def run(self):
+        """Drive the heartbeat forever."""
+        self.start()
+        self.running = True
+        self._wakeup = asyncio.Event()
+        logger.info(f"Heartbeat started with {len(self.pulses)} pulses")
+        try:
+            while True:
+                now = self.clock()
+                if self._heap and self._heap[0][0] <= now:
+                    await self.step(now)
+                    continue
+                delay = (self._heap[0][0] - now) if self._heap else 1.0
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.running = False
+
+    # -- reporting ----------------------------------------------------------
+
+    def get_stats(self) -> List[dict]:
+        """Per-pulse statistics sorted by next-due order."""
+        return [p.to_dict() for p in sorted(self.pulses.values(),
+                                            key=lambda p: (p.period, p.phase))]
+
+    def get_status(self) -> str:
+        """Human-readable status table for the @heartbeat admin command."""
+        lines = [
+            "Heartbeat Status:",
+            f"  Running: {self.running}",
+            f"  Pulses: {len(self.pulses)}",
+            "",
+            f"  {'Name':<18} {'Period':>7} {'Phase':>6} {'Runs':>6} "
+            f"{'Avg ms':>8} {'Max ms':>8} {'Over':>5} {'Err':>4} {'Skip':>5}",
+        ]
+        for s in self.get_stats():
+            flag = "" if s["enabled"] else " (off)"
+            lines.append(
+                f"  {s['name']:<18} {s['period']:>6.0f}s {s['phase']:>6.2f} "
+                f"{s['runs']:>6} {s['avg_ms']:>8.2f} {s['max_ms']:>8.2f} "
+                f"{s['overruns']:>5} {s['errors']:>4} {s['skipped']:>5}{flag}"
+            )
+        return "\n".join(lines)
+
+
+# Global heartbeat instance
+heartbeat = Heartbeat()
+
+
+def get_heartbeat() -> Heartbeat:
+    """Get the global heartbeat instance."""
+    return heartbeat
@@ -0,0 +1,598 @@
+"""
+Async pooled HTTP client for the LLM backends (Ollama, LM Studio).
+
+Replaces the per-request urllib + run_in_executor calls in src/ai.py:
+
+- Native asyncio HTTP/1.1 with keep-alive, so a burst of NPC chats reuses
+  a handful of sockets instead of opening one per request and never
+  touches the default thread pool.
+- Lanes: each backend host gets its own worker slots and bounded wait
+  queue, so a crowded server cannot starve another. Within a lane,
+  interactive requests are served before background ones (chat
+  summaries), and background work never takes every slot.
+  Requests beyond a lane's queue limit fail fast with LLMQueueFull.
+- Per-request deadlines covering queue wait, connect and read.
+- Streaming: NDJSON (Ollama) and SSE "data:" lines (OpenAI-compatible /
+  LM Studio) are parsed incrementally and yielded as dicts.
+
+No external dependencies; only what the stdlib asyncio streams provide.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("OrekaMUD.LLMClient")
+
+# Defaults (overridable via configure())
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_POOL_SIZE = 4
+IDLE_CONNECTION_TTL = 60  # seconds an idle keep-alive socket is kept
+
+# Lane used when a request names no lane (or an unknown one)
+DEFAULT_LANE = "default"
+
+# Request priorities within a lane (lower is served first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class LLMClientError(Exception):
+    """HTTP or protocol failure talking to an LLM backend.
+
+    ``status`` holds the HTTP status code for error responses.
+    """
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+class LLMQueueFull(LLMClientError):
+    """Too many requests already waiting for a concurrency slot."""
+
+
+def _remaining(deadline: float) -> float:
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise asyncio.TimeoutError()
+    return left
+
+
+class _Connection:
+    """One keep-alive socket to a backend host."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def usable(self) -> bool:
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        return time.monotonic() - self.last_used < IDLE_CONNECTION_TTL
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class _Lane:
+    """Worker slots plus a bounded priority wait queue for one lane."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int,
+                 background_limit: Optional[int] = None):
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        # Max slots background work may hold; None keeps one slot free
+        # for interactive requests (when there is more than one).
+        self.background_limit = background_limit
+        self.reset()
+
+        # Instrumentation
+        self.requests = 0
+        self.rejected = 0
+        self.queued = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    def reset(self):
+        """Drop runtime state (waiter futures belong to the old event loop)."""
+        self.active = 0
+        self.active_background = 0
+        self._waiters: List[list] = []  # heap of [priority, seq, future]
+        self._seq = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _admits(self, priority: int) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        if priority < PRIORITY_BACKGROUND:
+            return True
+        limit = self.background_limit
+        if limit is None:
+            limit = max(1, self.max_concurrency - 1)
+        return self.active_background < limit
+
+    def _grant(self, priority: int):
+        self.active += 1
+        if priority >= PRIORITY_BACKGROUND:
+            self.active_background += 1
+
+    def _wake(self):
+        while self._waiters:
+            priority, _, fut = self._waiters[0]
+            if fut.done():  # cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            if not self._admits(priority):
+                break  # everything behind the head ranks no higher
+            heapq.heappop(self._waiters)
+            self._grant(priority)
+            fut.set_result(None)
+
+    async def acquire(self, priority: int, deadline: float):
+        self.requests += 1
+        ahead = self._waiters and self._waiters[0][0] <= priority
+        if not ahead and self._admits(priority):
+            # Free slot: granted without yielding
+            self._grant(priority)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise LLMQueueFull(f"LLM lane {self.name} full ({len(self._waiters)} waiting)")
+        fut = asyncio.get_running_loop().create_future()
+        entry = [priority, self._seq, fut]
+        self._seq += 1
+        heapq.heappush(self._waiters, entry)
+        self.queued += 1
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(fut, timeout=_remaining(deadline))
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                self.release(priority)  # granted as the deadline hit
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+        finally:
+            waited = time.monotonic() - start
+            self.total_queue_wait += waited
+            self.max_queue_wait = max(self.max_queue_wait, waited)
+
+    def release(self, priority: int):
+        self.active -= 1
+        if priority >= PRIORITY_BACKGROUND:
+            self.active_background -= 1
+        self._wake()
+
+    def get_stats(self) -> dict:
+        done = max(self.requests, 1)
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "active_background": self.active_background,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self.total_queue_wait / done * 1000, 1),
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000, 1),
+        }
+
+
+class LLMClient:
+    """Pooled, lane-limited async HTTP client for LLM calls."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_queue: int = DEFAULT_MAX_QUEUE,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self._loop = None
+        self._pools: Dict[Tuple[str, str, int], List[_Connection]] = {}
+        self.lanes: Dict[str, _Lane] = {
+            DEFAULT_LANE: _Lane(DEFAULT_LANE, max_concurrency, max_queue),
+        }
+
+        # Instrumentation
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.total_latency = 0.0
+
+    @property
+    def rejected(self) -> int:
+        return sum(lane.rejected for lane in self.lanes.values())
+
+    def configure_lane(self, name: str, max_concurrency: int = None,
+                       max_queue: int = None, background_limit: int = None) -> _Lane:
+        """Create or resize a lane (limits apply to new acquisitions)."""
+        lane = self.lanes.get(name)
+        if lane is None:
+            lane = self.lanes[name] = _Lane(
+                name,
+                DEFAULT_MAX_CONCURRENCY if max_concurrency is None else max_concurrency,
+                DEFAULT_MAX_QUEUE if max_queue is None else max_queue,
+                background_limit)
+            return lane
+        if max_concurrency is not None:
+            lane.max_concurrency = max(1, int(max_concurrency))
+        if max_queue is not None:
+            lane.max_queue = max(0, int(max_queue))
+        if background_limit is not None:
+            lane.background_limit = background_limit
+        return lane
+
+    def _lane(self, name: Optional[str]) -> _Lane:
+        return self.lanes.get(name) or self.lanes[DEFAULT_LANE]
+
+    # -- loop binding -------------------------------------------------------
+
+    def _bind_loop(self):
+        """Waiters and sockets belong to one event loop; rebind if it changed."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pools = {}
+            for lane in self.lanes.values():
+                lane.reset()
+
+    # -- connections --------------------------------------------------------
+
+    async def _get_connection(self, key, deadline: float) -> _Connection:
+        pool = self._pools.setdefault(key, [])
+        while pool:
+            conn = pool.pop()
+            if conn.usable():
+                self.connections_reused += 1
+                return conn
+            conn.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=(scheme == "https") or None),
+            timeout=_remaining(deadline),
+        )
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def _return_connection(self, key, conn: _Connection, reusable: bool):
+        pool = self._pools.setdefault(key, [])
+        if reusable and len(pool) < self.pool_size and conn.usable():
+            conn.last_used = time.monotonic()
+            pool.append(conn)
+        else:
+            conn.close()
+
+    # -- HTTP ---------------------------------------------------------------
+
+    @staticmethod
+    def _split(url: str):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return (scheme, parts.hostname, port), path
+
+    async def _send(self, conn: _Connection, method: str, host: str, path: str,
+                    body: Optional[bytes], deadline: float):
+        headers = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {host}",
+            "Connection: keep-alive",
+            "Accept: application/json",
+        ]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+            headers.append(f"Content-Length: {len(body)}")
+        conn.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await asyncio.wait_for(conn.writer.drain(), timeout=_remaining(deadline))
+
+        status_line = await asyncio.wait_for(conn.reader.readline(), timeout=_remaining(deadline))
+        if not status_line:
+            raise ConnectionResetError("Backend closed the connection")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise LLMClientError(f"Bad status line: {status_line!r}")
+        resp_headers = {}
+        while True:
+            line = await asyncio.wait_for(conn.reader.readline(), timeout=_remaining(deadline))
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            resp_headers[name.strip().lower()] = value.strip()
+        return status, resp_headers
+
+    async def _iter_body(self, conn: _Connection, headers: dict,
+                         deadline: float) -> AsyncIterator[bytes]:
+        """Yield raw body chunks (handles Content-Length, chunked and EOF)."""
+        reader = conn.reader
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), timeout=_remaining(deadline))
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailer section ends with a blank line
+                    while True:
+                        line = await asyncio.wait_for(reader.readline(), timeout=_remaining(deadline))
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                    return
+                chunk = await asyncio.wait_for(reader.readexactly(size), timeout=_remaining(deadline))
+                await asyncio.wait_for(reader.readline(), timeout=_remaining(deadline))
+                yield chunk
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            while length > 0:
+                chunk = await asyncio.wait_for(reader.read(min(length, 65536)),
+                                               timeout=_remaining(deadline))
+                if not chunk:
+                    raise ConnectionResetError("Backend closed mid-body")
+                length -= len(chunk)
+                yield chunk
+        else:
+            while True:
+                chunk = await asyncio.wait_for(reader.read(65536), timeout=_remaining(deadline))
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def _reusable(headers: dict) -> bool:
+        if headers.get("connection", "").lower() == "close":
+            return False
+        return ("content-length" in headers
+                or headers.get("transfer-encoding", "").lower() == "chunked")
+
+    async def _exchange(self, method: str, url: str, payload: Any, deadline: float,
+                        lane: str = None,
+                        priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[bytes]:
+        """Run one request under a lane slot, yielding body chunks."""
+        key, path = self._split(url)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        self._bind_loop()
+        slots = self._lane(lane)
+        await slots.acquire(priority, deadline)
+        start = time.monotonic()
+        conn = None
+        reusable = False
+        self.requests += 1
+        try:
+            for attempt in (0, 1):
+                conn = await self._get_connection(key, deadline)
+                try:
+                    status, headers = await self._send(conn, method, key[1], path, body, deadline)
+                    break
+                except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                    # Stale keep-alive socket: retry once on a fresh one
+                    conn.close()
+                    conn = None
+                    if attempt:
+                        raise
+            if status >= 400:
+                detail = b"".join([c async for c in self._iter_body(conn, headers, deadline)])
+                raise LLMClientError(f"HTTP {status} from {url}: {detail[:200]!r}",
+                                     status=status)
+            async for chunk in self._iter_body(conn, headers, deadline):
+                yield chunk
+            reusable = self._reusable(headers)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            if conn is not None:
+                self._return_connection(key, conn, reusable)
+            self.total_latency += time.monotonic() - start
+            slots.release(priority)
+
+    # -- public API ---------------------------------------------------------
+
+    async def get_status(self, url: str, timeout: float = 5) -> int:
+        """GET a URL and return its HTTP status (body discarded)."""
+        deadline = time.monotonic() + timeout
+        try:
+            async for _ in self._exchange("GET", url, None, deadline):
+                pass
+        except LLMClientError as e:
+            if e.status is not None:
+                return e.status
+            raise
+        return 200
+
+    async def post_json(self, url: str, payload: dict, timeout: float, *,
+                        lane: str = None, priority: int = PRIORITY_INTERACTIVE) -> dict:
+        """POST JSON and return the decoded JSON response."""
+        deadline = time.monotonic() + timeout
+        chunks = [c async for c in self._exchange("POST", url, payload, deadline,
+                                                  lane, priority)]
+        return json.loads(b"".join(chunks).decode("utf-8"))
+
+    async def stream_json(self, url: str, payload: dict, timeout: float, *,
+                          lane: str = None,
+                          priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[dict]:
+        """POST JSON and yield each streamed JSON object as it arrives.
+
+        Understands newline-delimited JSON (Ollama) and SSE ``data:`` lines
+        (OpenAI-compatible servers); a ``data: [DONE]`` line ends the stream.
+        """
+        deadline = time.monotonic() + timeout
+        buf = b""
+        done = False
+        # Keep draining after [DONE] so the connection ends cleanly and
+        # can go back into the pool.
+        async for chunk in self._exchange("POST", url, payload, deadline, lane, priority):
+            if done:
+                continue
+            buf += chunk
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                obj = self._parse_stream_line(line)
+                if obj is _DONE:
+                    done = True
+                    break
+                if obj is not None:
+                    yield obj
+        if not done:
+            obj = self._parse_stream_line(buf)
+            if obj is not None and obj is not _DONE:
+                yield obj
+
+    @staticmethod
+    def _parse_stream_line(line: bytes):
+        line = line.strip()
+        if not line or line.startswith(b":"):
+            return None
+        if line.startswith(b"data:"):
+            line = line[5:].strip()
+            if line == b"[DONE]":
+                return _DONE
+        try:
+            return json.loads(line.decode("utf-8"))
+        except ValueError:
+            logger.debug(f"Skipping unparseable stream line: {line[:80]!r}")
+            return None
+
+    async def close(self):
+        """Close every pooled connection."""
+        for pool in self._pools.values():
+            for conn in pool:
+                conn.close()
+        self._pools = {}
+
+    def get_stats(self) -> dict:
+        done = max(self.requests, 1)
+        lanes = list(self.lanes.values())
+        return {
+            "active": sum(lane.active for lane in lanes),
+            "waiting": sum(lane.waiting for lane in lanes),
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "idle_connections": sum(len(p) for p in self._pools.values()),
+            "avg_latency_ms": round(self.total_latency / done * 1000, 1),
+            "avg_queue_wait_ms": round(
+                sum(lane.total_queue_wait for lane in lanes) / done * 1000, 1),
+            "lanes": {lane.name: lane.get_stats() for lane in lanes},
+        }
+
+
+_DONE = object()
+
+
+# Characters trimmed from both ends of an NPC reply
+REPLY_STRIP = ' \t\r\n"\''
+
+# Longest NPC reply shown to a player; longer replies end in "..."
+MAX_REPLY_CHARS = 500
+
+
+class TokenStreamer:
+    """Forward partial LLM text to a telnet/WebSocket writer as it arrives.
+
+    Applies the same cleanup as a non-streamed reply: leading and
+    trailing quotes/whitespace are dropped and the reply is cut at
+    ``limit`` characters with "...". Trailing quote characters and the
+    last few characters before the limit are held back until more text
+    (or finish()) shows whether they belong in the reply.
+
+    The prefix (e.g. ``Aldric says: "``) is written with the first
+    non-empty chunk; ``started`` tells the caller whether anything was
+    shown, and ``finished`` whether the whole reply was streamed.
+    """
+
+    def __init__(self, writer, prefix: str = "", limit: int = MAX_REPLY_CHARS):
+        self.writer = writer
+        self.prefix = prefix
+        self.limit = limit
+        self.started = False
+        self.finished = False
+        self.truncated = False
+        self.text = ""
+        self._shown = 0
+        self._pending = ""
+
+    def _write(self, text: str):
+        self.text += text
+        try:
+            self.writer.write(text)
+        except Exception:
+            pass
+
+    def __call__(self, chunk: str):
+        if not chunk or self.truncated or self.finished:
+            return
+        if not self.started:
+            chunk = chunk.lstrip(REPLY_STRIP)
+            if not chunk:
+                return
+            self.started = True
+            self._write(self.prefix)
+        self._pending += chunk
+        body = self._pending.rstrip(REPLY_STRIP)
+        room = self.limit - 3 - self._shown
+        if self._shown + len(body) > self.limit:
+            self._write(body[:room] + "...")
+            self.truncated = True
+            self._pending = ""
+            return
+        safe = min(len(body), room)
+        if safe > 0:
+            self._write(body[:safe])
+            self._shown += safe
+            self._pending = self._pending[safe:]
+
+    def finish(self):
+        """The reply is complete: write what was held back, minus trailing quotes."""
+        if self.started and not self.truncated:
+            self._write(self._pending.rstrip(REPLY_STRIP))
+        self._pending = ""
+        self.finished = True
+
+
+# Global client instance
+llm_client = LLMClient()
+
+
+def get_llm_client() -> LLMClient:
+    """Get the global LLM HTTP client."""
+    return llm_client
+
+
+def configure(max_concurrency: int = None, max_queue: int = None,
+              pool_size: int = None):
+    """Adjust limits on the global client's default lane."""
+    llm_client.configure_lane(DEFAULT_LANE, max_concurrency=max_concurrency,
+                              max_queue=max_queue)
+    if pool_size is not None:
+        llm_client.pool_size = max(0, int(pool_size))
+
+
+def configure_lane(name: str, max_concurrency: int = None, max_queue: int = None,
+                   background_limit: int = None):
+    """Create or resize a lane on the global client."""
+    return llm_client.configure_lane(name, max_concurrency=max_concurrency,
+                                     max_queue=max_queue,
+                                     background_limit=background_limit)
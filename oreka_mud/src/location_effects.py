@@ -2,16 +2,67 @@
 Location Effects System for OrekaMUD3.
 Handles room-based environmental mechanics: Kin-sense modifiers, elemental resonance,
 environmental hazards, rune-circles, and sanctuaries.
+
+Hazards are tracked through a registry of hazard-bearing rooms, built from
+room.effects on the first tick. Code that adds a room, changes its vnum or
+edits its effects at runtime (@dig, @setvnum, module merges) must call
+update_room() so the registry follows. Each tick visits only the occupants of those rooms, and
+exposure timers sit in a due-time heap keyed by (player, room, hazard
+index); a timer whose player has left is dropped when it comes due.
 """
+import heapq
+import itertools
 import random
 import time
 
+# Heartbeat period for tick_hazards; hazard intervals finer than this round up
+HAZARD_PULSE = 5
+
+
+def _room_hazards(room):
+    """The hazard effects of a room, as a list (empty if none)."""
+    return [e for e in (getattr(room, 'effects', None) or []) if e.get("type") == "hazard"]
+
 
 class LocationEffectsManager:
     """Processes room effects on player entry, exit, and periodic ticks."""
 
     def __init__(self):
-        self.hazard_timers = {}  # {(player_name, room_vnum): last_tick_time}
+        self.hazard_rooms = {}  # {room_vnum: [hazard effect, ...]}
+        self._indexed_world = None
+        # Exposure timers: heap of (due, seq, key), key = (player_name, room_vnum, hazard_index);
+        # _timers holds each key's live due time and player
+        self._timer_heap = []
+        self._timers = {}
+        self._seq = itertools.count()
+
+    # === HAZARD REGISTRY ===
+
+    def index_world(self, world):
+        """Rebuild the hazard room registry from every room's effects."""
+        self.hazard_rooms = {}
+        for vnum, room in world.rooms.items():
+            hazards = _room_hazards(room)
+            if hazards:
+                self.hazard_rooms[vnum] = hazards
+        self._indexed_world = world
+
+    def update_room(self, room, old_vnum=None):
+        """
+        Refresh one room's registry entry after it was created, renumbered
+        from old_vnum, or had its effects edited.
+        """
+        if old_vnum is not None:
+            self.hazard_rooms.pop(old_vnum, None)
+        hazards = _room_hazards(room)
+        if hazards:
+            self.hazard_rooms[room.vnum] = hazards
+        else:
+            self.hazard_rooms.pop(room.vnum, None)
+
+    def _schedule(self, key, player, due):
+        self._timers[key] = (due, player)
+        heapq.heappush(self._timer_heap, (due, next(self._seq), key))
 
     def on_room_enter(self, character, room):
         """Called when a player enters a room. Returns list of messages to show."""
@@ -50,8 +101,8 @@ class LocationEffectsManager:
 
     def on_room_exit(self, character, room):
         """Called when player leaves a room. Clean up timers."""
-        key = (character.name, room.vnum)
-        self.hazard_timers.pop(key, None)
+        for index in range(len(self.hazard_rooms.get(room.vnum, ()))):
+            self._timers.pop((character.name, room.vnum, index), None)
 
     # === KIN-SENSE MODIFIERS ===
 
@@ -129,73 +180,87 @@ class LocationEffectsManager:
         Returns list of (player, message) tuples."""
         notifications = []
         now = time.time()
+        if self._indexed_world is not world:
+            self.index_world(world)
 
-        for player in world.players:
-            if not hasattr(player, 'room') or not player.room:
+        # Start timers for anyone standing in a hazard room without one
+        for vnum, hazards in self.hazard_rooms.items():
+            room = world.rooms.get(vnum)
+            if room is None or not room.players:
+                continue
+            for player in room.players:
+                for index in range(len(hazards)):
+                    key = (player.name, vnum, index)
+                    if key not in self._timers:
+                        self._schedule(key, player, now)
+
+        heap = self._timer_heap
+        while heap and heap[0][0] <= now:
+            due, _seq, key = heapq.heappop(heap)
+            entry = self._timers.get(key)
+            if entry is None or entry[0] != due:
+                continue  # Superseded or evicted
+            player = entry[1]
+            _name, vnum, index = key
+            hazards = self.hazard_rooms.get(vnum, ())
+            room = getattr(player, 'room', None)
+            if index >= len(hazards) or room is None or room.vnum != vnum:
+                del self._timers[key]  # Player left or hazard removed
                 continue
 
-            effects = getattr(player.room, 'effects', None) or []
-            for effect in effects:
-                if effect.get("type") != "hazard":
-                    continue
-
-                interval = effect.get("interval", 300)
-                key = (player.name, player.room.vnum)
-                last_tick = self.hazard_timers.get(key, 0)
-
-                if now - last_tick < interval:
-                    continue
-
-                self.hazard_timers[key] = now
-
-                # Make save
-                save_type = effect.get("save", "fort")
-                dc = effect.get("dc", 14)
-                damage_str = effect.get("damage", "1d6")
-                damage_type = effect.get("damage_type", "fire")
-                resist_element = effect.get("resist_element", damage_type)
-
-                # Calculate save bonus
-                save_mod = 0
-                if save_type == "fort":
-                    save_mod = getattr(player, 'fort_save', 0) or (getattr(player, 'con_score', 10) - 10) // 2
-                elif save_type == "reflex":
-                    save_mod = getattr(player, 'ref_save', 0) or (getattr(player, 'dex_score', 10) - 10) // 2
-                elif save_type == "will":
-                    save_mod = getattr(player, 'will_save', 0) or (getattr(player, 'wis_score', 10) - 10) // 2
-
-                roll = random.randint(1, 20) + save_mod
-
-                if roll >= dc:
-                    msg = f"\033[0;33m[Hazard] You endure the {damage_type} hazard. (Save: {roll} vs DC {dc})\033[0m"
-                    notifications.append((player, msg))
-                else:
-                    # Roll damage
-                    damage = self._roll_dice(damage_str)
-
-                    # Check resistance
-                    elem_affinity = getattr(player, 'elemental_affinity', '')
-                    if elem_affinity and resist_element:
-                        # Matching elemental affinity grants natural resistance
-                        element_map = {"earth": "acid", "fire": "fire", "water": "cold", "wind": "electricity"}
-                        if element_map.get(elem_affinity) == damage_type:
-                            damage = max(0, damage - 5)
-
-                    # Check divine buffs for resistance
-                    divine = getattr(player, 'divine_buffs', {})
-                    resist = divine.get('resist', {})
-                    if damage_type in resist:
-                        damage = max(0, damage - resist[damage_type])
-
-                    if damage > 0 and hasattr(player, 'hp'):
-                        player.hp -= damage
-                        msg = f"\033[1;31m[Hazard] The {damage_type} hazard burns you for {damage} damage! (Save: {roll} vs DC {dc})\033[0m"
-                    else:
-                        msg = f"\033[0;33m[Hazard] Your resistance absorbs the {damage_type} hazard.\033[0m"
-                    notifications.append((player, msg))
+            effect = hazards[index]
+            self._schedule(key, player, now + effect.get("interval", 300))
+            notifications.append((player, self._apply_hazard(player, effect)))
 
         return notifications
 
+    def _apply_hazard(self, player, effect):
+        """Roll one hazard exposure against *player*. Returns the message."""
+        # Make save
+        save_type = effect.get("save", "fort")
+        dc = effect.get("dc", 14)
+        damage_str = effect.get("damage", "1d6")
+        damage_type = effect.get("damage_type", "fire")
+        resist_element = effect.get("resist_element", damage_type)
+
+        # Calculate save bonus
+        save_mod = 0
+        if save_type == "fort":
+            save_mod = getattr(player, 'fort_save', 0) or (getattr(player, 'con_score', 10) - 10) // 2
+        elif save_type == "reflex":
+            save_mod = getattr(player, 'ref_save', 0) or (getattr(player, 'dex_score', 10) - 10) // 2
+        elif save_type == "will":
+            save_mod = getattr(player, 'will_save', 0) or (getattr(player, 'wis_score', 10) - 10) // 2
+
+        roll = random.randint(1, 20) + save_mod
+
+        if roll >= dc:
+            return f"\033[0;33m[Hazard] You endure the {damage_type} hazard. (Save: {roll} vs DC {dc})\033[0m"
+        else:
+            # Roll damage
+            damage = self._roll_dice(damage_str)
+
+            # Check resistance
+            elem_affinity = getattr(player, 'elemental_affinity', '')
+            if elem_affinity and resist_element:
+                # Matching elemental affinity grants natural resistance
+                element_map = {"earth": "acid", "fire": "fire", "water": "cold", "wind": "electricity"}
+                if element_map.get(elem_affinity) == damage_type:
+                    damage = max(0, damage - 5)
+
+            # Check divine buffs for resistance
+            divine = getattr(player, 'divine_buffs', {})
+            resist = divine.get('resist', {})
+            if damage_type in resist:
+                damage = max(0, damage - resist[damage_type])
+
+            if damage > 0 and hasattr(player, 'hp'):
+                player.hp -= damage
+                msg = f"\033[1;31m[Hazard] The {damage_type} hazard burns you for {damage} damage! (Save: {roll} vs DC {dc})\033[0m"
+            else:
+                msg = f"\033[0;33m[Hazard] Your resistance absorbs the {damage_type} hazard.\033[0m"
+            return msg
+
     # === RUNE CIRCLES ===
 
     def _handle_rune_circle_enter(self, character, effect):
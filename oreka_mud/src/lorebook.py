@@ -21,6 +21,12 @@ The scanner checks the player's latest message AND the last few
 conversation turns for keyword matches, then returns the top entries
 sorted by priority, capped at a configurable total token budget.
 
+Matching is a single pass over the text: keywords are normalized the
+same way as conversation text at load, single words are looked up from
+the text's token set, and multi-word phrases run through an Aho-Corasick
+automaton.  Matches are memoized per conversation window (the exact
+scanned text), since consecutive prompt builds rescan the same history.
+
 Usage in the prompt builder:
 
     from src.lorebook import get_lorebook, scan_for_lore
@@ -37,6 +43,8 @@ import json
 import logging
 import os
 import re
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger("OrekaMUD.Lorebook")
@@ -55,6 +63,64 @@ DEFAULT_MAX_TOTAL_TOKENS = 800
 # Minimum keyword length to avoid false positives on short words
 MIN_KEYWORD_LENGTH = 3
 
+# Conversation windows whose matches are memoized
+MAX_CACHED_SCANS = 256
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace for matching."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+# ---------------------------------------------------------------------------
+# Phrase automaton
+# ---------------------------------------------------------------------------
+
+class _PhraseAutomaton:
+    """Aho-Corasick automaton: finds every phrase occurring in a text in
+    one pass, with the same results as ``phrase in text`` per phrase."""
+
+    def __init__(self, phrases):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for phrase in phrases:
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append(phrase)
+
+        # Breadth-first failure links
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        """Set of phrases occurring in *text*."""
+        found = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
 
 # ---------------------------------------------------------------------------
 # Data loading
@@ -65,10 +131,19 @@ class Lorebook:
 
     def __init__(self):
         self.entries: List[Dict[str, Any]] = []
-        # keyword (lowercased) -> list of entry indices
+        # keyword (normalized) -> list of entry indices
         self._keyword_index: Dict[str, List[int]] = {}
+        self._keyword_rank: Dict[str, int] = {}
+        self._phrases: Optional[_PhraseAutomaton] = None
+        self._scan_cache: "OrderedDict[str, Dict[int, List[str]]]" = OrderedDict()
         self._loaded = False
 
+        # Scan counters (shown by lorebook_status)
+        self.scans = 0
+        self.cache_hits = 0
+        self.scan_seconds = 0.0
+        self.last_scan_seconds = 0.0
+
     def load(self, path: Optional[str] = None) -> None:
         path = path or _DATA_PATH
         try:
@@ -77,6 +152,10 @@ class Lorebook:
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logger.warning("lorebook.json load failed: %s", e)
             self.entries = []
+            self._keyword_index = {}
+            self._keyword_rank = {}
+            self._phrases = None
+            self._scan_cache.clear()
             self._loaded = True
             return
 
@@ -97,13 +176,19 @@ class Lorebook:
 
             # Build keyword index
             for kw in entry["keywords"]:
-                kw_lower = kw.strip().lower()
-                if len(kw_lower) < MIN_KEYWORD_LENGTH:
+                kw_norm = _normalize_text(kw)
+                if len(kw_norm) < MIN_KEYWORD_LENGTH:
                     continue
-                self._keyword_index.setdefault(kw_lower, []).append(
-                    len(self.entries) - 1
-                )
-
+                indices = self._keyword_index.setdefault(kw_norm, [])
+                # "kin-sense" and "kin sense" normalize to one keyword
+                if not indices or indices[-1] != len(self.entries) - 1:
+                    indices.append(len(self.entries) - 1)
+
+        self._keyword_rank = {kw: i for i, kw in enumerate(self._keyword_index)}
+        self._phrases = _PhraseAutomaton(
+            kw for kw in self._keyword_index if " " in kw
+        )
+        self._scan_cache.clear()
         self._loaded = True
         logger.info("Lorebook: loaded %d entries with %d keywords",
                     len(self.entries), len(self._keyword_index))
@@ -112,6 +197,39 @@ class Lorebook:
         self._loaded = False
         self.load()
 
+    def match(self, normalized: str) -> Dict[int, List[str]]:
+        """Entry index -> matched keywords for already-normalized text.
+
+        Single words match whole tokens; phrases match as substrings.
+        Returns a fresh copy, so callers may mutate the keyword lists
+        without corrupting the scan cache.
+        """
+        cached = self._scan_cache.get(normalized)
+        if cached is not None:
+            self._scan_cache.move_to_end(normalized)
+            self.cache_hits += 1
+            return {idx: list(kws) for idx, kws in cached.items()}
+
+        start = time.perf_counter()
+        index = self._keyword_index
+        matched_indices: Dict[int, List[str]] = {}
+        hits = [kw for kw in set(normalized.split()) if kw in index]
+        if self._phrases is not None:
+            hits.extend(self._phrases.find(normalized))
+        # Index order keeps priority ties in entry load order
+        for kw in sorted(hits, key=self._keyword_rank.__getitem__):
+            for idx in index[kw]:
+                matched_indices.setdefault(idx, []).append(kw)
+
+        elapsed = time.perf_counter() - start
+        self.scans += 1
+        self.scan_seconds += elapsed
+        self.last_scan_seconds = elapsed
+        self._scan_cache[normalized] = matched_indices
+        if len(self._scan_cache) > MAX_CACHED_SCANS:
+            self._scan_cache.popitem(last=False)
+        return {idx: list(kws) for idx, kws in matched_indices.items()}
+
 
 _lorebook: Optional[Lorebook] = None
 
@@ -128,11 +246,6 @@ def get_lorebook() -> Lorebook:
 # Keyword scanner
 # ---------------------------------------------------------------------------
 
-def _normalize_text(text: str) -> str:
-    """Lowercase and strip punctuation for matching."""
-    return re.sub(r"[^\w\s]", " ", text.lower())
-
-
 def scan_for_lore(text: str, *,
                   max_total_tokens: int = DEFAULT_MAX_TOTAL_TOKENS,
                   exclude_ids: Optional[set] = None) -> List[Dict[str, Any]]:
@@ -149,28 +262,14 @@ def scan_for_lore(text: str, *,
     if not book._loaded or not book.entries:
         return []
 
-    normalized = _normalize_text(text)
     exclude = exclude_ids or set()
 
     # Find all matching entries
-    matched_indices: Dict[int, List[str]] = {}  # entry_index -> [matched keywords]
-    for kw, indices in book._keyword_index.items():
-        # Check if the keyword appears as a whole word (or phrase) in the text
-        # Use word-boundary-like check for single words; substring for phrases
-        if " " in kw:
-            # Multi-word phrase: substring match
-            if kw in normalized:
-                for idx in indices:
-                    if book.entries[idx]["id"] not in exclude:
-                        matched_indices.setdefault(idx, []).append(kw)
-        else:
-            # Single word: check as whole word to avoid false positives
-            # e.g., "kin" shouldn't match "kinsweave" (kinsweave has its own entry)
-            pattern = r"\b" + re.escape(kw) + r"\b"
-            if re.search(pattern, normalized):
-                for idx in indices:
-                    if book.entries[idx]["id"] not in exclude:
-                        matched_indices.setdefault(idx, []).append(kw)
+    matched_indices = {
+        idx: keywords
+        for idx, keywords in book.match(_normalize_text(text)).items()
+        if book.entries[idx]["id"] not in exclude
+    }
 
     if not matched_indices:
         return []
@@ -238,13 +337,17 @@ def lorebook_status() -> str:
     n_entries = len(book.entries)
     n_keywords = len(book._keyword_index)
     total_tokens = sum(e.get("max_tokens", 0) for e in book.entries)
+    avg_us = book.scan_seconds / book.scans * 1e6 if book.scans else 0.0
     return (f"Lorebook: {n_entries} entries, {n_keywords} unique keywords, "
-            f"~{total_tokens} total tokens if all loaded")
+            f"~{total_tokens} total tokens if all loaded\n"
+            f"  Scans: {book.scans} (avg {avg_us:.0f}us, last "
+            f"{book.last_scan_seconds * 1e6:.0f}us), "
+            f"cache hits: {book.cache_hits}/{len(book._scan_cache)} windows cached")
 
 
 def test_keyword(keyword: str) -> List[str]:
     """Return entry IDs that would trigger on a given keyword."""
     book = get_lorebook()
-    kw = keyword.strip().lower()
+    kw = _normalize_text(keyword)
     indices = book._keyword_index.get(kw, [])
     return [book.entries[i]["id"] for i in indices]
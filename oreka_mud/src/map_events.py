@@ -13,9 +13,15 @@ viewer:
     7. Error log (pushed immediately via a logging handler)
 
 The snapshot is rebuilt from in-memory world state every
-``SNAPSHOT_INTERVAL`` seconds (default 2) and broadcast to all
-subscribers.  Error events are forwarded on a separate message type
-as they happen.
+``SNAPSHOT_INTERVAL`` seconds (default 2).  A viewer gets one full
+``snapshot`` when it subscribes; after that each frame is sent as a
+compact ``delta`` (entities entered / left / changed fields, keyed per
+overlay by ``ENTITY_KEYS``).  Each frame is serialized once and handed
+to every subscriber's bounded send queue; a per-subscriber sender task
+drains it, so one slow browser never delays the others.  A viewer whose
+queue overflows has its stale frames dropped and is resynced with the
+next full snapshot.  Error events are forwarded on a separate message
+type as they happen.
 
 Admin auth (v1): a single shared token configured via the
 ``OREKA_MAP_TOKEN`` environment variable.  The viewer must send it as
@@ -32,7 +38,7 @@ import os
 import secrets
 import time
 from collections import deque
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List
 
 logger = logging.getLogger("OrekaMUD.Map")
 
@@ -43,21 +49,149 @@ logger = logging.getLogger("OrekaMUD.Map")
 
 MAP_WS_PORT = int(os.environ.get("OREKA_MAP_WS_PORT", "8766"))
 MAP_WS_HOST = os.environ.get("OREKA_MAP_WS_HOST", "127.0.0.1")
-SNAPSHOT_INTERVAL = 2.0          # seconds between full snapshots
+SNAPSHOT_INTERVAL = 2.0          # seconds between frames
+SEND_QUEUE_SIZE = 8              # frames buffered per viewer before resync
 ERROR_RING_SIZE = 100            # retained recent errors
 AUTH_TIMEOUT = 10.0              # seconds to send auth before disconnect
 
+# Entity overlays diffed per frame, and the field identifying each entity
+ENTITY_KEYS = {
+    "players":       "name",
+    "stalkers":      "id",
+    "chat_sessions": "player",
+    "gods":          "name",
+}
+
+
+# ---------------------------------------------------------------------------
+# Frame diffing
+# ---------------------------------------------------------------------------
+
+def _diff_entities(old: List[dict], new: List[dict], key: str) -> Dict[str, list]:
+    before = {e.get(key): e for e in old}
+    after = {e.get(key): e for e in new}
+    entered, changed, unset = [], [], []
+    for k, entity in after.items():
+        prior = before.get(k)
+        if prior is None:
+            entered.append(entity)
+        elif prior != entity:
+            fields = {f: v for f, v in entity.items() if f not in prior or prior[f] != v}
+            if fields:
+                fields[key] = k
+                changed.append(fields)
+            dropped = [f for f in prior if f not in entity]
+            if dropped:
+                unset.append({key: k, "fields": dropped})
+    left = [k for k in before if k not in after]
+    out: Dict[str, list] = {}
+    if entered:
+        out["entered"] = entered
+    if left:
+        out["left"] = left
+    if changed:
+        out["changed"] = changed
+    if unset:
+        out["unset"] = unset
+    return out
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Compact delta turning snapshot ``old`` into ``new`` (None if identical).
+
+    Entity overlays carry ``entered`` (full entries), ``left`` (keys),
+    ``changed`` (key plus changed fields) and ``unset`` (key plus the
+    ``fields`` an entry no longer has); combat rooms carry
+    ``added``/``removed`` vnums; weather carries changed/removed regions;
+    time of day is resent whole when it changes.
+    """
+    delta: Dict[str, Any] = {}
+    for overlay, key in ENTITY_KEYS.items():
+        d = _diff_entities(old.get(overlay, []), new.get(overlay, []), key)
+        if d:
+            delta[overlay] = d
+
+    before, after = set(old.get("combat_rooms", [])), set(new.get("combat_rooms", []))
+    if before != after:
+        delta["combat_rooms"] = {"added": sorted(after - before),
+                                 "removed": sorted(before - after)}
+
+    old_w, new_w = old.get("weather", {}), new.get("weather", {})
+    if old_w != new_w:
+        delta["weather"] = {
+            "changed": {r: w for r, w in new_w.items() if old_w.get(r) != w},
+            "removed": [r for r in old_w if r not in new_w],
+        }
+
+    if old.get("time_of_day") != new.get("time_of_day"):
+        delta["time_of_day"] = new.get("time_of_day")
+
+    if not delta:
+        return None
+    delta["type"] = "delta"
+    delta["timestamp"] = new.get("timestamp", time.time())
+    return delta
+
 
 # ---------------------------------------------------------------------------
 # The broker
 # ---------------------------------------------------------------------------
 
+class _Subscriber:
+    """One viewer: a bounded queue of serialized frames and its sender task."""
+
+    def __init__(self, ws, broker: "MapEventBroker") -> None:
+        self.ws = ws
+        self.broker = broker
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.needs_full = False
+        self.sent = 0
+        self.dropped = 0
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, message: str, state: bool = True) -> None:
+        """Queue a frame.  ``state`` frames (snapshot/delta) must not be
+        lost silently: on overflow the backlog is discarded and the viewer
+        is resynced with the next full snapshot.  Other events just drop."""
+        if state and self.needs_full:
+            return
+        if not self.queue.full():
+            self.queue.put_nowait(message)
+            return
+        if not state:
+            self.dropped += 1
+            return
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.needs_full = True
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                message = await self.queue.get()
+                await self.ws.send(message)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.broker.subscribers.pop(self.ws, None)
+
+
 class MapEventBroker:
     """Tracks subscribed viewers and broadcasts snapshots / events to them."""
 
     def __init__(self) -> None:
-        self.subscribers: Set[Any] = set()
+        self.subscribers: Dict[Any, _Subscriber] = {}
         self.recent_errors: deque = deque(maxlen=ERROR_RING_SIZE)
+        # Last published frame: the base every viewer's deltas apply to
+        self._snapshot: Dict[str, Any] | None = None
+        self._full_message: str | None = None
+        # Instrumentation
+        self.frames = 0
+        self.deltas = 0
+        self.resyncs = 0
+        self.bytes_serialized = 0
         # Shared admin token.  Preference: env > generated random.
         self.token = os.environ.get("OREKA_MAP_TOKEN")
         if not self.token:
@@ -69,28 +203,75 @@ class MapEventBroker:
         else:
             logger.info("Map WS: using OREKA_MAP_TOKEN from environment")
 
-    async def subscribe(self, ws) -> None:
-        self.subscribers.add(ws)
+    def _serialize(self, payload: dict) -> str:
+        message = json.dumps(payload, default=str, separators=(",", ":"))
+        self.bytes_serialized += len(message)
+        return message
+
+    def full_message(self) -> str:
+        """The current base frame as a full snapshot (serialized once)."""
+        if self._full_message is None:
+            self._full_message = self._serialize(self._snapshot)
+        return self._full_message
+
+    async def subscribe(self, ws, world=None) -> None:
+        """Register a viewer and queue its initial full snapshot."""
+        if world is not None and (self._snapshot is None or not self.subscribers):
+            # No live stream to stay consistent with: start a fresh base
+            self._snapshot = build_snapshot(world)
+            self._full_message = None
+        sub = _Subscriber(ws, self)
+        if self._snapshot is not None:
+            sub.offer(self.full_message())
+        else:
+            sub.needs_full = True
+        self.subscribers[ws] = sub
         logger.info("Map WS: subscriber connected (%d total)",
                     len(self.subscribers))
 
     async def unsubscribe(self, ws) -> None:
-        self.subscribers.discard(ws)
+        sub = self.subscribers.pop(ws, None)
+        if sub is not None:
+            sub.task.cancel()
         logger.info("Map WS: subscriber disconnected (%d total)",
                     len(self.subscribers))
 
+    def publish_frame(self, snapshot: Dict[str, Any]) -> None:
+        """Diff against the previous frame and fan the result out."""
+        prev = self._snapshot
+        self._snapshot = snapshot
+        self._full_message = None
+        self.frames += 1
+        delta = diff_snapshots(prev, snapshot) if prev is not None else None
+        delta_message = self._serialize(delta) if delta else None
+        if delta_message:
+            self.deltas += 1
+        for sub in list(self.subscribers.values()):
+            if sub.needs_full or prev is None:
+                if sub.needs_full:
+                    self.resyncs += 1
+                sub.needs_full = False
+                sub.offer(self.full_message())
+            elif delta_message:
+                sub.offer(delta_message)
+
     async def broadcast(self, payload: dict) -> None:
+        """Send a one-off event (e.g. an error) to every viewer."""
         if not self.subscribers:
             return
-        message = json.dumps(payload, default=str)
-        dead: List[Any] = []
-        for ws in list(self.subscribers):
-            try:
-                await ws.send(message)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.subscribers.discard(ws)
+        message = self._serialize(payload)
+        for sub in list(self.subscribers.values()):
+            sub.offer(message, state=False)
+
+    def get_status(self) -> str:
+        subs = list(self.subscribers.values())
+        return "\n".join([
+            "Live Map Stream:",
+            f"  Viewers: {len(subs)}  Frames: {self.frames}  Deltas: {self.deltas}  "
+            f"Resyncs: {self.resyncs}",
+            f"  Serialized: {self.bytes_serialized // 1024} KB  "
+            f"Sent: {sum(s.sent for s in subs)}  Dropped: {sum(s.dropped for s in subs)}",
+        ])
 
     def record_error(self, record: logging.LogRecord) -> dict:
         entry = {
@@ -233,6 +414,7 @@ def build_snapshot(world) -> Dict[str, Any]:
             target = getattr(s, "target", None)
             target_room = getattr(target, "room", None) if target else None
             stalkers_out.append({
+                "id":              str(s.id),
                 "name":            getattr(s.mob, "name", "stalker"),
                 "cr":              getattr(s.mob, "cr", None),
                 "room_vnum":       int(getattr(s.mob, "room_vnum", 0)),
@@ -299,15 +481,14 @@ def build_snapshot(world) -> Dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 async def snapshot_broadcast_loop(world) -> None:
-    """Build and push a snapshot every SNAPSHOT_INTERVAL seconds."""
+    """Build a frame every SNAPSHOT_INTERVAL seconds and publish its delta."""
     broker = get_broker()
     while True:
         try:
             await asyncio.sleep(SNAPSHOT_INTERVAL)
             if not broker.subscribers:
                 continue  # no viewers -- skip the work
-            snap = build_snapshot(world)
-            await broker.broadcast(snap)
+            broker.publish_frame(build_snapshot(world))
         except asyncio.CancelledError:
             raise
         except Exception as e:
@@ -337,14 +518,12 @@ async def _handle_client(ws, world) -> None:
             await ws.close(code=4003, reason="auth failed")
             return
 
-        # Accepted.  Send a hello + initial snapshot, then register.
+        # Accepted.  Send a hello, then register; the initial full
+        # snapshot goes out through the subscriber's send queue.
         await ws.send(json.dumps({"type": "hello",
-                                  "interval": SNAPSHOT_INTERVAL}))
-        try:
-            await ws.send(json.dumps(build_snapshot(world), default=str))
-        except Exception:
-            pass
-        await broker.subscribe(ws)
+                                  "interval": SNAPSHOT_INTERVAL,
+                                  "deltas": True}))
+        await broker.subscribe(ws, world)
 
         # Hold the connection open; we don't expect further messages for v1.
         try:
@@ -1,8 +1,17 @@
 import random
 from .feats import get_feat
 from . import maneuvers
+from .state_version import Versioned, track_attrs
+
+# Attributes shown in Room.Mobs; writes bump state_version
+_SUMMARY_ATTRS = frozenset({"name", "hp", "max_hp"})
+
 
 class Mob:
+    state_version = 0
+    feats_version = 0  # keys the parsed feat table (feats.get_feat_table)
+    feats = Versioned("feats_version")
+
     def to_dict(self):
         """Serialize mob for saving (exclude live state like conditions, alive, etc)."""
         return {
@@ -84,6 +93,23 @@ class Mob:
     def grapple_escape(self, grappler):
         """Attempt to escape from a grapple."""
         return maneuvers.grapple_action_escape(self, grappler)
+
+    @property
+    def alive(self):
+        return self._alive
+
+    @alive.setter
+    def alive(self, value):
+        was_alive = self.__dict__.get('_alive', False)
+        self._alive = value
+        if was_alive != value:
+            self.state_version += 1
+        if was_alive and not value:
+            # Queue the respawn for mobs that came from a spawn point
+            spawn_point = self.__dict__.get('_spawn_point')
+            if spawn_point is not None:
+                spawn_point.on_mob_died(self)
+
     def __init__(self, vnum, name, level, hp_dice, ac, damage_dice, flags=None, 
                  type_="", alignment="", ability_scores=None, initiative=0, speed=None, attacks=None, 
                  special_attacks=None, special_qualities=None, feats=None, skills=None, saves=None, 
@@ -380,10 +406,8 @@ class Mob:
 
     def has_feat(self, feat_name):
         """Return True if mob has the named feat (case-insensitive, partial match allowed for Weapon Focus etc)."""
-        for f in self.feats:
-            if feat_name.lower() in f.lower():
-                return True
-        return False
+        from .feats import get_feat_table
+        return get_feat_table(self).has(feat_name)
 
     def is_weapon_proficient(self, weapon_name_or_type):
         # D&D 3.5 core proficiencies by class
@@ -405,6 +429,9 @@ class Mob:
             return w in ("club", "dagger", "heavy crossbow", "light crossbow", "quarterstaff")
         return False
 
+
+track_attrs(Mob, _SUMMARY_ATTRS, "state_version")
+
 # Weapon lists (abbreviated, expand as needed)
 SIMPLE_WEAPONS = set([
     "club", "dagger", "heavy crossbow", "light crossbow", "quarterstaff", "shortspear", "spear", "mace", "sickle", "javelin", "morningstar", "sling", "staff", "light mace", "heavy mace", "dart", "greatclub", "handaxe", "light hammer", "light pick", "heavy pick", "scythe"
@@ -340,6 +340,12 @@ def _extract_path_roots(expr: str) -> set:
     """
     if not isinstance(expr, str) or not expr.strip():
         return set()
+    # Compiled (and cached for runtime) by validate_persona already
+    from src.ai_schemas.arc_expression import compile_expression, ArcExpressionError
+    try:
+        return {path[0] for path in compile_expression(expr).paths}
+    except ArcExpressionError:
+        pass
     import re
     # Match identifiers, but only those followed by . or whitespace (not inside strings)
     tokens = re.findall(r'\b([A-Za-z_][A-Za-z_0-9]*)', expr)
@@ -388,13 +394,15 @@ def apply_module_to_world(module: Module, world) -> dict:
                 world.mobs[v] = mob
                 room_vnum = mob_data.get("room_vnum")
                 if room_vnum and room_vnum in world.rooms:
-                    world.rooms[room_vnum].mobs.append(mob)
+                    from src.world import get_location_index
+                    get_location_index(world).place_mob(mob, room_vnum)
                 stats["merged_mobs"] += 1
             except Exception as e:
                 logger.error(f"Failed to instantiate module mob vnum {v}: {e}")
 
     # Rooms
     if hasattr(world, 'rooms'):
+        from src.location_effects import get_location_effects
         from src.room import Room
         for room_data in module.rooms:
             v = room_data.get("vnum")
@@ -404,6 +412,7 @@ def apply_module_to_world(module: Module, world) -> dict:
                 room = Room(**room_data)
                 room._world = world
                 world.rooms[v] = room
+                get_location_effects().update_room(room)
                 stats["merged_rooms"] += 1
             except Exception as e:
                 logger.error(f"Failed to instantiate module room vnum {v}: {e}")
@@ -476,6 +485,10 @@ def apply_all_modules_to_world(world, modules_dir: str = None) -> dict:
         except Exception as e:
             logger.error(f"failed to apply module '{mod.module_id}': {e}")
             all_errors.append(f"{mod.module_id}: apply failed: {e}")
+    if applied:
+        # Module rooms may add or replace exits
+        from src.room_graph import get_room_graph
+        get_room_graph(world).invalidate()
 
     # Run arc migration for every loaded arc
     all_arcs = []
@@ -7,6 +7,13 @@ the escalating Silence Breach crisis.  Each chapter has trigger conditions
 
 Characters store completed chapter IDs in ``narrative_progress`` (a list).
 
+Triggers are reactive: at load each chapter is subscribed under its
+trigger type (level threshold, faction, quest id, room vnum or region),
+and the game's event hooks -- level-up, room entry, faction change, quest
+turn-in and kill -- evaluate only the chapters subscribed to that
+event.  The hooks return the cutscenes so they play on the command that
+caused them.  ``catch_up`` runs the full evaluation once at login.
+
 Usage
 -----
 ::
@@ -19,6 +26,7 @@ Usage
         writer.write(text)
 """
 
+import bisect
 import json
 import logging
 import os
@@ -287,6 +295,17 @@ class NarrativeManager:
         self.room_triggers: Dict[str, Dict[str, Any]] = dict(ROOM_NARRATIVE_TRIGGERS)
         self.kill_triggers: Dict[str, Dict[str, Any]] = dict(KILL_NARRATIVE_TRIGGERS)
         self.lore: Dict[str, str] = _load_lore()
+
+        # Trigger subscriptions, filled by _subscribe()
+        self._level_thresholds: List[int] = []
+        self._level_subs: List[Dict[str, Any]] = []
+        self._faction_subs: Dict[str, List[Dict[str, Any]]] = {}
+        self._quest_subs: Dict[Any, List[Dict[str, Any]]] = {}
+        self._room_vnum_subs: Dict[int, List[Dict[str, Any]]] = {}
+        self._region_subs: Dict[str, List[Dict[str, Any]]] = {}
+        for chapter in self.chapters:
+            self._subscribe(chapter)
+
         logger.info(
             "NarrativeManager initialised: %d chapters, %d room triggers, "
             "%d kill triggers, %d lore entries",
@@ -296,6 +315,51 @@ class NarrativeManager:
             len(self.lore),
         )
 
+    # ------------------------------------------------------------------
+    # Trigger subscriptions
+    # ------------------------------------------------------------------
+
+    def _subscribe(self, chapter: Dict[str, Any]) -> None:
+        """File *chapter* under the event that can satisfy its trigger."""
+        trigger = chapter.get("trigger", {})
+        ttype = trigger.get("type")
+        if ttype == "level":
+            threshold = trigger.get("value", 999)
+            pos = bisect.bisect_right(self._level_thresholds, threshold)
+            self._level_thresholds.insert(pos, threshold)
+            self._level_subs.insert(pos, chapter)
+        elif ttype == "faction_rep":
+            self._faction_subs.setdefault(trigger.get("faction", "any"), []).append(chapter)
+        elif ttype == "quest_complete":
+            self._quest_subs.setdefault(trigger.get("quest"), []).append(chapter)
+        elif ttype == "room":
+            if trigger.get("vnum") is not None:
+                self._room_vnum_subs.setdefault(trigger["vnum"], []).append(chapter)
+            elif trigger.get("region") is not None:
+                self._region_subs.setdefault(trigger["region"], []).append(chapter)
+        elif ttype != "kill":
+            logger.debug("Chapter '%s' has unknown trigger type: %s",
+                         chapter.get("id"), ttype)
+
+    def register_chapter(self, chapter: Dict[str, Any]) -> None:
+        """Add a main-arc chapter and subscribe its trigger."""
+        self.chapters.append(chapter)
+        self._subscribe(chapter)
+
+    def _fire(
+        self, character, candidates: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], str]]:
+        """Trigger each candidate chapter whose condition now holds."""
+        results: List[Tuple[Dict[str, Any], str]] = []
+        for chapter in candidates:
+            if _has_chapter(character, chapter["id"]):
+                continue
+            if self._check_trigger(character, chapter.get("trigger", {})):
+                text, _rewards = self.trigger_chapter(character, chapter)
+                if text:
+                    results.append((chapter, text))
+        return results
+
     # ------------------------------------------------------------------
     # Trigger checking
     # ------------------------------------------------------------------
@@ -575,12 +639,35 @@ class NarrativeManager:
         Returns a list of ``(chapter, cutscene_text)`` for every chapter
         that just triggered.
         """
-        results: List[Tuple[Dict[str, Any], str]] = []
-        for chapter in self.check_triggers(character):
-            text, _rewards = self.trigger_chapter(character, chapter)
-            if text:
-                results.append((chapter, text))
-        return results
+        level = getattr(character, "level", 0)
+        reached = bisect.bisect_right(self._level_thresholds, level)
+        return self._fire(character, self._level_subs[:reached])
+
+    def catch_up(self, character) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Trigger every main-arc chapter *character* already qualifies for.
+
+        Called at login and by the ``story`` command, for chapters whose
+        conditions were met offline or before the chapter existed (e.g.
+        the level-1 awakening for a new character).
+        """
+        return self._fire(character, self.check_triggers(character))
+
+    def on_quest_complete(self, character, quest_id) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Called when *character* turns in a quest.
+
+        Fires quest_complete chapters for *quest_id*, plus level and
+        faction_rep chapters since quest rewards can grant a level and
+        reputation directly.
+        """
+        candidates = list(self._quest_subs.get(quest_id, []))
+        level = getattr(character, "level", 0)
+        candidates.extend(
+            self._level_subs[:bisect.bisect_right(self._level_thresholds, level)])
+        for chapters in self._faction_subs.values():
+            candidates.extend(chapters)
+        return self._fire(character, candidates)
 
     def on_enter_room(self, character, room) -> List[Tuple[Dict[str, Any], str]]:
         """
@@ -589,22 +676,14 @@ class NarrativeManager:
         Checks both main-arc room triggers and region-based narrative
         fragments.
         """
-        results: List[Tuple[Dict[str, Any], str]] = []
-
         # Main-arc triggers that use room-type conditions
-        for chapter in self.chapters:
-            cid = chapter["id"]
-            if _has_chapter(character, cid):
-                continue
-            trigger = chapter.get("trigger", {})
-            if trigger.get("type") == "room":
-                if self._check_trigger(character, trigger):
-                    text, _rewards = self.trigger_chapter(character, chapter)
-                    if text:
-                        results.append((chapter, text))
+        region = _room_region(room)
+        candidates = list(self._room_vnum_subs.get(getattr(room, "vnum", None), []))
+        if region:
+            candidates.extend(self._region_subs.get(region, []))
+        results = self._fire(character, candidates) if candidates else []
 
         # Region-based narrative fragments
-        region = _room_region(room)
         if region and region in self.room_triggers:
             trigger_data = self.room_triggers[region]
             cid = trigger_data["chapter"]
@@ -681,19 +760,8 @@ class NarrativeManager:
 
         Re-evaluates faction_rep triggers on main-arc chapters.
         """
-        results: List[Tuple[Dict[str, Any], str]] = []
-        for chapter in self.chapters:
-            cid = chapter["id"]
-            if _has_chapter(character, cid):
-                continue
-            trigger = chapter.get("trigger", {})
-            if trigger.get("type") != "faction_rep":
-                continue
-            if self._check_trigger(character, trigger):
-                text, _rewards = self.trigger_chapter(character, chapter)
-                if text:
-                    results.append((chapter, text))
-        return results
+        candidates = self._faction_subs.get(faction, []) + self._faction_subs.get("any", [])
+        return self._fire(character, candidates)
 
     # ------------------------------------------------------------------
     # Lore lookup
@@ -737,3 +805,38 @@ def get_narrative_manager() -> NarrativeManager:
     if _narrative_manager is None:
         _narrative_manager = NarrativeManager()
     return _narrative_manager
+
+
+def event_cutscenes(character, event: str, *args) -> List[str]:
+    """
+    Run the ``on_<event>`` hook for *character* and return the cutscene
+    texts, or an empty list if the hook fails.
+
+    Every path that changes a character's level, room or reputation goes
+    through this or :func:`announce_event`, since there is no sweep to
+    catch chapters a caller forgot to fire.
+    """
+    try:
+        hook = getattr(get_narrative_manager(), f"on_{event}")
+        return [text for _chapter, text in hook(character, *args)]
+    except Exception:
+        logger.exception("Narrative %s hook failed for %s",
+                         event, getattr(character, "name", "?"))
+        return []
+
+
+def announce_event(character, event: str, *args) -> List[str]:
+    """
+    Like :func:`event_cutscenes`, but also write each cutscene to
+    *character*'s connection, for callers with no command output to
+    append it to.
+    """
+    texts = event_cutscenes(character, event, *args)
+    writer = getattr(character, "_writer", None) or getattr(character, "writer", None)
+    if writer:
+        for text in texts:
+            try:
+                writer.write(text + "\n")
+            except Exception:
+                pass  # Player may have disconnected
+    return texts
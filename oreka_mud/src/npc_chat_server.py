@@ -20,6 +20,8 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
+from src.world import get_location_index
+
 logger = logging.getLogger("OrekaMUD.NPCChat")
 
 NPC_CHAT_PORT = 8767
@@ -163,13 +165,10 @@ def _list_chat_npcs(world) -> list:
         room_name = "unknown"
         room_vnum = getattr(mob, "room_vnum", None)
         if room_vnum is None:
-            # Find room by scanning
-            for r in world.rooms.values():
-                if mob in r.mobs:
-                    room = r
-                    room_vnum = r.vnum
-                    room_name = r.name
-                    break
+            room = get_location_index(world).room_of(mob)
+            if room:
+                room_vnum = room.vnum
+                room_name = room.name
         else:
             room = world.rooms.get(room_vnum)
             room_name = room.name if room else "unknown"
@@ -267,12 +266,11 @@ async def _handle_client(ws, world):
 
                 session.npc = mob
                 # Find the NPC's room for context
-                for r in world.rooms.values():
-                    if mob in r.mobs:
-                        session.room = r
-                        if not session.authenticated:
-                            session.player.room = r
-                        break
+                r = get_location_index(world).room_of(mob)
+                if r:
+                    session.room = r
+                    if not session.authenticated:
+                        session.player.room = r
 
                 session.history = []
                 npc_name = getattr(mob, "name", "NPC")
@@ -417,8 +415,11 @@ async def _handle_client(ws, world):
                     from src.prompt_pipeline import (
                         build_npc_prompt, extract_and_save_memory
                     )
-                    from src.ai import _call_ollama, _config
+                    from src.ai import call_llm, npc_model_tier, _config
+                    from src.npc_memory import get_npc_memory_store
 
+                    await get_npc_memory_store().prefetch(
+                        getattr(session.npc, "vnum", 0), session.player.name)
                     system_prompt, user_prompt = build_npc_prompt(
                         npc=session.npc,
                         player=session.player,
@@ -437,9 +438,11 @@ async def _handle_client(ws, world):
                                 gen_params = persona["generation"]
                         except Exception:
                             pass
-                        response = await _call_ollama(user_prompt,
-                                                       system_prompt,
-                                                       generation_params=gen_params)
+                        response = await call_llm(user_prompt,
+                                                  system_prompt,
+                                                  kind="chat",
+                                                  tier=npc_model_tier(session.npc),
+                                                  generation_params=gen_params)
                         if response:
                             response = response.strip().strip('"').strip("'")
                             if len(response) > 500:
@@ -0,0 +1,413 @@
+"""
+Unified NPC memory store.
+
+NPC memory used to live in three JSON layouts under data/npc_memories:
+chat sessions kept one file per NPC holding every player, the chat
+context kept one file per NPC/player pair re-sorted by importance on
+every read, and the prompt pipeline wrote a different document to that
+same per-pair path. Every chat turn re-read and re-parsed from disk and
+every save rewrote a whole file on the event loop.
+
+This module keeps one NPCMemory record per (npc vnum, player):
+
+- Session summary: facts, disposition, sessions, last_seen.
+- Importance-ranked memories, kept sorted on insert, so the top N are a
+  slice rather than a sort.
+- Records live in an LRU cache; a miss reads one row from SQLite
+  (data/npc_memory.db). Async chat paths call prefetch() first so the
+  read runs on a worker thread and the sync accessors hit the cache.
+- Changes mark the record dirty. The ``npc_memory`` heartbeat pulse
+  writes the dirty records in a single transaction on a worker thread.
+  Outside a running server (tests, scripts) writes go straight through.
+- The database is in WAL mode and reads use their own connection and
+  lock, so a read never waits behind a flush.
+- import_legacy() reads the three old layouts. A new database imports
+  them when it is opened: the server calls open() on a worker thread at
+  startup, and scripts/migrate_npc_memories.py runs it by hand.
+
+Usage:
+    store = get_npc_memory_store()
+    store.add_memory(npc_vnum, player_name, "Helped me", importance=0.5)
+    top = store.top_memories(npc_vnum, player_name, 5)
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("OrekaMUD.NPCMemory")
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DB_PATH = os.path.join(DATA_DIR, 'npc_memory.db')
+LEGACY_DIR = os.path.join(DATA_DIR, 'npc_memories')
+
+# Seconds between write-behind flushes (heartbeat period)
+FLUSH_PERIOD = 10
+
+# Records kept in memory
+MAX_CACHED = 1024
+
+# Per-record caps
+MAX_FACTS = 20
+MAX_MEMORIES = 20
+
+Key = Tuple[int, str]
+
+
+def _importance(memory: dict) -> float:
+    return -memory.get("importance", 0)
+
+
+@dataclass
+class NPCMemory:
+    """Everything one NPC remembers about one player."""
+    npc_vnum: int
+    player: str
+    npc_name: str = ""
+    facts: List[str] = field(default_factory=list)
+    disposition: str = "neutral"
+    sessions: int = 0
+    last_seen: Optional[str] = None
+    # Highest importance first; equal importance keeps insertion order
+    memories: List[dict] = field(default_factory=list)
+    last_interaction: float = 0
+
+    def add_facts(self, facts: List[str]):
+        existing = set(self.facts)
+        for fact in facts:
+            if fact and fact not in existing:
+                self.facts.append(fact)
+                existing.add(fact)
+        del self.facts[:-MAX_FACTS]
+
+    def add_memory(self, memory: dict):
+        pos = bisect.bisect_right(self.memories, _importance(memory), key=_importance)
+        if pos < MAX_MEMORIES:
+            self.memories.insert(pos, memory)
+            del self.memories[MAX_MEMORIES:]
+
+    def to_dict(self) -> dict:
+        return {
+            "npc_name": self.npc_name,
+            "facts": self.facts,
+            "disposition": self.disposition,
+            "sessions": self.sessions,
+            "last_seen": self.last_seen,
+            "memories": self.memories,
+            "last_interaction": self.last_interaction,
+        }
+
+    @classmethod
+    def from_dict(cls, npc_vnum: int, player: str, data: dict) -> "NPCMemory":
+        return cls(
+            npc_vnum=npc_vnum,
+            player=player,
+            npc_name=data.get("npc_name", ""),
+            facts=list(data.get("facts", [])),
+            disposition=data.get("disposition", "neutral"),
+            sessions=data.get("sessions", 0),
+            last_seen=data.get("last_seen"),
+            memories=sorted(data.get("memories", []), key=_importance),
+            last_interaction=data.get("last_interaction", 0),
+        )
+
+
+class NPCMemoryStore:
+    """LRU-cached, write-behind NPC memory records backed by SQLite."""
+
+    def __init__(self, db_path: str = DB_PATH, legacy_dir: Optional[str] = LEGACY_DIR):
+        self.db_path = db_path
+        self.legacy_dir = legacy_dir
+        self.active = False  # True once the server's flush pulse is running
+        self._cache: "OrderedDict[Key, NPCMemory]" = OrderedDict()
+        self._dirty: Dict[Key, NPCMemory] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()  # guards the write connection across threads
+        self._read_lock = threading.Lock()  # guards the read connection
+
+        # Instrumentation
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.flushes = 0
+        self.last_flush_count = 0
+
+    # -- storage ------------------------------------------------------------
+
+    def open(self):
+        """Create the database, importing legacy files into a new one.
+
+        Blocking: the server runs it on a worker thread at startup. Any
+        other first access opens it implicitly.
+        """
+        with self._lock:
+            if self._conn is not None:
+                return
+            fresh = not os.path.exists(self.db_path)
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS npc_memory ("
+                " npc_vnum INTEGER NOT NULL, player TEXT NOT NULL,"
+                " data TEXT NOT NULL, updated REAL NOT NULL,"
+                " PRIMARY KEY (npc_vnum, player))")
+            conn.commit()
+            self._reader = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn = conn
+            if fresh and self.legacy_dir and os.path.isdir(self.legacy_dir):
+                imported = import_legacy(self, self.legacy_dir)
+                if imported:
+                    logger.info(f"Imported {imported} legacy NPC memory record(s)")
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.open()
+        return self._conn
+
+    def _read(self, key: Key) -> Optional[dict]:
+        self._db()
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT data FROM npc_memory WHERE npc_vnum = ? AND player = ?",
+                key).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_rows(self, rows: List[tuple]):
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO npc_memory (npc_vnum, player, data, updated)"
+                    " VALUES (?, ?, ?, ?)", rows)
+        self.writes += len(rows)
+
+    # -- records ------------------------------------------------------------
+
+    def get(self, npc_vnum: int, player: str) -> NPCMemory:
+        """The record for this NPC and player (empty if they never met)."""
+        key = (int(npc_vnum or 0), player)
+        record = self._cache.get(key)
+        if record is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return record
+        self.misses += 1
+        return self._insert(key, self._read(key))
+
+    async def prefetch(self, npc_vnum: int, player: str):
+        """Load a record into the cache on a worker thread.
+
+        Async callers await this before the sync accessors so a cache
+        miss does not read SQLite on the event loop.
+        """
+        key = (int(npc_vnum or 0), player)
+        if key in self._cache:
+            return
+        data = await asyncio.get_running_loop().run_in_executor(None, self._read, key)
+        if key not in self._cache:  # a sync get() may have loaded it meanwhile
+            self.misses += 1
+            self._insert(key, data)
+
+    def _insert(self, key: Key, data: Optional[dict]) -> NPCMemory:
+        record = (NPCMemory.from_dict(key[0], key[1], data) if data is not None
+                  else NPCMemory(npc_vnum=key[0], player=key[1]))
+        self._cache[key] = record
+        self._evict()
+        return record
+
+    def _evict(self):
+        # Dirty records stay until they are flushed
+        excess = len(self._cache) - MAX_CACHED
+        if excess <= 0:
+            return
+        for key in list(self._cache):
+            if key not in self._dirty:
+                del self._cache[key]
+                excess -= 1
+                if excess <= 0:
+                    break
+
+    def mark_dirty(self, record: NPCMemory):
+        self._dirty[(record.npc_vnum, record.player)] = record
+        if not self.active:
+            self.flush()
+
+    def top_memories(self, npc_vnum: int, player: str, count: int = 5) -> List[dict]:
+        return self.get(npc_vnum, player).memories[:count]
+
+    def add_memory(self, npc_vnum: int, player: str, text: str,
+                   importance: float = 0.3, session_id: str = ""):
+        """Remember an event; only the MAX_MEMORIES most important are kept."""
+        record = self.get(npc_vnum, player)
+        now = time.time()
+        record.add_memory({
+            "text": text,
+            "importance": importance,
+            "session_id": session_id,
+            "created_at": now,
+        })
+        record.last_interaction = now
+        self.mark_dirty(record)
+
+    def record_session(self, npc_vnum: int, npc_name: str, player: str,
+                       facts: List[str], disposition: str = "neutral"):
+        """Merge a chat session's facts and count the session."""
+        record = self.get(npc_vnum, player)
+        record.npc_name = npc_name or record.npc_name
+        record.add_facts(facts)
+        record.disposition = disposition
+        record.sessions += 1
+        record.last_seen = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.mark_dirty(record)
+
+    def set_facts(self, npc_vnum: int, player: str, facts: List[str]):
+        """Replace the fact list (keeps the newest MAX_FACTS)."""
+        record = self.get(npc_vnum, player)
+        record.facts = list(facts[-MAX_FACTS:])
+        self.mark_dirty(record)
+
+    # -- write-behind ---------------------------------------------------------
+
+    def _take_dirty(self) -> Tuple[Dict[Key, NPCMemory], List[tuple]]:
+        """Take the dirty records and encode them on the calling (loop) thread."""
+        dirty, self._dirty = self._dirty, {}
+        now = time.time()
+        return dirty, [(r.npc_vnum, r.player, json.dumps(r.to_dict(), ensure_ascii=False), now)
+                       for r in dirty.values()]
+
+    def _requeue(self, dirty: Dict[Key, NPCMemory]):
+        """Retry records from a failed write on the next flush, unless
+        they were re-dirtied meanwhile."""
+        for key, record in dirty.items():
+            self._dirty.setdefault(key, record)
+
+    def flush(self):
+        """Write every dirty record now, in one transaction."""
+        dirty, rows = self._take_dirty()
+        if rows and not self._commit(rows):
+            self._requeue(dirty)
+
+    async def flush_async(self):
+        """Heartbeat pulse: encode on the loop, write on a worker thread."""
+        dirty, rows = self._take_dirty()
+        if rows:
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self._commit, rows):
+                self._requeue(dirty)
+
+    def _commit(self, rows: List[tuple]) -> bool:
+        try:
+            self._write_rows(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write NPC memory (will retry): {e}")
+            return False
+        self.flushes += 1
+        self.last_flush_count = len(rows)
+        return True
+
+    def get_status(self) -> str:
+        lookups = self.hits + self.misses
+        rate = f"{self.hits * 100 // lookups}%" if lookups else "n/a"
+        return "\n".join([
+            "NPC Memory Store:",
+            f"  Cached: {len(self._cache)}/{MAX_CACHED}  Dirty: {len(self._dirty)}  "
+            f"Hit rate: {rate}",
+            f"  Write-behind: {'active' if self.active else 'inactive (immediate writes)'}  "
+            f"Flushes: {self.flushes} (last {self.last_flush_count} records)  "
+            f"Records written: {self.writes}",
+        ])
+
+
+# ---------------------------------------------------------------------------
+# Legacy import
+# ---------------------------------------------------------------------------
+
+def _load_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable NPC memory file {path}: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def import_legacy(store: NPCMemoryStore, directory: str = LEGACY_DIR) -> int:
+    """Merge the old JSON layouts under ``directory`` into ``store``.
+
+    - ``<vnum>.json``: per-NPC file of {player: {facts, disposition, ...}}
+    - ``<vnum>/<player>.json`` with ``memories``: importance-ranked events
+    - ``<vnum>/<player>.json`` with ``facts``: prompt-pipeline facts
+
+    Facts and memories already present are not duplicated, so running
+    it twice is harmless. Returns the number of records touched.
+    """
+    records: Dict[Key, NPCMemory] = {}
+
+    def record_for(vnum: int, player: str) -> NPCMemory:
+        key = (vnum, player)
+        if key not in records:
+            data = store._read(key)
+            records[key] = (NPCMemory.from_dict(vnum, player, data) if data is not None
+                            else NPCMemory(npc_vnum=vnum, player=player))
+        return records[key]
+
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith('.json') and name[:-5].isdigit():
+            data = _load_json(path)
+            if data is None:
+                continue
+            vnum = int(name[:-5])
+            for player, mem in (data.get("memories") or {}).items():
+                record = record_for(vnum, player)
+                record.npc_name = data.get("npc_name", record.npc_name)
+                record.add_facts(mem.get("facts", []))
+                record.disposition = mem.get("disposition", record.disposition)
+                record.sessions = max(record.sessions, mem.get("sessions", 0))
+                record.last_seen = mem.get("last_seen") or record.last_seen
+        elif name.isdigit() and os.path.isdir(path):
+            vnum = int(name)
+            for fn in sorted(os.listdir(path)):
+                if not fn.endswith('.json'):
+                    continue
+                data = _load_json(os.path.join(path, fn))
+                if data is None:
+                    continue
+                player = data.get("player_name") or data.get("player") or fn[:-5]
+                record = record_for(vnum, player)
+                if isinstance(data.get("memories"), list):
+                    seen = {(m.get("text"), m.get("created_at")) for m in record.memories}
+                    for memory in data["memories"]:
+                        if (memory.get("text"), memory.get("created_at")) not in seen:
+                            record.add_memory(memory)
+                    record.last_interaction = max(record.last_interaction,
+                                                  data.get("last_interaction", 0))
+                if data.get("facts"):
+                    record.add_facts(data["facts"])
+
+    now = time.time()
+    store._write_rows([(r.npc_vnum, r.player, json.dumps(r.to_dict(), ensure_ascii=False), now)
+                       for r in records.values()])
+    for key in records:
+        store._cache.pop(key, None)
+    return len(records)
+
+
+# Global store instance
+npc_memory_store = NPCMemoryStore()
+
+
+def get_npc_memory_store() -> NPCMemoryStore:
+    """Get the global NPC memory store."""
+    return npc_memory_store
@@ -0,0 +1,240 @@
+"""
+Write-behind persistence for player saves.
+
+Character.save() used to copy the previous file to a fresh timestamped
+.bak.json and rewrite the whole indent=2 document synchronously on the
+event loop, every time. This module replaces that with:
+
+- Dirty tracking: save() during play just marks the character dirty;
+  repeated saves before the next flush coalesce into one write.
+- A heartbeat pulse (``player_saves``) flushes dirty characters. The
+  snapshot is encoded as compact JSON on the loop (so it is consistent
+  with live state) and the file I/O runs on a single worker thread.
+- A bounded ring of rotated backups per player: at most one new
+  ``<name>.<timestamp>.bak.json`` per BACKUP_INTERVAL, keeping the newest
+  MAX_BACKUPS. Character.rollback() reads the same files.
+- flush_sync() writes everything synchronously for shutdown.
+
+Outside a running server (tests, scripts) nothing is deferred: save()
+writes immediately.
+
+Usage:
+    store = get_player_store()
+    store.mark_dirty(character)
+    await store.flush()
+"""
+
+import asyncio
+import datetime
+import glob
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+logger = logging.getLogger("OrekaMUD.Persistence")
+
+PLAYER_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'players')
+
+# Rotated backups kept per player
+MAX_BACKUPS = 5
+
+# Minimum seconds between rotated backups for one player
+BACKUP_INTERVAL = 600
+
+# Seconds between write-behind flushes (heartbeat period)
+FLUSH_PERIOD = 10
+
+
+def player_path(name: str, player_dir: str = None) -> str:
+    return os.path.join(player_dir or PLAYER_DIR, f"{name.lower()}.json")
+
+
+def _backups(name: str, player_dir: str):
+    pattern = os.path.join(player_dir, f"{name.lower()}.*.bak.json")
+    return sorted(glob.glob(pattern))
+
+
+def write_player_file(name: str, payload: str, player_dir: str = None,
+                      backup: bool = True, max_backups: int = MAX_BACKUPS,
+                      backup_interval: float = BACKUP_INTERVAL) -> str:
+    """Atomically write an encoded player document, rotating backups.
+
+    The current file becomes a backup only if the newest backup is older
+    than ``backup_interval`` seconds (0 forces one); the ring is then
+    pruned to ``max_backups`` entries.
+    """
+    player_dir = player_dir or PLAYER_DIR
+    os.makedirs(player_dir, exist_ok=True)
+    filename = player_path(name, player_dir)
+
+    if backup and os.path.exists(filename):
+        existing = _backups(name, player_dir)
+        newest = os.path.getmtime(existing[-1]) if existing else 0
+        if time.time() - newest >= backup_interval:
+            stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_name = os.path.join(player_dir, f"{name.lower()}.{stamp}.bak.json")
+            # copyfile, not copy2: the backup's mtime must be its rotation time
+            shutil.copyfile(filename, backup_name)
+            existing.append(backup_name)
+        for old in existing[:-max_backups] if max_backups > 0 else existing:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    # Unique per writer so overlapping writes never share a temp file
+    tmpfile = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmpfile, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmpfile, filename)
+    except BaseException:
+        try:
+            os.remove(tmpfile)
+        except OSError:
+            pass
+        raise
+    return filename
+
+
+def encode_character(character) -> str:
+    """Compact JSON for a character (runs on the loop thread)."""
+    return json.dumps(character.to_dict(), separators=(',', ':'))
+
+
+class PlayerStore:
+    """Dirty-tracking write-behind queue for player files."""
+
+    def __init__(self, player_dir: str = None):
+        self.player_dir = player_dir
+        self.active = False  # True once the server's flush pulse is running
+        self._dirty: Dict[str, object] = {}
+        self._pending: Dict[str, object] = {}  # taken by flush(), not yet written
+        self._executor = None
+        self._flushing = False
+
+        # Instrumentation
+        self.saves = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.last_flush_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._dirty.keys() | self._pending.keys())
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # One writer thread: saves for a player never race each other
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="player-save")
+        return self._executor
+
+    def mark_dirty(self, character):
+        key = character.name.lower()
+        if key in self._dirty:
+            self.coalesced += 1
+        self._dirty[key] = character
+
+    def discard(self, character):
+        """Stop tracking a character (or character name) for write-behind."""
+        key = (character if isinstance(character, str) else character.name).lower()
+        self._dirty.pop(key, None)
+        self._pending.pop(key, None)
+
+    def _write(self, name: str, payload: str, backup_interval: float):
+        start = time.perf_counter()
+        write_player_file(name, payload, self.player_dir, backup_interval=backup_interval)
+        elapsed = time.perf_counter() - start
+        self.saves += 1
+        self.last_latency = elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+
+    def save_now(self, character, backup_interval: float = BACKUP_INTERVAL):
+        """Write one character synchronously (admin saves, no running server)."""
+        self.discard(character)
+        self._write(character.name, encode_character(character), backup_interval)
+
+    async def save_async(self, character):
+        """Write one character now on the worker thread (e.g. on logout)."""
+        self.discard(character)
+        payload = encode_character(character)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._pool(), self._write, character.name,
+                                   payload, BACKUP_INTERVAL)
+
+    async def flush(self):
+        """Write every dirty character on the worker thread."""
+        if self._flushing or not self._dirty:
+            return
+        self._flushing = True
+        try:
+            self.last_flush_count = len(self._dirty)
+            loop = asyncio.get_running_loop()
+            # Entries stay tracked in _dirty/_pending until written, so a
+            # shutdown mid-batch still saves them in flush_sync()
+            for key in list(self._dirty):
+                character = self._dirty.pop(key, None)
+                if character is None:
+                    continue  # discarded by an immediate save meanwhile
+                self._pending[key] = character
+                try:
+                    payload = encode_character(character)
+                    await loop.run_in_executor(self._pool(), self._write, character.name,
+                                               payload, BACKUP_INTERVAL)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Failed to save character {character.name}: {e}")
+                    # Retry on the next flush unless it was re-dirtied meanwhile
+                    self._dirty.setdefault(key, character)
+                self._pending.pop(key, None)
+        finally:
+            self._flushing = False
+
+    def flush_sync(self):
+        """Write everything still dirty, synchronously (shutdown).
+
+        Writes already handed to the worker thread finish first, so an
+        older in-flight payload can never land after the final one; the
+        rest of an interrupted flush() batch is written here.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        batch = {**self._pending, **self._dirty}
+        self._pending, self._dirty = {}, {}
+        for character in batch.values():
+            try:
+                self._write(character.name, encode_character(character), BACKUP_INTERVAL)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Failed to save character {character.name}: {e}")
+        if batch:
+            logger.info(f"Flushed {len(batch)} player save(s)")
+
+    def get_status(self) -> str:
+        """Summary for the @saves admin command."""
+        return "\n".join([
+            "Player Save Queue:",
+            f"  Write-behind: {'active' if self.active else 'inactive (immediate saves)'}  "
+            f"Flush every: {FLUSH_PERIOD}s",
+            f"  Queue depth: {self.queue_depth}  Last flush: {self.last_flush_count} player(s)",
+            f"  Saves: {self.saves}  Coalesced: {self.coalesced}  Errors: {self.errors}",
+            f"  Last save: {self.last_latency * 1000:.2f} ms  Max: {self.max_latency * 1000:.2f} ms",
+            f"  Backups kept per player: {MAX_BACKUPS} (at most one per {BACKUP_INTERVAL}s)",
+        ])
+
+
+# Global player store instance
+player_store = PlayerStore()
+
+
+def get_player_store() -> PlayerStore:
+    """Get the global player store."""
+    return player_store
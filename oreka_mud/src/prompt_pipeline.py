@@ -36,39 +36,17 @@ logger = logging.getLogger("OrekaMUD.PromptPipeline")
 # NPC memory I/O (persistent cross-session memory per NPC per player)
 # ---------------------------------------------------------------------------
 
-_MEMORY_DIR = os.path.join(os.path.dirname(__file__), "..", "data",
-                           "npc_memories")
-
-
-def _memory_path(npc_vnum: int, player_name: str) -> str:
-    npc_dir = os.path.join(_MEMORY_DIR, str(npc_vnum))
-    os.makedirs(npc_dir, exist_ok=True)
-    safe_name = "".join(c for c in player_name if c.isalnum() or c in "._-")
-    return os.path.join(npc_dir, f"{safe_name}.json")
-
-
 def load_npc_memory(npc_vnum: int, player_name: str) -> List[str]:
     """Load persistent facts this NPC remembers about this player."""
-    path = _memory_path(npc_vnum, player_name)
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("facts", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    from src.npc_memory import get_npc_memory_store
+    return list(get_npc_memory_store().get(npc_vnum, player_name).facts)
 
 
 def save_npc_memory(npc_vnum: int, player_name: str,
                     facts: List[str]) -> None:
     """Save persistent facts.  Keeps the last 20 facts."""
-    path = _memory_path(npc_vnum, player_name)
-    facts = facts[-20:]  # cap
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump({"player": player_name, "facts": facts,
-                       "updated": time.time()}, f, indent=2)
-    except Exception as e:
-        logger.debug("NPC memory save failed: %s", e)
+    from src.npc_memory import get_npc_memory_store
+    get_npc_memory_store().set_facts(npc_vnum, player_name, facts)
 
 
 # ---------------------------------------------------------------------------
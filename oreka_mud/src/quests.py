@@ -412,6 +412,45 @@ class QuestLog:
         self.failed_quests: Set[int] = set()             # Quest IDs failed
         self.abandoned_quests: Set[int] = set()          # Quest IDs abandoned
         self.owner = owner  # Reference to owning Character (for GMCP)
+        # Objective index, rebuilt lazily after any quest/objective state change:
+        # incomplete objectives of ACTIVE quests by type, and ACTIVE quests
+        # whose required objectives are all done (awaiting complete_quest).
+        self._pending: Dict[ObjectiveType, List[Tuple[int, QuestObjective]]] = {}
+        self._remaining: Dict[int, int] = {}
+        self._index_dirty = True
+
+    def _invalidate_index(self):
+        self._index_dirty = True
+
+    def _ensure_index(self):
+        if not self._index_dirty:
+            return
+        pending: Dict[ObjectiveType, List[Tuple[int, QuestObjective]]] = {}
+        remaining: Dict[int, int] = {}
+        for quest_id, active_quest in self.active_quests.items():
+            if active_quest.state != QuestState.ACTIVE:
+                continue
+            count = 0
+            for obj in active_quest.objectives:
+                if obj.is_complete:
+                    continue
+                pending.setdefault(obj.objective_type, []).append((quest_id, obj))
+                if not obj.optional:
+                    count += 1
+            remaining[quest_id] = count
+        self._pending = pending
+        self._remaining = remaining
+        self._index_dirty = False
+
+    def pending_objectives(self, objective_type: ObjectiveType) -> List[Tuple[int, QuestObjective]]:
+        """(quest_id, objective) for incomplete objectives of a type in active quests."""
+        self._ensure_index()
+        return self._pending.get(objective_type, [])
+
+    def ready_quests(self) -> List[int]:
+        """Active quests whose required objectives are all complete."""
+        self._ensure_index()
+        return [qid for qid, count in self._remaining.items() if count == 0]
 
     def _emit_gmcp_quest(self):
         """Emit GMCP Char.Quest if an owner character is set."""
@@ -458,6 +497,7 @@ class QuestLog:
         )
 
         self.active_quests[quest.id] = active_quest
+        self._invalidate_index()
         self._emit_gmcp_quest()
         return True, f"Quest accepted: {quest.name}"
 
@@ -468,6 +508,7 @@ class QuestLog:
 
         del self.active_quests[quest_id]
         self.abandoned_quests.add(quest_id)
+        self._invalidate_index()
         self._emit_gmcp_quest()
         return True, "Quest abandoned."
 
@@ -481,6 +522,7 @@ class QuestLog:
         active_quest = self.active_quests[quest_id]
         active_quest.state = QuestState.COMPLETE
         active_quest.completion_time = time.time()
+        self._invalidate_index()
         self._emit_gmcp_quest()
         return True, "Quest objectives complete!"
 
@@ -496,6 +538,7 @@ class QuestLog:
         # Move to completed
         del self.active_quests[quest_id]
         self.completed_quests.add(quest_id)
+        self._invalidate_index()
         self._emit_gmcp_quest()
 
         # PcSheet: record quest completion
@@ -519,6 +562,7 @@ class QuestLog:
 
         del self.active_quests[quest_id]
         self.failed_quests.add(quest_id)
+        self._invalidate_index()
         self._emit_gmcp_quest()
         return True, f"Quest failed{': ' + reason if reason else '.'}"
 
@@ -541,18 +585,26 @@ class QuestLog:
 
         for obj in active_quest.objectives:
             if obj.id == objective_id:
-                old_count = obj.current_count
-                if set_value:
-                    obj.current_count = min(progress, obj.required_count)
-                else:
-                    obj.current_count = min(obj.current_count + progress, obj.required_count)
-
-                if obj.current_count > old_count:
-                    msg = f"Quest progress: {obj.description} ({obj.progress_text})"
-                    if obj.is_complete:
-                        msg += " - COMPLETE!"
-                    return True, msg
+                return self._advance(obj, progress, set_value)
+
+        return False, ""
 
+    def _advance(self, obj: QuestObjective, progress: int = 1,
+                 set_value: bool = False) -> Tuple[bool, str]:
+        was_complete = obj.is_complete
+        old_count = obj.current_count
+        if set_value:
+            obj.current_count = min(progress, obj.required_count)
+        else:
+            obj.current_count = min(obj.current_count + progress, obj.required_count)
+        if obj.is_complete != was_complete:
+            self._invalidate_index()
+
+        if obj.current_count > old_count:
+            msg = f"Quest progress: {obj.description} ({obj.progress_text})"
+            if obj.is_complete:
+                msg += " - COMPLETE!"
+            return True, msg
         return False, ""
 
     def check_objective_by_target(
@@ -568,17 +620,17 @@ class QuestLog:
         messages = []
         target_lower = target.lower()
 
-        for quest_id, active_quest in self.active_quests.items():
-            if active_quest.state != QuestState.ACTIVE:
+        # Only this type's incomplete objectives; copy, since completing one
+        # rebuilds the index
+        for quest_id, obj in list(self.pending_objectives(objective_type)):
+            if obj.is_complete:
                 continue
-
-            for obj in active_quest.objectives:
-                if obj.objective_type == objective_type and not obj.is_complete:
-                    # Check if target matches
-                    if obj.target.lower() in target_lower or target_lower in obj.target.lower():
-                        updated, msg = self.update_objective(quest_id, obj.id, progress)
-                        if updated:
-                            messages.append(msg)
+            # Check if target matches
+            obj_target = obj.target.lower()
+            if obj_target in target_lower or target_lower in obj_target:
+                updated, msg = self._advance(obj, progress)
+                if updated:
+                    messages.append(msg)
 
         return messages
 
@@ -619,6 +671,7 @@ class QuestLog:
         log.completed_quests = set(data.get("completed_quests", []))
         log.failed_quests = set(data.get("failed_quests", []))
         log.abandoned_quests = set(data.get("abandoned_quests", []))
+        log._invalidate_index()
         return log
 
 
@@ -630,6 +683,7 @@ class QuestManager:
     def __init__(self):
         self.quests: Dict[int, Quest] = {}
         self.npc_quests: Dict[str, List[int]] = {}  # NPC name -> list of quest IDs
+        self.auto_accept_by_room: Dict[int, List[int]] = {}  # giver room -> auto-accept quest IDs
 
     def load_quests(self, filepath: str = None):
         """Load quests from JSON file."""
@@ -994,8 +1048,18 @@ class QuestManager:
 
     def register_quest(self, quest: Quest):
         """Register a quest in the manager."""
+        previous = self.quests.get(quest.id)
+        if previous is not None and previous.auto_accept:
+            room_quests = self.auto_accept_by_room.get(previous.giver_room, [])
+            if quest.id in room_quests:
+                room_quests.remove(quest.id)
         self.quests[quest.id] = quest
 
+        if quest.auto_accept and quest.giver_room is not None:
+            room_quests = self.auto_accept_by_room.setdefault(quest.giver_room, [])
+            if quest.id not in room_quests:
+                room_quests.append(quest.id)
+
         # Track NPC quest associations
         if quest.giver_npc:
             npc_name = quest.giver_npc.lower()
@@ -1008,6 +1072,13 @@ class QuestManager:
         """Get a quest by ID."""
         return self.quests.get(quest_id)
 
+    def get_auto_accept_quests(self, room_vnum: int) -> List[Quest]:
+        """Auto-accept quests handed out on entering a room."""
+        quest_ids = self.auto_accept_by_room.get(room_vnum)
+        if not quest_ids:
+            return []
+        return [self.quests[qid] for qid in quest_ids if qid in self.quests]
+
     def get_quests_for_npc(self, npc_name: str) -> List[Quest]:
         """Get all quests available from an NPC."""
         npc_lower = npc_name.lower()
@@ -1080,10 +1151,37 @@ class QuestManager:
         return turnable
 
 
+# Global quest manager instance
+quest_manager: Optional[QuestManager] = None
+
+
+def get_quest_manager() -> QuestManager:
+    """Get the global quest manager, loading quests on first use."""
+    global quest_manager
+    if quest_manager is None:
+        quest_manager = QuestManager()
+        quest_manager.load_quests()
+    return quest_manager
+
+
 # =============================================================================
 # Quest Event Handlers
 # =============================================================================
 
+def _complete_ready_quests(quest_log: QuestLog, quest_manager: QuestManager,
+                           messages: List[str], kill_text: bool = False):
+    """Mark active quests whose required objectives are all done as complete."""
+    for quest_id in quest_log.ready_quests():
+        quest = quest_manager.get_quest(quest_id) if quest_manager else None
+        quest_log.complete_quest(quest_id)
+        if not kill_text:
+            messages.append(f"Quest objectives complete: {quest.name if quest else quest_id}")
+        elif quest and quest.auto_complete:
+            messages.append(f"Quest complete: {quest.name}!")
+        else:
+            messages.append(f"Quest objectives complete: {quest.name if quest else quest_id}. Return to turn in.")
+
+
 def on_mob_killed(character, mob, quest_log: QuestLog, quest_manager: QuestManager) -> List[str]:
     """
     Called when a mob is killed. Updates kill objectives.
@@ -1093,23 +1191,7 @@ def on_mob_killed(character, mob, quest_log: QuestLog, quest_manager: QuestManag
     messages = quest_log.check_objective_by_target(ObjectiveType.KILL, mob_name)
 
     # Check for quest completion
-    for quest_id, active_quest in list(quest_log.active_quests.items()):
-        if active_quest.state == QuestState.ACTIVE:
-            all_complete = True
-            for obj in active_quest.objectives:
-                if not obj.optional and not obj.is_complete:
-                    all_complete = False
-                    break
-
-            if all_complete:
-                quest = quest_manager.get_quest(quest_id)
-                if quest and quest.auto_complete:
-                    quest_log.complete_quest(quest_id)
-                    messages.append(f"Quest complete: {quest.name}!")
-                else:
-                    quest_log.complete_quest(quest_id)
-                    messages.append(f"Quest objectives complete: {quest.name if quest else quest_id}. Return to turn in.")
-
+    _complete_ready_quests(quest_log, quest_manager, messages, kill_text=True)
     return messages
 
 
@@ -1122,16 +1204,7 @@ def on_item_collected(character, item, quest_log: QuestLog, quest_manager: Quest
     messages = quest_log.check_objective_by_target(ObjectiveType.COLLECT, item_name)
 
     # Check for quest completion
-    for quest_id, active_quest in list(quest_log.active_quests.items()):
-        if active_quest.state == QuestState.ACTIVE:
-            all_complete = all(
-                obj.is_complete for obj in active_quest.objectives if not obj.optional
-            )
-            if all_complete:
-                quest = quest_manager.get_quest(quest_id)
-                quest_log.complete_quest(quest_id)
-                messages.append(f"Quest objectives complete: {quest.name if quest else quest_id}")
-
+    _complete_ready_quests(quest_log, quest_manager, messages)
     return messages
 
 
@@ -1143,28 +1216,24 @@ def on_room_entered(character, room_vnum: int, quest_log: QuestLog, quest_manage
     messages = quest_log.check_objective_by_target(ObjectiveType.EXPLORE, str(room_vnum))
 
     # Check for auto-accept quests in this room
-    for quest in quest_manager.quests.values():
-        if quest.auto_accept and quest.giver_room == room_vnum:
-            if not quest_log.is_quest_active(quest.id) and not quest_log.is_quest_complete(quest.id):
-                meets_prereqs, _ = quest.prerequisites.check(character, quest_log)
-                if meets_prereqs:
-                    success, msg = quest_log.accept_quest(quest)
-                    if success:
-                        messages.append(f"New quest discovered: {quest.name}")
-                        if quest.accept_text:
-                            messages.append(quest.accept_text)
+    if quest_manager is None:
+        quest_manager = get_quest_manager()
+    try:
+        room_vnum = int(room_vnum)
+    except (TypeError, ValueError):
+        pass
+    for quest in quest_manager.get_auto_accept_quests(room_vnum):
+        if not quest_log.is_quest_active(quest.id) and not quest_log.is_quest_complete(quest.id):
+            meets_prereqs, _ = quest.prerequisites.check(character, quest_log)
+            if meets_prereqs:
+                success, msg = quest_log.accept_quest(quest)
+                if success:
+                    messages.append(f"New quest discovered: {quest.name}")
+                    if quest.accept_text:
+                        messages.append(quest.accept_text)
 
     # Check for quest completion
-    for quest_id, active_quest in list(quest_log.active_quests.items()):
-        if active_quest.state == QuestState.ACTIVE:
-            all_complete = all(
-                obj.is_complete for obj in active_quest.objectives if not obj.optional
-            )
-            if all_complete:
-                quest = quest_manager.get_quest(quest_id)
-                quest_log.complete_quest(quest_id)
-                messages.append(f"Quest objectives complete: {quest.name if quest else quest_id}")
-
+    _complete_ready_quests(quest_log, quest_manager, messages)
     return messages
 
 
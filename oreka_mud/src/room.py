@@ -1,4 +1,11 @@
+from src.state_version import Versioned
+
+
 class Room:
+    # Bumped when mobs enter or leave (see state_version)
+    mobs_version = 0
+    mobs = Versioned("mobs_version")
+
     def __init__(self, vnum, name, description, exits, flags, items=None, terrain=None, weather=None,
                  light=None, builder_notes=None, owner=None, area_file=None, effects=None, **kwargs):
         self.vnum = vnum
@@ -0,0 +1,406 @@
+"""
+Room graph pathfinding service.
+
+Builds a compact adjacency structure from world.rooms once and answers
+route and radius queries against it:
+
+- Rooms are numbered 0..n-1; adjacency is a tuple of neighbour indices per
+  room, so BFS works on ints with a parent array instead of copying path
+  lists for every node.
+- Exits that are dicts (doors) are remembered per exit, and their live
+  ``closed`` flag is checked when a query asks to respect doors. Two rooms
+  joined by several exits stay connected while any one of them is open.
+- Results go into a bounded LRU cache. Builder edits (dig, exit, vnum
+  changes) invalidate the whole graph; door open/close only drops the
+  door-aware cache entries.
+- An optional all-pairs next-hop table can be precomputed per area for
+  hot, small areas (guard patrol routes, town streets).
+
+Usage:
+    graph = get_room_graph(world)
+    path = graph.find_path(3001, 3040)          # [3001, ..., 3040]
+    nearby = graph.within_radius(3001, 3, respect_doors=True)
+"""
+
+import logging
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("OrekaMUD.RoomGraph")
+
+# Maximum number of cached route/radius results
+DEFAULT_CACHE_SIZE = 4096
+
+# Areas larger than this are not given an all-pairs next-hop table
+MAX_AREA_TABLE_ROOMS = 300
+
+
+def exit_target(exit_data) -> Optional[int]:
+    """Destination vnum of an exit (int or door dict), or None."""
+    if isinstance(exit_data, dict):
+        target = exit_data.get("room", exit_data.get("to"))
+    else:
+        target = exit_data
+    return target if isinstance(target, int) else None
+
+
+def find_route(rooms: Dict[int, Any], start_vnum: int, end_vnum: int,
+               max_depth: int = None, respect_doors: bool = False) -> Optional[List[int]]:
+    """One-off BFS over a rooms dict without building a graph.
+
+    For callers that only hold a rooms dict. World code should use
+    get_room_graph(world).find_path(), which is cached.
+    """
+    if start_vnum not in rooms or end_vnum not in rooms:
+        return None
+    if start_vnum == end_vnum:
+        return [start_vnum]
+    parent = {start_vnum: None}
+    queue = deque([(start_vnum, 0)])
+    while queue:
+        cur, depth = queue.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for exit_data in (getattr(rooms[cur], 'exits', None) or {}).values():
+            nxt = exit_target(exit_data)
+            if nxt is None or nxt in parent or nxt not in rooms:
+                continue
+            if respect_doors and isinstance(exit_data, dict) and exit_data.get("closed"):
+                continue
+            parent[nxt] = cur
+            if nxt == end_vnum:
+                path = []
+                node = nxt
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                path.reverse()
+                return path
+            queue.append((nxt, depth + 1))
+    return None
+
+
+class RoomGraph:
+    """Compact, cached exit graph over a rooms dict (vnum -> Room)."""
+
+    def __init__(self, rooms: Dict[int, Any], cache_size: int = DEFAULT_CACHE_SIZE):
+        self.rooms = rooms
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._index: Dict[int, int] = {}
+        self._vnums: List[int] = []
+        self._adj: List[Tuple[int, ...]] = []
+        self._exits: List[Dict[str, int]] = []
+        self._doors: Dict[Tuple[int, int], List[dict]] = {}
+        self._area_tables: Dict[str, Tuple[Dict[int, int], List[array]]] = {}
+        self._room_count = -1
+        self._dirty = True
+
+        # Instrumentation
+        self.builds = 0
+        self.searches = 0
+        self.cache_hits = 0
+        self.table_hits = 0
+        self.invalidations = 0
+        self.total_search_time = 0.0
+        self.max_search_time = 0.0
+
+    # -- building -----------------------------------------------------------
+
+    def build(self):
+        """(Re)build adjacency arrays from the rooms dict."""
+        start = time.perf_counter()
+        vnums = list(self.rooms.keys())
+        index = {v: i for i, v in enumerate(vnums)}
+        adj = []
+        exits = []
+        doors: Dict[Tuple[int, int], List[dict]] = {}
+        open_pairs = set()
+        for i, vnum in enumerate(vnums):
+            neighbours = []
+            by_direction = {}
+            for direction, exit_data in (getattr(self.rooms[vnum], 'exits', None) or {}).items():
+                target = exit_target(exit_data)
+                j = index.get(target)
+                if j is None:
+                    continue
+                if j not in neighbours:
+                    neighbours.append(j)
+                by_direction[direction] = j
+                if isinstance(exit_data, dict):
+                    doors.setdefault((i, j), []).append(exit_data)
+                else:
+                    open_pairs.add((i, j))
+            adj.append(tuple(neighbours))
+            exits.append(by_direction)
+        for pair in open_pairs:
+            doors.pop(pair, None)  # a plain exit keeps the pair connected
+        self._vnums = vnums
+        self._index = index
+        self._adj = adj
+        self._exits = exits
+        self._doors = doors
+        self._area_tables = {}
+        self._cache.clear()
+        self._room_count = len(self.rooms)
+        self._dirty = False
+        self.builds += 1
+        logger.debug(f"Room graph built: {len(vnums)} rooms in "
+                     f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def _ensure_built(self):
+        if self._dirty or self._room_count != len(self.rooms):
+            self.build()
+
+    def invalidate(self):
+        """Exits or rooms changed (dig, @exit, vnum edits): rebuild on next query."""
+        self._dirty = True
+        self.invalidations += 1
+
+    def note_door_change(self):
+        """A door opened/closed/locked: drop only door-aware cached results."""
+        for key in [k for k in self._cache if k[-1]]:
+            del self._cache[key]
+
+    # -- cache --------------------------------------------------------------
+
+    def _cache_get(self, key):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return True, self._cache[key]
+        return False, None
+
+    def _cache_put(self, key, value):
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # -- traversal ----------------------------------------------------------
+
+    def _passable(self, i: int, j: int, respect_doors: bool) -> bool:
+        if not respect_doors:
+            return True
+        doors = self._doors.get((i, j))
+        return doors is None or any(not d.get("closed", False) for d in doors)
+
+    def _bfs(self, src: int, dst: int, max_depth: Optional[int],
+             respect_doors: bool) -> Optional[List[int]]:
+        parent = {src: -1}
+        depth = {src: 0}
+        queue = deque([src])
+        adj = self._adj
+        while queue:
+            cur = queue.popleft()
+            d = depth[cur]
+            if max_depth is not None and d >= max_depth:
+                continue
+            for nxt in adj[cur]:
+                if nxt in parent or not self._passable(cur, nxt, respect_doors):
+                    continue
+                parent[nxt] = cur
+                depth[nxt] = d + 1
+                if nxt == dst:
+                    path = []
+                    node = nxt
+                    while node != -1:
+                        path.append(self._vnums[node])
+                        node = parent[node]
+                    path.reverse()
+                    return path
+                queue.append(nxt)
+        return None
+
+    def find_path(self, start_vnum: int, end_vnum: int, max_depth: int = None,
+                  respect_doors: bool = False) -> Optional[List[int]]:
+        """Shortest route from start to end, inclusive of both ends.
+
+        Args:
+            start_vnum: Starting room vnum
+            end_vnum: Destination room vnum
+            max_depth: Maximum number of steps (None = unbounded)
+            respect_doors: Treat closed doors as impassable
+
+        Returns:
+            List of vnums [start, ..., end], or None if unreachable.
+        """
+        self._ensure_built()
+        src = self._index.get(start_vnum)
+        dst = self._index.get(end_vnum)
+        if src is None or dst is None:
+            return None
+        if src == dst:
+            return [start_vnum]
+
+        key = ("path", src, dst, max_depth, respect_doors)
+        hit, cached = self._cache_get(key)
+        if hit:
+            return list(cached) if cached is not None else None
+
+        t0 = time.perf_counter()
+        path = None
+        if not respect_doors:
+            path = self._table_path(src, dst)
+            if path is not None and max_depth is not None and len(path) - 1 > max_depth:
+                path = None
+            if path is not None:
+                self.table_hits += 1
+        if path is None:
+            path = self._bfs(src, dst, max_depth, respect_doors)
+        self._record_search(time.perf_counter() - t0)
+
+        self._cache_put(key, tuple(path) if path is not None else None)
+        return path
+
+    def next_hop(self, start_vnum: int, end_vnum: int,
+                 respect_doors: bool = False) -> Optional[int]:
+        """First room to step into on the way from start to end."""
+        path = self.find_path(start_vnum, end_vnum, respect_doors=respect_doors)
+        if not path or len(path) < 2:
+            return None
+        return path[1]
+
+    def walk(self, start_vnum: int, directions: List[str],
+             respect_doors: bool = True) -> Tuple[List[int], Optional[str]]:
+        """Follow a literal sequence of exit names (speedwalk).
+
+        Returns the vnums entered, in order, and the first direction that
+        could not be taken (None if the whole sequence resolves).
+        """
+        self._ensure_built()
+        cur = self._index.get(start_vnum)
+        route = []
+        if cur is None:
+            return route, directions[0] if directions else None
+        for direction in directions:
+            nxt = self._exits[cur].get(direction)
+            if nxt is None:
+                return route, direction
+            if respect_doors:
+                exit_data = self.rooms[self._vnums[cur]].exits.get(direction)
+                if isinstance(exit_data, dict) and exit_data.get("closed"):
+                    return route, direction
+            cur = nxt
+            route.append(self._vnums[cur])
+        return route, None
+
+    def within_radius(self, start_vnum: int, radius: int,
+                      respect_doors: bool = True) -> List[int]:
+        """Vnums reachable within ``radius`` steps, start room first."""
+        self._ensure_built()
+        src = self._index.get(start_vnum)
+        if src is None:
+            return [start_vnum] if start_vnum in self.rooms else []
+
+        key = ("radius", src, radius, respect_doors)
+        hit, cached = self._cache_get(key)
+        if hit:
+            return list(cached)
+
+        t0 = time.perf_counter()
+        seen = {src}
+        order = [src]
+        frontier = [src]
+        for _ in range(radius):
+            nxt_frontier = []
+            for cur in frontier:
+                for nxt in self._adj[cur]:
+                    if nxt in seen or not self._passable(cur, nxt, respect_doors):
+                        continue
+                    seen.add(nxt)
+                    order.append(nxt)
+                    nxt_frontier.append(nxt)
+            if not nxt_frontier:
+                break
+            frontier = nxt_frontier
+        result = tuple(self._vnums[i] for i in order)
+        self._record_search(time.perf_counter() - t0)
+        self._cache_put(key, result)
+        return list(result)
+
+    def _record_search(self, elapsed: float):
+        self.searches += 1
+        self.total_search_time += elapsed
+        self.max_search_time = max(self.max_search_time, elapsed)
+
+    # -- per-area next-hop tables -------------------------------------------
+
+    def precompute_area(self, area_file: str,
+                        max_rooms: int = MAX_AREA_TABLE_ROOMS) -> bool:
+        """Build an all-pairs next-hop table for one area (door-agnostic).
+
+        Paths answered from the table stay inside the area. Returns False if
+        the area is unknown or larger than ``max_rooms``.
+        """
+        self._ensure_built()
+        members = [i for i, v in enumerate(self._vnums)
+                   if getattr(self.rooms[v], 'area_file', None) == area_file]
+        if not members or len(members) > max_rooms:
+            return False
+        local = {g: k for k, g in enumerate(members)}
+        n = len(members)
+        table = []
+        for k, g in enumerate(members):
+            # BFS from each member; record the first hop toward every target
+            hops = array('i', [-1] * n)
+            first = {g: -1}
+            queue = deque([g])
+            while queue:
+                cur = queue.popleft()
+                for nxt in self._adj[cur]:
+                    if nxt in first or nxt not in local:
+                        continue
+                    first[nxt] = nxt if cur == g else first[cur]
+                    hops[local[nxt]] = first[nxt]
+                    queue.append(nxt)
+            table.append(hops)
+        self._area_tables[area_file] = (local, table)
+        return True
+
+    def precompute_areas(self, max_rooms: int = MAX_AREA_TABLE_ROOMS) -> int:
+        """Precompute next-hop tables for every area up to ``max_rooms``."""
+        self._ensure_built()
+        areas = {getattr(r, 'area_file', None) for r in self.rooms.values()}
+        return sum(1 for a in areas if a and self.precompute_area(a, max_rooms))
+
+    def _table_path(self, src: int, dst: int) -> Optional[List[int]]:
+        for local, table in self._area_tables.values():
+            if src in local and dst in local:
+                path = [self._vnums[src]]
+                cur = src
+                target = local[dst]
+                while cur != dst:
+                    cur = table[local[cur]][target]
+                    if cur == -1:
+                        return None
+                    path.append(self._vnums[cur])
+                return path
+        return None
+
+    # -- reporting ----------------------------------------------------------
+
+    def get_status(self) -> str:
+        """Summary for the @roomgraph admin command."""
+        self._ensure_built()
+        avg = self.total_search_time / self.searches if self.searches else 0.0
+        edges = sum(len(a) for a in self._adj)
+        return "\n".join([
+            "Room Graph Status:",
+            f"  Rooms: {len(self._vnums)}  Edges: {edges}  Door edges: {len(self._doors)}",
+            f"  Builds: {self.builds}  Invalidations: {self.invalidations}",
+            f"  Area next-hop tables: {len(self._area_tables)}",
+            f"  Cache: {len(self._cache)}/{self.cache_size} entries, {self.cache_hits} hits",
+            f"  Searches: {self.searches}  Table hits: {self.table_hits}",
+            f"  Avg search: {avg * 1000:.3f} ms  Max search: {self.max_search_time * 1000:.3f} ms",
+        ])
+
+
+def get_room_graph(world) -> RoomGraph:
+    """Get the world's room graph, attaching one if it has none yet."""
+    graph = getattr(world, 'room_graph', None)
+    if graph is None or graph.rooms is not world.rooms:
+        graph = RoomGraph(world.rooms)
+        world.room_graph = graph
+    return graph
@@ -12,9 +12,10 @@ import time
 import random
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any, Set
-from collections import deque
 from dataclasses import dataclass, field
 
+from src.room_graph import find_route, get_room_graph
+
 
 # =============================================================================
 # Game Time System
@@ -267,32 +268,8 @@ def find_path(start_vnum: int, end_vnum: int, rooms: Dict[int, Any]) -> Optional
     """
     if start_vnum == end_vnum:
         return []
-
-    if start_vnum not in rooms or end_vnum not in rooms:
-        return None
-
-    # BFS
-    queue = deque([(start_vnum, [])])
-    visited: Set[int] = {start_vnum}
-
-    while queue:
-        current, path = queue.popleft()
-        current_room = rooms.get(current)
-
-        if not current_room:
-            continue
-
-        # Check all exits
-        exits = getattr(current_room, 'exits', {})
-        for direction, next_vnum in exits.items():
-            if next_vnum == end_vnum:
-                return path + [next_vnum]
-
-            if next_vnum not in visited and next_vnum in rooms:
-                visited.add(next_vnum)
-                queue.append((next_vnum, path + [next_vnum]))
-
-    return None  # No path found
+    path = find_route(rooms, start_vnum, end_vnum)
+    return path[1:] if path is not None else None
 
 
 # =============================================================================
@@ -416,7 +393,8 @@ class ScheduleManager:
 
                 if not current_path or (current_path and current_path[-1] != target_location):
                     # Need new path
-                    current_path = find_path(current_location, target_location, world.rooms)
+                    route = get_room_graph(world).find_path(current_location, target_location)
+                    current_path = route[1:] if route is not None else None
                     state['current_path'] = current_path if current_path else []
 
                 if current_path:
@@ -444,9 +422,10 @@ class ScheduleManager:
 
     def _find_npc_location(self, npc, world) -> Optional[int]:
         """Find which room an NPC is currently in."""
-        for room_vnum, room in world.rooms.items():
-            if npc in room.mobs:
-                return room_vnum
+        from src.world import get_location_index
+        room_vnum = get_location_index(world).room_vnum_of(npc)
+        if room_vnum is not None:
+            return room_vnum
         return getattr(npc, 'room_vnum', None)
 
     def _move_npc(self, npc, from_vnum: int, to_vnum: int, world) -> List[Tuple[int, str]]:
@@ -470,16 +449,19 @@ class ScheduleManager:
                 direction = dir_name
                 break
 
-        # Remove from old room
-        if npc in from_room.mobs:
-            from_room.mobs.remove(npc)
+        from src.world import get_location_index
+        locations = get_location_index(world)
+        was_here = npc in from_room.mobs
+        already_there = npc in to_room.mobs
+
+        # Remove from old room / add to new room through the location index
+        locations.move_mob(npc, to_vnum)
+
+        if was_here:
             leave_msg = f"{npc.name} leaves {direction}." if direction else f"{npc.name} leaves."
             messages.append((from_vnum, leave_msg))
 
-        # Add to new room
-        if npc not in to_room.mobs:
-            to_room.mobs.append(npc)
-
+        if not already_there:
             # Find arrival direction
             arrive_dir = None
             opposite = {
@@ -495,9 +477,6 @@ class ScheduleManager:
             arrive_msg = f"{npc.name} arrives from the {arrive_dir}." if arrive_dir else f"{npc.name} arrives."
             messages.append((to_vnum, arrive_msg))
 
-        # Update NPC's room reference
-        npc.room_vnum = to_vnum
-
         return messages
 
     def force_move_npc(self, npc_vnum: int, room_vnum: int, world) -> Tuple[bool, str]:
@@ -510,15 +489,9 @@ class ScheduleManager:
         if not target_room:
             return False, f"Room vnum {room_vnum} not found."
 
-        # Remove from current room
-        for room in world.rooms.values():
-            if npc in room.mobs:
-                room.mobs.remove(npc)
-                break
-
-        # Add to target room
-        target_room.mobs.append(npc)
-        npc.room_vnum = room_vnum
+        # Move out of the current room and into the target room
+        from src.world import get_location_index
+        get_location_index(world).move_mob(npc, room_vnum)
 
         # Clear path
         if npc_vnum in self.npc_states:
@@ -0,0 +1,119 @@
+"""
+Buffered, day-segmented write-behind shared by the event log and the
+chat session archive.
+
+Records are buffered on the event loop and appended to their segments by
+a heartbeat pulse on a worker thread:
+
+- The buffer is swapped on the calling (loop) thread before the batch is
+  handed to the worker, so a record appended mid-flush lands in the next
+  batch instead of on a list the worker has already written.
+- Flushes run one at a time and in order; a full buffer starts one early.
+- Records whose segment write fails wait in a retry list (guarded by the
+  writer lock) and go first in the next flush.
+- replace_file() rewrites a whole segment through a temp file, so readers
+  that skip the lock never see a truncated segment.
+
+Subclasses provide _load() (discover segments and indexes) and
+_append(records) -> records that could not be written.
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, List
+
+logger = logging.getLogger("OrekaMUD.SegmentStore")
+
+
+def replace_file(path: str, data: bytes) -> bool:
+    """Atomically replace ``path`` with ``data``; False (old file kept) on error."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.error(f"Failed to rewrite segment {path}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+class SegmentStore:
+    """Base for buffered stores with one append-only file per UTC day."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.active = False  # True once the server's flush pulse is running
+        self._buffer: List[dict] = []
+        self._retry: List[dict] = []  # failed writes, guarded by _lock
+        self._indexes: Dict[str, dict] = {}
+        self._lock = threading.Lock()  # serializes writers
+        self._loaded = False
+        self._writing = None  # in-flight worker flush, if any
+
+        # Instrumentation
+        self.flushes = 0
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _append(self, records: List[dict]) -> List[dict]:
+        raise NotImplementedError
+
+    @property
+    def pending(self) -> List[dict]:
+        """Records not yet in a segment (failed retries first)."""
+        return self._retry + self._buffer
+
+    # -- writing ------------------------------------------------------------
+
+    def _add(self, record: dict, max_buffered: int):
+        self._buffer.append(record)
+        if not self.active:
+            self.flush()
+        elif len(self._buffer) >= max_buffered:
+            self._flush_early()
+
+    def _take_buffer(self) -> List[dict]:
+        """Swap out the buffer on the calling (loop) thread."""
+        batch, self._buffer = self._buffer, []
+        return batch
+
+    def _write_batch(self, batch: List[dict]):
+        with self._lock:
+            batch, self._retry = self._retry + batch, []
+            if not batch:
+                return
+            self._load()
+            self._retry = self._append(batch)
+            self.flushes += 1
+
+    def _flush_early(self):
+        """Start a worker-thread flush ahead of the next pulse."""
+        if self._writing is not None and not self._writing.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._writing = loop.run_in_executor(None, self._write_batch, self._take_buffer())
+
+    def flush(self):
+        """Write everything buffered now, on the calling thread."""
+        self._write_batch(self._take_buffer())
+
+    async def flush_async(self):
+        """Heartbeat pulse: flush on a worker thread after any in-flight one."""
+        if self._writing is not None and not self._writing.done():
+            await self._writing
+        if not (self._buffer or self._retry):
+            return
+        loop = asyncio.get_running_loop()
+        self._writing = loop.run_in_executor(None, self._write_batch, self._take_buffer())
+        await self._writing
@@ -2,11 +2,18 @@
 Shadow Presence System for OrekaMUD3.
 When a Veil player starts an AI NPC chat, they appear as a dreaming
 presence in the live MUD world. Real players can see and interact with them.
+
+The manager keeps shadows indexed by room (room events and look output
+read only that room's shadows) and in last-active order (stale detection
+stops at the first shadow that is still active).  A shadow stays in the
+room it was created in until it is removed or materializes, so the room
+index only changes on create() and remove(); activity goes through touch().
 """
 import asyncio
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Dict, Optional, List
 import logging
 
 logger = logging.getLogger("OrekaMUD.Shadow")
@@ -100,6 +107,35 @@ class ShadowPresenceManager:
 
     def __init__(self):
         self.shadows = {}  # {player_id: ShadowPresence}
+        self._by_room: Dict[int, Dict[str, ShadowPresence]] = {}
+        # player_id -> shadow, least recently active first
+        self._by_activity: "OrderedDict[str, ShadowPresence]" = OrderedDict()
+
+    @staticmethod
+    def _room_key(room_vnum):
+        try:
+            return int(room_vnum)
+        except (TypeError, ValueError):
+            return room_vnum
+
+    def _add(self, shadow: ShadowPresence):
+        self._discard(shadow.player_id)
+        shadow.room_vnum = self._room_key(shadow.room_vnum)
+        self.shadows[shadow.player_id] = shadow
+        self._by_room.setdefault(shadow.room_vnum, {})[shadow.player_id] = shadow
+        self._by_activity[shadow.player_id] = shadow
+
+    def _discard(self, player_id: str) -> Optional[ShadowPresence]:
+        shadow = self.shadows.pop(player_id, None)
+        if shadow is None:
+            return None
+        occupants = self._by_room.get(shadow.room_vnum)
+        if occupants is not None:
+            occupants.pop(player_id, None)
+            if not occupants:
+                del self._by_room[shadow.room_vnum]
+        self._by_activity.pop(player_id, None)
+        return shadow
 
     def create(self, player_id: str, player_name: str,
                npc_id: int, npc_name: str, room_vnum: int) -> ShadowPresence:
@@ -111,13 +147,14 @@ class ShadowPresenceManager:
             npc_name=npc_name,
             room_vnum=room_vnum
         )
-        self.shadows[player_id] = shadow
+        self._add(shadow)
         logger.info(f"Shadow created: {player_name} at room {room_vnum} with {npc_name}")
         return shadow
 
     def get_by_room(self, room_vnum: int) -> List[ShadowPresence]:
         """Get all shadow presences in a specific room."""
-        return [s for s in self.shadows.values() if s.room_vnum == room_vnum]
+        occupants = self._by_room.get(room_vnum)
+        return list(occupants.values()) if occupants else []
 
     def get_by_player(self, player_id: str) -> Optional[ShadowPresence]:
         """Get a specific player's shadow."""
@@ -148,7 +185,7 @@ class ShadowPresenceManager:
 
     def remove(self, player_id: str) -> Optional[ShadowPresence]:
         """Remove a shadow (player disconnected or materialized)."""
-        shadow = self.shadows.pop(player_id, None)
+        shadow = self._discard(player_id)
         if shadow:
             logger.info(f"Shadow removed: {shadow.player_name}")
         return shadow
@@ -166,7 +203,7 @@ class ShadowPresenceManager:
             is_telnet=True,
             character_ref=character,
         )
-        self.shadows[character.name] = shadow
+        self._add(shadow)
         logger.info(f"Telnet shadow created: {character.name} at room {room_vnum} with {npc.name}")
         return shadow
 
@@ -175,12 +212,17 @@ class ShadowPresenceManager:
         shadow = self.shadows.get(player_id)
         if shadow:
             shadow.last_active = time.time()
+            self._by_activity.move_to_end(player_id)
 
     def get_stale(self, timeout_seconds: int = 1800) -> List[ShadowPresence]:
         """Return shadows inactive for longer than timeout."""
         now = time.time()
-        return [s for s in self.shadows.values()
-                if (now - s.last_active) > timeout_seconds]
+        stale = []
+        for shadow in self._by_activity.values():
+            if (now - shadow.last_active) <= timeout_seconds:
+                break
+            stale.append(shadow)
+        return stale
 
     def get_all(self) -> dict:
         """Get all active shadows."""
@@ -1,10 +1,31 @@
-"""Mob spawning and respawn management system."""
-
+"""Mob spawning and respawn management system.
+
+Respawns are driven by a timer queue: a dying mob (Mob.alive going False)
+marks its spawn point dead, which pushes the point onto the manager's
+min-heap keyed by due time. tick() pops only due entries, so its cost
+follows recent deaths rather than the number of spawn points. Entries are
+invalidated lazily: each point remembers the due time it is queued under,
+and anything that respawns or reschedules it (spawn, force_respawn,
+set_respawn_time) leaves older heap entries to be discarded when popped.
+
+Mobs respawning in the same room on one tick are announced together, with
+a single Room.Mobs GMCP update per player there.
+
+Usage:
+    manager = get_spawn_manager()
+    messages = manager.tick(world)
+"""
+
+import heapq
+import itertools
+import logging
 import time
 import copy
 import random
 from typing import Dict, List, Optional, Tuple, Any
 
+logger = logging.getLogger("OrekaMUD.Spawning")
+
 # Default respawn time in seconds (5 minutes)
 DEFAULT_RESPAWN_TIME = 300
 
@@ -46,6 +67,11 @@ class SpawnPoint:
         self.death_time = None
         self.spawn_count = 0  # Track how many times this mob has spawned
 
+        # Respawn queue bookkeeping (set by SpawnManager)
+        self.manager = None
+        self.key = None
+        self.due = None  # Due time this point is queued under, if any
+
     def is_alive(self) -> bool:
         """Check if the current mob instance is alive."""
         if self.current_mob is None:
@@ -81,6 +107,13 @@ class SpawnPoint:
         """Mark the current mob as dead and record death time."""
         self.death_time = time.time()
         self.current_mob = None
+        if self.manager is not None:
+            self.manager.schedule(self)
+
+    def on_mob_died(self, mob):
+        """Mob.alive hook: the mob this point spawned has died."""
+        if self.current_mob is mob:
+            self.mark_dead()
 
     def spawn(self, world) -> Optional[Any]:
         """
@@ -109,20 +142,26 @@ class SpawnPoint:
         mob_data['hp_dice'] = hp_dice
 
         new_mob = Mob(**mob_data)
-        new_mob.room_vnum = self.room_vnum
 
         # Reset combat state
         new_mob.alive = True
         new_mob.conditions = set()
         new_mob.active_conditions = {}
 
-        # Add to world and room
+        # Add to world and room, replacing the dead instance this point tracked
+        from src.world import get_location_index
+        index = get_location_index(world)
+        old_mob = self.current_mob
+        if old_mob is not None and not getattr(old_mob, 'alive', True):
+            index.remove_mob(old_mob)
         world.mobs[new_mob.vnum] = new_mob
-        room.mobs.append(new_mob)
+        index.place_mob(new_mob, self.room_vnum)
 
         # Update spawn point tracking
         self.current_mob = new_mob
+        new_mob._spawn_point = self
         self.death_time = None
+        self.due = None
         self.spawn_count += 1
 
         return new_mob
@@ -135,6 +174,53 @@ class SpawnManager:
         self.spawn_points: Dict[int, SpawnPoint] = {}  # vnum -> SpawnPoint
         self.respawn_messages: List[str] = []  # Messages to broadcast
         self.enabled = True
+        self.world = None  # set by link_existing_mobs / tick
+
+        # Respawn timer queue: (due, seq, spawn_key)
+        self._queue: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+
+        # Counters
+        self.respawned = 0
+        self.stale_popped = 0
+        self.room_batches = 0
+        self.last_tick_popped = 0
+        self.no_respawn_points = 0
+
+    def _add_point(self, spawn_key, spawn_point: SpawnPoint):
+        """Register a spawn point; unspawned points are due immediately."""
+        spawn_point.manager = self
+        spawn_point.key = spawn_key
+        self.spawn_points[spawn_key] = spawn_point
+        if spawn_point.respawn_time is None:
+            self.no_respawn_points += 1
+        self.schedule(spawn_point)
+
+    def schedule(self, spawn_point: SpawnPoint, due: float = None):
+        """Queue a spawn point for respawn at *due* (default: its respawn time)."""
+        if spawn_point.respawn_time is None or spawn_point.key is None:
+            spawn_point.due = None
+            return
+        if due is None:
+            if spawn_point.death_time is None:
+                due = 0.0
+            else:
+                due = spawn_point.death_time + spawn_point.respawn_time
+        spawn_point.due = due
+        heapq.heappush(self._queue, (due, next(self._seq), spawn_point.key))
+
+    def _queued_points(self) -> List[SpawnPoint]:
+        """Spawn points with a live queue entry and no living mob."""
+        points = []
+        seen = set()
+        for due, _seq, key in self._queue:
+            sp = self.spawn_points.get(key)
+            if sp is None or sp.due != due or key in seen:
+                continue
+            seen.add(key)
+            if sp.respawn_time is not None and not sp.is_alive():
+                points.append(sp)
+        return points
 
     def initialize_from_mobs_data(self, mobs_data: List[dict]):
         """
@@ -160,7 +246,7 @@ class SpawnManager:
                 spawn_key = vnum
                 seen_vnums.add(vnum)
 
-            self.spawn_points[spawn_key] = SpawnPoint(mob_data, room_vnum)
+            self._add_point(spawn_key, SpawnPoint(mob_data, room_vnum))
 
     def link_existing_mobs(self, world):
         """
@@ -170,24 +256,26 @@ class SpawnManager:
         Args:
             world: The OrekaWorld instance
         """
+        self.world = world
         for vnum, mob in world.mobs.items():
-            if vnum in self.spawn_points:
-                self.spawn_points[vnum].current_mob = mob
-            else:
+            spawn_point = self.spawn_points.get(vnum)
+            if spawn_point is None:
                 # Try composite key
                 room_vnum = getattr(mob, 'room_vnum', None)
                 if room_vnum:
-                    spawn_key = vnum * 10000 + room_vnum
-                    if spawn_key in self.spawn_points:
-                        self.spawn_points[spawn_key].current_mob = mob
+                    spawn_point = self.spawn_points.get(vnum * 10000 + room_vnum)
+            if spawn_point is not None:
+                spawn_point.current_mob = mob
+                mob._spawn_point = spawn_point
 
-    def on_mob_death(self, mob, room=None):
+    def on_mob_death(self, mob, room=None, world=None):
         """
         Called when a mob dies. Records death time for respawn tracking.
 
         Args:
             mob: The Mob instance that died
             room: The room where it died (optional, for cleanup)
+            world: The OrekaWorld instance (defaults to the linked world)
         """
         vnum = getattr(mob, 'vnum', None)
         if vnum is None:
@@ -205,10 +293,11 @@ class SpawnManager:
         if spawn_point:
             spawn_point.mark_dead()
 
-            # Remove from room's mob list
-            if room:
-                if mob in room.mobs:
-                    room.mobs.remove(mob)
+            # Remove from the room through the location index
+            world = world or self.world
+            if world is not None:
+                from src.world import get_location_index
+                get_location_index(world).remove_mob(mob, room)
 
     def tick(self, world) -> List[str]:
         """
@@ -224,18 +313,71 @@ class SpawnManager:
         if not self.enabled:
             return []
 
-        messages = []
+        self.world = world
+        from src.world import get_location_index
+        get_location_index(world).prune()
 
-        for spawn_key, spawn_point in self.spawn_points.items():
-            if spawn_point.can_respawn():
-                new_mob = spawn_point.spawn(world)
-                if new_mob:
-                    room = world.rooms.get(spawn_point.room_vnum)
-                    room_name = room.name if room else "somewhere"
-                    messages.append(f"[Respawn] {new_mob.name} appears in {room_name}.")
+        messages = []
+        by_room: Dict[int, List[Any]] = {}
+        queue = self._queue
+        now = time.time()
+        popped = 0
+
+        while queue and queue[0][0] <= now:
+            due, _seq, spawn_key = heapq.heappop(queue)
+            popped += 1
+            spawn_point = self.spawn_points.get(spawn_key)
+            if spawn_point is None or spawn_point.due != due:
+                self.stale_popped += 1
+                continue
+            spawn_point.due = None
+            if spawn_point.respawn_time is None or spawn_point.is_alive():
+                continue
+            if not spawn_point.can_respawn():
+                # Death time moved since it was queued
+                self.schedule(spawn_point)
+                continue
+            new_mob = spawn_point.spawn(world)
+            if new_mob:
+                self.respawned += 1
+                by_room.setdefault(spawn_point.room_vnum, []).append(new_mob)
+                room = world.rooms.get(spawn_point.room_vnum)
+                room_name = room.name if room else "somewhere"
+                messages.append(f"[Respawn] {new_mob.name} appears in {room_name}.")
+
+        self.last_tick_popped = popped
+        for room_vnum, mobs in by_room.items():
+            room = world.rooms.get(room_vnum)
+            if room is not None:
+                self._announce_respawns(room, mobs)
 
         return messages
 
+    def _announce_respawns(self, room, mobs: List[Any]):
+        """Tell players in a room about its respawns in one message and GMCP update."""
+        players = getattr(room, 'players', None)
+        if not players:
+            return
+        self.room_batches += 1
+        names = ", ".join(getattr(m, 'name', 'Something') for m in mobs)
+        verb = "appears" if len(mobs) == 1 else "appear"
+        try:
+            from src.gmcp import emit_room_mobs
+        except Exception:
+            emit_room_mobs = None
+        for player in players:
+            writer = getattr(player, '_writer', None) or getattr(player, 'writer', None)
+            if writer is not None:
+                try:
+                    writer.write(f"\n{names} {verb}.\n")
+                except Exception:
+                    pass
+            if emit_room_mobs is not None:
+                try:
+                    emit_room_mobs(player, room)
+                except Exception as e:
+                    logger.debug(f"Room.Mobs after respawn: {e}")
+
     def force_respawn(self, vnum: int, world) -> Tuple[bool, str]:
         """
         Force a specific mob to respawn immediately.
@@ -306,33 +448,39 @@ class SpawnManager:
             return False, f"No spawn point found for vnum {vnum}."
 
         if seconds <= 0:
+            if spawn_point.respawn_time is not None:
+                self.no_respawn_points += 1
             spawn_point.respawn_time = None
+            spawn_point.due = None
             return True, f"{spawn_point.name} will no longer respawn."
         else:
+            if spawn_point.respawn_time is None:
+                self.no_respawn_points -= 1
             spawn_point.respawn_time = seconds
+            if not spawn_point.is_alive():
+                self.schedule(spawn_point)
             minutes = seconds / 60
             return True, f"{spawn_point.name} respawn time set to {minutes:.1f} minutes."
 
     def get_status(self) -> str:
         """Get a summary of spawn point status."""
-        alive = 0
-        dead = 0
-        no_respawn = 0
-
-        for sp in self.spawn_points.values():
-            if sp.respawn_time is None:
-                no_respawn += 1
-            elif sp.is_alive():
-                alive += 1
-            else:
-                dead += 1
+        queued = self._queued_points()
+        pending = len(queued)
+        no_respawn = self.no_respawn_points
+        next_due = ""
+        if queued:
+            soonest = min(sp.due for sp in queued)
+            next_due = f" (next in {max(0.0, soonest - time.time()):.0f}s)"
 
         status = f"Spawn Manager Status:\n"
         status += f"  Enabled: {self.enabled}\n"
         status += f"  Total spawn points: {len(self.spawn_points)}\n"
-        status += f"  Alive: {alive}\n"
-        status += f"  Dead (pending respawn): {dead}\n"
+        status += f"  Alive: {len(self.spawn_points) - pending - no_respawn}\n"
+        status += f"  Dead (pending respawn): {pending}{next_due}\n"
         status += f"  No respawn: {no_respawn}\n"
+        status += f"  Queue entries: {len(self._queue)} (stale popped: {self.stale_popped})\n"
+        status += f"  Respawned: {self.respawned} in {self.room_batches} room batches "
+        status += f"(last tick popped {self.last_tick_popped})\n"
         status += f"  Default respawn time: {DEFAULT_RESPAWN_TIME}s ({DEFAULT_RESPAWN_TIME/60:.1f} min)\n"
         status += f"  Boss respawn time: {BOSS_RESPAWN_TIME}s ({BOSS_RESPAWN_TIME/60:.1f} min)"
 
@@ -347,11 +495,10 @@ class SpawnManager:
         """
         pending = []
 
-        for spawn_key, sp in self.spawn_points.items():
-            if not sp.is_alive() and sp.respawn_time is not None:
-                remaining = sp.time_until_respawn()
-                if remaining is not None:
-                    pending.append((sp.name, sp.vnum, remaining))
+        for sp in self._queued_points():
+            remaining = sp.time_until_respawn()
+            if remaining is not None:
+                pending.append((sp.name, sp.vnum, remaining))
 
         # Sort by time remaining
         pending.sort(key=lambda x: x[2])
@@ -0,0 +1,148 @@
+"""
+Mutation version counters for GMCP state deltas.
+
+The GMCP tick used to rebuild every character's vitals, condition set
+and room-mob fingerprint every pulse just to find nothing had changed.
+Instead, the state it reports carries integer counters that are bumped
+when that state is written:
+
+- Character.vitals_version: hp, move, ac, gold, xp, level, spell slots.
+- Character.status_version: conditions, active_conditions, divine_buffs.
+- Mob.state_version: name, hp, max_hp, alive.
+- Room.mobs_version: mobs entering or leaving the room.
+
+Tracked attributes are ``Versioned`` data descriptors installed on the
+class, so only writes to those names pay for the check (only real changes
+bump); every other attribute write is a plain instance-dict store.
+Containers that callers mutate in place are copied into the tracked
+subclasses below when assigned, so ``ch.conditions.add("prone")`` or
+``room.mobs.remove(mob)`` bump the owner's counter too.
+
+Usage:
+    if character.vitals_version != prev["vitals_version"]:
+        ... rebuild and emit Char.Vitals ...
+"""
+
+_MISSING = object()
+
+
+class _Tracked:
+    """Mixin: call ``on_change`` after every mutating method."""
+    on_change = None
+
+    def __reduce__(self):
+        # Copies and pickles are plain containers, detached from the owner
+        return (self._plain, (self._plain(self),))
+
+
+def _track(cls, base, method_names):
+    def make(name):
+        method = getattr(base, name)
+
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            if self.on_change is not None:
+                self.on_change()
+            return result
+
+        wrapper.__name__ = name
+        return wrapper
+
+    for name in method_names:
+        setattr(cls, name, make(name))
+    cls._plain = base
+    return cls
+
+
+class TrackedList(_Tracked, list):
+    pass
+
+
+class TrackedSet(_Tracked, set):
+    pass
+
+
+class TrackedDict(_Tracked, dict):
+    pass
+
+
+_track(TrackedList, list, (
+    'append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+    '__setitem__', '__delitem__', '__iadd__', '__imul__'))
+_track(TrackedSet, set, (
+    'add', 'discard', 'remove', 'pop', 'clear', 'update', 'difference_update',
+    'intersection_update', 'symmetric_difference_update',
+    '__ior__', '__iand__', '__isub__', '__ixor__'))
+_track(TrackedDict, dict, (
+    '__setitem__', '__delitem__', 'pop', 'popitem', 'clear', 'update',
+    'setdefault', '__ior__'))
+
+_TRACKED_TYPES = {
+    list: TrackedList, TrackedList: TrackedList,
+    set: TrackedSet, TrackedSet: TrackedSet,
+    dict: TrackedDict, TrackedDict: TrackedDict,
+}
+
+
+def bump(obj, counter: str):
+    """Increment ``obj.<counter>``."""
+    d = obj.__dict__
+    d[counter] = d.get(counter, 0) + 1
+
+
+def set_versioned(obj, name: str, value, counter: str):
+    """Assign ``obj.<name> = value`` and bump ``counter`` if it changed.
+
+    Plain lists, sets and dicts are copied into a Tracked* container so
+    in-place mutation also bumps the counter. The attribute is therefore
+    not the object that was assigned: keep mutating ``obj.<name>``, not
+    the original container, or the change is neither seen nor counted.
+    """
+    d = obj.__dict__
+    current = d.get(name, _MISSING)
+    if value is current:
+        return  # e.g. ch.conditions |= {...} after the in-place update
+    tracked_type = _TRACKED_TYPES.get(type(value))
+    if tracked_type is not None:
+        value = tracked_type(value)
+        value.on_change = lambda: bump(obj, counter)
+    elif current == value:
+        return
+    d[name] = value
+    d[counter] = d.get(counter, 0) + 1
+
+
+class Versioned:
+    """Data descriptor that routes ``obj.<name> = value`` through
+    set_versioned, bumping ``obj.<counter>``.
+
+    The value lives in the instance ``__dict__`` under the same name;
+    reading an unset attribute raises AttributeError as usual.
+    """
+
+    def __init__(self, counter: str):
+        self.counter = counter
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(obj).__name__!r} object has no attribute {self.name!r}") from None
+
+    def __set__(self, obj, value):
+        set_versioned(obj, self.name, value, self.counter)
+
+
+def track_attrs(cls, names, counter: str):
+    """Install a Versioned descriptor on ``cls`` for each of ``names``."""
+    for name in names:
+        descriptor = Versioned(counter)
+        descriptor.__set_name__(cls, name)
+        setattr(cls, name, descriptor)
@@ -0,0 +1,268 @@
+"""
+Telnet codec for OrekaMUD3.
+
+Input: TelnetDecoder is an incremental IAC parser. Plain text between IAC
+bytes is located with bytes.find() and copied in bulk through a
+memoryview, so a paste flood costs a few slice copies rather than a
+Python loop iteration per byte. Sequences split across reads (a lone
+trailing IAC, an unterminated subnegotiation) are carried over to the
+next feed(). A subnegotiation longer than MAX_SUBNEG_BYTES is dropped,
+along with everything up to its IAC SE, instead of being buffered.
+
+Output: TelnetOutput batches every write() issued during one event-loop
+tick into a single transport write, honours transport backpressure in
+drain(), and optionally compresses the stream with MCCP2 (zlib) once the
+client has agreed to it.
+
+Usage:
+    decoder = TelnetDecoder()
+    text, events = decoder.feed(raw)     # events: ("gmcp", "Core.Hello {...}"),
+                                         #         ("do", 86), ("sb", opt, bytes), ...
+    out = TelnetOutput(stream_writer)
+    out.write("You see a room.\\n")      # flushed once per loop tick
+"""
+
+import asyncio
+import logging
+import os
+import zlib
+from typing import List, Tuple
+
+logger = logging.getLogger("OrekaMUD.Telnet")
+
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+SB = 250
+SE = 240
+GMCP_OPT = 201
+MCCP2_OPT = 86
+
+_IAC_BYTE = b"\xff"
+_NEGOTIATION = {WILL: "will", WONT: "wont", DO: "do", DONT: "dont"}
+
+# Longest subnegotiation (IAC SB ... IAC SE) buffered before it is dropped
+MAX_SUBNEG_BYTES = 8192
+
+# Offer MCCP2 to telnet clients (set OREKA_MCCP2=0 to disable)
+MCCP2_ENABLED = os.environ.get("OREKA_MCCP2", "1") != "0"
+
+
+class TelnetDecoder:
+    """Incremental telnet input parser.
+
+    feed() returns (clean_bytes, events). Events are tuples:
+      ("will"|"wont"|"do"|"dont", option)
+      ("gmcp", payload_str)           -- IAC SB 201 ... IAC SE
+      ("sb", option, payload_bytes)   -- any other subnegotiation
+      ("cmd", command_byte)           -- other two-byte IAC commands
+    """
+
+    def __init__(self):
+        self._pending = b""
+        self._discarding = False  # inside an oversized SB, skipping to IAC SE
+        self.dropped_subnegs = 0
+
+    def feed(self, data: bytes) -> Tuple[bytes, List[tuple]]:
+        if self._pending:
+            data = self._pending + data
+            self._pending = b""
+        if self._discarding:
+            end, lone_iac = self._scan_se(data, 0)
+            if end < 0:
+                if lone_iac:
+                    self._pending = _IAC_BYTE
+                return b"", []
+            self._discarding = False
+            data = data[end + 2:]
+        if _IAC_BYTE not in data:
+            return data, []
+
+        view = memoryview(data)
+        out = []
+        events = []
+        n = len(data)
+        pos = 0
+        while pos < n:
+            i = data.find(_IAC_BYTE, pos)
+            if i < 0:
+                out.append(view[pos:])
+                break
+            if i > pos:
+                out.append(view[pos:i])
+            if i + 1 >= n:
+                self._pending = data[i:]
+                break
+            cmd = data[i + 1]
+            if cmd == IAC:
+                out.append(_IAC_BYTE)
+                pos = i + 2
+            elif cmd in _NEGOTIATION:
+                if i + 2 >= n:
+                    self._pending = data[i:]
+                    break
+                events.append((_NEGOTIATION[cmd], data[i + 2]))
+                pos = i + 3
+            elif cmd == SB:
+                end, lone_iac = self._scan_se(data, i + 2)
+                if end < 0:
+                    if n - i > MAX_SUBNEG_BYTES:
+                        self._drop_subneg()
+                        self._discarding = True
+                        if lone_iac:
+                            self._pending = _IAC_BYTE
+                    else:
+                        self._pending = data[i:]
+                    break
+                if end - i > MAX_SUBNEG_BYTES:
+                    self._drop_subneg()
+                elif i + 2 < end:
+                    opt = data[i + 2]
+                    payload = data[i + 3:end].replace(b"\xff\xff", _IAC_BYTE)
+                    if opt == GMCP_OPT:
+                        events.append(("gmcp", payload.decode("utf-8", errors="replace")))
+                    else:
+                        events.append(("sb", opt, payload))
+                pos = end + 2
+            else:
+                events.append(("cmd", cmd))
+                pos = i + 2
+        return b"".join(out), events
+
+    def _drop_subneg(self):
+        self.dropped_subnegs += 1
+        logger.warning(f"Dropped telnet subnegotiation over {MAX_SUBNEG_BYTES} bytes")
+
+    @staticmethod
+    def _scan_se(data: bytes, start: int) -> Tuple[int, bool]:
+        """Find the IAC SE ending a subnegotiation.
+
+        Returns (index of its IAC or -1, whether the data ends in an
+        unpaired IAC that the next read may complete).
+        """
+        pos = start
+        while True:
+            j = data.find(_IAC_BYTE, pos)
+            if j < 0:
+                return -1, False
+            if j + 1 >= len(data):
+                return -1, True
+            nxt = data[j + 1]
+            if nxt == SE:
+                return j, False
+            # IAC IAC is an escaped 255 inside the payload
+            pos = j + 2 if nxt == IAC else j + 1
+
+
+def strip_iac(data: bytes) -> bytes:
+    """One-shot: remove all telnet sequences from a complete buffer."""
+    return TelnetDecoder().feed(data)[0]
+
+
+def extract_gmcp(data: bytes) -> Tuple[bytes, List[str]]:
+    """One-shot: (clean_bytes, [gmcp payloads]) from a complete buffer."""
+    clean, events = TelnetDecoder().feed(data)
+    return clean, [e[1] for e in events if e[0] == "gmcp"]
+
+
+def gmcp_frame(payload: str) -> bytes:
+    """IAC SB GMCP <payload> IAC SE, escaping any 255 bytes in the payload."""
+    body = payload.encode("utf-8").replace(_IAC_BYTE, b"\xff\xff")
+    return bytes([IAC, SB, GMCP_OPT]) + body + bytes([IAC, SE])
+
+
+class TelnetOutput:
+    """Per-connection output buffer: one transport write per loop tick.
+
+    Text and raw telnet sequences written during the same tick are joined
+    and handed to the transport once. drain() flushes immediately and
+    waits on the stream's flow control, so a slow client applies
+    backpressure to whoever awaits drain(). After start_mccp2() the byte
+    stream is zlib-compressed (sync-flushed per batch).
+    """
+
+    def __init__(self, stream_writer):
+        self._writer = stream_writer
+        self._chunks: List[bytes] = []
+        self._scheduled = False
+        self._compressor = None
+        self.closed = False
+
+        # Instrumentation
+        self.writes = 0
+        self.flushes = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def compressing(self) -> bool:
+        return self._compressor is not None
+
+    def write(self, data: bytes):
+        if self.closed or not data:
+            return
+        self._chunks.append(data)
+        self.writes += 1
+        if not self._scheduled:
+            self._scheduled = True
+            try:
+                asyncio.get_running_loop().call_soon(self.flush)
+            except RuntimeError:
+                self.flush()
+
+    def flush(self):
+        self._scheduled = False
+        if not self._chunks or self.closed:
+            self._chunks = []
+            return
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.bytes_in += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.bytes_out += len(data)
+        self.flushes += 1
+        try:
+            self._writer.write(data)
+        except Exception:
+            self.closed = True
+
+    async def drain(self):
+        self.flush()
+        try:
+            await self._writer.drain()
+        except Exception:
+            pass
+
+    def start_mccp2(self):
+        """Client sent DO MCCP2: announce and compress everything after."""
+        if self._compressor is not None:
+            return
+        self.flush()
+        try:
+            self._writer.write(bytes([IAC, SB, MCCP2_OPT, IAC, SE]))
+        except Exception:
+            return
+        self._compressor = zlib.compressobj(6)
+        logger.debug("MCCP2 compression started")
+
+    def stop_mccp2(self):
+        if self._compressor is None:
+            return
+        self.flush()
+        try:
+            self._writer.write(self._compressor.flush(zlib.Z_FINISH))
+        except Exception:
+            pass
+        self._compressor = None
+
+    def close(self):
+        self.flush()
+        self.stop_mccp2()
+        self.closed = True
+        try:
+            self._writer.close()
+        except Exception:
+            pass
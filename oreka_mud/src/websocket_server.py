@@ -1,16 +1,26 @@
 """
 WebSocket server for OrekaMUD3.
 Runs alongside the telnet server. Veil Client connects via WebSocket.
-Proxies bidirectionally to the internal telnet server.
-
-GMCP Integration:
-  - Telnet IAC SB 201 ... IAC SE sequences are extracted from the MUD output
-    stream and re-sent to the WebSocket client as text frames:
-        GMCP:<package> <json>
-  - WebSocket client GMCP messages (prefixed with "GMCP:") are converted to
-    telnet subnegotiation and forwarded to the MUD.
+
+In-process transport (default when main.py passes a client handler):
+  - Each WebSocket session is attached directly to handle_client through
+    WebSocketReader / WebSocketWriter, which expose the same
+    readline()/write()/drain()/close() interface as the telnet wrappers.
+  - Login answers collected by the Veil pre-auth wizard are queued as the
+    first input lines, so no sleep-timed autologin is needed.
+  - GMCP goes out as native ``GMCP:<package> <json>`` text frames through
+    WebSocketGMCPHandler, in order with the text output; inbound
+    ``GMCP:`` frames are handed to the same handler. No telnet bytes are
+    generated or parsed.
+
+Legacy proxy (no client handler, e.g. the server run standalone):
+  - Proxies bidirectionally to the internal telnet server. Telnet
+    IAC SB 201 ... IAC SE sequences are extracted from the MUD output
+    stream and re-sent as ``GMCP:`` text frames; client ``GMCP:`` frames
+    are converted to telnet subnegotiation.
 """
 import asyncio
+import functools
 import logging
 
 logger = logging.getLogger("OrekaMUD.WebSocket")
@@ -18,15 +28,9 @@ logger = logging.getLogger("OrekaMUD.WebSocket")
 WS_PORT = 8765
 WS_HOST = '127.0.0.1'
 
-# Telnet bytes used for GMCP extraction
-IAC = 255
-SB = 250
-SE = 240
-WILL = 251
-WONT = 252
-DO = 253
-DONT = 254
-GMCP_OPT = 201
+from src.telnet_codec import (
+    DO, GMCP_OPT, IAC, TelnetDecoder, extract_gmcp, gmcp_frame,
+)
 
 
 def _extract_gmcp_and_clean(data):
@@ -36,60 +40,12 @@ def _extract_gmcp_and_clean(data):
     GMCP payloads are returned as strings like "Char.Vitals {...}" ready
     to prefix with "GMCP:" for WebSocket delivery.
     """
-    gmcp_messages = []
-    result = bytearray()
-    i = 0
-    while i < len(data):
-        if data[i] == IAC and i + 1 < len(data):
-            cmd = data[i + 1]
-            if cmd == SB and i + 2 < len(data) and data[i + 2] == GMCP_OPT:
-                # GMCP subnegotiation: IAC SB 201 <payload> IAC SE
-                j = i + 3
-                payload_start = j
-                while j < len(data) - 1:
-                    if data[j] == IAC and data[j + 1] == SE:
-                        payload = data[payload_start:j]
-                        try:
-                            gmcp_messages.append(payload.decode('utf-8', errors='replace'))
-                        except Exception:
-                            pass
-                        j += 2
-                        break
-                    j += 1
-                else:
-                    # Incomplete subnegotiation — skip to end
-                    j = len(data)
-                i = j
-                continue
-            elif cmd in (WILL, WONT, DO, DONT):
-                i += 3  # Skip IAC + cmd + option
-                continue
-            elif cmd == SB:
-                # Non-GMCP subnegotiation — skip until IAC SE
-                j = i + 2
-                while j < len(data) - 1:
-                    if data[j] == IAC and data[j + 1] == SE:
-                        j += 2
-                        break
-                    j += 1
-                i = j
-                continue
-            elif cmd == IAC:  # Escaped IAC
-                result.append(IAC)
-                i += 2
-                continue
-            else:
-                i += 2
-                continue
-        result.append(data[i])
-        i += 1
-    return bytes(result), gmcp_messages
+    return extract_gmcp(data)
 
 
 def _gmcp_to_telnet_sb(package_and_data):
     """Convert a GMCP string (e.g. 'Core.Hello {...}') to IAC SB 201 ... IAC SE."""
-    payload = package_and_data.encode('utf-8')
-    return bytes([IAC, SB, GMCP_OPT]) + payload + bytes([IAC, SE])
+    return gmcp_frame(package_and_data)
 
 
 # =========================================================================
@@ -206,19 +162,180 @@ async def _veil_preauth(websocket):
     }, None
 
 
+# =========================================================================
+# In-process transport — WebSocket reader/writer for handle_client
+# =========================================================================
+
+class WebSocketReader:
+    """Line reader over WebSocket frames, matching TelnetReader's interface.
+
+    ``GMCP:`` frames are consumed by the GMCP handler and never surface as
+    input. Lines in ``preload`` are returned first (pre-auth answers).
+    """
+
+    IDLE_TIMEOUT = 300  # same idle cutoff as the telnet reader
+
+    def __init__(self, websocket, gmcp=None, preload=()):
+        self.websocket = websocket
+        self.gmcp = gmcp
+        self._lines = list(preload)
+        self._buffer = ""
+        self._closed = False
+
+    async def _fill(self) -> bool:
+        """Receive one input frame into the buffer. False on close/timeout."""
+        while True:
+            try:
+                msg = await asyncio.wait_for(self.websocket.recv(),
+                                             timeout=self.IDLE_TIMEOUT)
+            except Exception:
+                self._closed = True
+                return False
+            if isinstance(msg, bytes):
+                msg = msg.decode('utf-8', errors='replace')
+            if msg.startswith("GMCP:"):
+                if self.gmcp is not None:
+                    self.gmcp.handle_client_message(msg)
+                continue
+            # Each text frame is one line of input unless it carries its own
+            self._buffer += msg if msg.endswith('\n') else msg + '\n'
+            return True
+
+    async def readline(self):
+        if self._lines:
+            return self._lines.pop(0)
+        while '\n' not in self._buffer:
+            if self._closed or not await self._fill():
+                return ""
+        line, self._buffer = self._buffer.split('\n', 1)
+        return line.strip('\r')
+
+    async def read(self, n):
+        if self._lines:
+            self._buffer = self._lines.pop(0) + '\n' + self._buffer
+        if not self._buffer and not self._closed:
+            await self._fill()
+        result = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return result
+
+
+class WebSocketWriter:
+    """Ordered, non-blocking frame writer matching TelnetWriter's interface.
+
+    ``write()`` is synchronous like the telnet writer; text is queued and a
+    single sender task delivers it, coalescing consecutive writes into one
+    frame. GMCP frames go through the same queue so they stay in order
+    with the surrounding text.
+    """
+
+    def __init__(self, websocket):
+        self._writer = websocket  # underlying transport, as on TelnetWriter
+        self.websocket = websocket
+        self._queue = []
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self._sender = asyncio.ensure_future(self._send_loop())
+        from src.gmcp import WebSocketGMCPHandler
+        self.gmcp = WebSocketGMCPHandler(self)
+
+    def _enqueue(self, is_gmcp: bool, text: str):
+        if self._closed:
+            return
+        self._queue.append((is_gmcp, text))
+        self._idle.clear()
+        self._wakeup.set()
+
+    def write(self, text):
+        """Queue text for the client."""
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', errors='replace')
+        if text:
+            self._enqueue(False, text)
+
+    def send_nowait(self, message: str):
+        """Queue a complete frame (used by WebSocketGMCPHandler)."""
+        self._enqueue(True, message)
+
+    async def _send_loop(self):
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._queue:
+                    batch, self._queue = self._queue, []
+                    text = []
+                    for is_gmcp, item in batch:
+                        if is_gmcp:
+                            if text:
+                                await self.websocket.send("".join(text))
+                                text = []
+                            await self.websocket.send(item)
+                        else:
+                            text.append(item)
+                    if text:
+                        await self.websocket.send("".join(text))
+                self._idle.set()
+                if self._closed:
+                    return
+        except Exception:
+            # Client went away; drop anything still queued
+            self._closed = True
+            self._queue = []
+            self._idle.set()
+
+    async def drain(self):
+        await self._idle.wait()
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+
+    async def wait_closed(self):
+        try:
+            await asyncio.wait_for(asyncio.shield(self._sender), timeout=5)
+        except Exception:
+            self._sender.cancel()
+
+
+def _preauth_input(auth):
+    """Input lines that answer handle_client's login prompts for this session."""
+    if auth["is_new"]:
+        lines = ["n"]
+    else:
+        lines = ["y", auth["username"], auth["password"]]
+        if auth["mode"] == "chat" and auth.get("chat_npc_name"):
+            lines.append(f"chat {auth['chat_npc_name'].split()[0]}")
+    return lines
+
+
+async def _run_in_process(websocket, auth, client_handler):
+    """Attach a pre-authenticated WebSocket session directly to the MUD."""
+    writer = WebSocketWriter(websocket)
+    reader = WebSocketReader(websocket, gmcp=writer.gmcp,
+                             preload=_preauth_input(auth))
+    try:
+        await client_handler(reader, writer)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
 # =========================================================================
 # Main WebSocket handler
 # =========================================================================
 
-async def ws_handler(websocket):
-    """Handle a WebSocket connection by proxying to the telnet MUD.
+async def ws_handler(websocket, client_handler=None):
+    """Handle a WebSocket connection.
 
-    GMCP subnegotiation from the MUD is intercepted and forwarded as
-    ``GMCP:<package> <json>`` text frames to the WebSocket client.
+    After the Veil pre-auth wizard the session is handed straight to
+    ``client_handler(reader, writer)`` (main.handle_client) when one is
+    given; otherwise it falls back to proxying through the telnet port.
     """
     logger.info(f"WebSocket connection from {websocket.remote_address}")
 
-    writer = None
     try:
         # === PHASE 1: Veil Pre-Auth Wizard ===
         auth, error = await _veil_preauth(websocket)
@@ -232,7 +349,29 @@ async def ws_handler(websocket):
         if not auth:
             return
 
-        # === PHASE 2: Open telnet proxy ===
+        # === PHASE 2: Attach to the game ===
+        if client_handler is not None:
+            await _run_in_process(websocket, auth, client_handler)
+        else:
+            await _proxy_to_telnet(websocket, auth)
+    except Exception as e:
+        logger.error(f"WebSocket handler error: {e}")
+    finally:
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+        logger.info(f"WebSocket connection closed from {websocket.remote_address}")
+
+
+async def _proxy_to_telnet(websocket, auth):
+    """Legacy path: proxy the session through the loopback telnet server.
+
+    GMCP subnegotiation from the MUD is intercepted and forwarded as
+    ``GMCP:<package> <json>`` text frames to the WebSocket client.
+    """
+    writer = None
+    try:
         reader, writer = await asyncio.wait_for(
             asyncio.open_connection('127.0.0.1', 4000),
             timeout=10.0,
@@ -311,48 +450,18 @@ async def ws_handler(websocket):
 
             Intercepts GMCP subnegotiation bytes and sends them as
             GMCP:-prefixed text frames instead of raw telnet bytes.
-            Buffers partial IAC sequences across read boundaries.
+            The decoder buffers partial IAC sequences across reads.
             """
-            pending = bytearray()
+            decoder = TelnetDecoder()
             try:
                 while True:
                     data = await reader.read(4096)
                     if not data:
                         break
 
-                    # Prepend any leftover bytes from a split IAC sequence
-                    if pending:
-                        data = bytes(pending) + data
-                        pending.clear()
-
-                    # Check if data ends mid-IAC sequence (incomplete subneg)
-                    # Look for IAC SB without matching IAC SE
-                    i = len(data) - 1
-                    while i >= 0 and data[i] != IAC:
-                        i -= 1
-                    if i >= 0 and i < len(data) - 1:
-                        cmd = data[i + 1]
-                        if cmd == SB:
-                            # IAC SB started but no IAC SE found after it
-                            has_se = False
-                            for j in range(i + 2, len(data) - 1):
-                                if data[j] == IAC and data[j + 1] == SE:
-                                    has_se = True
-                                    break
-                            if not has_se:
-                                # Buffer the incomplete sequence for next read
-                                pending.extend(data[i:])
-                                data = data[:i]
-                    elif i == len(data) - 1:
-                        # Data ends with lone IAC byte — buffer it
-                        pending.append(data[i])
-                        data = data[:i]
-
-                    if not data:
-                        continue
-
-                    # Extract GMCP messages and clean telnet negotiation
-                    clean, gmcp_messages = _extract_gmcp_and_clean(data)
+                    # Incremental decode: split IAC sequences carry over
+                    clean, events = decoder.feed(data)
+                    gmcp_messages = [e[1] for e in events if e[0] == "gmcp"]
 
                     # Send any GMCP messages as prefixed text frames
                     for gmcp_msg in gmcp_messages:
@@ -382,8 +491,6 @@ async def ws_handler(websocket):
                 task.cancel()
             await asyncio.gather(*tasks, return_exceptions=True)
 
-    except Exception as e:
-        logger.error(f"WebSocket handler error: {e}")
     finally:
         # Clean up TCP connection
         if writer:
@@ -392,20 +499,20 @@ async def ws_handler(websocket):
                 await writer.wait_closed()
             except Exception:
                 pass
-        # Close WebSocket
-        try:
-            await websocket.close()
-        except Exception:
-            pass
-        logger.info(f"WebSocket connection closed from {websocket.remote_address}")
 
 
-async def start_websocket_server():
-    """Start the WebSocket server. Call from main.py."""
+async def start_websocket_server(client_handler=None):
+    """Start the WebSocket server. Call from main.py.
+
+    Args:
+        client_handler: ``async (reader, writer)`` session handler to attach
+            WebSocket clients to in-process. None proxies via telnet.
+    """
     try:
         import websockets
         async with websockets.serve(
-            ws_handler, WS_HOST, WS_PORT,
+            functools.partial(ws_handler, client_handler=client_handler),
+            WS_HOST, WS_PORT,
             ping_interval=30,
             ping_timeout=10,
             close_timeout=5,
@@ -1,8 +1,156 @@
 
 import os
 import json
+from typing import Any, Dict, Optional
 from src.room import Room
 from src.mob import Mob
+from src.room_graph import RoomGraph
+
+
+class LocationIndex:
+    """
+    Authoritative mob -> room vnum index for a world.
+
+    Room.mobs remains the room -> occupants side; this index is the reverse
+    mapping so "where is this mob?" is a dict read instead of a scan of
+    every room. Subsystems move mobs through place_mob / move_mob /
+    remove_mob so both sides stay in step. A mob that was placed by code
+    that bypassed the index is found once by scanning and then recorded.
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self._mob_rooms: Dict[Any, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def rebuild(self):
+        """Re-derive the index from every room's mob list."""
+        self._mob_rooms = {}
+        for vnum, room in self.world.rooms.items():
+            for mob in room.mobs:
+                self._mob_rooms[mob] = vnum
+
+    def _resolve(self, room) -> Optional[Room]:
+        """Accept a Room or a room vnum."""
+        if isinstance(room, int):
+            return self.world.rooms.get(room)
+        return room
+
+    def place_mob(self, mob, room) -> bool:
+        """Put a mob into a room (Room or vnum), leaving any room it was in.
+
+        Returns False if the room is unknown.
+        """
+        room = self._resolve(room)
+        if room is None:
+            return False
+        old_vnum = self._mob_rooms.get(mob)
+        if old_vnum is not None and old_vnum != room.vnum:
+            old_room = self.world.rooms.get(old_vnum)
+            if old_room is not None and mob in old_room.mobs:
+                old_room.mobs.remove(mob)
+        if mob not in room.mobs:
+            room.mobs.append(mob)
+        self._mob_rooms[mob] = room.vnum
+        mob.room_vnum = room.vnum
+        return True
+
+    def move_mob(self, mob, room) -> Optional[int]:
+        """Move a mob to another room. Returns the vnum it left, if any."""
+        from_vnum = self.room_vnum_of(mob)
+        if not self.place_mob(mob, room):
+            return None
+        return from_vnum
+
+    def remove_mob(self, mob, room=None) -> Optional[int]:
+        """Take a mob out of the world's rooms (despawn, mount, follow).
+
+        Args:
+            mob: The mob to remove
+            room: Room the caller knows the mob is in (optional)
+        """
+        room = self._resolve(room)
+        vnum = self._mob_rooms.pop(mob, None)
+        if vnum is None and room is None:
+            vnum = self.room_vnum_of(mob)
+            self._mob_rooms.pop(mob, None)
+        if vnum is not None:
+            indexed = self.world.rooms.get(vnum)
+            if indexed is not None and mob in indexed.mobs:
+                indexed.mobs.remove(mob)
+        if room is not None and mob in room.mobs:
+            room.mobs.remove(mob)
+            vnum = room.vnum
+        return vnum
+
+    def renumber_room(self, old_vnum: int, new_vnum: int):
+        """Re-key index entries after a room's vnum changes."""
+        for mob, vnum in self._mob_rooms.items():
+            if vnum == old_vnum:
+                self._mob_rooms[mob] = new_vnum
+
+    def room_vnum_of(self, mob) -> Optional[int]:
+        """Vnum of the room a mob is in, or None if it is not in any room."""
+        rooms = self.world.rooms
+        vnum = self._mob_rooms.get(mob)
+        if vnum is not None:
+            room = rooms.get(vnum)
+            if room is not None and mob in room.mobs:
+                self.hits += 1
+                return vnum
+            # Left its room behind the index's back: forget and look again
+            del self._mob_rooms[mob]
+        self.misses += 1
+        # Not indexed yet: check the mob's own hint, then scan once.
+        hint = getattr(mob, 'room_vnum', None)
+        room = rooms.get(hint) if hint is not None else None
+        if room is not None and mob in room.mobs:
+            self._record(mob, hint)
+            return hint
+        for vnum, room in rooms.items():
+            if mob in room.mobs:
+                self._record(mob, vnum)
+                return vnum
+        return None
+
+    def _record(self, mob, vnum: int):
+        # Dead mobs are answered by scan but not kept in the index
+        if getattr(mob, 'alive', True):
+            self._mob_rooms[mob] = vnum
+
+    def prune(self) -> int:
+        """Drop entries for dead mobs and mobs no longer in their room."""
+        rooms = self.world.rooms
+        stale = [mob for mob, vnum in self._mob_rooms.items()
+                 if not getattr(mob, 'alive', True)
+                 or vnum not in rooms or mob not in rooms[vnum].mobs]
+        for mob in stale:
+            del self._mob_rooms[mob]
+        return len(stale)
+
+    def room_of(self, mob) -> Optional[Room]:
+        """The Room a mob is in, or None."""
+        vnum = self.room_vnum_of(mob)
+        return self.world.rooms.get(vnum) if vnum is not None else None
+
+    def occupants(self, room_vnum: int) -> list:
+        """Mobs currently in a room."""
+        room = self.world.rooms.get(room_vnum)
+        return room.mobs if room is not None else []
+
+    def __len__(self):
+        return len(self._mob_rooms)
+
+
+def get_location_index(world) -> LocationIndex:
+    """Get the world's location index, attaching one if it has none yet."""
+    index = getattr(world, 'locations', None)
+    if index is None:
+        index = LocationIndex(world)
+        world.locations = index
+    return index
+
 
 class OrekaWorld:
     def save_items(self):
@@ -21,11 +169,9 @@ class OrekaWorld:
         mobs_data = []
         for mob in self.mobs.values():
             d = mob.to_dict()
-            # Try to find the room vnum for this mob
-            for room in self.rooms.values():
-                if mob in room.mobs:
-                    d["room_vnum"] = room.vnum
-                    break
+            room_vnum = self.locations.room_vnum_of(mob)
+            if room_vnum is not None:
+                d["room_vnum"] = room_vnum
             mobs_data.append(d)
         with open(mobs_file, "w", encoding="utf-8") as f:
             json.dump(mobs_data, f, indent=2)
@@ -44,6 +190,8 @@ class OrekaWorld:
         self.mobs = {}
         self.players = []
         self.players_by_name = {}  # name.lower() -> Character for O(1) lookup
+        self.locations = LocationIndex(self)  # mob -> room vnum
+        self.room_graph = RoomGraph(self.rooms)  # cached exit graph / routes
         self.quests = {
             1: {"id": 1, "name": "Starweave Ritual", "description": "Perform the Starweave in Guild Street.", "location": 3001}
         }
@@ -94,7 +242,7 @@ class OrekaWorld:
             self.mobs[mob.vnum] = mob
             room_vnum = mob_data.get("room_vnum")
             if room_vnum in self.rooms:
-                self.rooms[room_vnum].mobs.append(mob)
+                self.locations.place_mob(mob, room_vnum)
 
     def do_who(self):
         output = "Players Online:\n"
@@ -8,7 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.ai_schemas.arc_expression import (
     parse_expression, evaluate_expression, validate_expression,
-    ArcExpressionError,
+    compile_expression, clear_expression_cache, ArcExpressionError,
 )
 
 
@@ -192,5 +192,31 @@ class TestValidate(unittest.TestCase):
         self.assertTrue(len(errors) >= 1)
 
 
+class TestCompiled(unittest.TestCase):
+    def setUp(self):
+        clear_expression_cache()
+
+    def test_compiled_once_per_source(self):
+        expr = "met_maeren.state == checked AND NOT arc.flags.done == yes"
+        first = compile_expression(expr)
+        self.assertIs(compile_expression(expr), first)
+        self.assertEqual(first.paths, (("met_maeren", "state"), ("arc", "flags", "done")))
+        self.assertTrue(first({"met_maeren": {"state": "checked"}, "arc": {"flags": {}}}))
+        self.assertFalse(first({}))
+
+    def test_invalid_expression_raises_each_time(self):
+        for _ in range(2):
+            with self.assertRaises(ArcExpressionError):
+                compile_expression("met_maeren.state ==")
+        self.assertFalse(evaluate_expression("met_maeren.state ==", {}))
+
+    def test_validation_warms_cache(self):
+        expr = "learned_x.detail.depth >= 3"
+        self.assertEqual(validate_expression(expr), [])
+        compiled = compile_expression(expr)
+        self.assertTrue(compiled({"learned_x": {"detail": {"depth": "4"}}}))
+        self.assertFalse(compiled({"learned_x": {"detail": {"depth": "deep"}}}))
+
+
 if __name__ == "__main__":
     unittest.main()
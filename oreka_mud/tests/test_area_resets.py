@@ -0,0 +1,95 @@
+"""Tests for incremental area resets."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.area_resets import ResetManager
+from src.room import Room
+
+
+class FakeItem:
+    def __init__(self, vnum):
+        self.vnum = vnum
+        self.name = f"item {vnum}"
+
+
+class FakeWorld:
+    def __init__(self, vnums):
+        self.rooms = {v: Room(vnum=v, name=f"Room {v}", description="", exits={}, flags=[])
+                      for v in vnums}
+
+
+class TestAreaResets(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        path = os.path.join(self.dir, "area_resets.json")
+        rooms = {str(v): {"items": [{"vnum": 500 + v}]} for v in range(1, 121)}
+        with open(path, "w") as f:
+            json.dump({"areas": {"crypt": {"reset_interval": 600, "rooms": rooms}}}, f)
+        patches = [
+            mock.patch("src.area_resets._config_path", return_value=path),
+            mock.patch.object(ResetManager, "_create_item", staticmethod(FakeItem)),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.world = FakeWorld(range(1, 121))
+        self.rm = ResetManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _make_due(self):
+        self.rm.last_reset["crypt"] = 0
+        self.rm._schedule("crypt")
+
+    def test_area_waits_for_its_due_time(self):
+        self.assertEqual(self.rm.check_resets(self.world), [])
+        self.assertEqual(self.rm.rooms_checked, 0)
+
+    def test_large_reset_spread_over_pulses(self):
+        self._make_due()
+        self.assertEqual(self.rm.check_resets(self.world, max_rooms=50), [])
+        self.assertEqual(self.rm.rooms_checked, 50)
+        self.assertEqual(self.rm.check_resets(self.world, max_rooms=50), [])
+        messages = self.rm.check_resets(self.world, max_rooms=50)
+        self.assertEqual(messages, ["Area 'crypt' reset: 120 room(s) restored."])
+        self.assertEqual(len(self.world.rooms[120].items), 1)
+        self.assertIn("next reset in", self.rm.get_status())
+
+    def test_only_dirty_rooms_are_touched(self):
+        self.rm.reset_area(self.world, "crypt")
+        checked = self.rm.rooms_checked
+        room = self.world.rooms[7]
+        room.items.clear()
+        from src import area_resets
+        with mock.patch.object(area_resets, "get_reset_manager", return_value=self.rm):
+            area_resets.mark_room_dirty(room)
+        self._make_due()
+        messages = self.rm.check_resets(self.world)
+        self.assertEqual(self.rm.rooms_checked - checked, 1)
+        self.assertEqual(messages, ["Area 'crypt' reset: 1 room(s) restored."])
+        self.assertEqual([i.vnum for i in room.items], [507])
+
+        self._make_due()
+        self.assertEqual(self.rm.check_resets(self.world), [])
+        self.assertEqual(self.rm.rooms_checked - checked, 1)
+
+    def test_combat_rooms_stay_dirty(self):
+        self.rm.dirty["crypt"] = {3}
+        self._make_due()
+        with mock.patch.object(ResetManager, "_room_has_combat", return_value=True):
+            messages = self.rm.check_resets(self.world)
+        self.assertEqual(messages, ["Area 'crypt' reset: 0 room(s) restored, 1 skipped (combat)."])
+        self.assertEqual(self.rm.dirty["crypt"], {3})
+
+
+if __name__ == '__main__':
+    unittest.main()
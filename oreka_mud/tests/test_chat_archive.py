@@ -0,0 +1,143 @@
+"""Tests for the segmented chat session archive."""
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import chat_archive
+from src.chat_archive import ChatArchive
+
+DAY = 86400
+T0 = 1767225600  # 2026-01-01 00:00 UTC
+
+
+def _session(player, npc_vnum, ended_at):
+    return {"session_id": f"{player}-{ended_at}", "player_name": player,
+            "npc_vnum": npc_vnum, "started_at": ended_at - 60, "ended_at": ended_at,
+            "conversation_history": [{"role": "user", "content": "hail"}]}
+
+
+class TestChatArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.archive = ChatArchive(directory=self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _files(self, suffix):
+        return sorted(fn for fn in os.listdir(self.dir) if fn.endswith(suffix))
+
+    def test_buffered_while_active_and_segmented_by_day(self):
+        self.archive.active = True
+        self.archive.archive(_session("Ann", 9010, T0 + 10))
+        self.archive.archive(_session("Bo", 9204, T0 + 20))
+        self.archive.archive(_session("Ann", 9204, T0 + DAY + 5))
+        self.assertEqual(self._files(".jsonl.gz"), [])
+
+        asyncio.run(self.archive.flush_async())
+        self.assertEqual(self._files(".jsonl.gz"),
+                         ["sessions-20260101.jsonl.gz", "sessions-20260102.jsonl.gz"])
+        with open(os.path.join(self.dir, "sessions-20260101.idx.json")) as f:
+            index = json.load(f)
+        self.assertEqual((index["count"], index["players"], index["npcs"]),
+                         (2, {"Ann": 1, "Bo": 1}, {"9010": 1, "9204": 1}))
+        with gzip.open(os.path.join(self.dir, "sessions-20260102.jsonl.gz"), "rt") as f:
+            self.assertEqual(json.loads(f.readline())["player_name"], "Ann")
+
+    def test_query_skips_segments_by_index(self):
+        for day in range(5):
+            self.archive.archive(_session("Ann" if day == 3 else "Bo", 9010, T0 + day * DAY))
+        self.archive.archive(_session("Bo", 9204, T0 + 3 * DAY + 60))
+
+        reopened = ChatArchive(directory=self.dir)
+        found = list(reopened.iter_sessions(player="ann"))
+        self.assertEqual([s["ended_at"] for s in found], [T0 + 3 * DAY])
+        self.assertEqual((reopened.segments_scanned, reopened.segments_skipped), (1, 4))
+
+        found = list(reopened.iter_sessions(npc_vnum=9204))
+        self.assertEqual([s["player_name"] for s in found], ["Bo"])
+        found = list(reopened.iter_sessions(since=T0 + DAY, until=T0 + 2 * DAY))
+        self.assertEqual(len(found), 2)
+
+    def test_appends_accumulate_in_one_segment(self):
+        self.archive.archive(_session("Ann", 9010, T0 + 1))
+        self.archive.archive(_session("Ann", 9010, T0 + 2))
+        self.assertEqual(len(self._files(".jsonl.gz")), 1)
+        # A stale index (segment grew elsewhere) is rebuilt on load
+        os.remove(os.path.join(self.dir, "sessions-20260101.idx.json"))
+        self.assertEqual(len(list(ChatArchive(directory=self.dir).iter_sessions())), 2)
+
+    def test_legacy_files_read_and_imported(self):
+        with open(os.path.join(self.dir, "Ann_Elder_20251231_120000.json"), "w") as f:
+            json.dump(_session("Ann", 9010, T0 - 100), f, indent=2)
+        self.archive.archive(_session("Bo", 9010, T0 + 5))
+        self.assertEqual([s["player_name"] for s in self.archive.iter_sessions()], ["Ann", "Bo"])
+
+        self.assertEqual(self.archive.import_legacy(), 1)
+        self.assertEqual(self._files(".json"), ["sessions-20251231.idx.json",
+                                                "sessions-20260101.idx.json"])
+        self.assertEqual([s["player_name"] for s in self.archive.iter_sessions()], ["Ann", "Bo"])
+
+    def test_purge_player(self):
+        self.archive.archive(_session("Ann", 9010, T0 + 1))
+        self.archive.archive(_session("Bo", 9010, T0 + 2))
+        self.archive.archive(_session("Ann", 9010, T0 + DAY))
+        self.archive.archive(_session("Bo", 9010, T0 + 2 * DAY))
+        trash = os.path.join(self.dir, "trash")
+
+        self.assertEqual(self.archive.purge_player("ann", trash_dir=trash), 2)
+        self.assertEqual(sorted(os.listdir(trash)),
+                         ["sessions-20260101.jsonl.gz", "sessions-20260102.jsonl.gz"])
+        self.assertEqual(self._files(".jsonl.gz"),
+                         ["sessions-20260101.jsonl.gz", "sessions-20260103.jsonl.gz"])
+        reopened = ChatArchive(directory=self.dir)
+        self.assertEqual([s["player_name"] for s in reopened.iter_sessions()], ["Bo", "Bo"])
+
+
+    def test_failed_purge_rewrite_keeps_segment(self):
+        self.archive.archive(_session("Ann", 9010, T0 + 1))
+        self.archive.archive(_session("Bo", 9010, T0 + 2))
+        with mock.patch("src.segment_store.os.replace", side_effect=OSError("disk full")):
+            self.assertEqual(self.archive.purge_player("Ann"), 0)
+        self.assertEqual(self._files(".tmp"), [])
+        self.assertEqual([s["player_name"] for s in self.archive.iter_sessions()], ["Ann", "Bo"])
+
+    def test_full_buffer_flushes_on_worker_thread(self):
+        self.archive.active = True
+
+        write, threads = self.archive._write_batch, []
+
+        def spy(batch):
+            threads.append(threading.get_ident())
+            write(batch)
+
+        async def burst():
+            with mock.patch.object(chat_archive, "MAX_BUFFERED", 2), \
+                    mock.patch.object(self.archive, "_write_batch", spy):
+                self.archive.archive(_session("Ann", 9010, T0 + 1))
+                self.archive.archive(_session("Bo", 9010, T0 + 2))
+                # The buffer is swapped on the loop, before the worker runs
+                self.assertEqual(self.archive._buffer, [])
+                self.archive.archive(_session("Cy", 9010, T0 + 3))
+                await self.archive._writing
+                self.assertEqual(len(self.archive._buffer), 1)
+
+        asyncio.run(burst())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+        self.assertEqual(self._files(".jsonl.gz"), ["sessions-20260101.jsonl.gz"])
+        self.assertEqual([s["player_name"] for s in self.archive.iter_sessions()],
+                         ["Ann", "Bo", "Cy"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for the rolling chat context window and background summarization."""
+
+import asyncio
+import time
+import types
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import ai, chat_session
+from src.chat_session import ChatSession, SUMMARY_CHUNK, SUMMARY_KEEP_RECENT
+
+
+def _session():
+    now = time.time()
+    return ChatSession(
+        session_id="s1", player_name="Ann", player_level=3, player_class="Wizard",
+        player_race="Human", player_deity=None, player_factions={},
+        npc_vnum=9010, npc_name="Elder", npc_type=None, anchor_room_vnum=1,
+        anchor_room_name="Hall", anchor_region="Chapel", started_at=now, last_active=now,
+    )
+
+
+def _talk(session, turns):
+    for i in range(turns):
+        session.add_message("user", f"question {i}")
+        session.add_message("assistant", f"answer {i}")
+
+
+class TestRollingWindow(unittest.TestCase):
+
+    def test_all_unsummarized_turns_are_sent(self):
+        session = _session()
+        _talk(session, 15)
+        messages = session.get_messages_for_llm()
+        self.assertEqual(len(messages), 30)
+        self.assertEqual(messages[0]["content"], "question 0")
+        self.assertNotIn("system", [m["role"] for m in messages])
+        self.assertTrue(session.history_over_budget())
+        self.assertFalse(session.history_over_budget(max_messages=30))
+        self.assertTrue(session.history_over_budget(max_messages=30, token_budget=5))
+
+    def test_overflowing_window_is_summarized_before_reply(self):
+        session = _session()
+        _talk(session, 15)
+
+        async def summary(prompt, system_prompt, **kwargs):
+            return "They discussed wolves."
+
+        with mock.patch.dict(ai._config, {"enabled": True, "backend": "ollama"}), \
+             mock.patch.object(ai, "_call_ollama", summary):
+            asyncio.run(ai.summarize_to_budget(session))
+        self.assertEqual(len(session.conversation_history), SUMMARY_KEEP_RECENT)
+        self.assertEqual(session.folded_entries, 30 - SUMMARY_KEEP_RECENT)
+        self.assertEqual(session.get_messages_for_llm()[0]["content"], "question 9")
+        self.assertFalse(session.history_over_budget())
+
+        prompt = ai.build_unified_npc_prompt(
+            npc=types.SimpleNamespace(vnum=9010, name="Elder", flags=[], ai_persona=None),
+            character=None, room=None,
+            mode="chat", session=session, npc_memory={"sessions": 0})
+        self.assertIn("EARLIER IN THIS CONVERSATION:\nThey discussed wolves.", prompt)
+
+    def test_failed_summary_keeps_turns(self):
+        session = _session()
+        _talk(session, 15)
+
+        async def down(prompt, system_prompt, **kwargs):
+            raise ai.LLMQueueFull("busy")
+
+        for call in (down, mock.AsyncMock(return_value="")):
+            with mock.patch.dict(ai._config, {"enabled": True, "backend": "ollama"}), \
+                 mock.patch.object(ai, "_call_ollama", call):
+                asyncio.run(ai.summarize_to_budget(session))
+            self.assertEqual(len(session.conversation_history), 30)
+            self.assertEqual(session.folded_entries, 0)
+            self.assertIsNone(session._summary)
+
+    def test_archive_keeps_folded_turns(self):
+        session = _session()
+        _talk(session, 15)
+
+        async def summary(prompt, system_prompt, **kwargs):
+            return "They discussed wolves."
+
+        with mock.patch.dict(ai._config, {"enabled": True, "backend": "ollama"}), \
+             mock.patch.object(ai, "_call_ollama", summary):
+            asyncio.run(ai.summarize_to_budget(session))
+        archived = []
+        with mock.patch.object(chat_session, "get_chat_archive",
+                               return_value=mock.Mock(archive=archived.append)):
+            chat_session._save_session_log(session)
+        history = archived[0]["conversation_history"]
+        self.assertEqual([m["content"] for m in history[:2]], ["question 0", "answer 0"])
+        self.assertEqual(len(history), 30)
+
+    def test_needs_summary_after_chunk_ages_out(self):
+        session = _session()
+        session.conversation_history = [{"role": "user", "content": "x"}] * (
+            SUMMARY_KEEP_RECENT + SUMMARY_CHUNK - 1)
+        self.assertFalse(session.needs_summary())
+        session.add_message("user", "x")
+        self.assertTrue(session.needs_summary())
+        session._summarizing = True
+        self.assertFalse(session.needs_summary())
+
+
+class TestBackgroundSummary(unittest.TestCase):
+
+    def test_turn_does_not_wait_for_summary(self):
+        session = _session()
+        _talk(session, 10)
+        release = asyncio.Event()
+        prompts = []
+
+        async def slow_summary(prompt, system_prompt, **kwargs):
+            prompts.append(prompt)
+            await release.wait()
+            return f"summary {len(prompts)}"
+
+        async def reply(session, character):
+            return "Indeed.", []
+
+        character = mock.Mock()
+        character.name = "Ann"
+
+        async def scenario():
+            with mock.patch.dict(ai._config, {"enabled": True, "backend": "ollama"}), \
+                 mock.patch.object(ai, "_call_ollama", slow_summary), \
+                 mock.patch.object(ai, "get_chat_response", reply):
+                out = await chat_session.process_player_input(session, character, "hello")
+                self.assertEqual(out, 'Elder says: "Indeed."')
+                self.assertTrue(session._summarizing)
+                self.assertEqual(session.folded_entries, 0)
+                self.assertIsNone(ai.schedule_summary(session))
+
+                release.set()
+                await asyncio.gather(*ai._summary_tasks)
+                self.assertEqual(session._summary, "summary 1")
+                self.assertEqual(session.folded_entries, 22 - SUMMARY_KEEP_RECENT)
+                self.assertEqual(len(session.conversation_history), SUMMARY_KEEP_RECENT)
+
+                # The next fold is incremental and builds on the previous summary
+                _talk(session, SUMMARY_CHUNK // 2)
+                await ai.schedule_summary(session)
+            self.assertIn("Summary so far:\nsummary 1", prompts[1])
+            self.assertNotIn("question 0", prompts[1])
+
+        asyncio.run(scenario())
+        self.assertEqual(len(session.conversation_history), SUMMARY_KEEP_RECENT)
+        self.assertEqual(session.folded_entries, 30 - SUMMARY_KEEP_RECENT)
+        self.assertEqual(session.summaries, 2)
+        self.assertIn("summaries 2", session.get_token_usage())
+
+
+if __name__ == '__main__':
+    unittest.main()
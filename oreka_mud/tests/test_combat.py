@@ -2,3 +2,91 @@ import unittest
 class TestCombat(unittest.TestCase):
     def test_attack_roll(self):
         pass
+
+
+class _Writer:
+    def __init__(self):
+        self.out = []
+
+    def write(self, text):
+        self.out.append(text)
+
+
+class _Room:
+    def __init__(self, vnum):
+        self.vnum = vnum
+        self.players = []
+        self.mobs = []
+
+
+class _Player:
+    def __init__(self, name, room):
+        self.name = name
+        self.room = room
+        self.xp = 0
+        self.hp = 10
+        self.writer = _Writer()
+
+    def get_prompt(self):
+        return ">"
+
+
+class _Mob:
+    def __init__(self, name, room):
+        self.name = name
+        self.room = room
+        self.hp = 10
+        self.alive = True
+
+
+class TestCombatScheduler(unittest.TestCase):
+    """One pulse advances each fight by exactly one turn, regardless of
+    how many players are connected."""
+
+    def setUp(self):
+        from unittest import mock
+        from src.combat import CombatInstance, CombatantState, CombatScheduler, _active_combats
+        self.active = _active_combats
+        self.room = _Room(9100)
+        self.p1 = _Player("Ana", self.room)
+        self.p2 = _Player("Bo", self.room)
+        self.mob = _Mob("Ogre", self.room)
+        self.combat = CombatInstance(self.room)
+        for i, ent in enumerate((self.p1, self.p2, self.mob)):
+            state = CombatantState(ent, 20 - i)
+            self.combat.combatants[ent] = state
+            self.combat.initiative_order.append(state)
+        self.combat.is_active = True
+        _active_combats[self.room.vnum] = self.combat
+        self.scheduler = CombatScheduler()
+        self.patch = mock.patch.object(CombatInstance, "execute_turn",
+                                       lambda self, c, p=None: f"{c.name} swings.")
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.active.clear()
+
+    def test_one_turn_per_pulse_with_many_players(self):
+        self.scheduler.step_all()
+        self.assertEqual(self.combat.current_turn_index, 1)
+        self.assertEqual(self.scheduler.turns_stepped, 1)
+
+    def test_output_fans_out_to_all_participants(self):
+        self.scheduler.step_all()
+        self.assertTrue(any("swings" in o for o in self.p1.writer.out))
+        self.assertTrue(any("swings" in o for o in self.p2.writer.out))
+
+    def test_combat_without_connected_players_still_advances(self):
+        self.p1.writer = None
+        self.p2.writer = None
+        self.scheduler.step_all()
+        self.scheduler.step_all()
+        self.assertEqual(self.combat.current_turn_index, 2)
+
+    def test_victory_ends_and_unregisters_combat(self):
+        self.mob.hp = 0
+        self.scheduler.step_all()
+        self.assertNotIn(self.room.vnum, self.active)
+        self.assertTrue(any("VICTORY" in o for o in self.p1.writer.out))
+        self.assertEqual(self.scheduler.combats_ended, 1)
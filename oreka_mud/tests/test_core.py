@@ -68,5 +68,55 @@ class TestWorld(unittest.TestCase):
         self.assertIsInstance(w.mobs, dict)
         self.assertIsInstance(w.players, list)
 
+
+class TestLocationIndex(unittest.TestCase):
+    def setUp(self):
+        from src.room import Room
+        from src.mob import Mob
+        self.w = OrekaWorld()
+        for v in (1, 2):
+            self.w.rooms[v] = Room(v, f"Room {v}", "", {}, [])
+        self.mob = Mob(500, "Guard", 1, (1, 8, 0), 10, (1, 4, 0))
+
+    def test_place_move_remove(self):
+        idx = self.w.locations
+        self.assertTrue(idx.place_mob(self.mob, 1))
+        self.assertEqual(idx.room_vnum_of(self.mob), 1)
+        self.assertEqual(idx.move_mob(self.mob, 2), 1)
+        self.assertNotIn(self.mob, self.w.rooms[1].mobs)
+        self.assertIn(self.mob, self.w.rooms[2].mobs)
+        self.assertEqual(self.mob.room_vnum, 2)
+        self.assertEqual(idx.remove_mob(self.mob), 2)
+        self.assertEqual(self.w.rooms[2].mobs, [])
+        self.assertIsNone(idx.room_vnum_of(self.mob))
+
+    def test_unindexed_mob_found_once_then_cached(self):
+        self.w.rooms[2].mobs.append(self.mob)
+        idx = self.w.locations
+        self.assertEqual(idx.room_vnum_of(self.mob), 2)
+        self.assertEqual(idx.misses, 1)
+        self.assertEqual(idx.room_vnum_of(self.mob), 2)
+        self.assertEqual(idx.hits, 1)
+
+    def test_unknown_room_rejected(self):
+        self.assertFalse(self.w.locations.place_mob(self.mob, 99))
+
+    def test_stale_entry_checked_against_room(self):
+        idx = self.w.locations
+        idx.place_mob(self.mob, 1)
+        self.w.rooms[1].mobs.remove(self.mob)  # bypasses the index
+        self.assertIsNone(idx.room_vnum_of(self.mob))
+        self.assertEqual(len(idx), 0)
+
+    def test_prune_drops_dead_mobs(self):
+        idx = self.w.locations
+        idx.place_mob(self.mob, 1)
+        self.mob.alive = False
+        self.assertEqual(idx.prune(), 1)
+        self.assertEqual(len(idx), 0)
+        # Still answered by scan, but not re-indexed while dead
+        self.assertEqual(idx.room_vnum_of(self.mob), 1)
+        self.assertEqual(len(idx), 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for cached derived combat stats, feat tables and condition profiles."""
+
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.character import Character
+from src import combat
+from src import conditions as cond
+from src import feats as feat_module
+from src.derived_stats import get_derived
+
+FIGHTER_FEATS = [
+    "Power Attack", "Cleave", "Great Cleave", "Weapon Focus (longsword)",
+    "Greater Weapon Focus (longsword)", "Weapon Specialization (longsword)",
+    "Greater Weapon Specialization (longsword)", "Improved Initiative", "Dodge",
+    "Mobility", "Iron Will", "Great Fortitude", "Lightning Reflexes",
+    "Combat Expertise", "Toughness",
+]
+
+
+def _fighter(level=20, feats=None):
+    return Character(
+        name="Bran", title="", race="Human", level=level, hp=100, max_hp=100, ac=18,
+        room=None, char_class="Fighter", skills={}, spells_known={}, str_score=18,
+        feats=list(feats if feats is not None else FIGHTER_FEATS),
+    )
+
+
+class TestFeatTable(unittest.TestCase):
+
+    def test_bonuses_match_uncached_fold(self):
+        ch = _fighter()
+        for context, kwargs in (("attack", {"weapon": "longsword"}),
+                                ("damage", {"weapon": None}),
+                                ("save", {"save_type": "Will"}),
+                                ("initiative", {}), ("hp", {})):
+            expected = 0
+            for name in ch.feats:
+                feat = feat_module.FEATS.get(name.split('(')[0].strip())
+                if feat and feat.effect:
+                    expected = feat.apply(ch, context=context, value=expected, **kwargs)
+            self.assertEqual(feat_module.apply_feat_bonuses(ch, context, 0, **kwargs),
+                             expected, context)
+
+    def test_live_effects_follow_toggles(self):
+        ch = _fighter()
+        base = feat_module.get_attack_feat_bonus(ch, "longsword")
+        ch.power_attack_amt = 3
+        self.assertEqual(feat_module.get_attack_feat_bonus(ch, "longsword"), base - 3)
+        ch.power_attack_amt = 0
+        self.assertEqual(feat_module.get_attack_feat_bonus(ch, "longsword"), base)
+
+    def test_feat_changes_invalidate(self):
+        ch = _fighter(feats=[])
+        self.assertFalse(ch.has_feat("Weapon Finesse"))
+        self.assertEqual(feat_module.get_initiative_feat_bonus(ch), 0)
+        ch.feats.append("Weapon Finesse")
+        ch.feats.append("Improved Initiative")
+        self.assertTrue(feat_module.has_feat_by_name(ch, "weapon finesse"))
+        self.assertEqual(feat_module.get_initiative_feat_bonus(ch), 4)
+        ch.feats = ["Iron Will"]
+        self.assertFalse(ch.has_feat("Weapon Finesse"))
+
+    def test_in_place_edit_same_length_invalidates(self):
+        ch = _fighter(feats=["Iron Will"])
+        self.assertTrue(ch.has_feat("Iron Will"))
+        ch.feats[0] = "Weapon Finesse"
+        self.assertFalse(ch.has_feat("Iron Will"))
+        self.assertTrue(ch.has_feat("Weapon Finesse"))
+
+    def test_tuple_kwargs_are_part_of_memo_key(self):
+        table = feat_module.FeatTable(("Toughness",))
+        seen = []
+
+        def effect(character, context=None, value=0, dice=None, **kwargs):
+            seen.append(dice)
+            return value + dice[0]
+
+        feat = feat_module.Feat("Dice Test", "", effect=effect)
+        table.static = [feat]
+        self.assertEqual(table.apply(None, "damage", 0, {"dice": (2, 6)}), 2)
+        self.assertEqual(table.apply(None, "damage", 0, {"dice": (3, 6)}), 3)
+        self.assertEqual(table.apply(None, "damage", 0, {"dice": (3, 6)}), 3)
+        self.assertEqual(seen, [(2, 6), (3, 6)])
+
+    def test_static_effects_not_rerun(self):
+        ch = _fighter()
+        feat_module.get_save_feat_bonus(ch, "Fortitude")
+        with mock.patch.object(feat_module.Feat, "apply",
+                               autospec=True, side_effect=feat_module.Feat.apply) as spy:
+            for _ in range(10):
+                feat_module.get_save_feat_bonus(ch, "Fortitude")
+        # Live effects only run for the contexts they modify
+        self.assertEqual(spy.call_count, 0)
+
+
+class TestDerivedStats(unittest.TestCase):
+
+    def test_bab_and_size_follow_level_and_race(self):
+        ch = _fighter(level=12)
+        self.assertEqual(get_derived(ch).bab, 12)
+        ch.level = 13
+        self.assertEqual(get_derived(ch).bab, 13)
+        ch.race = "Halfling"
+        self.assertEqual(combat.get_size_modifier(ch), 1)
+
+    def test_attack_bonus_unchanged_over_full_round(self):
+        ch = _fighter()
+        first = combat.calculate_attack_bonus(ch)
+        for _ in range(4):
+            self.assertEqual(combat.calculate_attack_bonus(ch), first)
+        ch.add_condition("shaken")
+        self.assertEqual(combat.calculate_attack_bonus(ch), first - 2)
+        ch.remove_condition("shaken")
+        self.assertEqual(combat.calculate_attack_bonus(ch), first)
+
+
+class TestConditionProfile(unittest.TestCase):
+
+    def test_profile_tracks_condition_set(self):
+        ch = _fighter()
+        self.assertFalse(cond.has_effect(ch, "loses_dex_to_ac"))
+        ch.conditions.add("stunned")
+        self.assertTrue(cond.has_effect(ch, "loses_dex_to_ac"))
+        self.assertEqual(cond.calculate_condition_modifiers(ch, "ac_penalty"),
+                         cond.CONDITIONS["stunned"].effects.get("ac_penalty", 0))
+        ch.conditions.discard("stunned")
+        ch.active_conditions["prone"] = 2
+        self.assertFalse(cond.has_effect(ch, "loses_dex_to_ac"))
+        self.assertEqual(cond.calculate_condition_modifiers(ch, "melee_ac_penalty"),
+                         cond.CONDITIONS["prone"].effects.get("melee_ac_penalty", 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
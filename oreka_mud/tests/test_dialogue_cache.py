@@ -0,0 +1,183 @@
+"""Tests for the NPC dialogue response cache."""
+
+import asyncio
+import tempfile
+import unittest
+from contextlib import ExitStack
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dialogue_cache import DialogueCache, dialogue_key
+from src import ai, npc_memory
+from src.npc_memory import NPCMemoryStore
+
+
+_cleanup = ExitStack()
+
+
+def setUpModule():
+    """Point the global NPC memory store at a temp database, not data/."""
+    tmp = _cleanup.enter_context(tempfile.TemporaryDirectory())
+    _cleanup.enter_context(mock.patch.object(
+        npc_memory, "npc_memory_store",
+        NPCMemoryStore(db_path=os.path.join(tmp, "npc_memory.db"), legacy_dir=None)))
+
+
+def tearDownModule():
+    _cleanup.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDialogueCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = DialogueCache(max_entries=2, ttl=60, clock=self.clock)
+        self.calls = 0
+
+    async def _reply(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return "Welcome, friend."
+
+    def test_key_normalizes_message(self):
+        a = dialogue_key(1, "standard", "p1", "casual", (5, "dusk"), "What's  for sale?")
+        self.assertEqual(a, dialogue_key(1, "standard", "p1", "casual", (5, "dusk"),
+                                         "whats for SALE"))
+        self.assertNotEqual(a, dialogue_key(1, "standard", "p1", "warm", (5, "dusk"),
+                                            "What's for sale?"))
+        self.assertNotEqual(a, dialogue_key(1, "standard", "p1", "casual", (5, "night"),
+                                            "What's for sale?"))
+        self.assertNotEqual(a, dialogue_key(1, "premium", "p2", "casual", (5, "dusk"),
+                                            "What's for sale?"))
+
+    def test_hit_after_miss(self):
+        key = ("k", 1)
+        asyncio.run(self.cache.get_or_create(key, self._reply))
+        asyncio.run(self.cache.get_or_create(key, self._reply))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_ttl_expiry(self):
+        key = ("k", 1)
+        asyncio.run(self.cache.get_or_create(key, self._reply))
+        self.clock.now += 61
+        asyncio.run(self.cache.get_or_create(key, self._reply))
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.cache.expirations, 1)
+
+    def test_lru_eviction(self):
+        for k in ("a", "b", "c"):
+            self.cache.put((k, 0), k)
+        self.assertIsNone(self.cache.get(("a", 0)))
+        self.assertEqual(self.cache.get(("c", 0)), "c")
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_concurrent_requests_coalesce(self):
+        async def burst():
+            return await asyncio.gather(
+                *[self.cache.get_or_create(("k", 1), self._reply) for _ in range(5)])
+        results = asyncio.run(burst())
+        self.assertEqual(results, ["Welcome, friend."] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.coalesced, 4)
+
+    def test_failures_and_filtered_replies_not_cached(self):
+        async def boom():
+            raise RuntimeError("backend down")
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.cache.get_or_create(("k", 1), boom))
+        asyncio.run(self.cache.get_or_create(("k", 1), self._reply,
+                                             store_if=lambda r: "friend" not in r))
+        self.assertIsNone(self.cache.get(("k", 1)))
+
+    def test_unshareable_reply_not_handed_to_waiters(self):
+        replies = iter(["Hello Ann.", "Hello Bo."])
+
+        async def personal():
+            await asyncio.sleep(0.01)
+            return next(replies)
+
+        async def burst():
+            return await asyncio.gather(
+                *[self.cache.get_or_create(("k", 1), personal,
+                                           store_if=lambda r: "Ann" not in r)
+                  for _ in range(2)])
+        self.assertEqual(asyncio.run(burst()), ["Hello Ann.", "Hello Bo."])
+        self.assertEqual(self.cache.coalesced, 0)
+        self.assertEqual(self.cache.misses, 2)
+
+
+class TestTalkUsesCache(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_call = ai._call_ollama
+        self.saved_backend = ai._config["backend"]
+        ai._config["backend"] = "ollama"
+        ai.get_dialogue_cache().clear()
+        self.calls = []
+
+        async def fake_call(prompt, system_prompt, **kwargs):
+            self.calls.append(prompt)
+            return "Fine wares today."
+        ai._call_ollama = fake_call
+
+    def tearDown(self):
+        ai._call_ollama = self.saved_call
+        ai._config["backend"] = self.saved_backend
+        ai.get_dialogue_cache().clear()
+
+    def _npc(self):
+        class Npc:
+            vnum = 987654
+            name = "Shopkeeper"
+            ai_persona = None
+        return Npc()
+
+    def test_repeated_question_hits_backend_once(self):
+        npc = self._npc()
+        ann = Player("Ann")
+        first = asyncio.run(ai._get_llm_response(npc, ann, "Hello!", None))
+        second = asyncio.run(ai._get_llm_response(npc, ann, "Hello!", None))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_players_share_normalized_question(self):
+        npc = self._npc()
+        asyncio.run(ai._get_llm_response(npc, Player("Ann"), "What's for sale?", None))
+        asyncio.run(ai._get_llm_response(npc, Player("Bo", level=9), "what's for sale", None))
+        self.assertEqual(len(self.calls), 1)
+        self.assertNotIn("Ann", self.calls[0])
+        asyncio.run(ai._get_llm_response(npc, Player("Ann"), "Any rumours?", None))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_remembered_player_is_not_cached(self):
+        npc = self._npc()
+        memory = {"sessions": 3, "facts": ["Bought a lamp"], "disposition": "warm"}
+        with mock.patch("src.chat_session.load_npc_memory", return_value=memory):
+            for _ in range(2):
+                asyncio.run(ai._get_llm_response(npc, Player("Ann"), "Hello!", None))
+        self.assertEqual(len(self.calls), 2)
+        self.assertIn("The player Ann says", self.calls[0])
+
+
+class Player:
+    def __init__(self, name, level=1):
+        self.name = name
+        self.level = level
+        self.race = "Human"
+        self.char_class = "Fighter"
+        self.reputation = {}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -206,6 +206,7 @@ class TestStalker:
 
         s = enc.Stalker(mob, "kinsweave", target, [target])
         mgr.active = [s]
+        assert enc.Stalker(mob, "kinsweave", target, [target]).id > s.id  # ids never reused
 
         # First tick: solo, mob should advance toward target.
         mgr.tick_stalkers(world)
@@ -0,0 +1,149 @@
+"""Tests for the segmented event log store."""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.event_log import EventStore
+
+
+def _entry(player, event_type, days_ago=0, region=None, n=0):
+    ts = (datetime.utcnow() - timedelta(days=days_ago)).isoformat()
+    return {"timestamp": ts, "player": player, "type": event_type,
+            "data": {"n": n}, "room_vnum": None, "region": region}
+
+
+class TestEventStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = EventStore(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _segments(self):
+        return sorted(f for f in os.listdir(self.dir) if f.endswith(".jsonl"))
+
+    def test_events_split_into_daily_segments_with_index(self):
+        self.store.append(_entry("Ann", "login", days_ago=2))
+        self.store.append(_entry("Bo", "mob_kill", days_ago=0))
+        self.assertEqual(len(self._segments()), 2)
+        today = datetime.utcnow().strftime("%Y%m%d")
+        with open(os.path.join(self.dir, f"events-{today}.idx.json")) as f:
+            index = json.load(f)
+        self.assertEqual(index["count"], 1)
+        self.assertEqual(index["players"], {"Bo": 1})
+        self.assertEqual(index["types"], {"mob_kill": 1})
+
+    def test_query_newest_matches_in_order_and_skips_segments(self):
+        for day in (3, 2, 1, 0):
+            self.store.append(_entry("Ann", "login", days_ago=day, n=day))
+        self.store.append(_entry("Bo", "level_up", days_ago=2))
+        events = self.store.query(count=2, player="Ann")
+        self.assertEqual([e["data"]["n"] for e in events], [1, 0])
+        # Only the two newest segments were opened
+        self.assertEqual(self.store.segments_scanned, 2)
+
+        self.store.segments_scanned = 0
+        events = self.store.query(event_type="level_up")
+        self.assertEqual(len(events), 1)
+        self.assertEqual(self.store.segments_scanned, 1)
+        self.assertEqual(self.store.segments_skipped, 3)
+
+    def test_buffered_appends_flush_on_pulse_and_are_queryable(self):
+        self.store.active = True
+        self.store.append(_entry("Ann", "login", region="Kinsweave"))
+        self.assertEqual(self._segments(), [])
+        self.assertEqual(len(self.store.query(region="Kinsweave")), 1)
+        asyncio.run(self.store.flush_async())
+        self.assertEqual(len(self._segments()), 1)
+        self.assertEqual(len(self.store.query(region="Kinsweave")), 1)
+
+    def test_query_does_not_take_writer_lock(self):
+        self.store.append(_entry("Ann", "login"))
+        with self.store._lock:  # a flush in progress on the worker thread
+            self.assertEqual(len(self.store.query(player="Ann")), 1)
+            self.assertIn("Events: 1", self.store.get_status())
+
+    def test_full_buffer_flushes_on_worker_thread(self):
+        from src import event_log
+
+        async def burst():
+            self.store.active = True
+            for i in range(event_log.MAX_BUFFERED):
+                self.store.append(_entry("Ann", "login", n=i))
+            self.assertIsNotNone(self.store._writing)
+            # Swapped on the loop: a later append waits for the next flush
+            self.assertEqual(self.store._buffer, [])
+            self.store.append(_entry("Ann", "logout"))
+            await self.store._writing
+            self.assertEqual(len(self.store._buffer), 1)
+
+        asyncio.run(burst())
+        self.assertEqual(len(self._segments()), 1)
+        self.assertEqual(len(self.store.query(count=1000)), event_log.MAX_BUFFERED + 1)
+
+    def test_failed_segment_write_is_retried(self):
+        from unittest import mock
+        self.store.active = True
+        self.store.append(_entry("Ann", "login"))
+        with mock.patch("builtins.open", side_effect=OSError("disk full")):
+            self.store.flush()
+        self.assertEqual(self._segments(), [])
+        self.assertEqual(len(self.store.query(player="Ann")), 1)
+        self.store.flush()
+        self.assertEqual(len(self._segments()), 1)
+        self.assertEqual(self.store.pending, [])
+
+    def test_purge_rewrites_through_temp_file(self):
+        from unittest import mock
+        self.store.append(_entry("Ann", "login"))
+        self.store.append(_entry("Bo", "login"))
+        with mock.patch("src.segment_store.os.replace", side_effect=OSError("disk full")):
+            self.assertEqual(self.store.purge_player("Ann"), 0)
+        self.assertEqual(len(self.store.query(player="Ann")), 1)
+        self.assertEqual(self.store.purge_player("Ann"), 1)
+        self.assertEqual([e["player"] for e in self.store.query()], ["Bo"])
+        self.assertEqual([f for f in os.listdir(self.dir) if f.endswith(".tmp")], [])
+
+    def test_retention_drops_whole_segments(self):
+        self.store.append(_entry("Ann", "login", days_ago=40))
+        self.store.append(_entry("Ann", "login", days_ago=35))
+        self.store.append(_entry("Ann", "login", days_ago=1))
+        self.assertEqual(self.store.drop_before(30), 2)
+        self.assertEqual(len(self._segments()), 1)
+        self.assertEqual(len([f for f in os.listdir(self.dir) if f.endswith(".idx.json")]), 1)
+
+    def test_stale_index_is_rebuilt(self):
+        self.store.append(_entry("Ann", "login"))
+        path = os.path.join(self.dir, self._segments()[0])
+        with open(path, "a") as f:
+            f.write(json.dumps(_entry("Cy", "pvp_kill")) + "\n")
+        fresh = EventStore(self.dir)
+        self.assertEqual(len(fresh.query(player="Cy")), 1)
+
+    def test_legacy_file_read_and_purge(self):
+        legacy = os.path.join(self.dir, "player_events.jsonl")
+        with open(legacy, "w") as f:
+            f.write(json.dumps(_entry("Ann", "login", days_ago=90, n=-1)) + "\n")
+        store = EventStore(self.dir, legacy_file=legacy)
+        store.append(_entry("Ann", "logout"))
+        store.append(_entry("Bo", "login"))
+        self.assertEqual([e["data"]["n"] for e in store.query(player="Ann")], [-1, 0])
+
+        trash = os.path.join(self.dir, "trash")
+        self.assertEqual(store.purge_player("ann", trash_dir=trash), 2)
+        self.assertEqual(store.query(player="Ann"), [])
+        self.assertEqual(len(store.query()), 1)
+        self.assertEqual(len(os.listdir(trash)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Tests for version-counter gating of the GMCP delta tick."""
+
+import copy
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import gmcp
+from src.character import Character
+from src.mob import Mob
+from src.room import Room
+from src.state_version import TrackedSet
+
+
+class FakeHandler:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, package, data):
+        self.sent.append((package, data))
+
+    def emit_status(self, character, added=None, removed=None):
+        self.emit("Char.Status", gmcp._build_status(character, added, removed))
+
+    def emit_room_mobs(self, room, character=None):
+        self.emit("Room.Mobs", gmcp._build_room_mobs(room, character))
+
+    def packages(self):
+        sent = [p for p, _ in self.sent]
+        self.sent.clear()
+        return sent
+
+
+def _char(name, room):
+    ch = Character(name=name, title="", race="Human", level=3, hp=20, max_hp=20, ac=12,
+                   room=room, char_class="Wizard")
+    room.players.append(ch)
+    return ch
+
+
+class TestGMCPTick(unittest.TestCase):
+
+    def setUp(self):
+        self.room = Room(vnum=1, name="Hall", description="", exits={}, flags=[])
+        self.rat = Mob(vnum=10, name="rat", level=1, hp_dice=[1, 4, 2], ac=12,
+                       damage_dice=[1, 3, 0])
+        self.room.mobs.append(self.rat)
+        self.ann = _char("Ann", self.room)
+        self.bo = _char("Bo", self.room)
+        self.handlers = {"Ann": FakeHandler(), "Bo": FakeHandler()}
+        patcher = mock.patch.dict(gmcp._handlers, self.handlers, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(gmcp._last_emit_state.clear)
+        self.world = mock.Mock(players=[self.ann, self.bo])
+        gmcp.tick_all(self.world)
+        for handler in self.handlers.values():
+            handler.packages()
+
+    def test_idle_tick_builds_nothing(self):
+        with mock.patch.object(gmcp, "_build_vitals", wraps=gmcp._build_vitals) as vitals, \
+             mock.patch.object(gmcp, "_mob_summary", wraps=gmcp._mob_summary) as summary:
+            gmcp.tick_all(self.world)
+        self.assertEqual((vitals.call_count, summary.call_count), (0, 0))
+        self.assertEqual(self.handlers["Ann"].packages(), [])
+
+    def test_vitals_and_status_changes_emit(self):
+        ann = self.handlers["Ann"]
+        self.ann.hp -= 5
+        gmcp.tick_all(self.world)
+        self.assertEqual(ann.packages(), ["Char.Vitals"])
+
+        self.ann.spells_per_day[1] = self.ann.spells_per_day.get(1, 0) - 1
+        gmcp.tick_all(self.world)
+        self.assertEqual(ann.packages(), ["Char.Vitals"])
+
+        self.ann.conditions.add("prone")
+        gmcp.tick_all(self.world)
+        self.assertEqual(ann.packages(), ["Char.Status"])
+        self.assertEqual(self.handlers["Bo"].packages(), [])
+
+        # A timer ticking down bumps the counter but changes nothing visible
+        self.ann.active_conditions["shaken"] = 3
+        gmcp.tick_all(self.world)
+        ann.packages()
+        self.ann.active_conditions["shaken"] = 2
+        gmcp.tick_all(self.world)
+        self.assertEqual(ann.packages(), [])
+
+    def test_room_mobs_built_once_per_room(self):
+        self.rat.hp -= 1
+        with mock.patch.object(gmcp, "_mob_summary", wraps=gmcp._mob_summary) as summary:
+            gmcp.tick_all(self.world)
+        self.assertEqual(summary.call_count, 1)
+        ann_mobs = self.handlers["Ann"].sent[0][1]["mobs"]
+        self.assertIs(ann_mobs, self.handlers["Bo"].sent[0][1]["mobs"])
+        self.handlers["Ann"].packages()
+
+        self.room.mobs.remove(self.rat)
+        gmcp.tick_all(self.world)
+        self.assertEqual(self.handlers["Ann"].sent[0][1]["mobs"], [])
+
+    def test_tracked_containers(self):
+        version = self.ann.status_version
+        self.ann.conditions |= {"dazed"}
+        self.assertEqual(self.ann.status_version, version + 1)
+        version = self.ann.vitals_version
+        self.ann.ac = self.ann.ac
+        self.assertEqual(self.ann.vitals_version, version)
+        self.assertIsInstance(self.ann.conditions, TrackedSet)
+        self.assertIs(type(copy.deepcopy(self.ann.conditions)), set)
+
+    def test_only_tracked_attributes_are_intercepted(self):
+        self.assertNotIn("__setattr__", vars(Character))
+        self.assertNotIn("__setattr__", vars(Mob))
+        version = self.ann.vitals_version
+        self.ann.description = "A traveler."
+        self.assertEqual(self.ann.vitals_version, version)
+        self.ann.hp -= 1
+        self.assertEqual(self.ann.vitals_version, version + 1)
+        version = self.rat.state_version
+        self.rat.name = "a wary rat"
+        self.assertEqual(self.rat.state_version, version + 1)
+
+    def test_unset_tracked_attribute_raises_attribute_error(self):
+        room = Room.__new__(Room)
+        with self.assertRaises(AttributeError):
+            room.mobs
+        self.assertFalse(hasattr(room, "mobs"))
+
+
+if __name__ == '__main__':
+    unittest.main()
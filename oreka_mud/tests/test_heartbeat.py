@@ -0,0 +1,132 @@
+"""Tests for the world heartbeat scheduler."""
+
+import asyncio
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.heartbeat import Heartbeat
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHeartbeat(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.hb = Heartbeat(stagger=0.5, clock=self.clock)
+        self.calls = []
+
+    def _cb(self, name):
+        self.calls.append(name)
+
+    def test_auto_phase_staggers_same_period(self):
+        a = self.hb.register("a", self._cb, period=30, args=("a",))
+        b = self.hb.register("b", self._cb, period=30, args=("b",))
+        c = self.hb.register("c", self._cb, period=60, args=("c",))
+        self.assertEqual(len({a.phase, b.phase, c.phase}), 3)
+
+    def test_explicit_phase_and_due_order(self):
+        self.hb.register("late", self._cb, period=10, phase=3, args=("late",))
+        self.hb.register("early", self._cb, period=10, phase=1, args=("early",))
+        self.hb.start()
+        self.clock.now += 10.5
+        self.assertEqual(asyncio.run(self.hb.step()), 0)
+        self.clock.now += 3
+        self.assertEqual(asyncio.run(self.hb.step()), 2)
+        self.assertEqual(self.calls, ["early", "late"])
+
+    def test_periodic_reschedule(self):
+        self.hb.register("tick", self._cb, period=5, phase=0, args=("tick",))
+        self.hb.start()
+        for _ in range(3):
+            self.clock.now += 5
+            asyncio.run(self.hb.step())
+        self.assertEqual(self.calls, ["tick"] * 3)
+        self.assertEqual(self.hb.pulses["tick"].runs, 3)
+
+    def test_async_callback_awaited(self):
+        async def pulse():
+            self.calls.append("async")
+        self.hb.register("a", pulse, period=2, phase=0)
+        self.hb.start()
+        self.clock.now += 2
+        asyncio.run(self.hb.step())
+        self.assertEqual(self.calls, ["async"])
+
+    def test_overrun_and_error_counters(self):
+        def slow():
+            import time
+            time.sleep(0.01)
+
+        def boom():
+            raise RuntimeError("bad")
+        self.hb.register("slow", slow, period=1, phase=0, budget=0.001)
+        self.hb.register("boom", boom, period=1, phase=0.5)
+        self.hb.start()
+        self.clock.now += 2
+        asyncio.run(self.hb.step())
+        self.assertEqual(self.hb.pulses["slow"].overruns, 1)
+        self.assertEqual(self.hb.pulses["boom"].errors, 1)
+        self.assertIn("slow", self.hb.get_status())
+
+    def test_falling_behind_skips_instead_of_bursting(self):
+        self.hb.register("tick", self._cb, period=1, phase=0, args=("tick",))
+        self.hb.start()
+        self.clock.now += 10
+        asyncio.run(self.hb.step())
+        asyncio.run(self.hb.step())
+        self.assertEqual(self.calls, ["tick"])
+        self.assertGreater(self.hb.pulses["tick"].skipped, 0)
+
+    def test_unregister_drops_pending(self):
+        self.hb.register("gone", self._cb, period=1, phase=0, args=("gone",))
+        self.hb.start()
+        self.hb.unregister("gone")
+        self.clock.now += 5
+        asyncio.run(self.hb.step())
+        self.assertEqual(self.calls, [])
+
+    def test_background_pulse_does_not_block_others(self):
+        release = None
+        order = []
+
+        async def slow_flush():
+            order.append("flush-start")
+            await release.wait()
+            order.append("flush-done")
+
+        async def scenario():
+            nonlocal release
+            release = asyncio.Event()
+            self.hb.register("flush", slow_flush, period=1, phase=0, background=True)
+            self.hb.register("combat", lambda: order.append("combat"), period=1, phase=0.5)
+            self.hb.start()
+            self.clock.now += 2
+            await self.hb.step()
+            await asyncio.sleep(0)
+            self.assertEqual(sorted(order), ["combat", "flush-start"])
+            # Still in flight when due again: skipped, not doubled
+            skipped = self.hb.pulses["flush"].skipped
+            self.clock.now += 1
+            await self.hb.step()
+            await asyncio.sleep(0)
+            self.assertEqual(order.count("flush-start"), 1)
+            self.assertEqual(self.hb.pulses["flush"].skipped, skipped + 1)
+            release.set()
+            await self.hb.pulses["flush"].task
+            self.assertEqual(order[-1], "flush-done")
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
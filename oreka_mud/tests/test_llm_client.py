@@ -0,0 +1,378 @@
+"""Tests for the pooled async LLM HTTP client and its ai.py wiring."""
+
+import asyncio
+import json
+import time
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest import mock
+
+from src.llm_client import (
+    LLMClient, LLMQueueFull, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, TokenStreamer,
+    get_llm_client,
+)
+from src import ai
+
+
+class FakeOllama:
+    """Minimal keep-alive HTTP/1.1 server speaking the Ollama/OpenAI APIs."""
+
+    def __init__(self, delay=0.0, words=("Well", " met,", " traveller.")):
+        self.delay = delay
+        self.words = words
+        self.connections = 0
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{self.port}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    k, _, v = line.decode().partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                body = b""
+                if "content-length" in headers:
+                    body = await reader.readexactly(int(headers["content-length"]))
+                self.requests += 1
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                try:
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    await self._respond(writer, method, path,
+                                        json.loads(body) if body else {})
+                finally:
+                    self.active -= 1
+        except (ConnectionResetError, asyncio.IncompleteReadError,
+                asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, method, path, payload):
+        if path in ("/api/tags", "/v1/models"):
+            self._send_json(writer, {"models": []})
+        elif path == "/missing":
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+        elif payload.get("stream"):
+            writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+            for word in self.words:
+                if path == "/v1/chat/completions":
+                    line = b"data: " + json.dumps(
+                        {"choices": [{"delta": {"content": word}}]}).encode() + b"\n\n"
+                elif path == "/api/chat":
+                    line = json.dumps({"message": {"content": word}}).encode() + b"\n"
+                else:
+                    line = json.dumps({"response": word, "done": False}).encode() + b"\n"
+                writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+                await writer.drain()
+            if path == "/v1/chat/completions":
+                tail = b"data: [DONE]\n\n"
+                writer.write(b"%x\r\n%s\r\n" % (len(tail), tail))
+            writer.write(b"0\r\n\r\n")
+        else:
+            text = "".join(self.words)
+            if path == "/v1/chat/completions":
+                data = {"choices": [{"message": {"content": text}}]}
+            elif path == "/api/chat":
+                data = {"message": {"content": text}}
+            else:
+                data = {"response": text}
+            self._send_json(writer, data)
+        await writer.drain()
+
+    @staticmethod
+    def _send_json(writer, data):
+        body = json.dumps(data).encode()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+
+
+def run_with_server(coro_fn, **server_kwargs):
+    """Run ``coro_fn(server, base_url)`` against a fresh fake backend."""
+    async def runner():
+        server = FakeOllama(**server_kwargs)
+        base = await server.start()
+        try:
+            return await coro_fn(server, base)
+        finally:
+            await get_llm_client().close()
+            await server.stop()
+    return asyncio.run(runner())
+
+
+class TestLLMClient(unittest.TestCase):
+
+    def test_post_json_reuses_connection(self):
+        client = LLMClient()
+
+        async def go(server, base):
+            for _ in range(3):
+                data = await client.post_json(f"{base}/api/generate", {"prompt": "hi"}, timeout=5)
+                self.assertEqual(data["response"], "Well met, traveller.")
+            return server.connections
+
+        self.assertEqual(run_with_server(go), 1)
+        self.assertEqual(client.connections_reused, 2)
+
+    def test_stream_ndjson_and_sse(self):
+        client = LLMClient()
+
+        async def go(server, base):
+            ndjson = [o["response"] async for o in client.stream_json(
+                f"{base}/api/generate", {"stream": True}, timeout=5)]
+            sse = [o["choices"][0]["delta"]["content"] async for o in client.stream_json(
+                f"{base}/v1/chat/completions", {"stream": True}, timeout=5)]
+            return ndjson, sse
+
+        ndjson, sse = run_with_server(go)
+        self.assertEqual(ndjson, ["Well", " met,", " traveller."])
+        self.assertEqual(sse, ["Well", " met,", " traveller."])
+
+    def test_concurrency_limit_and_queue_full(self):
+        client = LLMClient(max_concurrency=2, max_queue=1)
+
+        async def go(server, base):
+            url = f"{base}/api/generate"
+            tasks = [asyncio.ensure_future(client.post_json(url, {}, timeout=5))
+                     for _ in range(4)]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            return server, results
+
+        server, results = run_with_server(go, delay=0.05)
+        self.assertLessEqual(server.max_active, 2)
+        rejected = [r for r in results if isinstance(r, LLMQueueFull)]
+        self.assertEqual(len(rejected), 1)
+        self.assertEqual(client.rejected, 1)
+
+    def test_deadline_times_out(self):
+        client = LLMClient()
+
+        async def go(server, base):
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.post_json(f"{base}/api/generate", {}, timeout=0.05)
+
+        run_with_server(go, delay=0.5)
+        self.assertEqual(client.timeouts, 1)
+
+    def test_get_status(self):
+        client = LLMClient()
+
+        async def go(server, base):
+            return (await client.get_status(f"{base}/api/tags"),
+                    await client.get_status(f"{base}/missing"))
+
+        self.assertEqual(run_with_server(go), (200, 404))
+
+    def test_token_streamer_prefix_once(self):
+        class Sink:
+            def __init__(self):
+                self.out = []
+
+            def write(self, s):
+                self.out.append(s)
+
+        sink = Sink()
+        streamer = TokenStreamer(sink, 'Bob says: "')
+        streamer("  ")
+        self.assertFalse(streamer.started)
+        streamer(' "Hello')
+        streamer(" there")
+        self.assertEqual("".join(sink.out), 'Bob says: "Hello there')
+
+    def test_token_streamer_matches_reply_cleanup(self):
+        class Sink:
+            def __init__(self):
+                self.out = []
+
+            def write(self, s):
+                self.out.append(s)
+
+        sink = Sink()
+        streamer = TokenStreamer(sink, "> ")
+        streamer('"Short')
+        streamer(' reply."  ')
+        self.assertEqual("".join(sink.out), "> Short reply.")
+        streamer.finish()
+        self.assertTrue(streamer.finished)
+        self.assertEqual("".join(sink.out), "> Short reply.")
+
+        sink = Sink()
+        streamer = TokenStreamer(sink)
+        for _ in range(60):
+            streamer("0123456789")
+        streamer.finish()
+        self.assertTrue(streamer.truncated)
+        self.assertEqual("".join(sink.out), "0123456789" * 49 + "0123456" + "...")
+
+        # Exactly at the limit: nothing is cut
+        sink = Sink()
+        streamer = TokenStreamer(sink, limit=20)
+        streamer("x" * 19)
+        streamer("y")
+        streamer.finish()
+        self.assertEqual("".join(sink.out), "x" * 19 + "y")
+
+
+class TestAIBackendCalls(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = dict(ai._config)
+
+    def tearDown(self):
+        ai._config.clear()
+        ai._config.update(self.saved)
+
+    def test_ollama_generate_streams_tokens(self):
+        async def go(server, base):
+            ai._config["ollama_host"] = base
+            tokens = []
+            text = await ai._call_ollama("hi", "sys", on_token=tokens.append)
+            plain = await ai._call_ollama("hi", "sys")
+            return tokens, text, plain
+
+        tokens, text, plain = run_with_server(go)
+        self.assertEqual(tokens, ["Well", " met,", " traveller."])
+        self.assertEqual(text, "Well met, traveller.")
+        self.assertEqual(plain, text)
+
+    def test_chat_endpoints(self):
+        async def go(server, base):
+            ai._config["ollama_host"] = base
+            ai._config["lmstudio_host"] = base
+            msgs = [{"role": "user", "content": "hi"}]
+            return (await ai._call_ollama_chat(msgs),
+                    await ai._call_lmstudio_chat(msgs),
+                    await ai._call_lmstudio("hi", "sys", on_token=lambda t: None),
+                    await ai.check_ollama_available(),
+                    await ai.check_lmstudio_available())
+
+        self.assertEqual(run_with_server(go), ("Well met, traveller.",) * 3 + (True, True))
+
+
+class TestLanes(unittest.TestCase):
+
+    def test_interactive_jumps_background_and_lanes_are_separate(self):
+        client = LLMClient()
+        client.configure_lane("fast", max_concurrency=2, max_queue=8)
+        client.configure_lane("premium", max_concurrency=1, max_queue=2)
+        fast = client.lanes["fast"]
+        order = []
+
+        async def hold(lane, priority, label, release):
+            deadline = time.monotonic() + 5
+            await lane.acquire(priority, deadline)
+            order.append(label)
+            await release.wait()
+            lane.release(priority)
+
+        async def go():
+            client._bind_loop()
+            release = asyncio.Event()
+            # Background work may hold only one of fast's two slots
+            tasks = [asyncio.ensure_future(hold(fast, PRIORITY_BACKGROUND, f"bg{i}", release))
+                     for i in range(3)]
+            await asyncio.sleep(0)
+            self.assertEqual((fast.active, fast.waiting), (1, 2))
+            tasks.append(asyncio.ensure_future(
+                hold(fast, PRIORITY_INTERACTIVE, "chat1", release)))
+            tasks.append(asyncio.ensure_future(
+                hold(fast, PRIORITY_INTERACTIVE, "chat2", release)))
+            # A full fast lane does not block the premium lane
+            tasks.append(asyncio.ensure_future(hold(client.lanes["premium"],
+                                                    PRIORITY_INTERACTIVE, "deity", asyncio.Event())))
+            await asyncio.sleep(0)
+            self.assertEqual(order, ["bg0", "chat1", "deity"])
+            release.set()
+            await asyncio.gather(*tasks[:5])
+            tasks[5].cancel()
+
+        asyncio.run(go())
+        self.assertEqual(order[3], "chat2")
+        stats = client.get_stats()["lanes"]["fast"]
+        self.assertEqual((stats["requests"], stats["queued"], stats["active"]), (5, 3, 0))
+        self.assertGreater(stats["max_queue_wait_ms"], 0)
+
+    def test_lane_queue_full_and_timeout_cleanup(self):
+        client = LLMClient()
+        lane = client.configure_lane("premium", max_concurrency=1, max_queue=1)
+
+        async def go():
+            client._bind_loop()
+            await lane.acquire(PRIORITY_INTERACTIVE, time.monotonic() + 5)
+            with self.assertRaises(asyncio.TimeoutError):
+                await lane.acquire(PRIORITY_INTERACTIVE, time.monotonic() + 0.01)
+            self.assertEqual(lane.waiting, 0)
+            waiter = asyncio.ensure_future(lane.acquire(PRIORITY_INTERACTIVE,
+                                                        time.monotonic() + 5))
+            await asyncio.sleep(0)
+            with self.assertRaises(LLMQueueFull):
+                await lane.acquire(PRIORITY_INTERACTIVE, time.monotonic() + 5)
+            lane.release(PRIORITY_INTERACTIVE)
+            await waiter
+            self.assertEqual(lane.active, 1)
+
+        asyncio.run(go())
+        self.assertEqual(client.rejected, 1)
+
+
+class TestRouting(unittest.TestCase):
+
+    def test_routes_by_tier_and_kind(self):
+        overrides = {"premium": {"ollama_model": "big-model"}, "standard": {}}
+        with mock.patch.dict(ai._config, {"backend": "ollama", "ollama_model": "small"}), \
+             mock.patch.dict(ai._tier_config, overrides, clear=True):
+            deity = ai.resolve_route("chat", ai.npc_model_tier(mock.Mock(npc_type="deity_avatar")))
+            self.assertEqual((deity["tier"], deity["model"], deity["lane"]),
+                             ("premium", "big-model", "fast"))
+            self.assertEqual(deity["priority"], PRIORITY_INTERACTIVE)
+
+            summary = ai.resolve_route("summary", "premium")
+            self.assertEqual((summary["tier"], summary["model"], summary["priority"]),
+                             ("fast", "small", PRIORITY_BACKGROUND))
+
+            ai.set_tier_model("standard", "lmstudio", "mid-model")
+            merchant = ai.resolve_route("talk", "standard")
+            self.assertEqual((merchant["backend"], merchant["model"], merchant["host"]),
+                             ("lmstudio", "mid-model", ai._config["lmstudio_host"]))
+        self.assertIn(ai.resolve_route("chat", "premium")["lane"], get_llm_client().lanes)
+
+    def test_lanes_shared_per_backend_host(self):
+        overrides = {"premium": {"ollama_host": "http://gpu:11434"},
+                     "standard": {"ollama_model": "mid-model"}}
+        with mock.patch.dict(ai._config, {"backend": "ollama"}), \
+             mock.patch.dict(ai._tier_config, overrides, clear=True):
+            # Same server as fast: one lane, so AI_MAX_CONCURRENCY caps it
+            self.assertEqual(ai.resolve_route("talk", "standard")["lane"], "fast")
+            self.assertEqual(ai.resolve_route("dm")["lane"], "premium")
+            status = ai.get_llm_status()
+        self.assertEqual(status["max_concurrency"],
+                         ai._tier_lanes["fast"][0] + ai._tier_lanes["premium"][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the hazard room registry and exposure timers."""
+
+import time
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.location_effects import LocationEffectsManager
+from src.room import Room
+
+LAVA = {"type": "hazard", "interval": 30, "dc": 99, "damage": "1d1",
+        "damage_type": "fire", "message": "Heat."}
+
+
+class FakePlayer:
+    def __init__(self, name, room):
+        self.name = name
+        self.hp = 50
+        self.room = None
+        self.move_to(room)
+
+    def move_to(self, room):
+        if self.room is not None:
+            self.room.players.remove(self)
+        self.room = room
+        room.players.append(self)
+
+
+class FakeWorld:
+    def __init__(self, rooms):
+        self.rooms = {r.vnum: r for r in rooms}
+        self.players = []
+
+
+def _room(vnum, effects=None):
+    return Room(vnum=vnum, name=f"Room {vnum}", description="", exits={}, flags=[],
+                effects=effects)
+
+
+class TestHazards(unittest.TestCase):
+
+    def setUp(self):
+        self.lava = _room(1, [dict(LAVA), {"type": "sanctuary"}])
+        self.safe = _room(2)
+        self.world = FakeWorld([self.lava, self.safe])
+        self.le = LocationEffectsManager()
+
+    def _tick_at(self, when):
+        with mock.patch("src.location_effects.time.time", return_value=when):
+            return self.le.tick_hazards(self.world)
+
+    def test_registry_holds_only_hazard_rooms(self):
+        self.le.index_world(self.world)
+        self.assertEqual(list(self.le.hazard_rooms), [1])
+        self.safe.effects.append(dict(LAVA))
+        self.le.update_room(self.safe)
+        self.assertEqual(sorted(self.le.hazard_rooms), [1, 2])
+        self.lava.effects = []
+        self.le.update_room(self.lava)
+        self.assertEqual(list(self.le.hazard_rooms), [2])
+        self.safe.vnum = 3
+        self.le.update_room(self.safe, old_vnum=2)
+        self.assertEqual(list(self.le.hazard_rooms), [3])
+
+    def test_exposure_repeats_on_interval(self):
+        ann = FakePlayer("Ann", self.lava)
+        FakePlayer("Bo", self.safe)
+        now = time.time()
+        hits = self._tick_at(now)
+        self.assertEqual([p.name for p, _ in hits], ["Ann"])
+        self.assertEqual(ann.hp, 49)
+        self.assertEqual(self._tick_at(now + 10), [])
+        self.assertEqual(len(self._tick_at(now + 31)), 1)
+
+    def test_timers_evicted_when_player_leaves(self):
+        ann = FakePlayer("Ann", self.lava)
+        now = time.time()
+        self._tick_at(now)
+        ann.move_to(self.safe)  # Teleport: no on_room_exit call
+        self.assertEqual(self._tick_at(now + 31), [])
+        self.assertEqual(self.le._timers, {})
+
+        ann.move_to(self.lava)
+        self.assertEqual(len(self._tick_at(now + 40)), 1)
+        self.assertEqual(len(self.le._timers), 1)
+        self.le.on_room_exit(ann, self.lava)
+        self.assertEqual(self.le._timers, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for the single-pass Lorebook keyword matcher."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import lorebook
+from src.lorebook import Lorebook, _PhraseAutomaton
+
+ENTRIES = [
+    {"id": "aldenheim", "keywords": ["aldenheim", "fall of aldenheim"],
+     "content": "Aldenheim fell.", "priority": 5, "max_tokens": 100},
+    {"id": "kin_sense", "keywords": ["kin-sense", "kin sense"],
+     "content": "Kin-sense binds.", "priority": 3, "max_tokens": 100},
+    {"id": "titans_rest", "keywords": ["titan's rest"],
+     "content": "Titan's Rest stands.", "priority": 3, "max_tokens": 100},
+    {"id": "ore", "keywords": ["ore", "ox"],
+     "content": "Ore.", "priority": 1, "max_tokens": 100},
+]
+
+
+class TestLorebook(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "lorebook.json")
+        with open(self.path, "w") as f:
+            json.dump({"entries": ENTRIES}, f)
+        self.book = Lorebook()
+        self.book.load(self.path)
+        patcher = mock.patch.object(lorebook, "get_lorebook", return_value=self.book)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _ids(self, text, **kwargs):
+        return [e["id"] for e in lorebook.scan_for_lore(text, **kwargs)]
+
+    def test_automaton_finds_overlapping_phrases(self):
+        automaton = _PhraseAutomaton(["she sells", "sells sea", "sea shells", "he"])
+        self.assertEqual(automaton.find("she sells sea shells"),
+                         {"she sells", "sells sea", "sea shells", "he"})
+        self.assertEqual(automaton.find("nothing here"), {"he"})
+
+    def test_words_match_whole_tokens_and_phrases_substrings(self):
+        self.assertEqual(self._ids("The ORE cart"), ["ore"])
+        self.assertEqual(self._ids("more boredom"), [])
+        result = lorebook.scan_for_lore("After the fall of Aldenheim...")
+        self.assertEqual(result[0]["matched_keywords"], ["aldenheim", "fall of aldenheim"])
+
+    def test_punctuated_keywords_match(self):
+        self.assertEqual(self._ids("Her kin-sense tingled near Titan's Rest"),
+                         ["kin_sense", "titans_rest"])
+        result = lorebook.scan_for_lore("kin sense")
+        self.assertEqual(result[0]["matched_keywords"], ["kin sense"])
+        self.assertEqual(lorebook.test_keyword("Kin-Sense"), ["kin_sense"])
+
+    def test_scans_are_memoized_per_window(self):
+        window = "Tell me about Aldenheim."
+        self.assertEqual(self._ids(window), ["aldenheim"])
+        self.assertEqual(self._ids(window, exclude_ids={"aldenheim"}), [])
+        self.assertEqual(self._ids(window, max_total_tokens=50), [])
+        self.assertEqual((self.book.scans, self.book.cache_hits), (1, 2))
+        self.assertIn("cache hits: 2", lorebook.lorebook_status())
+
+        self.book.reload()
+        self.assertEqual(len(self.book._scan_cache), 0)
+
+    def test_cached_matches_are_copies(self):
+        window = "The fall of Aldenheim."
+        lorebook.scan_for_lore(window)[0]["matched_keywords"].append("junk")
+        result = lorebook.scan_for_lore(window)
+        self.assertEqual(result[0]["matched_keywords"], ["aldenheim", "fall of aldenheim"])
+        self.assertEqual(self.book.cache_hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
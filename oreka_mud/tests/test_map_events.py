@@ -0,0 +1,143 @@
+"""Tests for the live-map delta stream and per-viewer fan-out."""
+
+import asyncio
+import copy
+import json
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import map_events
+from src.map_events import ENTITY_KEYS, MapEventBroker, diff_snapshots
+
+
+def _snap(players, combat=(), weather=None, hour=8, ts=1.0):
+    return {"type": "snapshot", "timestamp": ts, "players": players, "stalkers": [],
+            "chat_sessions": [], "gods": [], "combat_rooms": sorted(combat),
+            "weather": weather or {"Kinsweave": "clear"},
+            "time_of_day": {"hour": hour}, "recent_errors": []}
+
+
+def _apply(state, delta):
+    """Python mirror of the viewer's applyLiveDelta."""
+    state = copy.deepcopy(state)
+    for overlay, key in ENTITY_KEYS.items():
+        d = delta.get(overlay)
+        if not d:
+            continue
+        by_key = {e[key]: e for e in state[overlay]}
+        for k in d.get("left", []):
+            by_key.pop(k)
+        for e in d.get("entered", []):
+            by_key[e[key]] = e
+        for c in d.get("changed", []):
+            by_key[c[key]] = {**by_key[c[key]], **c}
+        for u in d.get("unset", []):
+            for f in u["fields"]:
+                by_key[u[key]].pop(f)
+        state[overlay] = list(by_key.values())
+    if "combat_rooms" in delta:
+        rooms = set(state["combat_rooms"]) - set(delta["combat_rooms"]["removed"])
+        state["combat_rooms"] = sorted(rooms | set(delta["combat_rooms"]["added"]))
+    if "weather" in delta:
+        for region in delta["weather"]["removed"]:
+            del state["weather"][region]
+        state["weather"].update(delta["weather"]["changed"])
+    if "time_of_day" in delta:
+        state["time_of_day"] = delta["time_of_day"]
+    return state
+
+
+ANN = {"name": "Ann", "room_vnum": 1, "hp": 20, "max_hp": 20}
+BO = {"name": "Bo", "room_vnum": 2, "hp": 9, "max_hp": 12}
+
+
+class SlowWS:
+    def __init__(self, blocked=False):
+        self.received = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def send(self, message):
+        await self.gate.wait()
+        self.received.append(json.loads(message))
+
+
+class TestDiff(unittest.TestCase):
+
+    def test_compact_delta_reconstructs_snapshot(self):
+        old = _snap([ANN, BO], combat={5})
+        new = _snap([dict(ANN, hp=14), {"name": "Cy", "room_vnum": 3, "hp": 5, "max_hp": 5}],
+                    combat={5, 7}, weather={"Kinsweave": "rain"}, hour=9, ts=3.0)
+        delta = diff_snapshots(old, new)
+        self.assertEqual(delta["players"], {"entered": [new["players"][1]], "left": ["Bo"],
+                                            "changed": [{"hp": 14, "name": "Ann"}]})
+        self.assertEqual(delta["combat_rooms"], {"added": [7], "removed": []})
+        rebuilt = _apply(old, delta)
+        for field in ("players", "combat_rooms", "weather", "time_of_day"):
+            self.assertEqual(rebuilt[field], new[field])
+
+        # Timestamp / error ring changes alone are not a frame
+        self.assertIsNone(diff_snapshots(old, dict(_snap([ANN, BO], combat={5}), ts=9.0)))
+
+    def test_removed_fields_are_unset(self):
+        old = _snap([dict(ANN, fighting="rat"), BO])
+        new = _snap([ANN, dict(BO, fighting="rat")])
+        delta = diff_snapshots(old, new)
+        self.assertEqual(delta["players"], {"changed": [{"fighting": "rat", "name": "Bo"}],
+                                            "unset": [{"name": "Ann", "fields": ["fighting"]}]})
+        self.assertEqual(_apply(old, delta)["players"], new["players"])
+
+
+class TestBroker(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.dict(os.environ, {"OREKA_MAP_TOKEN": "t"}):
+            self.broker = MapEventBroker()
+
+    def test_slow_viewer_does_not_block_and_resyncs(self):
+        broker = self.broker
+        frames = [_snap([dict(ANN, hp=20 - i)], ts=i) for i in range(map_events.SEND_QUEUE_SIZE + 2)]
+
+        async def go():
+            with mock.patch.object(map_events, "build_snapshot", return_value=frames[0]):
+                fast, slow = SlowWS(), SlowWS(blocked=True)
+                await broker.subscribe(fast, world=object())
+                await broker.subscribe(slow, world=object())
+            with mock.patch.object(broker, "_serialize", wraps=broker._serialize) as ser:
+                for frame in frames[1:]:
+                    broker.publish_frame(frame)
+                    await asyncio.sleep(0)
+                self.assertEqual(ser.call_count, len(frames) - 1)  # once per frame
+
+            self.assertEqual([m["type"] for m in fast.received],
+                             ["snapshot"] + ["delta"] * (len(frames) - 1))
+            self.assertEqual(fast.received[-1]["players"]["changed"][0]["hp"],
+                             frames[-1]["players"][0]["hp"])
+            sub = broker.subscribers[slow]
+            self.assertTrue(sub.needs_full)
+            self.assertGreater(sub.dropped, 0)
+
+            # Once it catches up, the slow viewer gets a fresh full snapshot
+            slow.gate.set()
+            await asyncio.sleep(0)
+            final = _snap([dict(ANN, hp=1)], ts=99)
+            broker.publish_frame(final)
+            for _ in range(5):
+                await asyncio.sleep(0)
+            self.assertEqual(slow.received[-1]["type"], "snapshot")
+            self.assertEqual(slow.received[-1]["players"][0]["hp"], 1)
+            self.assertEqual(broker.resyncs, 1)
+
+            await broker.unsubscribe(fast)
+            await broker.unsubscribe(slow)
+
+        asyncio.run(go())
+        self.assertIn("Viewers: 0", broker.get_status())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for reactive narrative trigger subscriptions."""
+
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import narrative
+from src.narrative import NarrativeManager, announce_event
+
+
+class FakeRoom:
+    def __init__(self, vnum):
+        self.vnum = vnum
+
+
+class FakeCharacter:
+    def __init__(self, level=1):
+        self.name = "Ann"
+        self.level = level
+        self.xp = 0
+        self.reputation = {}
+        self.titles = []
+        self.narrative_progress = []
+        self.room = None
+
+
+class TestNarrativeTriggers(unittest.TestCase):
+
+    def setUp(self):
+        self.nm = NarrativeManager()
+        self.nm.register_chapter({
+            "id": "crypt", "title": "The Crypt", "description": "",
+            "trigger": {"type": "room", "vnum": 999001}, "narrative": "Dust.",
+        })
+        self.nm.register_chapter({
+            "id": "ratcatcher", "title": "Ratcatcher", "description": "",
+            "trigger": {"type": "quest_complete", "quest": 2}, "narrative": "Squeak.",
+            "rewards": {"xp": 10},
+        })
+
+    def test_level_up_plays_cutscene_once_with_single_reward(self):
+        ch = FakeCharacter(level=5)
+        ch.narrative_progress = ["awakening"]
+        results = self.nm.on_level_up(ch)
+        self.assertEqual([c["id"] for c, _ in results], ["the_breach"])
+        self.assertIn("Whispers of the Breach", results[0][1])
+        self.assertEqual(ch.xp, 500)
+        self.assertEqual(self.nm.on_level_up(ch), [])
+
+    def test_level_up_only_evaluates_level_chapters(self):
+        ch = FakeCharacter(level=1)
+        with mock.patch.object(self.nm, "_check_trigger",
+                               wraps=self.nm._check_trigger) as spy:
+            self.nm.on_level_up(ch)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(ch.narrative_progress, ["awakening"])
+
+    def test_room_faction_and_quest_events(self):
+        ch = FakeCharacter(level=1)
+        ch.narrative_progress = ["awakening"]
+        ch.room = FakeRoom(999001)
+        self.assertEqual([c["id"] for c, _ in self.nm.on_enter_room(ch, ch.room)], ["crypt"])
+
+        ch.reputation["sand_wardens"] = 150
+        self.assertEqual([c["id"] for c, _ in
+                          self.nm.on_faction_change(ch, "sand_wardens", 150)],
+                         ["faction_ties"])
+
+        ch.quest_log = mock.Mock(completed_quests={2}, active_quests={})
+        self.assertEqual([c["id"] for c, _ in self.nm.on_quest_complete(ch, 2)],
+                         ["ratcatcher"])
+        self.assertEqual(self.nm.on_quest_complete(ch, 3), [])
+
+    def test_quest_complete_fires_chapters_for_reward_levels(self):
+        # apply_quest_rewards can set character.level directly
+        ch = FakeCharacter(level=5)
+        ch.narrative_progress = ["awakening"]
+        self.assertEqual([c["id"] for c, _ in self.nm.on_quest_complete(ch, 3)],
+                         ["the_breach"])
+
+    def test_announce_event_writes_cutscenes(self):
+        ch = FakeCharacter(level=1)
+        ch.narrative_progress = ["awakening"]
+        ch.writer = mock.Mock()
+        ch.room = FakeRoom(999001)
+        with mock.patch.object(narrative, "_narrative_manager", self.nm):
+            texts = announce_event(ch, "enter_room", ch.room)
+            self.assertEqual(announce_event(ch, "no_such_event"), [])
+        self.assertEqual(len(texts), 1)
+        self.assertIn("The Crypt", texts[0])
+        ch.writer.write.assert_called_once_with(texts[0] + "\n")
+
+    def test_catch_up_fires_everything_met(self):
+        ch = FakeCharacter(level=10)
+        ids = [c["id"] for c, _ in self.nm.catch_up(ch)]
+        self.assertEqual(ids, ["awakening", "the_breach", "elemental_trials"])
+        self.assertIn("Elemental Aspirant", ch.titles)
+
+
+if __name__ == '__main__':
+    unittest.main()
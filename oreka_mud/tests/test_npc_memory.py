@@ -0,0 +1,154 @@
+"""Tests for the unified NPC memory store."""
+
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import npc_memory
+from src.npc_memory import NPCMemoryStore, import_legacy
+
+
+class TestNPCMemoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.db = os.path.join(self.dir, "npc_memory.db")
+        self.store = NPCMemoryStore(db_path=self.db, legacy_dir=None)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _rows(self):
+        with sqlite3.connect(self.db) as conn:
+            return conn.execute("SELECT COUNT(*) FROM npc_memory").fetchone()[0]
+
+    def test_memories_ranked_on_insert_and_persisted(self):
+        for i, importance in enumerate([0.3, 0.9, 0.3, 0.6] + [0.1] * 20):
+            self.store.add_memory(9010, "Ann", f"m{i}", importance=importance)
+        texts = [m["text"] for m in self.store.top_memories(9010, "Ann", 4)]
+        self.assertEqual(texts, ["m1", "m3", "m0", "m2"])
+        self.assertEqual(len(self.store.get(9010, "Ann").memories), npc_memory.MAX_MEMORIES)
+
+        reopened = NPCMemoryStore(db_path=self.db, legacy_dir=None)
+        self.assertEqual([m["text"] for m in reopened.top_memories(9010, "Ann", 4)], texts)
+        self.assertEqual(reopened.get(9010, "Bo").sessions, 0)
+
+    def test_writes_batched_while_active(self):
+        self.store.active = True
+        self.store.record_session(9010, "Elder", "Ann", ["Asked about: wolves"])
+        self.store.record_session(9010, "Elder", "Ann", ["Asked about: wolves", "Gave bread"])
+        self.store.add_memory(9204, "Bo", "Interrupted", importance=0.6)
+        self.assertEqual(self._rows(), 0)
+
+        asyncio.run(self.store.flush_async())
+        self.assertEqual(self._rows(), 2)
+        self.assertEqual((self.store.flushes, self.store.last_flush_count), (1, 2))
+        record = NPCMemoryStore(db_path=self.db, legacy_dir=None).get(9010, "Ann")
+        self.assertEqual((record.facts, record.sessions, record.npc_name),
+                         (["Asked about: wolves", "Gave bread"], 2, "Elder"))
+
+    def test_failed_write_is_retried(self):
+        self.store.active = True
+        self.store.add_memory(9010, "Ann", "Lent a lamp", importance=0.5)
+        locked = sqlite3.OperationalError("database is locked")
+        with mock.patch.object(self.store, "_write_rows", side_effect=locked):
+            asyncio.run(self.store.flush_async())
+        self.assertIn((9010, "Ann"), self.store._dirty)
+        asyncio.run(self.store.flush_async())
+        self.assertEqual(self.store._dirty, {})
+        reopened = NPCMemoryStore(db_path=self.db, legacy_dir=None)
+        self.assertEqual([m["text"] for m in reopened.top_memories(9010, "Ann", 1)],
+                         ["Lent a lamp"])
+
+    def test_lru_keeps_dirty_records(self):
+        self.store.active = True
+        with mock.patch.object(npc_memory, "MAX_CACHED", 2):
+            self.store.set_facts(1, "Ann", ["a"])
+            self.store.get(2, "Ann")
+            self.store.get(3, "Ann")
+            self.store.get(4, "Ann")
+        self.assertIn((1, "Ann"), self.store._cache)
+        self.assertEqual(len(self.store._cache), 2)
+
+    def test_import_legacy_layouts(self):
+        legacy = os.path.join(self.dir, "npc_memories")
+        os.makedirs(os.path.join(legacy, "9010"))
+        with open(os.path.join(legacy, "9010.json"), "w") as f:
+            json.dump({"npc_vnum": 9010, "npc_name": "Elder", "memories": {
+                "Ann": {"facts": ["Asked about: wolves"], "disposition": "warm",
+                        "sessions": 3, "last_seen": "2026-01-01T00:00:00"}}}, f)
+        with open(os.path.join(legacy, "9010", "Ann.json"), "w") as f:
+            json.dump({"npc_vnum": 9010, "player_name": "Ann", "memories": [
+                {"text": "low", "importance": 0.2, "created_at": 1},
+                {"text": "high", "importance": 0.8, "created_at": 2}]}, f)
+        with open(os.path.join(legacy, "9010", "Bo.json"), "w") as f:
+            json.dump({"player": "Bo", "facts": ["[2026-01-01] Said: \"hi\""]}, f)
+
+        self.assertEqual(import_legacy(self.store, legacy), 2)
+        self.assertEqual(import_legacy(self.store, legacy), 2)
+        ann = self.store.get(9010, "Ann")
+        self.assertEqual([m["text"] for m in ann.memories], ["high", "low"])
+        self.assertEqual((ann.facts, ann.disposition, ann.sessions),
+                         (["Asked about: wolves"], "warm", 3))
+        self.assertEqual(len(self.store.get(9010, "Bo").facts), 1)
+
+        # A fresh database imports the legacy files on first open
+        fresh = NPCMemoryStore(db_path=os.path.join(self.dir, "fresh.db"), legacy_dir=legacy)
+        self.assertEqual(fresh.get(9010, "Ann").sessions, 3)
+
+    def test_prefetch_reads_off_loop_and_fills_cache(self):
+        NPCMemoryStore(db_path=self.db, legacy_dir=None).add_memory(9010, "Ann", "Helped")
+
+        async def chat():
+            with mock.patch.object(self.store, "_read", wraps=self.store._read) as spy:
+                await self.store.prefetch(9010, "Ann")
+                await self.store.prefetch(9010, "Ann")
+            return spy.call_count
+
+        self.assertEqual(asyncio.run(chat()), 1)
+        self.assertEqual(self.store.top_memories(9010, "Ann", 1)[0]["text"], "Helped")
+        self.assertEqual((self.store.hits, self.store.misses), (1, 1))
+
+    def test_reads_do_not_wait_for_writer_lock(self):
+        self.store.add_memory(9010, "Ann", "Helped")
+        self.store._cache.clear()
+        with self.store._lock:
+            done = []
+            reader = threading.Thread(target=lambda: done.append(self.store.get(9010, "Ann")))
+            reader.start()
+            reader.join(timeout=5)
+        self.assertEqual(done[0].memories[0]["text"], "Helped")
+
+    def test_open_imports_legacy_files(self):
+        legacy = os.path.join(self.dir, "npc_memories")
+        os.makedirs(legacy)
+        with open(os.path.join(legacy, "9010.json"), "w") as f:
+            json.dump({"memories": {"Ann": {"sessions": 2}}}, f)
+        fresh = NPCMemoryStore(db_path=os.path.join(self.dir, "fresh.db"), legacy_dir=legacy)
+        fresh.open()
+        self.assertEqual(fresh._cache, {})
+        self.assertEqual(fresh.get(9010, "Ann").sessions, 2)
+
+    def test_legacy_entry_points_share_one_record(self):
+        from src import chat_context, chat_session, prompt_pipeline
+        with mock.patch.object(npc_memory, "npc_memory_store", self.store):
+            chat_context.save_npc_memory(9010, "Ann", "Helped", importance=0.5)
+            chat_session.save_npc_memory(9010, "Elder", "Ann", ["Gave bread"])
+            prompt_pipeline.save_npc_memory(9010, "Ann", ["Gave bread", "Said: hi"])
+            self.assertEqual(chat_context.load_npc_memory(9010, "Ann")[0]["text"], "Helped")
+            self.assertEqual(chat_session.load_npc_memory(9010, "Ann")["sessions"], 1)
+            self.assertEqual(prompt_pipeline.load_npc_memory(9010, "Ann"),
+                             ["Gave bread", "Said: hi"])
+        self.assertEqual(self._rows(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
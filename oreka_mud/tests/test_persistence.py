@@ -0,0 +1,134 @@
+"""Tests for write-behind player persistence."""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.persistence import PlayerStore, write_player_file
+
+
+class FakeCharacter:
+    def __init__(self, name, hp=10):
+        self.name = name
+        self.hp = hp
+        self.encodes = 0
+
+    def to_dict(self):
+        self.encodes += 1
+        return {"name": self.name, "hp": self.hp}
+
+
+class TestPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = PlayerStore(player_dir=self.dir)
+
+    def tearDown(self):
+        self.store.flush_sync()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _load(self, name):
+        with open(os.path.join(self.dir, f"{name}.json"), encoding='utf-8') as f:
+            return f.read()
+
+    def test_dirty_saves_coalesce_until_flush(self):
+        ann = FakeCharacter("Ann")
+        for hp in (9, 8, 7):
+            ann.hp = hp
+            self.store.mark_dirty(ann)
+        self.assertEqual(self.store.queue_depth, 1)
+        self.assertEqual(self.store.coalesced, 2)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "ann.json")))
+
+        asyncio.run(self.store.flush())
+        self.assertEqual(self.store.queue_depth, 0)
+        self.assertEqual(ann.encodes, 1)
+        self.assertEqual(json.loads(self._load("ann")), {"name": "Ann", "hp": 7})
+
+    def test_compact_json(self):
+        self.store.save_now(FakeCharacter("Bo"))
+        self.assertEqual(self._load("bo"), '{"name":"Bo","hp":10}')
+
+    def test_backup_ring_is_bounded(self):
+        for i in range(8):
+            write_player_file("cy", f'{{"v":{i}}}', self.dir, max_backups=3,
+                              backup_interval=0)
+            # Distinct timestamps without sleeping: rename the newest backup
+            for path in os.listdir(self.dir):
+                if path.endswith(".bak.json") and "_x" not in path:
+                    os.rename(os.path.join(self.dir, path),
+                              os.path.join(self.dir, f"cy.2000{i:02d}_x.bak.json"))
+        backups = [p for p in os.listdir(self.dir) if p.endswith(".bak.json")]
+        self.assertEqual(len(backups), 3)
+
+    def test_backup_interval_limits_rotation(self):
+        for i in range(4):
+            write_player_file("di", f'{{"v":{i}}}', self.dir, backup_interval=600)
+        backups = [p for p in os.listdir(self.dir) if p.endswith(".bak.json")]
+        self.assertEqual(len(backups), 1)
+
+    def test_flush_sync_writes_pending(self):
+        self.store.mark_dirty(FakeCharacter("Eve", hp=3))
+        self.store.flush_sync()
+        self.assertEqual(json.loads(self._load("eve"))["hp"], 3)
+        self.assertIn("Queue depth: 0", self.store.get_status())
+
+    def test_flush_sync_waits_for_in_flight_write(self):
+        import threading
+        release = threading.Event()
+        write = self.store._write
+
+        def slow_write(name, payload, interval):
+            release.wait(5)
+            write(name, payload, interval)
+
+        fay = FakeCharacter("Fay", hp=1)
+        self.store._pool().submit(slow_write, "Fay", '{"name":"Fay","hp":1}', 600)
+        fay.hp = 2
+        self.store.mark_dirty(fay)
+        threading.Timer(0.05, release.set).start()
+        self.store.flush_sync()
+        self.assertEqual(json.loads(self._load("fay"))["hp"], 2)
+        self.assertEqual([p for p in os.listdir(self.dir) if p.endswith(".tmp")], [])
+
+    def test_flush_sync_finishes_interrupted_flush(self):
+        import threading
+        first_written, release = threading.Event(), threading.Event()
+        write = self.store._write
+
+        def write_then_stall(name, payload, interval):
+            if first_written.is_set():
+                release.wait(5)  # shutdown arrives while this write is in flight
+            write(name, payload, interval)
+            first_written.set()
+
+        for name in ("A", "B", "C"):
+            self.store.mark_dirty(FakeCharacter(name))
+
+        async def shutdown_mid_batch():
+            self.store._write = write_then_stall
+            task = asyncio.ensure_future(self.store.flush())
+            while not first_written.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+        asyncio.run(shutdown_mid_batch())
+        release.set()
+        self.store.flush_sync()
+        for name in ("a", "b", "c"):
+            self.assertEqual(json.loads(self._load(name))["name"], name.upper())
+
+    def test_discard_by_name_drops_queued_save(self):
+        self.store.mark_dirty(FakeCharacter("Gil"))
+        self.store.discard("gil")
+        self.store.flush_sync()
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "gil.json")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -283,6 +283,16 @@ class TestCmdFollowUnfollow(unittest.TestCase):
         self.parser.cmd_unfollow(self.bob, "")
         self.assertIsNone(self.bob.party)
 
+    def test_follower_moves_with_leader(self):
+        north = make_room(vnum=2)
+        self.room.exits = {"north": 2}
+        self.world.rooms = {1: self.room, 2: north}
+        self.bob.following = self.alice
+        result = self.parser.cmd_move(self.alice, "north")
+        self.assertIn("You move north", result)
+        self.assertIs(self.bob.room, north)
+        self.assertEqual(north.players, [self.alice, self.bob])
+
 
 # ---------------------------------------------------------------------------
 # cmd_gtell Tests
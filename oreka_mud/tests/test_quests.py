@@ -1,4 +1,95 @@
 import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.quests import (
+    ObjectiveType, Quest, QuestLog, QuestManager, QuestObjective, QuestReward, QuestState,
+    on_mob_killed, on_room_entered,
+)
+
+
+class FakeCharacter:
+    level = 5
+    name = "Ann"
+
+
+def _quest(quest_id, objectives, giver_room=3000, auto_accept=False):
+    return Quest(id=quest_id, name=f"Quest {quest_id}", description="", level=1,
+                 giver_room=giver_room, auto_accept=auto_accept, objectives=objectives,
+                 rewards=QuestReward())
+
+
+def _kill(obj_id, target, count=1, optional=False):
+    return QuestObjective(id=obj_id, objective_type=ObjectiveType.KILL,
+                          description=f"Kill {target}", target=target,
+                          required_count=count, optional=optional)
+
+
 class TestQuests(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = QuestManager()
+        self.log = QuestLog()
+        self.char = FakeCharacter()
+
     def test_quest_completion(self):
-        pass
+        quest = _quest(1, [_kill("rats", "giant rat", count=2),
+                           _kill("boss", "rat king", optional=True)])
+        self.manager.register_quest(quest)
+        self.log.accept_quest(quest)
+        self.assertEqual(on_mob_killed(self.char, type("M", (), {"name": "a giant rat"}),
+                                       self.log, self.manager),
+                         ["Quest progress: Kill giant rat (1/2)"])
+        messages = on_mob_killed(self.char, type("M", (), {"name": "giant rat"}),
+                                 self.log, self.manager)
+        self.assertIn("Quest objectives complete: Quest 1. Return to turn in.", messages)
+        self.assertEqual(self.log.active_quests[1].state, QuestState.COMPLETE)
+
+    def test_hooks_only_touch_matching_objectives(self):
+        self.manager.register_quest(_quest(1, [_kill("wolf", "wolf")]))
+        self.manager.register_quest(_quest(2, [QuestObjective(
+            id="find", objective_type=ObjectiveType.EXPLORE, description="Find it",
+            target="4001")]))
+        for quest in self.manager.quests.values():
+            self.log.accept_quest(quest)
+        self.assertEqual([qid for qid, _ in self.log.pending_objectives(ObjectiveType.KILL)], [1])
+        self.assertEqual(on_mob_killed(self.char, type("M", (), {"name": "goblin"}),
+                                       self.log, self.manager), [])
+        self.assertEqual(self.log.ready_quests(), [])
+        on_room_entered(self.char, 4001, self.log, self.manager)
+        self.assertEqual(self.log.active_quests[2].state, QuestState.COMPLETE)
+        self.assertEqual(self.log.pending_objectives(ObjectiveType.EXPLORE), [])
+        self.assertEqual(self.log.active_quests[1].state, QuestState.ACTIVE)
+
+    def test_auto_accept_indexed_by_room(self):
+        self.manager.register_quest(_quest(7, [_kill("wolf", "wolf")],
+                                           giver_room=5001, auto_accept=True))
+        self.assertEqual(on_room_entered(self.char, 5000, self.log, self.manager), [])
+        # Room vnums arrive as strings from some movement paths
+        messages = on_room_entered(self.char, "5001", self.log, self.manager)
+        self.assertEqual(messages, ["New quest discovered: Quest 7"])
+        self.assertTrue(self.log.is_quest_active(7))
+
+        # Re-registering a quest moves its room entry
+        self.manager.register_quest(_quest(7, [_kill("wolf", "wolf")], giver_room=5002,
+                                           auto_accept=True))
+        self.assertEqual(self.manager.get_auto_accept_quests(5001), [])
+        self.assertEqual([q.id for q in self.manager.get_auto_accept_quests(5002)], [7])
+
+    def test_index_survives_state_changes_and_reload(self):
+        quest = _quest(3, [_kill("orc", "orc", count=3)])
+        self.manager.register_quest(quest)
+        self.log.accept_quest(quest)
+        self.log.update_objective(3, "orc", progress=2)
+        restored = QuestLog.from_dict(self.log.to_dict())
+        self.assertEqual(len(restored.pending_objectives(ObjectiveType.KILL)), 1)
+        on_mob_killed(self.char, type("M", (), {"name": "orc"}), restored, self.manager)
+        self.assertEqual(restored.active_quests[3].state, QuestState.COMPLETE)
+
+        self.log.abandon_quest(3)
+        self.assertEqual(self.log.pending_objectives(ObjectiveType.KILL), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for the cached room graph pathfinding service."""
+
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.room import Room
+from src.room_graph import RoomGraph, find_route
+
+
+def make_rooms():
+    # 1 - 2 - 3 - 4        (2 -> 5 through a door)
+    #     |
+    #     5 (area "b")
+    rooms = {
+        1: Room(1, "R1", "", {"east": 2}, [], area_file="a"),
+        2: Room(2, "R2", "", {"west": 1, "east": 3,
+                              "south": {"room": 5, "door": True, "closed": True}},
+                [], area_file="a"),
+        3: Room(3, "R3", "", {"west": 2, "east": 4}, [], area_file="a"),
+        4: Room(4, "R4", "", {"west": 3}, [], area_file="a"),
+        5: Room(5, "R5", "", {"north": 2}, [], area_file="b"),
+    }
+    return rooms
+
+
+class TestRoomGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.rooms = make_rooms()
+        self.graph = RoomGraph(self.rooms)
+
+    def test_find_path_inclusive(self):
+        self.assertEqual(self.graph.find_path(1, 4), [1, 2, 3, 4])
+        self.assertEqual(self.graph.find_path(1, 1), [1])
+        self.assertIsNone(self.graph.find_path(1, 99))
+
+    def test_max_depth(self):
+        self.assertIsNone(self.graph.find_path(1, 4, max_depth=2))
+        self.assertEqual(self.graph.find_path(1, 3, max_depth=2), [1, 2, 3])
+
+    def test_door_aware(self):
+        self.assertEqual(self.graph.find_path(1, 5), [1, 2, 5])
+        self.assertIsNone(self.graph.find_path(1, 5, respect_doors=True))
+        self.rooms[2].exits["south"]["closed"] = False
+        self.graph.note_door_change()
+        self.assertEqual(self.graph.find_path(1, 5, respect_doors=True), [1, 2, 5])
+
+    def test_cache_hit_and_invalidate(self):
+        self.graph.find_path(1, 4)
+        self.graph.find_path(1, 4)
+        self.assertEqual(self.graph.cache_hits, 1)
+        self.rooms[1].exits["north"] = 4
+        self.graph.invalidate()
+        self.assertEqual(self.graph.find_path(1, 4), [1, 4])
+
+    def test_new_room_triggers_rebuild(self):
+        self.graph.find_path(1, 4)
+        self.rooms[6] = Room(6, "R6", "", {"west": 4}, [])
+        self.rooms[4].exits["east"] = 6
+        self.assertEqual(self.graph.find_path(1, 6), [1, 2, 3, 4, 6])
+
+    def test_within_radius_respects_doors(self):
+        self.assertEqual(self.graph.within_radius(2, 1), [2, 1, 3])
+        self.assertIn(5, self.graph.within_radius(2, 1, respect_doors=False))
+
+    def test_area_next_hop_table(self):
+        self.assertTrue(self.graph.precompute_area("a"))
+        self.assertEqual(self.graph.find_path(4, 1), [4, 3, 2, 1])
+        self.assertEqual(self.graph.table_hits, 1)
+        self.assertEqual(self.graph.next_hop(1, 4), 2)
+
+    def test_second_open_exit_keeps_pair_connected(self):
+        self.rooms[2].exits["down"] = {"room": 5, "door": True, "closed": False}
+        self.graph.invalidate()
+        self.assertEqual(self.graph.find_path(1, 5, respect_doors=True), [1, 2, 5])
+        self.rooms[2].exits["down"]["closed"] = True
+        self.graph.note_door_change()
+        self.assertIsNone(self.graph.find_path(1, 5, respect_doors=True))
+
+    def test_walk_directions(self):
+        self.assertEqual(self.graph.walk(1, ["east", "east", "east"]), ([2, 3, 4], None))
+        self.assertEqual(self.graph.walk(1, ["east", "south"]), ([2], "south"))
+        self.assertEqual(self.graph.walk(1, ["east", "south"], respect_doors=False), ([2, 5], None))
+        self.assertEqual(self.graph.walk(1, ["north"]), ([], "north"))
+
+    def test_find_route_without_graph(self):
+        self.assertEqual(find_route(self.rooms, 1, 4), [1, 2, 3, 4])
+        self.assertIsNone(find_route(self.rooms, 1, 5, respect_doors=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,11 @@
 
 import os
 import sys
+import tempfile
 import time
 import unittest
+from contextlib import ExitStack
+from unittest import mock
 from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,6 +16,26 @@ from src.chat_session import (
     force_end_disturbed, force_end_timeout, force_end_body_death,
     MATERIALIZE_HP_COST_PCT, MATERIALIZE_COOLDOWN_SECS,
 )
+from src import chat_archive, npc_memory
+from src.chat_archive import ChatArchive
+from src.npc_memory import NPCMemoryStore
+
+
+_cleanup = ExitStack()
+
+
+def setUpModule():
+    """Point the global NPC memory store and chat archive at temp paths, not data/."""
+    tmp = _cleanup.enter_context(tempfile.TemporaryDirectory())
+    _cleanup.enter_context(mock.patch.object(
+        npc_memory, "npc_memory_store",
+        NPCMemoryStore(db_path=os.path.join(tmp, "npc_memory.db"), legacy_dir=None)))
+    _cleanup.enter_context(mock.patch.object(
+        chat_archive, "chat_archive", ChatArchive(os.path.join(tmp, "chat_sessions"))))
+
+
+def tearDownModule():
+    _cleanup.close()
 
 
 def _make_world():
@@ -236,10 +259,8 @@ class TestBodyDamageBleed(unittest.TestCase):
 
 class TestSessionLogPersistsState(unittest.TestCase):
     def test_log_includes_state_and_transitions(self):
-        from src.character import State
-        from src.chat_session import _save_session_log, CHAT_SESSIONS_DIR
-        import json
-        import glob
+        import shutil
+        from src.chat_session import _save_session_log
 
         world = _make_world()
         char = _make_char(world)
@@ -251,30 +272,20 @@ class TestSessionLogPersistsState(unittest.TestCase):
         session.add_message("user", "hello")
         session.add_message("assistant", "hi")
 
-        # Clear any prior test files
-        os.makedirs(CHAT_SESSIONS_DIR, exist_ok=True)
-        before = set(os.listdir(CHAT_SESSIONS_DIR))
-
-        _save_session_log(session)
-
-        # Find new file
-        after = set(os.listdir(CHAT_SESSIONS_DIR))
-        new_files = list(after - before)
-        if not new_files:
-            self.skipTest("Couldn't find new session log file")
-
-        path = os.path.join(CHAT_SESSIONS_DIR, new_files[0])
-        with open(path, 'r') as f:
-            data = json.load(f)
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir, ignore_errors=True)
+        archive = ChatArchive(directory=archive_dir)
+        with patch.object(chat_archive, "chat_archive", archive):
+            _save_session_log(session)
 
+        sessions = list(archive.iter_sessions(player=session.player_name))
+        self.assertEqual(len(sessions), 1)
+        data = sessions[0]
         self.assertIn("state", data)
         self.assertEqual(data["state"], "EXITING_CLEAN")
         self.assertIn("state_transitions", data)
         self.assertGreaterEqual(len(data["state_transitions"]), 3)
 
-        # Cleanup
-        os.remove(path)
-
 
 if __name__ == "__main__":
     unittest.main()
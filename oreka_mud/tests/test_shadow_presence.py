@@ -0,0 +1,60 @@
+"""Tests for the room and activity indexes of ShadowPresenceManager."""
+
+import unittest
+from unittest import mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.shadow_presence import ShadowPresenceManager
+
+
+class TestShadowPresenceManager(unittest.TestCase):
+
+    def setUp(self):
+        self.sm = ShadowPresenceManager()
+
+    def test_room_index_follows_create_remove(self):
+        self.sm.create("p1", "Ann", 1, "Elder", 1000)
+        self.sm.create("p2", "Bo", 1, "Elder", "1000")
+        self.sm.create("p3", "Cy", 1, "Smith", 1001)
+        self.assertEqual([s.player_name for s in self.sm.get_by_room(1000)], ["Ann", "Bo"])
+        self.assertEqual([s.player_name for s in self.sm.get_by_room(1001)], ["Cy"])
+
+        self.sm.remove("p1")
+        self.sm.remove("p2")
+        self.assertEqual(self.sm.get_by_room(1000), [])
+        self.assertNotIn(1000, self.sm._by_room)
+        self.assertIsNone(self.sm.remove("p2"))
+
+    def test_recreate_replaces_old_shadow(self):
+        self.sm.create("p1", "Ann", 1, "Elder", 1000)
+        self.sm.create("p1", "Ann", 2, "Smith", 2000)
+        self.assertEqual(self.sm.get_by_room(1000), [])
+        self.assertEqual(self.sm.get_by_room(2000)[0].npc_name, "Smith")
+        self.assertEqual(len(self.sm._by_activity), 1)
+
+    def test_broadcast_reaches_only_room_shadows(self):
+        here = self.sm.create("p1", "Ann", 1, "Elder", 1000)
+        there = self.sm.create("p2", "Bo", 1, "Elder", 1001)
+        self.sm.broadcast_speech(1000, "Cal", "hello")
+        self.assertEqual(len(here.conversation_history), 1)
+        self.assertEqual(there.conversation_history, [])
+
+    def test_stale_detection_stops_at_first_active(self):
+        for i in range(5):
+            self.sm.create(f"p{i}", f"P{i}", 1, "Elder", 1000).last_active = 0.0
+        with mock.patch("src.shadow_presence.time.time", return_value=1000.0):
+            self.sm.touch("p0")
+            self.sm.touch("p3")
+        with mock.patch("src.shadow_presence.time.time", return_value=2000.0):
+            stale = self.sm.get_stale(timeout_seconds=1800)
+        self.assertEqual(sorted(s.player_id for s in stale), ["p1", "p2", "p4"])
+
+        self.sm.remove("p1")
+        with mock.patch("src.shadow_presence.time.time", return_value=2000.0):
+            self.assertEqual(len(self.sm.get_stale(timeout_seconds=1800)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
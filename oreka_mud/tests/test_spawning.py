@@ -1,6 +1,7 @@
 """Tests for the mob spawning and respawn system."""
 
 import unittest
+from unittest import mock
 import time
 import sys
 import os
@@ -367,5 +368,89 @@ class TestSpawnManager(unittest.TestCase):
         self.assertIn("Total spawn points: 2", status)
 
 
+def _template(vnum, room_vnum, name="Test Rat", flags=None):
+    return {"vnum": vnum, "name": name, "level": 1, "hp_dice": [1, 4, 0], "ac": 12,
+            "damage_dice": [1, 3, 0], "flags": flags or [], "room_vnum": room_vnum}
+
+
+class FakeWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.append(text)
+
+
+class TestRespawnQueue(unittest.TestCase):
+    """Test the respawn timer queue."""
+
+    def setUp(self):
+        self.world = MockWorld()
+        for vnum in (1000, 1001):
+            self.world.rooms[vnum] = Room(vnum=vnum, name=f"Room {vnum}",
+                                          description="", exits={}, flags=[])
+        self.manager = SpawnManager()
+
+    def test_death_queues_respawn_at_due_time(self):
+        self.manager.initialize_from_mobs_data([_template(2001, 1000)])
+        self.manager.tick(self.world)
+        mob = self.manager.spawn_points[2001].current_mob
+        self.assertEqual(self.manager.get_pending_respawns(), [])
+
+        mob.alive = False
+        pending = self.manager.get_pending_respawns()
+        self.assertEqual([(name, vnum) for name, vnum, _ in pending], [("Test Rat", 2001)])
+        self.assertEqual(self.manager.tick(self.world), [])
+
+        later = time.time() + DEFAULT_RESPAWN_TIME + 1
+        with mock.patch("src.spawning.time.time", return_value=later):
+            messages = self.manager.tick(self.world)
+        self.assertEqual(len(messages), 1)
+        self.assertIsNot(self.manager.spawn_points[2001].current_mob, mob)
+        self.assertEqual(self.manager.last_tick_popped, 1)
+
+    def test_respawns_batched_per_room(self):
+        data = [_template(2001, 1000), _template(2002, 1000, name="Test Bat"),
+                _template(2003, 1001)]
+        self.manager.initialize_from_mobs_data(data)
+        player = type("P", (), {})()
+        player._writer = FakeWriter()
+        self.world.rooms[1000].players.append(player)
+        with mock.patch("src.gmcp.emit_room_mobs") as emit:
+            self.assertEqual(len(self.manager.tick(self.world)), 3)
+        self.assertEqual(player._writer.lines, ["\nTest Rat, Test Bat appear.\n"])
+        emit.assert_called_once_with(player, self.world.rooms[1000])
+        self.assertEqual(self.manager.room_batches, 1)
+
+    def test_reschedule_and_force_respawn_invalidate_entries(self):
+        self.manager.initialize_from_mobs_data([_template(2001, 1000)])
+        self.manager.tick(self.world)
+        self.manager.spawn_points[2001].current_mob.alive = False
+        self.manager.set_respawn_time(2001, 30)
+        self.assertLessEqual(self.manager.get_pending_respawns()[0][2], 30)
+
+        self.manager.force_respawn(2001, self.world)
+        self.assertEqual(self.manager.get_pending_respawns(), [])
+        with mock.patch("src.spawning.time.time", return_value=time.time() + 3600):
+            self.assertEqual(self.manager.tick(self.world), [])
+        self.assertEqual(self.manager.stale_popped, 2)
+        self.assertIn("Dead (pending respawn): 0", self.manager.get_status())
+
+    def test_tick_cost_follows_deaths_not_spawn_points(self):
+        self.world.mobs = {}
+        data = [_template(100000 + i, 1000 + i % 2) for i in range(2000)]
+        self.manager.initialize_from_mobs_data(data)
+        self.manager.tick(self.world)
+        self.assertEqual(self.manager.last_tick_popped, 2000)
+
+        for key in list(self.manager.spawn_points)[:5]:
+            self.manager.spawn_points[key].current_mob.alive = False
+        self.manager.tick(self.world)
+        self.assertEqual(self.manager.last_tick_popped, 0)
+        with mock.patch("src.spawning.time.time", return_value=time.time() + DEFAULT_RESPAWN_TIME + 1):
+            self.assertEqual(len(self.manager.tick(self.world)), 5)
+        self.assertEqual(self.manager.last_tick_popped, 5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for the telnet codec (IAC decoder and coalescing output)."""
+
+import asyncio
+import unittest
+import zlib
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.telnet_codec import (
+    IAC, SB, SE, WILL, DO, GMCP_OPT, MCCP2_OPT,
+    TelnetDecoder, TelnetOutput, extract_gmcp, gmcp_frame, strip_iac,
+)
+
+
+class FakeStreamWriter:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestTelnetDecoder(unittest.TestCase):
+
+    def test_plain_text_passthrough(self):
+        self.assertEqual(TelnetDecoder().feed(b"look\r\n"), (b"look\r\n", []))
+
+    def test_negotiation_and_escaped_iac(self):
+        data = b"a" + bytes([IAC, DO, GMCP_OPT]) + b"b" + bytes([IAC, IAC]) + b"c"
+        clean, events = TelnetDecoder().feed(data)
+        self.assertEqual(clean, b"ab\xffc")
+        self.assertEqual(events, [("do", GMCP_OPT)])
+
+    def test_gmcp_and_other_subnegotiation(self):
+        data = (b"hp" + gmcp_frame('Char.Vitals {"hp":5}')
+                + bytes([IAC, SB, 24, 1, IAC, SE]) + b"!")
+        clean, events = TelnetDecoder().feed(data)
+        self.assertEqual(clean, b"hp!")
+        self.assertEqual(events, [("gmcp", 'Char.Vitals {"hp":5}'), ("sb", 24, b"\x01")])
+
+    def test_sequences_split_across_reads(self):
+        frame = b"x" + gmcp_frame("Core.Hello {}") + b"y" + bytes([IAC, WILL, MCCP2_OPT]) + b"z"
+        for cut in range(1, len(frame)):
+            decoder = TelnetDecoder()
+            a, ev_a = decoder.feed(frame[:cut])
+            b, ev_b = decoder.feed(frame[cut:])
+            self.assertEqual(a + b, b"xyz", cut)
+            self.assertEqual(ev_a + ev_b, [("gmcp", "Core.Hello {}"), ("will", MCCP2_OPT)], cut)
+
+    def test_oversized_subnegotiation_dropped(self):
+        decoder = TelnetDecoder()
+        clean, _ = decoder.feed(b"a" + bytes([IAC, SB, GMCP_OPT]) + b"x" * 5000)
+        self.assertEqual(clean, b"a")
+        # Past the cap the buffer stops growing
+        decoder.feed(b"x" * 5000 + bytes([IAC]))
+        self.assertEqual(decoder.dropped_subnegs, 1)
+        self.assertLessEqual(len(decoder._pending), 1)
+        for _ in range(100):
+            self.assertEqual(decoder.feed(b"y" * 4096), (b"", []))
+        self.assertEqual(decoder._pending, b"")
+        # Input resumes after the IAC SE, split across reads
+        clean, events = decoder.feed(b"zz" + bytes([IAC]))
+        clean, events = decoder.feed(bytes([SE]) + b"look" + gmcp_frame("Core.Ping {}"))
+        self.assertEqual(clean, b"look")
+        self.assertEqual(events, [("gmcp", "Core.Ping {}")])
+
+    def test_one_shot_helpers(self):
+        data = b"hi" + gmcp_frame("Room.Info {}")
+        self.assertEqual(strip_iac(data), b"hi")
+        self.assertEqual(extract_gmcp(data), (b"hi", ["Room.Info {}"]))
+
+
+class TestTelnetOutput(unittest.TestCase):
+
+    def test_writes_coalesced_per_tick(self):
+        async def go():
+            sink = FakeStreamWriter()
+            out = TelnetOutput(sink)
+            out.write(b"one ")
+            out.write(b"two ")
+            out.write(b"three")
+            await asyncio.sleep(0)
+            return sink.chunks, out
+
+        chunks, out = asyncio.run(go())
+        self.assertEqual(chunks, [b"one two three"])
+        self.assertEqual((out.writes, out.flushes), (3, 1))
+
+    def test_mccp2_stream_decompresses(self):
+        async def go():
+            sink = FakeStreamWriter()
+            out = TelnetOutput(sink)
+            out.start_mccp2()
+            out.write(b"You hit the orc. " * 20)
+            await out.drain()
+            out.write(b"The orc dies.")
+            await out.drain()
+            return sink.chunks, out
+
+        chunks, out = asyncio.run(go())
+        self.assertEqual(chunks[0], bytes([IAC, SB, MCCP2_OPT, IAC, SE]))
+        d = zlib.decompressobj()
+        self.assertEqual(b"".join(d.decompress(c) for c in chunks[1:]),
+                         b"You hit the orc. " * 20 + b"The orc dies.")
+        self.assertLess(out.bytes_out, out.bytes_in)
+
+
+if __name__ == '__main__':
+    unittest.main()
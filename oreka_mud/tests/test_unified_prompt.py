@@ -7,7 +7,10 @@ context, trust-filtered secrets, NPC memory).
 
 import os
 import sys
+import tempfile
 import unittest
+from contextlib import ExitStack
+from unittest import mock
 from unittest.mock import MagicMock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,6 +19,23 @@ from src.ai import build_unified_npc_prompt, PROMPT_MODES
 from src.ai_schemas import (
     AiPersona, ArcReaction, ArcSheet, ChecklistItem, PcSheet, RoomAmbience,
 )
+from src import npc_memory
+from src.npc_memory import NPCMemoryStore
+
+
+_cleanup = ExitStack()
+
+
+def setUpModule():
+    """Point the global NPC memory store at a temp database, not data/."""
+    tmp = _cleanup.enter_context(tempfile.TemporaryDirectory())
+    _cleanup.enter_context(mock.patch.object(
+        npc_memory, "npc_memory_store",
+        NPCMemoryStore(db_path=os.path.join(tmp, "npc_memory.db"), legacy_dir=None)))
+
+
+def tearDownModule():
+    _cleanup.close()
 
 
 def _make_room(with_ambience=True):
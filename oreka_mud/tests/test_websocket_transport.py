@@ -0,0 +1,103 @@
+"""Tests for the in-process WebSocket transport (no websockets package needed)."""
+
+import asyncio
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.websocket_server import (
+    WebSocketReader, WebSocketWriter, _preauth_input, _run_in_process,
+)
+
+
+class FakeWebSocket:
+    """Stands in for a websockets connection: scripted inbound, recorded outbound."""
+
+    def __init__(self, inbound=()):
+        self.inbound = asyncio.Queue()
+        for msg in inbound:
+            self.inbound.put_nowait(msg)
+        self.sent = []
+        self.remote_address = ("127.0.0.1", 0)
+
+    async def recv(self):
+        msg = await self.inbound.get()
+        if msg is None:
+            raise ConnectionError("closed")
+        return msg
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def close(self):
+        pass
+
+
+class TestWebSocketTransport(unittest.TestCase):
+
+    def test_reader_preload_then_frames_and_gmcp(self):
+        async def go():
+            ws = FakeWebSocket(['GMCP:Core.Supports.Set ["Char.Vitals 1"]',
+                                "look", "north\r\nsouth\n", None])
+            writer = WebSocketWriter(ws)
+            reader = WebSocketReader(ws, gmcp=writer.gmcp, preload=["y", "Ann"])
+            lines = [await reader.readline() for _ in range(6)]
+            writer.close()
+            await writer.wait_closed()
+            return lines, writer.gmcp.supported_packages
+
+        lines, packages = asyncio.run(go())
+        self.assertEqual(lines, ["y", "Ann", "look", "north", "south", ""])
+        self.assertIn("Char.Vitals", packages)
+
+    def test_writer_coalesces_text_and_orders_gmcp(self):
+        async def go():
+            ws = FakeWebSocket()
+            writer = WebSocketWriter(ws)
+            writer.write("You see ")
+            writer.write("a room.\n")
+            writer.gmcp.emit("Char.Vitals", {"hp": 5})
+            writer.write("> ")
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            return ws.sent
+
+        self.assertEqual(asyncio.run(go()), [
+            "You see a room.\n",
+            'GMCP:Char.Vitals {"hp":5}',
+            "> ",
+        ])
+
+    def test_preauth_input(self):
+        self.assertEqual(_preauth_input({"is_new": True, "mode": "mud"}), ["n"])
+        auth = {"is_new": False, "username": "Ann", "password": "pw",
+                "mode": "chat", "chat_npc_name": "Old Tomas"}
+        self.assertEqual(_preauth_input(auth), ["y", "Ann", "pw", "chat Old"])
+
+    def test_session_attached_to_client_handler(self):
+        seen = []
+
+        async def client_handler(reader, writer):
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                seen.append(line)
+                writer.write(f"echo {line}\n")
+                await writer.drain()
+
+        async def go():
+            ws = FakeWebSocket(["hello", None])
+            auth = {"is_new": False, "username": "Ann", "password": "pw", "mode": "mud"}
+            await _run_in_process(ws, auth, client_handler)
+            return ws.sent
+
+        sent = asyncio.run(go())
+        self.assertEqual(seen, ["y", "Ann", "pw", "hello"])
+        self.assertEqual("".join(sent), "echo y\necho Ann\necho pw\necho hello\n")
+
+
+if __name__ == '__main__':
+    unittest.main()